@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Compressed checkpoint storage.
+
+A checkpoint file (checkpoint_<timestamp>.ckpt) is laid out as:
+
+    MAGIC | 8-byte header length | header JSON | section blobs...
+
+The header holds the checkpoint metadata, the small "core" part of the
+workflow state and an index of (offset, length) for each large section
+(files_created, failed_agents, ...). Every section is compressed on its own,
+so a restore reads the header only and decompresses a section the first time
+it is accessed - or streams it straight into workflow-state.json without ever
+parsing it.
+
+Codec and encoding come from the environment, like WORKFLOW_GATE_MODE:
+    WORKFLOW_CHECKPOINT_CODEC     gzip (default) | lzma | zlib | none
+    WORKFLOW_CHECKPOINT_ENCODING  json (default) | marshal
+
+Legacy pretty-printed checkpoint_*.json files are still readable.
+
+Benchmark:
+    python3 checkpoint_store.py --benchmark [--files 50000]
+"""
+import argparse
+import json
+import lzma
+import marshal
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from collections.abc import MutableMapping
+from datetime import datetime
+
+MAGIC = b"WFCKPT1\n"
+EXTENSION = ".ckpt"
+CODECS = ("gzip", "lzma", "zlib", "none")
+ENCODINGS = ("json", "marshal")
+
+# State keys that grow with the run; stored as separately compressed sections
+LAZY_SECTIONS = (
+    "files_created",
+    "files_modified",
+    "failed_agents",
+    "gate_failures",
+    "gate_warnings",
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def get_codec():
+    """Checkpoint compression codec from WORKFLOW_CHECKPOINT_CODEC (default gzip)."""
+    codec = os.environ.get("WORKFLOW_CHECKPOINT_CODEC", "gzip").lower()
+    return codec if codec in CODECS else "gzip"
+
+
+def get_encoding():
+    """Section encoding from WORKFLOW_CHECKPOINT_ENCODING (default json)."""
+    encoding = os.environ.get("WORKFLOW_CHECKPOINT_ENCODING", "json").lower()
+    return encoding if encoding in ENCODINGS else "json"
+
+
+def _compress(data, codec):
+    if codec == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    if codec == "lzma":
+        return lzma.compress(data, preset=1)
+    return data
+
+
+def _decompressor(codec):
+    """Return a streaming decompressor with a .decompress(chunk) method, or None."""
+    if codec == "gzip":
+        return zlib.decompressobj(31)
+    if codec == "zlib":
+        return zlib.decompressobj()
+    if codec == "lzma":
+        return lzma.LZMADecompressor()
+    return None
+
+
+def _encode(value, encoding):
+    if encoding == "marshal":
+        return marshal.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _decode(data, encoding):
+    if encoding == "marshal":
+        return marshal.loads(data)
+    return json.loads(data)
+
+
+def write_checkpoint(checkpoint_dir, state, stop_reason="session_end", codec=None, encoding=None):
+    """Write state as a compressed checkpoint and return its path."""
+    codec = codec or get_codec()
+    encoding = encoding or get_encoding()
+    created_at = datetime.now()
+
+    core = {k: v for k, v in state.items() if k not in LAZY_SECTIONS}
+    blobs = []
+    sections = {}
+    offset = 0
+    for name in LAZY_SECTIONS:
+        if name not in state:
+            continue
+        blob = _compress(_encode(state[name], encoding), codec)
+        sections[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        "created_at": created_at.isoformat(),
+        "stop_reason": stop_reason,
+        "codec": codec,
+        "encoding": encoding,
+        "marshal_version": marshal.version if encoding == "marshal" else None,
+        "sections": sections,
+        "core": core,
+    }, separators=(",", ":")).encode()
+
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    timestamp = created_at.strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(checkpoint_dir, f"checkpoint_{timestamp}{EXTENSION}")
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack(">Q", len(header)) + header + b"".join(blobs))
+    return path
+
+
+class LazyState(MutableMapping):
+    """
+    Workflow state whose large sections are decompressed on first access.
+    Behaves like a dict; dict(state) or state.to_dict() materializes it.
+    """
+
+    def __init__(self, checkpoint):
+        self._checkpoint = checkpoint
+        self._data = dict(checkpoint.core)
+        self._pending = set(checkpoint.sections)
+
+    def _load(self, key):
+        if key in self._pending:
+            self._data[key] = self._checkpoint.read_section(key)
+            self._pending.discard(key)
+
+    def __getitem__(self, key):
+        self._load(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        if key in self._pending:
+            self._pending.discard(key)
+            if key not in self._data:
+                return
+        del self._data[key]
+
+    def __iter__(self):
+        yield from self._data
+        yield from (k for k in self._checkpoint.sections if k in self._pending and k not in self._data)
+
+    def __len__(self):
+        return len(set(self._data) | self._pending)
+
+    def __contains__(self, key):
+        return key in self._data or key in self._pending
+
+    def is_loaded(self, key):
+        return key not in self._pending
+
+    def to_dict(self):
+        for key in list(self._pending):
+            self._load(key)
+        return dict(self._data)
+
+    def save(self, state_path):
+        """
+        Write the state as indented JSON. Sections that were never accessed
+        are streamed from the checkpoint as-is instead of being parsed.
+        """
+        if self._checkpoint.encoding != "json":
+            self.to_dict()
+        streamed = [name for name in self._checkpoint.sections if name in self._pending]
+
+        os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            body = json.dumps(self._data, indent=2).encode()
+            if not streamed:
+                f.write(body)
+            else:
+                f.write(body[:-1].rstrip())  # drop closing brace
+                first = body.strip() == b"{}"
+                for name in streamed:
+                    f.write(b"\n" if first else b",\n")
+                    first = False
+                    f.write(b"  " + json.dumps(name).encode() + b": ")
+                    for chunk in self._checkpoint.iter_section_bytes(name):
+                        f.write(chunk)
+                f.write(b"\n}")
+        os.replace(tmp_path, state_path)
+
+
+class Checkpoint:
+    """A checkpoint opened for reading; only the header is parsed up front."""
+
+    def __init__(self, path):
+        self.path = path
+        self.legacy = not path.endswith(EXTENSION)
+        if self.legacy:
+            with open(path) as f:
+                payload = json.load(f)
+            self.created_at = payload.get("created_at")
+            self.stop_reason = payload.get("stop_reason", "")
+            self.codec = "none"
+            self.encoding = "json"
+            self.sections = {}
+            self.core = payload.get("state", {})
+            self._data_start = 0
+            return
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a workflow checkpoint: {path}")
+            (header_len,) = struct.unpack(">Q", f.read(8))
+            header = json.loads(f.read(header_len))
+        self._data_start = len(MAGIC) + 8 + header_len
+        self.created_at = header.get("created_at")
+        self.stop_reason = header.get("stop_reason", "")
+        self.codec = header.get("codec", "none")
+        self.encoding = header.get("encoding", "json")
+        self.sections = header.get("sections", {})
+        self.core = header.get("core", {})
+        if self.encoding == "marshal" and header.get("marshal_version") != marshal.version:
+            raise ValueError(f"Checkpoint {path} was written with an incompatible marshal version")
+
+    def iter_section_bytes(self, name):
+        """Yield the decompressed, still-encoded bytes of a section in chunks."""
+        offset, length = self.sections[name]
+        decompressor = _decompressor(self.codec)
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start + offset)
+            remaining = length
+            while remaining:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield decompressor.decompress(chunk) if decompressor else chunk
+            if decompressor is not None and hasattr(decompressor, "flush"):
+                tail = decompressor.flush()
+                if tail:
+                    yield tail
+
+    def read_section(self, name):
+        return _decode(b"".join(self.iter_section_bytes(name)), self.encoding)
+
+    @property
+    def state(self):
+        return LazyState(self)
+
+    def restore_to(self, state_path):
+        """
+        Write the checkpointed state to state_path.
+        JSON-encoded sections are streamed through without being parsed.
+        """
+        self.state.save(state_path)
+
+
+def list_checkpoints(checkpoint_dir):
+    """Checkpoint files (new and legacy) sorted oldest to newest."""
+    if not os.path.isdir(checkpoint_dir):
+        return []
+    names = [
+        f for f in os.listdir(checkpoint_dir)
+        if f.startswith("checkpoint_") and (f.endswith(EXTENSION) or f.endswith(".json"))
+    ]
+    return [os.path.join(checkpoint_dir, f) for f in sorted(names)]
+
+
+def open_latest(checkpoint_dir):
+    """Open the newest readable checkpoint, or return None."""
+    for path in reversed(list_checkpoints(checkpoint_dir)):
+        try:
+            return Checkpoint(path)
+        except Exception:
+            continue
+    return None
+
+
+def _synthetic_state(touched_files):
+    return {
+        "workflow_id": "benchmark",
+        "current_stage": "implementation",
+        "stage_status": {"implementation": "in_progress"},
+        "progress_percent": 50,
+        "files_created": [f"src/module_{i // 100}/component_{i}.ts" for i in range(touched_files // 2)],
+        "files_modified": [f"src/module_{i // 100}/component_{i}.ts" for i in range(touched_files // 2, touched_files)],
+        "failed_agents": [
+            {"agent": "code-implementer", "at": datetime.now().isoformat(), "result": {"error": f"failure {i}"}}
+            for i in range(200)
+        ],
+        "agent_results": {},
+        "stage_transitions": [],
+    }
+
+
+def run_benchmark(touched_files):
+    """Compare legacy JSON checkpoints with each codec on size and resume latency."""
+    state = _synthetic_state(touched_files)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "workflow-state.json")
+
+        legacy_dir = os.path.join(tmp, "legacy")
+        os.makedirs(legacy_dir)
+        legacy_path = os.path.join(legacy_dir, "checkpoint_legacy.json")
+        start = time.perf_counter()
+        with open(legacy_path, "w") as f:
+            json.dump({"created_at": datetime.now().isoformat(), "state": state}, f, indent=2)
+        write_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        with open(legacy_path) as f:
+            restored = json.load(f)["state"]
+        with open(state_path, "w") as f:
+            json.dump(restored, f, indent=2)
+        resume_ms = (time.perf_counter() - start) * 1000
+        legacy_size = os.path.getsize(legacy_path)
+        results.append(("legacy json", "json", legacy_size, write_ms, resume_ms))
+
+        for codec in CODECS:
+            for encoding in ENCODINGS:
+                ckpt_dir = os.path.join(tmp, f"{codec}-{encoding}")
+                start = time.perf_counter()
+                path = write_checkpoint(ckpt_dir, state, codec=codec, encoding=encoding)
+                write_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                open_latest(ckpt_dir).restore_to(state_path)
+                resume_ms = (time.perf_counter() - start) * 1000
+                results.append((codec, encoding, os.path.getsize(path), write_ms, resume_ms))
+
+        start = time.perf_counter()
+        stage = open_latest(os.path.join(tmp, "gzip-json")).state["current_stage"]
+        header_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Checkpoint benchmark: {touched_files} touched files")
+    print(f"{'codec':<12} {'encoding':<9} {'size':>12} {'ratio':>7} {'write ms':>9} {'resume ms':>10}")
+    for codec, encoding, size, write_ms, resume_ms in results:
+        print(f"{codec:<12} {encoding:<9} {size:>12,} {legacy_size / size:>6.1f}x {write_ms:>9.1f} {resume_ms:>10.1f}")
+    print(f"Lazy open + read current_stage ({stage}): {header_ms:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workflow checkpoint storage")
+    parser.add_argument("--benchmark", action="store_true", help="Run the size/resume benchmark")
+    parser.add_argument("--files", type=int, default=50000, help="Touched files in the synthetic state")
+    parser.add_argument("--inspect", metavar="PATH", help="Print a checkpoint's header summary")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.files)
+        return 0
+    if args.inspect:
+        checkpoint = Checkpoint(args.inspect)
+        print(json.dumps({
+            "created_at": checkpoint.created_at,
+            "stop_reason": checkpoint.stop_reason,
+            "codec": checkpoint.codec,
+            "encoding": checkpoint.encoding,
+            "current_stage": checkpoint.core.get("current_stage"),
+            "sections": {name: length for name, (_, length) in checkpoint.sections.items()},
+        }, indent=2))
+        return 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,13 @@ import sys
 import os
 from datetime import datetime
 
+# Ensure sibling module imports work regardless of CWD
+_HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _HOOKS_DIR not in sys.path:
+    sys.path.insert(0, _HOOKS_DIR)
+
+from workflow_summary import write_summary
+
 ESCALATION_TRIGGERS = [
     "critical_security",
     "legal_block",
@@ -87,5 +94,6 @@ if escalation_level == "critical":
             json.dump(state, f, indent=2)
     except Exception:
         pass
+    write_summary(state, project_dir)
 
 sys.exit(0)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Progress event spool.
+
+In spool mode (WORKFLOW_PROGRESS_MODE=spool, the default) the PostToolUse
+progress hook does not touch workflow-state.json. It appends one compact
+JSON line to .claude/progress-spool.jsonl with a single write. The spool is
+folded into workflow-state.json on Stop, on Task completion, and whenever a
+reader (stage gates, workflow status/resume) needs fresh state.
+
+Appenders hold a shared flock on the spool while writing; fold_spool holds
+an exclusive one while it reads, saves state and truncates, so no event is
+lost or applied twice. Replaying an event is harmless anyway: applying the
+same file path twice is a no-op.
+
+Set WORKFLOW_PROGRESS_MODE=immediate to apply every event as it happens.
+"""
+import fcntl
+import json
+import os
+from datetime import datetime
+
+from workflow_summary import write_summary
+
+DEFAULT_STAGE_STATUS = {
+    "prd_analysis": "pending",
+    "plan_generation": "pending",
+    "security_legal_review": "pending",
+    "implementation": "pending",
+    "testing": "pending",
+    "completion": "pending"
+}
+
+
+def get_paths(project_dir=None):
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    return {
+        "state": os.path.join(project_dir, ".claude/workflow-state.json"),
+        "plan": os.path.join(project_dir, ".claude/implementation-plan.json"),
+        "requirements": os.path.join(project_dir, ".claude/requirements.json"),
+        "spool": os.path.join(project_dir, ".claude/progress-spool.jsonl"),
+    }
+
+
+def get_progress_mode():
+    """
+    Progress tracking mode from WORKFLOW_PROGRESS_MODE.
+    Returns 'spool' (append events, fold later) or 'immediate'.
+    Invalid values default to 'spool'.
+    """
+    mode = os.environ.get("WORKFLOW_PROGRESS_MODE", "spool").lower()
+    if mode not in ("spool", "immediate"):
+        mode = "spool"
+    return mode
+
+
+def make_event(tool_name, file_path):
+    return {"tool": tool_name, "file": file_path, "at": datetime.now().isoformat()}
+
+
+def append_event(tool_name, file_path, project_dir=None):
+    """Append one event line to the spool (a single write under a shared lock)."""
+    spool_file = get_paths(project_dir)["spool"]
+    line = (json.dumps(make_event(tool_name, file_path), separators=(",", ":")) + "\n").encode()
+    fd = os.open(spool_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _normalize(path):
+    return os.path.normpath(os.path.expanduser(os.path.expandvars(path)))
+
+
+def _planned_progress(plan_file, touched):
+    """Percent of planned files touched (same matching rules as stage_gates), or None."""
+    try:
+        with open(plan_file) as f:
+            plan = json.load(f)
+    except Exception:
+        return None
+
+    planned_paths = set()
+    for f in plan.get("file_structure", {}).get("files", []):
+        path = f.get("path", "") if isinstance(f, dict) else str(f)
+        if path:
+            planned_paths.add(_normalize(path))
+    if not planned_paths:
+        return None
+
+    touched_normalized = {_normalize(f) for f in touched}
+    matched = 0
+    for planned in planned_paths:
+        if planned in touched_normalized:
+            matched += 1
+            continue
+        suffix = os.sep + planned
+        if any(t.endswith(suffix) for t in touched_normalized):
+            matched += 1
+    return min(100, int(matched / len(planned_paths) * 100))
+
+
+def apply_events(state, events, project_dir=None):
+    """Fold progress events into state in place (files, activity, stage status, percent)."""
+    paths = get_paths(project_dir)
+    created = state.setdefault("files_created", [])
+    modified = state.setdefault("files_modified", [])
+    created_set = set(created)
+    modified_set = set(modified)
+
+    for event in events:
+        tool_name = event.get("tool", "")
+        file_path = event.get("file", "")
+        if not file_path:
+            continue
+        if tool_name == "Write":
+            if file_path not in created_set:
+                created_set.add(file_path)
+                created.append(file_path)
+        elif tool_name in ["Edit", "MultiEdit"]:
+            if file_path not in modified_set:
+                modified_set.add(file_path)
+                modified.append(file_path)
+        state["last_activity"] = event.get("at") or datetime.now().isoformat()
+
+    # Ensure stage_status dict exists
+    if "stage_status" not in state:
+        state["stage_status"] = dict(DEFAULT_STAGE_STATUS)
+
+    # Update stage_status based on current_stage (mark as in_progress, don't auto-advance)
+    current_stage = state.get("current_stage")
+    if current_stage and current_stage in state["stage_status"]:
+        if state["stage_status"][current_stage] == "pending":
+            state["stage_status"][current_stage] = "in_progress"
+
+    # NOTE: Stage advancement is handled by subagent-result-processor.py, not here.
+    # This ensures approval gates (security/legal review) are respected.
+    # We only track artifact existence for informational purposes.
+    if os.path.exists(paths["requirements"]):
+        state["stage_status"]["prd_analysis"] = "completed"
+
+    if os.path.exists(paths["plan"]):
+        state["stage_status"]["plan_generation"] = "completed"
+        percent = _planned_progress(paths["plan"], created + modified)
+        if percent is not None:
+            state["progress_percent"] = percent
+    return state
+
+
+def load_state(state_file):
+    state = {
+        "files_created": [],
+        "files_modified": [],
+        "current_stage": "prd_analysis",
+        "progress_percent": 0
+    }
+    if os.path.exists(state_file):
+        try:
+            with open(state_file) as f:
+                state = json.load(f)
+        except Exception:
+            pass
+    return state
+
+
+def save_state(state_file, state):
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    with open(state_file, 'w') as f:
+        json.dump(state, f, indent=2)
+    # .claude/workflow-state.json -> project dir
+    write_summary(state, os.path.dirname(os.path.dirname(state_file)))
+
+
+def _parse_events(data):
+    events = []
+    for line in data.decode(errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # torn line from a crashed writer
+    return events
+
+
+def fold_spool(project_dir=None):
+    """
+    Apply pending spool events to workflow-state.json and clear the spool.
+    Returns the number of events folded. Safe to call when there is no spool.
+    """
+    paths = get_paths(project_dir)
+    try:
+        fd = os.open(paths["spool"], os.O_RDWR)
+    except OSError:
+        return 0
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        events = _parse_events(b"".join(chunks))
+        if events:
+            state = load_state(paths["state"])
+            apply_events(state, events, project_dir)
+            save_state(paths["state"], state)
+        # Truncate only after the state is saved: a crash in between replays
+        # events, which is idempotent, rather than dropping them
+        os.ftruncate(fd, 0)
+        return len(events)
+    finally:
+        os.close(fd)
+
+
+def clear_spool(project_dir=None):
+    """Drop pending events (a new workflow must not inherit the old run's edits)."""
+    try:
+        fd = os.open(get_paths(project_dir)["spool"], os.O_RDWR)
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.ftruncate(fd, 0)
+    finally:
+        os.close(fd)
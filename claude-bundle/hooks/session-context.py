@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Builds the SessionStart context block in a single process.
+
+Default: workflow summary only, read from the precomputed
+.claude/workflow-summary.json (falls back to workflow-state.json when the
+summary is missing or older than the state, and rewrites it for next time).
+
+--full (or WORKFLOW_SESSION_CONTEXT=full) also adds the git summary, a TODO
+digest and open GitHub issues - what load-context.sh used to gather.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+# Ensure sibling module imports work regardless of CWD
+_HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _HOOKS_DIR not in sys.path:
+    sys.path.insert(0, _HOOKS_DIR)
+
+from workflow_summary import get_state_path, read_summary, write_summary
+
+TODO_PATTERN = "TODO|FIXME|HACK"
+TODO_EXTENSIONS = (".js", ".ts", ".py", ".go", ".rs")
+TODO_LIMIT = 10
+SKIP_DIRS = {".git", "node_modules", ".claude", "__pycache__", ".venv", "venv", "build", "dist"}
+
+
+def run(cmd, cwd, timeout=5):
+    """Run a command and return stdout ('' on any failure)."""
+    try:
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+        return result.stdout if result.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def workflow_context(project_dir):
+    summary = read_summary(project_dir)
+    if summary is not None:
+        return summary.get("context", "")
+
+    state_file = get_state_path(project_dir)
+    if not os.path.exists(state_file):
+        return "No active workflow. Use workflow start <prd-path> to begin."
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+    except Exception:
+        state = {}
+    write_summary(state, project_dir)
+    summary = read_summary(project_dir) or {}
+    return summary.get("context", "No active workflow. Use workflow start <prd-path> to begin.")
+
+
+def git_context(project_dir):
+    # One status call yields branch and changes; log is the only other spawn
+    status = run(["git", "status", "--porcelain", "--branch"], project_dir)
+    if not status:
+        return ""
+    lines = status.splitlines()
+    branch = "unknown"
+    if lines and lines[0].startswith("## "):
+        branch = lines.pop(0)[3:].split("...")[0]
+    context = "## Current Git Status\n"
+    context += f"Branch: {branch}\n"
+    context += "\nRecent commits:\n"
+    context += (run(["git", "log", "--oneline", "-5"], project_dir).strip() or "No commits") + "\n"
+    if lines:
+        context += "\nUncommitted changes:\n" + "\n".join(lines[:20]) + "\n"
+    return context
+
+
+def _walk_todos(project_dir):
+    pattern = re.compile(TODO_PATTERN)
+    found = []
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if not name.endswith(TODO_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            try:
+                with open(path, errors="ignore") as f:
+                    for lineno, line in enumerate(f, 1):
+                        if pattern.search(line):
+                            rel = os.path.relpath(path, project_dir)
+                            found.append(f"./{rel}:{lineno}:{line.rstrip()}")
+                            if len(found) >= TODO_LIMIT:
+                                return found
+            except OSError:
+                continue
+    return found
+
+
+def todo_context(project_dir, in_git):
+    if in_git:
+        # git grep uses the index and skips ignored/vendored trees
+        globs = [f"*{ext}" for ext in TODO_EXTENSIONS]
+        todos = []
+        try:
+            proc = subprocess.Popen(
+                ["git", "grep", "-n", "-I", "-E", TODO_PATTERN, "--"] + globs,
+                cwd=project_dir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+            for line in proc.stdout:
+                todos.append(f"./{line.rstrip()}")
+                if len(todos) >= TODO_LIMIT:
+                    break
+            proc.kill()
+            proc.wait()
+        except OSError:
+            pass
+    else:
+        todos = _walk_todos(project_dir)
+    if not todos:
+        return ""
+    return "\n## TODOs in codebase:\n" + "\n".join(todos) + "\n"
+
+
+def issues_context(project_dir):
+    if not shutil.which("gh"):
+        return ""
+    issues = run(["gh", "issue", "list", "--limit", "5"], project_dir, timeout=10).strip()
+    return f"\n## Open GitHub Issues:\n{issues}\n" if issues else ""
+
+
+def main():
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    full = "--full" in sys.argv[1:] or os.environ.get("WORKFLOW_SESSION_CONTEXT", "").lower() == "full"
+
+    context = workflow_context(project_dir)
+    if full:
+        git = git_context(project_dir)
+        context += "\n" + git if git else ""
+        context += todo_context(project_dir, bool(git))
+        context += issues_context(project_dir)
+
+    print(json.dumps({
+        "hookSpecificOutput": {
+            "hookEventName": "SessionStart",
+            "additionalContext": context
+        }
+    }))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,30 @@ Gates can be configured to block or warn via WORKFLOW_GATE_MODE env var.
 """
 import os
 import json
+import hashlib
+
+from progress_spool import fold_spool
+
+# Project-root files whose contents define the dependency set under review
+DEPENDENCY_MANIFESTS = [
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+    "requirements.txt", "Pipfile", "Pipfile.lock", "pyproject.toml", "poetry.lock",
+    "Cargo.toml", "Cargo.lock", "go.mod", "go.sum",
+    "Gemfile", "Gemfile.lock", "Podfile", "Podfile.lock",
+    "Package.swift", "Package.resolved",
+    "build.gradle", "build.gradle.kts", "pom.xml",
+    "composer.json", "composer.lock",
+]
+
+# Project-root files that carry the project's own licensing terms
+LICENSE_FILE_PREFIXES = ("LICENSE", "LICENCE", "COPYING", "NOTICE")
+
+# Inputs each review agent signs off on; an approval is reused only while
+# every one of these still hashes to what the agent saw
+REVIEW_INPUTS = {
+    "security-auditor": ("plan", "dependencies"),
+    "legal-reviewer": ("plan", "dependencies", "licenses"),
+}
 
 
 def load_json(path):
@@ -19,7 +43,13 @@ def load_json(path):
         return {}
 
 
-def gate_prd_to_plan(project_dir):
+def load_state(project_dir):
+    """Load workflow-state.json after folding any spooled progress events."""
+    fold_spool(project_dir)
+    return load_json(os.path.join(project_dir, ".claude/workflow-state.json"))
+
+
+def gate_prd_to_plan(project_dir, state=None):
     """Stage 1 -> 2: requirements.json must exist with features."""
     req_file = os.path.join(project_dir, ".claude/requirements.json")
     req = load_json(req_file)
@@ -29,7 +59,7 @@ def gate_prd_to_plan(project_dir):
     return True, f"PRD analysis complete: {len(features)} features extracted"
 
 
-def gate_plan_to_review(project_dir):
+def gate_plan_to_review(project_dir, state=None):
     """Stage 2 -> 3: implementation-plan.json must exist with tasks."""
     plan_file = os.path.join(project_dir, ".claude/implementation-plan.json")
     plan = load_json(plan_file)
@@ -40,20 +70,106 @@ def gate_plan_to_review(project_dir):
     return True, f"Plan complete: {len(tasks)} tasks, {len(files)} files planned"
 
 
-def gate_review_to_impl(project_dir):
-    """Stage 3 -> 4: Both security and legal agents must have succeeded."""
-    state_file = os.path.join(project_dir, ".claude/workflow-state.json")
-    state = load_json(state_file)
-    results = state.get("agent_results", {})
+def _hash_files(paths):
+    """Hash (name, contents) of the given files that exist; 'none' if none do."""
+    digest = hashlib.sha256()
+    found = False
+    for path in sorted(paths):
+        if not os.path.isfile(path):
+            continue
+        found = True
+        digest.update(os.path.basename(path).encode() + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest() if found else "none"
+
 
-    security_ok = results.get("security-auditor", {}).get("success", False)
-    legal_ok = results.get("legal-reviewer", {}).get("success", False)
+def hash_plan(project_dir):
+    """Hash implementation-plan.json content, ignoring its created_at stamp."""
+    plan = load_json(os.path.join(project_dir, ".claude/implementation-plan.json"))
+    if not plan:
+        return "none"
+    plan = {k: v for k, v in plan.items() if k != "created_at"}
+    canonical = json.dumps(plan, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
-    if not security_ok:
-        return False, "security-auditor has not approved"
-    if not legal_ok:
-        return False, "legal-reviewer has not approved"
-    return True, "Security and legal review passed"
+
+def hash_dependencies(project_dir):
+    """Hash every dependency manifest/lockfile at the project root."""
+    return _hash_files(os.path.join(project_dir, name) for name in DEPENDENCY_MANIFESTS)
+
+
+def hash_licenses(project_dir):
+    """Hash the project's own license files (LICENSE, COPYING, NOTICE...)."""
+    try:
+        names = os.listdir(project_dir)
+    except OSError:
+        names = []
+    return _hash_files(
+        os.path.join(project_dir, name)
+        for name in names
+        if name.upper().startswith(LICENSE_FILE_PREFIXES)
+    )
+
+
+FINGERPRINT_INPUTS = {
+    "plan": hash_plan,
+    "dependencies": hash_dependencies,
+    "licenses": hash_licenses,
+}
+
+
+def review_fingerprint(project_dir, agent_name):
+    """Current fingerprint of the inputs agent_name reviews ({} if not a reviewer)."""
+    return {
+        name: FINGERPRINT_INPUTS[name](project_dir)
+        for name in REVIEW_INPUTS.get(agent_name, ())
+    }
+
+
+def check_review_approval(project_dir, state, agent_name):
+    """
+    Is agent_name's approval still valid?
+    Returns (approved: bool, reason: str). A stored approval is accepted only
+    while its fingerprint matches the current inputs; results recorded before
+    fingerprints existed fall back to the plain success flag.
+    """
+    approval = state.get("review_approvals", {}).get(agent_name)
+    if approval is None:
+        if state.get("agent_results", {}).get(agent_name, {}).get("success", False):
+            return True, f"{agent_name} approved"
+        return False, f"{agent_name} has not approved"
+
+    current = review_fingerprint(project_dir, agent_name)
+    stored = approval.get("fingerprint", {})
+    changed = sorted(name for name in current if stored.get(name) != current[name])
+    if changed:
+        return False, f"{agent_name} approval is stale: {', '.join(changed)} changed since review"
+    return True, f"{agent_name} approval still valid (reviewed {approval.get('approved_at', 'earlier')})"
+
+
+def pending_reviewers(project_dir, state):
+    """Review agents that must (re)run because they lack a valid approval."""
+    return [
+        agent for agent in REVIEW_INPUTS
+        if not check_review_approval(project_dir, state, agent)[0]
+    ]
+
+
+def gate_review_to_impl(project_dir, state=None):
+    """Stage 3 -> 4: Both security and legal agents must hold a valid approval."""
+    if state is None:
+        state = load_state(project_dir)
+
+    reasons = []
+    for agent in REVIEW_INPUTS:
+        approved, reason = check_review_approval(project_dir, state, agent)
+        if not approved:
+            return False, reason
+        reasons.append(reason)
+    return True, "Security and legal review passed (" + "; ".join(reasons) + ")"
 
 
 def normalize_path(path):
@@ -64,13 +180,13 @@ def normalize_path(path):
     return os.path.normpath(expanded)
 
 
-def gate_impl_to_testing(project_dir):
+def gate_impl_to_testing(project_dir, state=None):
     """Stage 4 -> 5: 100% of planned files created or modified."""
     plan_file = os.path.join(project_dir, ".claude/implementation-plan.json")
-    state_file = os.path.join(project_dir, ".claude/workflow-state.json")
 
     plan = load_json(plan_file)
-    state = load_json(state_file)
+    if state is None:
+        state = load_state(project_dir)
 
     planned_files = plan.get("file_structure", {}).get("files", [])
     created_files = state.get("files_created", [])
@@ -118,12 +234,12 @@ def gate_impl_to_testing(project_dir):
     return True, f"{percentage:.0f}% of planned files completed ({matched} created/modified)"
 
 
-def gate_testing_to_completion(project_dir):
+def gate_testing_to_completion(project_dir, state=None):
     """Stage 5 -> 6: Tests pass with 80% coverage and acceptance validation."""
-    state_file = os.path.join(project_dir, ".claude/workflow-state.json")
     validation_file = os.path.join(project_dir, ".claude/validation-report.json")
 
-    state = load_json(state_file)
+    if state is None:
+        state = load_state(project_dir)
     validation = load_json(validation_file)
     results = state.get("agent_results", {})
 
@@ -167,15 +283,19 @@ STAGE_GATES = {
 }
 
 
-def validate_transition(from_stage, to_stage, project_dir):
+def validate_transition(from_stage, to_stage, project_dir, state=None):
     """
     Check if transition from from_stage to to_stage is allowed.
     Returns (passed: bool, reason: str).
+
+    Callers that will save their own copy of the state afterwards must pass
+    it as state: otherwise gates fold the spool into workflow-state.json
+    behind their back, and the caller's save drops the folded events.
     """
     gate_fn = STAGE_GATES.get((from_stage, to_stage))
     if gate_fn is None:
         return True, f"No gate defined for {from_stage} -> {to_stage}"
-    return gate_fn(project_dir)
+    return gate_fn(project_dir, state)
 
 
 def get_gate_mode():
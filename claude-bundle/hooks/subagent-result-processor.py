@@ -3,14 +3,20 @@
 import json
 import sys
 import os
+import time
 from datetime import datetime
 
+_HOOK_STARTED = time.time()
+
 # Ensure sibling module imports work regardless of CWD
 _HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
 if _HOOKS_DIR not in sys.path:
     sys.path.insert(0, _HOOKS_DIR)
 
-from stage_gates import validate_transition, get_gate_mode
+from progress_spool import fold_spool
+from stage_gates import validate_transition, get_gate_mode, review_fingerprint, REVIEW_INPUTS, pending_reviewers
+from workflow_summary import write_summary
+from workflow_trace import record_hook_span
 
 STAGE_TRANSITIONS = {
     "prd-analyzer": ("prd_analysis", "plan_generation"),
@@ -37,6 +43,9 @@ success = result.get("success", False)
 project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
 state_file = os.path.join(project_dir, ".claude/workflow-state.json")
 
+# Task completion: fold spooled progress events before reading state
+fold_spool(project_dir)
+
 state = {}
 if os.path.exists(state_file):
     try:
@@ -51,6 +60,16 @@ state.setdefault("agent_results", {})[agent_name] = {
     "success": success
 }
 
+# Remember what each review agent approved so unchanged inputs need no re-review
+if agent_name in REVIEW_INPUTS:
+    if success:
+        state.setdefault("review_approvals", {})[agent_name] = {
+            "approved_at": datetime.now().isoformat(),
+            "fingerprint": review_fingerprint(project_dir, agent_name)
+        }
+    else:
+        state.get("review_approvals", {}).pop(agent_name, None)
+
 # Log failures for debugging
 if not success:
     state.setdefault("failed_agents", []).append({
@@ -68,11 +87,58 @@ def save_state():
             json.dump(state, f, indent=2)
     except Exception:
         pass
+    write_summary(state, project_dir)
 
 
 # Persist agent result BEFORE gate validation so gates see current state
 save_state()
 
+
+def try_transition(from_stage, to_stage):
+    """Run the stage gate and advance state if it passes (or gate mode is warn)."""
+    gate_started = time.time()
+    # Gates read this process's state: folding the spool again here would
+    # apply events that the saves below then overwrite
+    gate_passed, gate_reason = validate_transition(from_stage, to_stage, project_dir, state)
+    record_hook_span(f"{from_stage} -> {to_stage}", gate_started, category="gate",
+                     project_dir=project_dir, passed=gate_passed)
+    gate_mode = get_gate_mode()
+
+    if not gate_passed:
+        if gate_mode == "strict":
+            # Block transition and log failure
+            state.setdefault("gate_failures", []).append({
+                "from": from_stage,
+                "to": to_stage,
+                "reason": gate_reason,
+                "at": datetime.now().isoformat()
+            })
+            return False
+        # Warn mode: log but allow transition
+        state.setdefault("gate_warnings", []).append({
+            "from": from_stage,
+            "to": to_stage,
+            "reason": gate_reason,
+            "at": datetime.now().isoformat()
+        })
+
+    # Mark the from_stage as completed
+    state.setdefault("stage_status", {})[from_stage] = "completed"
+
+    # Transition to next stage
+    state["current_stage"] = to_stage
+
+    # Log transition with gate info
+    state.setdefault("stage_transitions", []).append({
+        "from": from_stage,
+        "to": to_stage,
+        "at": datetime.now().isoformat(),
+        "gate_passed": gate_passed,
+        "gate_reason": gate_reason
+    })
+    return True
+
+
 # Check for stage transition
 if agent_name in STAGE_TRANSITIONS and success:
     from_stage, to_stage = STAGE_TRANSITIONS[agent_name]
@@ -81,11 +147,9 @@ if agent_name in STAGE_TRANSITIONS and success:
     if current == from_stage:
         should_transition = False
 
-        # For security_legal_review, both agents must complete
+        # For security_legal_review, both agents must hold a valid approval
         if from_stage == "security_legal_review":
-            security_done = state.get("agent_results", {}).get("security-auditor", {}).get("success", False)
-            legal_done = state.get("agent_results", {}).get("legal-reviewer", {}).get("success", False)
-            if security_done and legal_done:
+            if not pending_reviewers(project_dir, state):
                 should_transition = True
         # For testing, both test-runner-fixer and acceptance-validator must complete
         elif from_stage == "testing":
@@ -97,44 +161,15 @@ if agent_name in STAGE_TRANSITIONS and success:
             should_transition = True
 
         if should_transition:
-            # Validate stage gate before allowing transition
-            gate_passed, gate_reason = validate_transition(from_stage, to_stage, project_dir)
-            gate_mode = get_gate_mode()
-
-            if not gate_passed:
-                if gate_mode == "strict":
-                    # Block transition and log failure
-                    state.setdefault("gate_failures", []).append({
-                        "from": from_stage,
-                        "to": to_stage,
-                        "reason": gate_reason,
-                        "at": datetime.now().isoformat()
-                    })
-                    should_transition = False
-                else:
-                    # Warn mode: log but allow transition
-                    state.setdefault("gate_warnings", []).append({
-                        "from": from_stage,
-                        "to": to_stage,
-                        "reason": gate_reason,
-                        "at": datetime.now().isoformat()
-                    })
-
-            if should_transition:
-                # Mark the from_stage as completed
-                state.setdefault("stage_status", {})[from_stage] = "completed"
-
-                # Transition to next stage
-                state["current_stage"] = to_stage
-
-                # Log transition with gate info
-                state.setdefault("stage_transitions", []).append({
-                    "from": from_stage,
-                    "to": to_stage,
-                    "at": datetime.now().isoformat(),
-                    "gate_passed": gate_passed,
-                    "gate_reason": gate_reason
-                })
+            transitioned = try_transition(from_stage, to_stage)
+
+            # Re-entering review with approvals whose inputs are unchanged:
+            # reuse them instead of re-running both review agents
+            if (transitioned and to_stage == "security_legal_review"
+                    and state.get("review_approvals")
+                    and not pending_reviewers(project_dir, state)):
+                save_state()
+                try_transition("security_legal_review", "implementation")
 
 # Update stage status for current stage
 current_stage = state.get("current_stage")
@@ -152,4 +187,6 @@ if current_stage:
 # Final state save (captures any transition updates)
 save_state()
 
+record_hook_span("subagent-result-processor", _HOOK_STARTED, project_dir=project_dir, agent=agent_name)
+
 sys.exit(0)
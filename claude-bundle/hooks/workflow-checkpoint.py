@@ -3,8 +3,20 @@
 import json
 import sys
 import os
+import time
 from datetime import datetime
 
+_HOOK_STARTED = time.time()
+
+# Ensure sibling module imports work regardless of CWD
+_HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _HOOKS_DIR not in sys.path:
+    sys.path.insert(0, _HOOKS_DIR)
+
+from checkpoint_store import write_checkpoint
+from progress_spool import fold_spool
+from workflow_trace import record_hook_span
+
 try:
     input_data = json.load(sys.stdin)
 except (json.JSONDecodeError, Exception):
@@ -17,6 +29,9 @@ checkpoint_dir = os.path.join(project_dir, ".claude/checkpoints")
 # Ensure checkpoint directory exists
 os.makedirs(checkpoint_dir, exist_ok=True)
 
+# Stop: fold spooled progress events so the checkpoint is complete
+folded = fold_spool(project_dir)
+
 # Load current state
 state = {}
 if os.path.exists(state_file):
@@ -30,19 +45,12 @@ if os.path.exists(state_file):
 if not state.get("current_stage"):
     sys.exit(0)
 
-# Create checkpoint
-checkpoint = {
-    "created_at": datetime.now().isoformat(),
-    "state": state,
-    "stop_reason": input_data.get("stop_reason", "session_end")
-}
-
-timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-checkpoint_file = os.path.join(checkpoint_dir, f"checkpoint_{timestamp}.json")
-
+# Create checkpoint (compressed; codec from WORKFLOW_CHECKPOINT_CODEC)
+checkpoint_file = None
 try:
-    with open(checkpoint_file, 'w') as f:
-        json.dump(checkpoint, f, indent=2)
+    checkpoint_file = write_checkpoint(
+        checkpoint_dir, state, stop_reason=input_data.get("stop_reason", "session_end")
+    )
 except Exception:
     pass
 
@@ -57,4 +65,6 @@ try:
 except Exception:
     pass
 
+record_hook_span("workflow-checkpoint", _HOOK_STARTED, project_dir=project_dir, folded_events=folded)
+
 sys.exit(0)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Workflow command handler for: workflow start, workflow status, workflow resume
+Workflow command handler for: workflow start, workflow status, workflow resume, workflow trace
 This script is invoked via UserPromptSubmit hook when workflow commands are detected.
 """
 import json
@@ -9,6 +9,17 @@ import os
 import uuid
 from datetime import datetime
 
+# Ensure sibling module imports work regardless of CWD
+_HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _HOOKS_DIR not in sys.path:
+    sys.path.insert(0, _HOOKS_DIR)
+
+from checkpoint_store import LazyState, open_latest
+from progress_spool import clear_spool, fold_spool
+from stage_gates import pending_reviewers, validate_transition
+from workflow_summary import write_summary
+from workflow_trace import export_trace
+
 
 def strip_quotes(value):
     """Remove wrapping quotes without touching internal content."""
@@ -55,6 +66,8 @@ def get_paths():
     }
 
 def load_state(paths):
+    # Fold spooled progress events so readers always see fresh state
+    fold_spool(os.environ.get("CLAUDE_PROJECT_DIR", "."))
     if os.path.exists(paths["state"]):
         try:
             with open(paths["state"]) as f:
@@ -64,9 +77,14 @@ def load_state(paths):
     return None
 
 def save_state(paths, state):
-    os.makedirs(os.path.dirname(paths["state"]), exist_ok=True)
-    with open(paths["state"], 'w') as f:
-        json.dump(state, f, indent=2)
+    if isinstance(state, LazyState):
+        # Restored from a checkpoint: stream untouched sections back out
+        state.save(paths["state"])
+    else:
+        os.makedirs(os.path.dirname(paths["state"]), exist_ok=True)
+        with open(paths["state"], 'w') as f:
+            json.dump(state, f, indent=2)
+    write_summary(state, os.environ.get("CLAUDE_PROJECT_DIR", "."))
 
 def workflow_start(prd_path, paths):
     """Initialize a new workflow with the given PRD."""
@@ -107,6 +125,7 @@ def workflow_start(prd_path, paths):
         "can_resume": True
     }
 
+    clear_spool(project_dir)
     save_state(paths, state)
 
     return {
@@ -157,18 +176,11 @@ def workflow_resume(paths):
 
     if not state:
         # Check for checkpoints
-        checkpoint_dir = paths["checkpoints"]
-        if os.path.exists(checkpoint_dir):
-            checkpoints = sorted([f for f in os.listdir(checkpoint_dir) if f.endswith('.json')])
-            if checkpoints:
-                latest = os.path.join(checkpoint_dir, checkpoints[-1])
-                try:
-                    with open(latest) as f:
-                        checkpoint = json.load(f)
-                        state = checkpoint.get("state", {})
-                        save_state(paths, state)
-                except Exception:
-                    pass
+        # Only the checkpoint header is parsed here; large sections are
+        # decompressed lazily and streamed back out by save_state
+        checkpoint = open_latest(paths["checkpoints"])
+        if checkpoint is not None:
+            state = checkpoint.state
 
     if not state or not state.get("current_stage"):
         return {
@@ -177,6 +189,22 @@ def workflow_resume(paths):
             "message": "No workflow to resume. Use 'workflow start <prd-path>' to begin."
         }
 
+    # Review approvals whose inputs are unchanged carry over: skip stage 3
+    if state.get("current_stage") == "security_legal_review" and state.get("review_approvals"):
+        project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
+        gate_passed, gate_reason = validate_transition("security_legal_review", "implementation", project_dir, state)
+        if gate_passed:
+            state.setdefault("stage_status", {})["security_legal_review"] = "completed"
+            state["stage_status"]["implementation"] = "in_progress"
+            state["current_stage"] = "implementation"
+            state.setdefault("stage_transitions", []).append({
+                "from": "security_legal_review",
+                "to": "implementation",
+                "at": datetime.now().isoformat(),
+                "gate_passed": gate_passed,
+                "gate_reason": gate_reason
+            })
+
     # Update state to mark as resumed
     state["last_activity"] = datetime.now().isoformat()
     state["can_resume"] = True
@@ -193,15 +221,46 @@ def workflow_resume(paths):
         "completion": "doc-writer"
     }
 
+    next_agent = stage_agents.get(stage, "unknown")
+    if stage == "security_legal_review" and state.get("review_approvals"):
+        # Only reviewers whose approval went stale need to re-run
+        project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
+        next_agent = " and ".join(pending_reviewers(project_dir, state))
+
     return {
         "action": "resume",
         "workflow_id": state.get("workflow_id"),
         "current_stage": stage,
         "current_task": state.get("current_task"),
-        "next_agent": stage_agents.get(stage, "unknown"),
+        "next_agent": next_agent,
         "message": f"Resuming workflow at stage: {stage}"
     }
 
+def workflow_trace(paths):
+    """Export the current run as a Chrome trace and summarize the critical path."""
+    state = load_state(paths)
+
+    if not state or not state.get("current_stage"):
+        return {
+            "action": "trace",
+            "status": "no_active_workflow",
+            "message": "No workflow to trace. Use 'workflow start <prd-path>' to begin."
+        }
+
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    try:
+        summary = export_trace(project_dir)
+    except Exception as e:
+        return {"action": "trace", "error": f"Trace export failed: {e}"}
+
+    return {
+        "action": "trace",
+        "workflow_id": state.get("workflow_id"),
+        "trace_file": summary["trace_file"],
+        "critical_path": summary,
+        "message": f"Trace written to {summary['trace_file']}; open it in chrome://tracing or ui.perfetto.dev"
+    }
+
 def extract_prd_from_prompt(raw_prompt, prompt_lower):
     """Heuristically extract PRD path from free-form workflow start prompts."""
     if "workflow start" in prompt_lower:
@@ -256,6 +315,8 @@ def main():
         result = workflow_status(paths)
     elif prompt_lower == "workflow resume":
         result = workflow_resume(paths)
+    elif prompt_lower == "workflow trace":
+        result = workflow_trace(paths)
     elif "workflow" in prompt_lower and ("start" in prompt_lower or "status" in prompt_lower or "resume" in prompt_lower):
         # Fuzzy match for workflow commands
         if "start" in prompt_lower:
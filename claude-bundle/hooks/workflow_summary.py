@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Precomputed workflow summary for SessionStart.
+
+Every hook that changes a summarized field of workflow-state.json refreshes
+.claude/workflow-summary.json, a few hundred bytes holding the fields the
+session banner needs and the rendered context block itself. Session start
+then does one small read instead of parsing the full state. In spool mode
+the summary reflects the last fold; Stop always folds, so a new session
+starts from an up-to-date summary.
+
+The summary records the state file's mtime; a summary whose state file is
+gone or has changed since (edited by hand, written by an older hook) is
+ignored, so readers fall back to the state itself.
+"""
+import json
+import os
+from datetime import datetime
+
+SUMMARY_FIELDS = ("workflow_id", "current_stage", "progress_percent", "current_task", "stage_status")
+
+
+def get_summary_path(project_dir=None):
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    return os.path.join(project_dir, ".claude/workflow-summary.json")
+
+
+def get_state_path(project_dir=None):
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    return os.path.join(project_dir, ".claude/workflow-state.json")
+
+
+def state_mtime(project_dir=None):
+    """mtime (ns) of workflow-state.json, or None if it doesn't exist."""
+    try:
+        return os.stat(get_state_path(project_dir)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def render_context(summary, state_file):
+    """Markdown context block shown to Claude at session start."""
+    if not summary.get("current_stage"):
+        return "No active workflow. Use workflow start <prd-path> to begin."
+    context = "## Active Workflow\n"
+    context += f"- Stage: {summary['current_stage']}\n"
+    context += f"- Progress: {summary.get('progress_percent') or 0}%\n"
+    context += f"- Current Task: {summary.get('current_task') or 'none'}\n"
+    if summary.get("blockers"):
+        context += f"- Blockers: {summary['blockers']}\n"
+    context += f"- State File: {state_file}\n"
+    return context
+
+
+def build_summary(state, project_dir=None):
+    state_file = get_state_path(project_dir)
+    summary = {field: state.get(field) for field in SUMMARY_FIELDS}
+    summary["blockers"] = len(state.get("blockers") or [])
+    summary["updated_at"] = datetime.now().isoformat()
+    summary["state_mtime"] = state_mtime(project_dir)
+    summary["context"] = render_context(summary, state_file)
+    return summary
+
+
+def write_summary(state, project_dir=None):
+    """Refresh workflow-summary.json from state; never raises."""
+    try:
+        summary = build_summary(state, project_dir)
+        path = get_summary_path(project_dir)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(summary, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+
+
+def read_summary(project_dir=None):
+    """
+    Load workflow-summary.json, or None if it is missing or unreadable, or
+    if workflow-state.json is missing or has changed since it was written.
+    """
+    try:
+        with open(get_summary_path(project_dir)) as f:
+            summary = json.load(f)
+    except Exception:
+        return None
+    mtime = state_mtime(project_dir)
+    if mtime is None or summary.get("state_mtime") != mtime:
+        return None
+    return summary
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Workflow trace export.
+
+Turns workflow-state.json, checkpoints and hook metrics into a Chrome Trace
+Event JSON file (viewable in chrome://tracing or https://ui.perfetto.dev) and,
+optionally, an OTLP/JSON file that OpenTelemetry tooling can import without a
+live collector.
+
+Hooks record their own timings with record_hook_span(); those lines are kept
+in .claude/hook-metrics.jsonl and become "hook" and "gate" spans in the trace.
+
+Usage:
+    python3 workflow_trace.py [--output FILE] [--otlp FILE] [--summary]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from checkpoint_store import Checkpoint, list_checkpoints
+from progress_spool import fold_spool
+
+STAGE_AGENTS = {
+    "prd_analysis": ["prd-analyzer"],
+    "plan_generation": ["plan-architect"],
+    "security_legal_review": ["security-auditor", "legal-reviewer"],
+    "implementation": ["code-implementer", "asset-builder"],
+    "testing": ["test-runner-fixer", "acceptance-validator"],
+    "completion": ["doc-writer"],
+}
+
+# Chrome trace "threads" used to lay spans out in separate rows
+TRACK_IDS = {
+    "stage": 1,
+    "agent": 2,
+    "gate": 3,
+    "hook": 4,
+    "checkpoint": 5,
+}
+
+METRICS_FILENAME = "hook-metrics.jsonl"
+
+
+def get_paths(project_dir=None):
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR", ".")
+    return {
+        "state": os.path.join(project_dir, ".claude/workflow-state.json"),
+        "checkpoints": os.path.join(project_dir, ".claude/checkpoints"),
+        "metrics": os.path.join(project_dir, ".claude", METRICS_FILENAME),
+        "trace": os.path.join(project_dir, ".claude/workflow-trace.json"),
+    }
+
+
+def record_hook_span(name, started, ended=None, category="hook", project_dir=None, **args):
+    """
+    Append one timing record to hook-metrics.jsonl.
+    started/ended are epoch seconds (time.time()); failures are swallowed so
+    metrics can never break a hook.
+    """
+    ended = time.time() if ended is None else ended
+    record = {
+        "name": name,
+        "cat": category,
+        "ts": round(started, 6),
+        "dur": round(max(0.0, ended - started), 6),
+    }
+    if args:
+        record["args"] = args
+    try:
+        metrics_file = get_paths(project_dir)["metrics"]
+        os.makedirs(os.path.dirname(metrics_file), exist_ok=True)
+        with open(metrics_file, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except Exception:
+        pass
+
+
+def parse_ts(value):
+    """ISO-8601 string (as written by the hooks) -> epoch seconds, or None."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def load_json(path):
+    """Load JSON file, return empty dict on failure."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def load_metrics(path, since=None):
+    """Read hook-metrics.jsonl, skipping malformed lines and records before since."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            ts = record.get("ts")
+            if isinstance(ts, (int, float)) and (since is None or ts >= since):
+                records.append(record)
+    return records
+
+
+def load_checkpoint_times(checkpoint_dir, since=None):
+    """Return [(epoch_seconds, filename, stop_reason)] for checkpoints saved since since."""
+    found = []
+    for path in list_checkpoints(checkpoint_dir):
+        try:
+            checkpoint = Checkpoint(path)
+        except Exception:
+            continue
+        ts = parse_ts(checkpoint.created_at)
+        if ts is not None and (since is None or ts >= since):
+            found.append((ts, os.path.basename(path), checkpoint.stop_reason))
+    return found
+
+
+def build_spans(state, metrics=None, checkpoints=None):
+    """
+    Derive a flat list of spans from workflow state and hook metrics.
+
+    Each span is a dict: name, category, start, end (epoch seconds), args.
+    Instants (checkpoints, gate failures) have start == end.
+    """
+    metrics = metrics or []
+    checkpoints = checkpoints or []
+    spans = []
+
+    transitions = sorted(
+        (t for t in state.get("stage_transitions", []) if parse_ts(t.get("at")) is not None),
+        key=lambda t: parse_ts(t["at"]),
+    )
+    started = parse_ts(state.get("started_at"))
+    if started is None and transitions:
+        started = parse_ts(transitions[0]["at"])
+    finished = (
+        parse_ts(state.get("completed_at"))
+        or parse_ts(state.get("last_activity"))
+        or parse_ts(state.get("checkpoint_at"))
+    )
+    if started is None:
+        # Nothing anchors the run in time; fall back to whatever we can see
+        known = [parse_ts(r.get("completed_at")) for r in state.get("agent_results", {}).values()]
+        known = [k for k in known if k is not None] + [m["ts"] for m in metrics]
+        if not known:
+            return spans
+        started = min(known)
+    if finished is None or finished < started:
+        finished = started
+
+    # Stage spans: a stage runs from the transition into it until the
+    # transition out of it (or the end of the run for the current stage)
+    stage_starts = {}
+    first_stage = transitions[0]["from"] if transitions else state.get("current_stage")
+    if first_stage:
+        stage_starts[first_stage] = started
+    stage_ends = {}
+    for t in transitions:
+        at = parse_ts(t["at"])
+        stage_ends[t.get("from")] = at
+        stage_starts.setdefault(t.get("to"), at)
+
+    stage_windows = {}
+    for stage, start in stage_starts.items():
+        if stage == "done":
+            continue
+        end = stage_ends.get(stage, finished)
+        end = max(start, end)
+        stage_windows[stage] = (start, end)
+        spans.append({
+            "name": stage,
+            "category": "stage",
+            "start": start,
+            "end": end,
+            "args": {"status": state.get("stage_status", {}).get(stage, "unknown")},
+        })
+
+    # Agent spans: only completion times are recorded, so an agent is assumed
+    # to start when its stage started (agents within a stage run in parallel)
+    agent_stage = {a: s for s, agents in STAGE_AGENTS.items() for a in agents}
+    for agent, result in state.get("agent_results", {}).items():
+        end = parse_ts(result.get("completed_at"))
+        if end is None:
+            continue
+        window = stage_windows.get(agent_stage.get(agent))
+        start = window[0] if window and window[0] <= end else end
+        spans.append({
+            "name": agent,
+            "category": "agent",
+            "start": start,
+            "end": end,
+            "args": {"success": bool(result.get("success")), "stage": agent_stage.get(agent)},
+        })
+    for failure in state.get("failed_agents", []):
+        at = parse_ts(failure.get("at"))
+        if at is not None:
+            spans.append({
+                "name": f"{failure.get('agent', 'agent')} failed",
+                "category": "agent",
+                "start": at,
+                "end": at,
+                "args": {},
+            })
+
+    for key in ("gate_failures", "gate_warnings"):
+        for entry in state.get(key, []):
+            at = parse_ts(entry.get("at"))
+            if at is not None:
+                spans.append({
+                    "name": f"{entry.get('from')} -> {entry.get('to')}",
+                    "category": "gate",
+                    "start": at,
+                    "end": at,
+                    "args": {"result": key[:-1], "reason": entry.get("reason", "")},
+                })
+
+    for record in metrics:
+        category = record.get("cat", "hook")
+        if category not in TRACK_IDS:
+            category = "hook"
+        spans.append({
+            "name": record.get("name", "hook"),
+            "category": category,
+            "start": record["ts"],
+            "end": record["ts"] + float(record.get("dur", 0)),
+            "args": record.get("args", {}),
+        })
+
+    for ts, name, reason in checkpoints:
+        spans.append({
+            "name": name,
+            "category": "checkpoint",
+            "start": ts,
+            "end": ts,
+            "args": {"stop_reason": reason},
+        })
+
+    spans.sort(key=lambda s: (s["start"], TRACK_IDS[s["category"]]))
+    return spans
+
+
+def to_chrome_trace(spans, workflow_id=None):
+    """Render spans as a Chrome Trace Event Format document."""
+    events = [{
+        "name": "process_name",
+        "ph": "M",
+        "pid": 1,
+        "args": {"name": f"workflow {workflow_id or 'unknown'}"},
+    }]
+    for category, tid in TRACK_IDS.items():
+        events.append({
+            "name": "thread_name",
+            "ph": "M",
+            "pid": 1,
+            "tid": tid,
+            "args": {"name": f"{category}s"},
+        })
+    for span in spans:
+        event = {
+            "name": span["name"],
+            "cat": span["category"],
+            "pid": 1,
+            "tid": TRACK_IDS[span["category"]],
+            "ts": int(span["start"] * 1_000_000),
+            "args": span["args"],
+        }
+        if span["end"] > span["start"]:
+            event["ph"] = "X"
+            event["dur"] = int((span["end"] - span["start"]) * 1_000_000)
+        else:
+            event["ph"] = "i"
+            event["s"] = "t"
+        events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans, workflow_id=None):
+    """Render spans as an OTLP/JSON ExportTraceServiceRequest document."""
+    seed = workflow_id or "workflow"
+    trace_id = hashlib.sha256(seed.encode()).hexdigest()[:32]
+    root_id = hashlib.sha256(f"{seed}:root".encode()).hexdigest()[:16]
+
+    stage_ids = {}
+    otlp_spans = []
+    if spans:
+        otlp_spans.append({
+            "traceId": trace_id,
+            "spanId": root_id,
+            "name": "workflow",
+            "kind": 1,
+            "startTimeUnixNano": str(int(min(s["start"] for s in spans) * 1e9)),
+            "endTimeUnixNano": str(int(max(s["end"] for s in spans) * 1e9)),
+            "attributes": [{"key": "workflow.id", "value": _otlp_value(seed)}],
+        })
+    for i, span in enumerate(spans):
+        span_id = hashlib.sha256(f"{seed}:{i}:{span['name']}".encode()).hexdigest()[:16]
+        parent = root_id
+        if span["category"] == "stage":
+            stage_ids[span["name"]] = span_id
+        elif span["category"] == "agent":
+            parent = stage_ids.get(span["args"].get("stage"), root_id)
+        attributes = [{"key": "workflow.category", "value": _otlp_value(span["category"])}]
+        attributes += [
+            {"key": f"workflow.{k}", "value": _otlp_value(v)}
+            for k, v in span["args"].items()
+        ]
+        otlp_spans.append({
+            "traceId": trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent,
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(int(span["start"] * 1e9)),
+            "endTimeUnixNano": str(int(span["end"] * 1e9)),
+            "attributes": attributes,
+        })
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [{"key": "service.name", "value": _otlp_value("autonomous-workflow")}],
+            },
+            "scopeSpans": [{
+                "scope": {"name": "workflow_trace"},
+                "spans": otlp_spans,
+            }],
+        }]
+    }
+
+
+def critical_path(spans):
+    """
+    Summarize where the run spent its time.
+
+    Stages run strictly in sequence, so the critical path is every stage in
+    order; inside a stage the agent that finished last is the one that held
+    the transition back.
+    """
+    stages = [s for s in spans if s["category"] == "stage"]
+    agents = [s for s in spans if s["category"] == "agent" and s["end"] > s["start"]]
+    if not stages:
+        return {"total_seconds": 0, "stages": [], "hooks": {}}
+
+    total = max(s["end"] for s in stages) - min(s["start"] for s in stages)
+    path = []
+    for stage in sorted(stages, key=lambda s: s["start"]):
+        duration = stage["end"] - stage["start"]
+        members = [a for a in agents if a["args"].get("stage") == stage["name"]]
+        blocking = max(members, key=lambda a: a["end"]) if members else None
+        path.append({
+            "stage": stage["name"],
+            "seconds": round(duration, 3),
+            "share_percent": round(duration / total * 100, 1) if total else 0.0,
+            "blocking_agent": blocking["name"] if blocking else None,
+        })
+
+    hooks = {}
+    for span in spans:
+        if span["category"] not in ("hook", "gate"):
+            continue
+        entry = hooks.setdefault(span["name"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = (span["end"] - span["start"]) * 1000
+        entry["calls"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + ms, 3)
+        entry["max_ms"] = round(max(entry["max_ms"], ms), 3)
+
+    slowest = max(path, key=lambda p: p["seconds"])
+    return {
+        "total_seconds": round(total, 3),
+        "slowest_stage": slowest["stage"],
+        "stages": path,
+        "hooks": hooks,
+    }
+
+
+def export_trace(project_dir=None, output=None, otlp_output=None):
+    """Write the Chrome trace (and optional OTLP file); return the summary."""
+    paths = get_paths(project_dir)
+    fold_spool(project_dir)
+    state = load_json(paths["state"])
+    # Metrics and checkpoints outlive a run: keep only the current one's
+    since = parse_ts(state.get("started_at"))
+    spans = build_spans(
+        state,
+        metrics=load_metrics(paths["metrics"], since),
+        checkpoints=load_checkpoint_times(paths["checkpoints"], since),
+    )
+    workflow_id = state.get("workflow_id")
+    output = output or paths["trace"]
+
+    with open(output, "w") as f:
+        json.dump(to_chrome_trace(spans, workflow_id), f)
+    if otlp_output:
+        with open(otlp_output, "w") as f:
+            json.dump(to_otlp(spans, workflow_id), f)
+
+    summary = critical_path(spans)
+    summary["trace_file"] = output
+    if otlp_output:
+        summary["otlp_file"] = otlp_output
+    summary["span_count"] = len(spans)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a workflow run as a Chrome/OTLP trace")
+    parser.add_argument("--project-dir", help="Project directory (default: $CLAUDE_PROJECT_DIR or .)")
+    parser.add_argument("--output", help="Chrome trace output path (default: .claude/workflow-trace.json)")
+    parser.add_argument("--otlp", help="Also write an OTLP/JSON trace to this path")
+    parser.add_argument("--summary", action="store_true", help="Print the critical-path summary as JSON")
+    args = parser.parse_args()
+
+    summary = export_trace(args.project_dir, args.output, args.otlp)
+    if args.summary:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"Trace written to {summary['trace_file']} ({summary['span_count']} spans)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,17 +5,62 @@ iOS Simulator Accessibility Audit
 Scans the current simulator screen for accessibility compliance issues.
 Optimized for minimal token output while maintaining functionality.
 
+Rules come in packs (wcag, touch-target, contrast) and are compiled into a
+type-dispatch table, so each element is only checked against the rules for
+its type, in a single pass over the tree. Findings are aggregated per rule
+(count + a few example elements) rather than reported per element.
+
+Incremental audits reuse results for subtrees already audited in this
+process (a cached tree, or the unchanged parts of a tree rebuilt from a
+delta, are not walked again), and report only issues that are new or
+resolved since the previous audit of the device or a stored baseline.
+
 Usage: python scripts/accessibility_audit.py [options]
+
+    # Default packs (wcag, touch-target)
+    python scripts/accessibility_audit.py
+
+    # Add color contrast from a screenshot (requires Pillow)
+    python scripts/accessibility_audit.py --packs wcag,contrast --screenshot screen.png
+
+    # Only what changed since the last incremental audit of this device
+    python scripts/accessibility_audit.py --incremental
+
+    # Store a baseline, later compare against it
+    python scripts/accessibility_audit.py --save-baseline login
+    python scripts/accessibility_audit.py --baseline login
 """
 
 import argparse
 import json
-import subprocess
 import sys
+import tempfile
+from collections import Counter
+from collections.abc import Callable
 from dataclasses import asdict, dataclass
+from pathlib import Path
 from typing import Any
 
-from common import flatten_tree, get_accessibility_tree, resolve_udid
+from common import (
+    capture_screenshot,
+    flatten_tree,
+    get_accessibility_tree,
+    resolve_udid,
+)
+
+SEVERITIES = ("critical", "warning", "info")
+INTERACTIVE_TYPES = frozenset(
+    {"Button", "Link", "TextField", "SecureTextField", "Switch", "Slider", "Cell"}
+)
+TEXT_TYPES = frozenset({"StaticText", "Button", "Link", "TextField"})
+MIN_TARGET_SIZE = 44  # Points (Apple HIG / WCAG 2.5.5)
+MIN_CONTRAST = 4.5  # WCAG AA for normal text
+EXAMPLES_PER_RULE = 3
+SUBTREE_CACHE_MAX = 200_000  # Memoized subtree results per rule set
+AUDIT_SESSION_PATH = Path("~/.ios-simulator-skill/audit-session.json").expanduser()
+
+# Issue fingerprint: (rule, element type, label[:30], identifier)
+Fingerprint = tuple[str, str, str | None, str | None]
 
 
 @dataclass
@@ -33,32 +78,342 @@ class Issue:
         return asdict(self)
 
 
+@dataclass(frozen=True)
+class Rule:
+    """
+    One audit rule.
+
+    Attributes:
+        name: Rule identifier reported in results
+        severity: critical, warning or info
+        check: Predicate on (node, depth); True means an issue. node is the
+            raw tree dict, so checks cost one dict lookup or two
+        types: Element types the rule applies to (None = every element)
+        issue: Human-readable issue description
+        fix: Fix suggestion
+    """
+
+    name: str
+    severity: str
+    check: Callable[[dict, int], bool]
+    types: frozenset[str] | None
+    issue: str
+    fix: str
+
+
+def _is_small_target(element: dict, depth: int = 0) -> bool:
+    """Check if touch target is too small (< 44x44 points)."""
+    frame = element.get("frame") or {}
+    width = frame.get("width", 0)
+    height = frame.get("height", 0)
+    # Zero-size elements are offscreen/hidden, not tiny targets
+    return 0 < width < MIN_TARGET_SIZE or 0 < height < MIN_TARGET_SIZE
+
+
+WCAG_RULES = [
+    Rule(
+        "missing_label",
+        "critical",
+        lambda e, _d: not e.get("AXLabel"),
+        frozenset({"Button", "Link"}),
+        "Interactive element missing accessibility label",
+        "Add accessibilityLabel",
+    ),
+    Rule(
+        "empty_button",
+        "critical",
+        lambda e, _d: not (e.get("AXLabel") or e.get("AXValue")),
+        frozenset({"Button"}),
+        "Button has no text or label",
+        "Set button title or accessibilityLabel",
+    ),
+    Rule(
+        "image_no_alt",
+        "critical",
+        lambda e, _d: not e.get("AXLabel"),
+        frozenset({"Image"}),
+        "Image missing alternative text",
+        "Add accessibilityLabel with description",
+    ),
+    Rule(
+        "missing_hint",
+        "warning",
+        lambda e, _d: not e.get("help"),
+        frozenset({"Slider", "TextField"}),
+        "Complex control missing hint",
+        "Add accessibilityHint",
+    ),
+    Rule(
+        "missing_traits",
+        "warning",
+        lambda e, _d: e.get("type") and not e.get("traits"),
+        None,
+        "Element missing accessibility traits",
+        "Set appropriate accessibilityTraits",
+    ),
+    Rule(
+        "no_identifier",
+        "info",
+        lambda e, _d: not e.get("AXUniqueId"),
+        None,
+        "Missing accessibility identifier",
+        "Add accessibilityIdentifier for testing",
+    ),
+    Rule(
+        "deep_nesting",
+        "info",
+        lambda _e, d: d > 5,
+        None,
+        "Deeply nested (>5 levels)",
+        "Simplify view hierarchy",
+    ),
+]
+
+TOUCH_TARGET_RULES = [
+    Rule(
+        "small_touch_target",
+        "warning",
+        _is_small_target,
+        INTERACTIVE_TYPES,
+        "Touch target smaller than 44x44pt",
+        "Increase to minimum 44x44pt",
+    ),
+]
+
+
+def _relative_luminance(level: int) -> float:
+    """WCAG relative luminance of an 8-bit gray level."""
+    c = level / 255
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def contrast_rules(screenshot_path: str, screen_width: float) -> list[Rule]:
+    """
+    Build the contrast pack for one screenshot.
+
+    Each text-bearing element's frame is cropped from the screenshot and the
+    contrast ratio between its darkest and lightest 10% of pixels is
+    compared against WCAG AA (4.5:1). This approximates text vs background
+    without OCR.
+
+    Args:
+        screenshot_path: Full-size PNG of the screen being audited
+        screen_width: Screen width in points (scales frames to pixels)
+
+    Returns:
+        Rule list for the 'contrast' pack
+
+    Raises:
+        RuntimeError: If Pillow is not installed
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise RuntimeError(
+            "The contrast pack requires Pillow. Install with: pip3 install pillow"
+        ) from e
+
+    image = Image.open(screenshot_path).convert("L")
+    scale = image.width / screen_width if screen_width else 1.0
+
+    def low_contrast(element: dict, depth: int) -> bool:
+        frame = element.get("frame") or {}
+        left, top = frame.get("x", 0) * scale, frame.get("y", 0) * scale
+        right = left + frame.get("width", 0) * scale
+        bottom = top + frame.get("height", 0) * scale
+        box = (
+            int(max(0, left)),
+            int(max(0, top)),
+            int(min(image.width, right)),
+            int(min(image.height, bottom)),
+        )
+        if box[2] - box[0] < 2 or box[3] - box[1] < 2:
+            return False
+        histogram = image.crop(box).histogram()
+        total = sum(histogram)
+        cutoff = max(1, total // 10)
+        dark = light = None
+        seen = 0
+        for level, count in enumerate(histogram):
+            seen += count
+            if seen >= cutoff:
+                dark = level
+                break
+        seen = 0
+        for level in range(255, -1, -1):
+            seen += histogram[level]
+            if seen >= cutoff:
+                light = level
+                break
+        if dark is None or light is None or light - dark < 8:
+            return False  # Flat region: nothing rendered to compare
+        ratio = (_relative_luminance(light) + 0.05) / (_relative_luminance(dark) + 0.05)
+        return ratio < MIN_CONTRAST
+
+    return [
+        Rule(
+            "low_contrast",
+            "warning",
+            low_contrast,
+            TEXT_TYPES,
+            f"Text contrast below {MIN_CONTRAST}:1",
+            "Darken text or lighten background (WCAG AA)",
+        ),
+    ]
+
+
+# Static packs; 'contrast' is built per screenshot by contrast_rules()
+RULE_PACKS: dict[str, list[Rule]] = {
+    "wcag": WCAG_RULES,
+    "touch-target": TOUCH_TARGET_RULES,
+}
+DEFAULT_PACKS = ("wcag", "touch-target")
+
+
+def register_rule_pack(name: str, rules: list[Rule]) -> None:
+    """
+    Register (or replace) a rule pack usable via --packs / AccessibilityAuditor(packs=...).
+
+    Pack rules may only look at the element's own fields (not its absolute
+    position) and depth: incremental audits reuse results for a subtree
+    wherever it appears in a later tree.
+
+    Args:
+        name: Pack name
+        rules: Rules in the pack
+    """
+    RULE_PACKS[name] = list(rules)
+
+
+class CompiledRules:
+    """
+    Rules compiled into a per-type dispatch table.
+
+    For each element type the applicable rules are resolved once (type-
+    specific plus wildcard rules), grouped into non-empty severity tiers and
+    stored as (check, name) pairs, so auditing an element is one dict lookup
+    and a handful of predicate calls.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self.by_name = {rule.name: rule for rule in rules}
+        self._wildcard = [r for r in rules if r.types is None]
+        self._typed = [r for r in rules if r.types is not None]
+        self._table: dict[str | None, tuple[tuple[tuple[Callable, str], ...], ...]] = {}
+
+    def for_type(self, element_type: str | None) -> tuple[tuple[tuple[Callable, str], ...], ...]:
+        """Compiled tiers for one element type (critical first, empty tiers dropped)."""
+        tiers = self._table.get(element_type)
+        if tiers is None:
+            applicable = [r for r in self._typed if element_type in r.types] + self._wildcard
+            tiers = tuple(
+                tier
+                for tier in (
+                    tuple((r.check, r.name) for r in applicable if r.severity == severity)
+                    for severity in SEVERITIES
+                )
+                if tier
+            )
+            self._table[element_type] = tiers
+        return tiers
+
+    def evaluate(self, node: dict, depth: int = 0) -> list[Rule]:
+        """
+        Rules an element violates.
+
+        Lower tiers are only checked when higher ones found nothing: an
+        element with a critical issue isn't also reported for warnings.
+        """
+        for tier in self.for_type(node.get("type")):
+            hits = [self.by_name[name] for check, name in tier if check(node, depth)]
+            if hits:
+                return hits
+        return []
+
+
+# Per rule set: id(subtree root) -> (root, depth, element count, issue fingerprints);
+# the root is kept so its id isn't reused while the entry exists
+_subtree_cache: dict[tuple[str, ...], dict[int, tuple[dict, int, int, tuple]]] = {}
+
+
+def diff_issues(previous: list, current: list) -> dict[str, Counter]:
+    """
+    Compare two audits' issue fingerprints.
+
+    An issue whose element changed (e.g. a new label) shows up as resolved
+    plus new.
+
+    Args:
+        previous: Fingerprints from the earlier audit (lists or tuples)
+        current: Fingerprints from the later audit
+
+    Returns:
+        {"new": Counter, "resolved": Counter} of fingerprints
+    """
+    before = Counter(map(tuple, previous))
+    after = Counter(map(tuple, current))
+    return {"new": after - before, "resolved": before - after}
+
+
+def load_audit_session() -> dict:
+    """Load stored previous audits and baselines ({"previous": {...}, "baselines": {...}})."""
+    try:
+        data = json.loads(AUDIT_SESSION_PATH.read_text())
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault("previous", {})
+    data.setdefault("baselines", {})
+    return data
+
+
+def save_audit_session(data: dict) -> None:
+    """Persist audit session data; failures only cost the next diff."""
+    try:
+        AUDIT_SESSION_PATH.parent.mkdir(parents=True, exist_ok=True)
+        AUDIT_SESSION_PATH.write_text(json.dumps(data))
+    except OSError:
+        pass
+
+
 class AccessibilityAuditor:
     """Performs accessibility audits on iOS simulator screens."""
 
-    # Critical rules that block users
-    CRITICAL_RULES = {
-        "missing_label": lambda e: e.get("type") in ["Button", "Link"] and not e.get("AXLabel"),
-        "empty_button": lambda e: e.get("type") == "Button"
-        and not (e.get("AXLabel") or e.get("AXValue")),
-        "image_no_alt": lambda e: e.get("type") == "Image" and not e.get("AXLabel"),
-    }
-
-    # Warnings that degrade UX
-    WARNING_RULES = {
-        "missing_hint": lambda e: e.get("type") in ["Slider", "TextField"] and not e.get("help"),
-        "missing_traits": lambda e: e.get("type") and not e.get("traits"),
-    }
-
-    # Info level suggestions
-    INFO_RULES = {
-        "no_identifier": lambda e: not e.get("AXUniqueId"),
-        "deep_nesting": lambda e: e.get("depth", 0) > 5,
-    }
-
-    def __init__(self, udid: str | None = None):
-        """Initialize auditor with optional device UDID."""
+    def __init__(
+        self,
+        udid: str | None = None,
+        packs: tuple[str, ...] | list[str] = DEFAULT_PACKS,
+        extra_rules: list[Rule] | None = None,
+        memoize: bool = True,
+    ):
+        """
+        Initialize auditor with optional device UDID.
+
+        Args:
+            udid: Device UDID (None = booted simulator)
+            packs: Names of registered rule packs to apply
+            extra_rules: Additional rules (e.g. contrast_rules(...))
+            memoize: Reuse subtree results across incremental audits in this
+                process (pointless when auditing a single fetched tree)
+
+        Raises:
+            ValueError: If a pack name is not registered
+        """
         self.udid = udid
+        unknown = [p for p in packs if p not in RULE_PACKS]
+        if unknown:
+            raise ValueError(
+                f"Unknown rule pack(s): {', '.join(unknown)} (available: {', '.join(RULE_PACKS)})"
+            )
+        rules = [rule for pack in packs for rule in RULE_PACKS[pack]] + list(extra_rules or [])
+        self.rules = CompiledRules(rules)
+        # Extra rules (contrast) depend on the screenshot and element position,
+        # so their results can't be reused across subtrees or screens
+        self.memo = None
+        if memoize and not extra_rules:
+            self.memo = _subtree_cache.setdefault(tuple(r.name for r in rules), {})
+        self.last_issues: tuple[Fingerprint, ...] = ()
+        self.last_stats: dict[str, int] = {}
 
     def get_accessibility_tree(self) -> dict:
         """Fetch accessibility tree from simulator using shared utility."""
@@ -67,161 +422,276 @@ class AccessibilityAuditor:
     @staticmethod
     def _is_small_target(element: dict) -> bool:
         """Check if touch target is too small (< 44x44 points)."""
-        frame = element.get("frame", {})
-        width = frame.get("width", 0)
-        height = frame.get("height", 0)
-        return width < 44 or height < 44
+        return _is_small_target(element)
 
-    def _flatten_tree(self, node: dict, depth: int = 0) -> list[dict]:
+    def _flatten_tree(self, node: dict, depth: int = 0) -> list:
         """Flatten nested accessibility tree for easier processing using shared utility."""
         return flatten_tree(node, depth)
 
-    def audit_element(self, element: dict) -> list[Issue]:
-        """Audit a single element for accessibility issues."""
-        issues = []
-
-        # Check critical rules
-        for rule_name, rule_func in self.CRITICAL_RULES.items():
-            if rule_func(element):
-                issues.append(
-                    Issue(
-                        severity="critical",
-                        rule=rule_name,
-                        element_type=element.get("type", "Unknown"),
-                        issue=self._get_issue_description(rule_name),
-                        fix=self._get_fix_suggestion(rule_name),
-                    )
-                )
-
-        # Check warnings (skip if critical issues found)
-        if not issues:
-            for rule_name, rule_func in self.WARNING_RULES.items():
-                if rule_func(element):
-                    issues.append(
-                        Issue(
-                            severity="warning",
-                            rule=rule_name,
-                            element_type=element.get("type", "Unknown"),
-                            issue=self._get_issue_description(rule_name),
-                            fix=self._get_fix_suggestion(rule_name),
-                        )
-                    )
-
-        # Check info level (only if verbose or no other issues)
-        if not issues:
-            for rule_name, rule_func in self.INFO_RULES.items():
-                if rule_func(element):
-                    issues.append(
-                        Issue(
-                            severity="info",
-                            rule=rule_name,
-                            element_type=element.get("type", "Unknown"),
-                            issue=self._get_issue_description(rule_name),
-                            fix=self._get_fix_suggestion(rule_name),
+    def audit_element(self, element: dict, depth: int | None = None) -> list[Issue]:
+        """Audit a single element (a node, flatten_tree() dict or iter_tree() view) for issues."""
+        if depth is None:
+            depth = element.get("depth", 0)
+        node = getattr(element, "node", element)
+        return [
+            Issue(
+                severity=rule.severity,
+                rule=rule.name,
+                element_type=element.get("type", "Unknown"),
+                issue=rule.issue,
+                fix=rule.fix,
+            )
+            for rule in self.rules.evaluate(node, depth)
+        ]
+
+    def audit_tree(self, tree: dict) -> dict[str, Any]:
+        """
+        Audit a tree in one pass, aggregating findings per rule.
+
+        Returns:
+            {"total": element count, "rules": {rule name: aggregate}} where
+            each aggregate has severity, count, issue, fix and up to
+            EXAMPLES_PER_RULE example elements.
+        """
+        table = self.rules._table
+        for_type = self.rules.for_type
+        counts: dict[str, int] = {}
+        examples: dict[str, list[dict]] = {}
+        total = 0
+        # Plain (node, depth) stack and inlined dispatch: this is the hot loop
+        stack = [(tree, 0)]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            node, depth = pop()
+            children = node.get("children")
+            if children:
+                extend((child, depth + 1) for child in reversed(children))
+            total += 1
+            element_type = node.get("type")
+            tiers = table.get(element_type)
+            if tiers is None:
+                tiers = for_type(element_type)
+            for tier in tiers:
+                hit = False
+                for check, name in tier:
+                    if check(node, depth):
+                        hit = True
+                        count = counts[name] = counts.get(name, 0) + 1
+                        if count <= EXAMPLES_PER_RULE:
+                            label = node.get("AXLabel")
+                            examples.setdefault(name, []).append(
+                                {
+                                    "type": element_type or "Unknown",
+                                    "label": label[:30] if label else None,
+                                }
+                            )
+                if hit:
+                    break
+
+        aggregates = {}
+        for name, count in counts.items():
+            rule = self.rules.by_name[name]
+            aggregates[name] = {
+                "severity": rule.severity,
+                "rule": name,
+                "count": count,
+                "issue": rule.issue,
+                "fix": rule.fix,
+                "examples": examples[name],
+            }
+        return {"total": total, "rules": aggregates}
+
+    def audit_incremental(self, tree: dict) -> dict[str, Any]:
+        """
+        Audit a tree, reusing results for subtrees audited before.
+
+        Results are memoized per subtree object and depth. The tree cache
+        returns the same tree until the screen changes, and apply_delta()
+        shares unchanged subtrees with the previous tree, so re-auditing
+        costs roughly the number of changed elements. Memoizing a freshly
+        fetched tree costs more than it saves unless the tree is audited
+        again. Without a memo (extra rules or memoize=False) every element
+        is evaluated, at about the cost of audit_tree() plus fingerprints.
+
+        Audited trees must not be mutated afterwards (copy.deepcopy first).
+
+        Returns:
+            audit_tree() output plus "issues" (all issue fingerprints, in
+            tree order) and "stats" (nodes, evaluated, reused subtrees).
+            The fingerprints are also kept in self.last_issues.
+        """
+        memo = self.memo
+        table = self.rules._table
+        for_type = self.rules.for_type
+        issues: list[Fingerprint] = []
+        add = issues.append
+        total = evaluated = reused = 0
+
+        # Pre-order walk, so a subtree's issues are one contiguous run of
+        # `issues`; a (None, start) marker below its children memoizes it
+        stack: list = [(tree, 0)]
+        pop, append, extend = stack.pop, stack.append, stack.extend
+        while stack:
+            node, depth = pop()
+            if node is None:
+                root, root_depth, start_total, start = depth
+                if len(memo) >= SUBTREE_CACHE_MAX:
+                    memo.clear()
+                memo[id(root)] = (root, root_depth, total - start_total, tuple(issues[start:]))
+                continue
+            children = node.get("children")
+            # Leaves are cheaper to evaluate than to memoize
+            if children and memo is not None:
+                cached = memo.get(id(node))
+                if cached is not None and cached[0] is node and cached[1] == depth:
+                    reused += 1
+                    total += cached[2]
+                    issues.extend(cached[3])
+                    continue
+                append((None, (node, depth, total, len(issues))))
+            if children:
+                extend((child, depth + 1) for child in reversed(children))
+
+            total += 1
+            evaluated += 1
+            element_type = node.get("type")
+            tiers = table.get(element_type)
+            if tiers is None:
+                tiers = for_type(element_type)
+            for tier in tiers:
+                hit = False
+                for check, name in tier:
+                    if check(node, depth):
+                        hit = True
+                        label = node.get("AXLabel")
+                        add(
+                            (
+                                name,
+                                element_type or "Unknown",
+                                label[:30] if label else None,
+                                node.get("AXUniqueId"),
+                            )
                         )
-                    )
-
-        return issues
-
-    def _get_issue_description(self, rule: str) -> str:
-        """Get human-readable issue description."""
-        descriptions = {
-            "missing_label": "Interactive element missing accessibility label",
-            "empty_button": "Button has no text or label",
-            "image_no_alt": "Image missing alternative text",
-            "missing_hint": "Complex control missing hint",
-            "small_touch_target": "Touch target smaller than 44x44pt",
-            "missing_traits": "Element missing accessibility traits",
-            "no_identifier": "Missing accessibility identifier",
-            "deep_nesting": "Deeply nested (>5 levels)",
+                if hit:
+                    break
+
+        issues = tuple(issues)
+        self.last_issues = issues
+        self.last_stats = {"nodes": total, "evaluated": evaluated, "reused": reused}
+        return {
+            "total": total,
+            "rules": self._aggregate(issues),
+            "issues": issues,
+            "stats": self.last_stats,
         }
-        return descriptions.get(rule, "Accessibility issue")
-
-    def _get_fix_suggestion(self, rule: str) -> str:
-        """Get fix suggestion for issue."""
-        fixes = {
-            "missing_label": "Add accessibilityLabel",
-            "empty_button": "Set button title or accessibilityLabel",
-            "image_no_alt": "Add accessibilityLabel with description",
-            "missing_hint": "Add accessibilityHint",
-            "small_touch_target": "Increase to minimum 44x44pt",
-            "missing_traits": "Set appropriate accessibilityTraits",
-            "no_identifier": "Add accessibilityIdentifier for testing",
-            "deep_nesting": "Simplify view hierarchy",
-        }
-        return fixes.get(rule, "Review accessibility")
-
-    def audit(self, verbose: bool = False) -> dict[str, Any]:
-        """Perform full accessibility audit."""
-        # Get accessibility tree
-        tree = self.get_accessibility_tree()
-
-        # Flatten for processing
-        elements = self._flatten_tree(tree)
-
-        # Audit each element
-        all_issues = []
-        for element in elements:
-            issues = self.audit_element(element)
-            for issue in issues:
-                issue_dict = issue.to_dict()
-                # Add minimal element info for context
-                issue_dict["element"] = {
-                    "type": element.get("type", "Unknown"),
-                    "label": element.get("AXLabel", "")[:30] if element.get("AXLabel") else None,
+
+    def _aggregate(self, issues: Counter | tuple | list) -> dict[str, dict]:
+        """Per-rule aggregates (as in audit_tree()) from issue fingerprints."""
+        if not isinstance(issues, Counter):
+            issues = Counter(issues)
+        aggregates: dict[str, dict] = {}
+        for (name, element_type, label, _), count in issues.items():
+            aggregate = aggregates.get(name)
+            if aggregate is None:
+                rule = self.rules.by_name[name]
+                aggregate = aggregates[name] = {
+                    "severity": rule.severity,
+                    "rule": name,
+                    "count": 0,
+                    "issue": rule.issue,
+                    "fix": rule.fix,
+                    "examples": [],
                 }
-                all_issues.append(issue_dict)
+            aggregate["count"] += count
+            if len(aggregate["examples"]) < EXAMPLES_PER_RULE:
+                aggregate["examples"].append({"type": element_type, "label": label})
+        return aggregates
+
+    def audit(
+        self,
+        verbose: bool = False,
+        tree: dict | None = None,
+        incremental: bool = False,
+        since: list | None = None,
+    ) -> dict[str, Any]:
+        """
+        Perform full accessibility audit.
+
+        Args:
+            verbose: Include per-rule details
+            tree: Tree to audit (fetched from the simulator if None)
+            incremental: Reuse memoized subtree results (see audit_incremental)
+            since: Issue fingerprints of an earlier audit (e.g. last_issues,
+                or a stored baseline); adds a "changes" section with only the
+                new and resolved issues. Implies incremental.
+
+        Returns:
+            Report dict (see build_report)
+        """
+        if tree is None:
+            tree = self.get_accessibility_tree()
+        if not (incremental or since is not None):
+            return self.build_report(self.audit_tree(tree), verbose)
+
+        audit = self.audit_incremental(tree)
+        result = self.build_report(audit, verbose)
+        result["summary"]["reused_subtrees"] = audit["stats"]["reused"]
+        if since is not None:
+            changes = diff_issues(since, audit["issues"])
+            new = self._aggregate(changes["new"])
+            resolved: Counter = Counter()
+            for (name, *_), count in changes["resolved"].items():
+                resolved[name] += count
+            result["summary"]["new"] = sum(changes["new"].values())
+            result["summary"]["new_critical"] = sum(
+                a["count"] for a in new.values() if a["severity"] == "critical"
+            )
+            result["summary"]["resolved"] = sum(resolved.values())
+            result["changes"] = {
+                "new": (
+                    self._sort_issues(list(new.values()))
+                    if verbose
+                    else self._get_top_issues(list(new.values()))
+                ),
+                "resolved": dict(resolved),
+            }
+        return result
 
-        # Count by severity
-        critical = len([i for i in all_issues if i["severity"] == "critical"])
-        warning = len([i for i in all_issues if i["severity"] == "warning"])
-        info = len([i for i in all_issues if i["severity"] == "info"])
+    def build_report(self, audit: dict[str, Any], verbose: bool = False) -> dict[str, Any]:
+        """Token-optimized report from audit_tree() output."""
+        aggregates = list(audit["rules"].values())
+        counts = dict.fromkeys(SEVERITIES, 0)
+        for aggregate in aggregates:
+            counts[aggregate["severity"]] += aggregate["count"]
 
-        # Build result (token-optimized)
         result = {
             "summary": {
-                "total": len(elements),
-                "issues": len(all_issues),
-                "critical": critical,
-                "warning": warning,
-                "info": info,
+                "total": audit["total"],
+                "issues": sum(counts.values()),
+                **counts,
             }
         }
 
         if verbose:
-            # Full details only if requested
-            result["issues"] = all_issues
+            # Full details only if requested: one entry per rule, not per element
+            result["issues"] = self._sort_issues(aggregates)
         else:
             # Default: top issues only (token-efficient)
-            result["top_issues"] = self._get_top_issues(all_issues)
+            result["top_issues"] = self._get_top_issues(aggregates)
 
         return result
 
+    @staticmethod
+    def _sort_issues(aggregates: list[dict]) -> list[dict]:
+        severity_order = {severity: i for i, severity in enumerate(SEVERITIES)}
+        return sorted(aggregates, key=lambda x: (severity_order[x["severity"]], -x["count"]))
+
     def _get_top_issues(self, issues: list[dict]) -> list[dict]:
         """Get top 3 issues grouped by type (token-efficient)."""
-        if not issues:
-            return []
-
-        # Group by rule
-        grouped = {}
-        for issue in issues:
-            rule = issue["rule"]
-            if rule not in grouped:
-                grouped[rule] = {
-                    "severity": issue["severity"],
-                    "rule": rule,
-                    "count": 0,
-                    "fix": issue["fix"],
-                }
-            grouped[rule]["count"] += 1
-
-        # Sort by severity and count
-        severity_order = {"critical": 0, "warning": 1, "info": 2}
-        sorted_issues = sorted(
-            grouped.values(), key=lambda x: (severity_order[x["severity"]], -x["count"])
-        )
-
-        return sorted_issues[:3]
+        return [
+            {key: issue[key] for key in ("severity", "rule", "count", "fix")}
+            for issue in self._sort_issues(issues)[:3]
+        ]
 
 
 def main():
@@ -237,6 +707,23 @@ def main():
     parser.add_argument(
         "--verbose", action="store_true", help="Include all issue details (increases output)"
     )
+    parser.add_argument(
+        "--packs",
+        default=",".join(DEFAULT_PACKS),
+        help=f"Comma-separated rule packs: {', '.join([*RULE_PACKS, 'contrast'])} "
+        f"(default: {','.join(DEFAULT_PACKS)})",
+    )
+    parser.add_argument(
+        "--screenshot",
+        help="Full-size screenshot for the contrast pack (captured automatically if omitted)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Report only issues new or resolved since the last incremental audit of this device",
+    )
+    parser.add_argument("--baseline", help="Report only issues new or resolved versus a baseline")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store this audit as a baseline")
 
     args = parser.parse_args()
 
@@ -247,15 +734,50 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Perform audit
-    auditor = AccessibilityAuditor(udid=udid)
+    packs = [p.strip() for p in args.packs.split(",") if p.strip()]
 
+    # Perform audit
     try:
-        result = auditor.audit(verbose=args.verbose)
+        tree = get_accessibility_tree(udid, nested=True)
+        # Scratch space for a captured screenshot, kept until the audit has read it
+        with tempfile.TemporaryDirectory() as scratch:
+            extra_rules = []
+            if "contrast" in packs:
+                packs.remove("contrast")
+                screenshot = args.screenshot
+                if not screenshot:
+                    screenshot = str(Path(scratch) / "audit.png")
+                    capture_screenshot(udid, output_path=screenshot, size="full")
+                screen_width = (tree.get("frame") or {}).get("width", 0)
+                extra_rules = contrast_rules(screenshot, screen_width)
+            # One fetched tree per run: nothing to reuse, so skip memoizing
+            auditor = AccessibilityAuditor(
+                udid=udid, packs=packs, extra_rules=extra_rules, memoize=False
+            )
+            session = None
+            since = None
+            if args.incremental or args.baseline or args.save_baseline:
+                session = load_audit_session()
+                if args.baseline:
+                    if args.baseline not in session["baselines"]:
+                        raise ValueError(f"No stored baseline named '{args.baseline}'")
+                    since = session["baselines"][args.baseline]
+                elif args.incremental:
+                    since = session["previous"].get(udid, [])
+            result = auditor.audit(
+                verbose=args.verbose, tree=tree, incremental=session is not None, since=since
+            )
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
+    if session is not None:
+        issues = [list(issue) for issue in auditor.last_issues]
+        session["previous"][udid] = issues
+        if args.save_baseline:
+            session["baselines"][args.save_baseline] = issues
+        save_audit_session(session)
+
     # Output results
     if args.output:
         # Save to file
@@ -276,15 +798,26 @@ def main():
             f"Critical: {summary['critical']}, Warning: {summary['warning']}, Info: {summary['info']}"
         )
 
-        if result.get("top_issues"):
+        if result.get("top_issues") and "changes" not in result:
             print("\nTop issues:")
             for issue in result["top_issues"]:
                 print(
                     f"  [{issue['severity']}] {issue['rule']} ({issue['count']}x) - {issue['fix']}"
                 )
 
-    # Exit with error if critical issues found
-    if result["summary"]["critical"] > 0:
+        if "changes" in result:
+            against = f"baseline '{args.baseline}'" if args.baseline else "previous audit"
+            print(f"\nSince {against}: {summary['new']} new, {summary['resolved']} resolved")
+            for issue in result["changes"]["new"]:
+                print(f"  + [{issue['severity']}] {issue['rule']} ({issue['count']}x)")
+            for rule, count in result["changes"]["resolved"].items():
+                print(f"  - {rule} ({count}x)")
+
+    # Exit with error if critical issues found (only new ones when diffing)
+    if "changes" in result:
+        if result["summary"]["new_critical"] > 0:
+            sys.exit(1)
+    elif result["summary"]["critical"] > 0:
         sys.exit(1)
 
 
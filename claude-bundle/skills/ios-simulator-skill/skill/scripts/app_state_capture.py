@@ -16,9 +16,11 @@ from datetime import datetime
 from pathlib import Path
 
 from common import (
+    IMAGE_FORMATS,
     capture_screenshot,
     count_elements,
     get_accessibility_tree,
+    get_inventory,
     resolve_udid,
 )
 
@@ -32,6 +34,7 @@ class AppStateCapture:
         udid: str | None = None,
         inline: bool = False,
         screenshot_size: str = "half",
+        screenshot_format: str = "png",
     ):
         """
         Initialize state capture.
@@ -41,11 +44,14 @@ class AppStateCapture:
             udid: Optional device UDID (uses booted if not specified)
             inline: If True, return screenshots as base64 (for vision-based automation)
             screenshot_size: 'full', 'half', 'quarter', 'thumb' (default: 'half')
+            screenshot_format: 'png', 'jpeg' or 'webp' (default: 'png')
         """
         self.app_bundle_id = app_bundle_id
         self.udid = udid
         self.inline = inline
         self.screenshot_size = screenshot_size
+        self.screenshot_format = screenshot_format
+        self.screenshot_file = f"screenshot.{IMAGE_FORMATS[screenshot_format][2]}"
 
     def capture_screenshot(self, output_path: Path) -> bool:
         """Capture screenshot of current screen."""
@@ -136,34 +142,26 @@ class AppStateCapture:
 
     def capture_device_info(self) -> dict:
         """Get device information."""
-        cmd = ["xcrun", "simctl", "list", "devices", "booted"]
-
-        if self.udid:
-            # Specific device info
-            cmd = ["xcrun", "simctl", "list", "devices"]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-            # Parse output for device info (simplified)
-            lines = result.stdout.split("\n")
-            device_info = {}
-
-            for line in lines:
-                if "iPhone" in line or "iPad" in line:
-                    # Extract device name and state
-                    parts = line.strip().split("(")
-                    if parts:
-                        device_info["name"] = parts[0].strip()
-                        if len(parts) > 2:
-                            device_info["udid"] = parts[1].replace(")", "").strip()
-                            device_info["state"] = parts[2].replace(")", "").strip()
-                    break
-
-            return device_info
-        except subprocess.CalledProcessError:
+            inventory = get_inventory()
+            if self.udid:
+                # Specific device info
+                device = inventory.get(self.udid)
+            else:
+                booted = inventory.booted()
+                device = booted[0] if booted else None
+        except RuntimeError:
             return {}
 
+        if not device:
+            return {}
+        return {
+            "name": device["name"],
+            "udid": device["udid"],
+            "state": device["state"],
+            "runtime": device["runtime_name"],
+        }
+
     def capture_all(
         self, output_dir: str, log_lines: int = 100, app_name: str | None = None
     ) -> dict:
@@ -195,12 +193,14 @@ class AppStateCapture:
         if capture_dir:
             summary["output_dir"] = str(capture_dir)
 
-        # Capture screenshot using new unified utility
+        # Capture screenshot using new unified utility (written straight into capture_dir)
         screenshot_result = capture_screenshot(
             self.udid,
+            output_path=str(capture_dir / self.screenshot_file) if capture_dir else None,
             size=self.screenshot_size,
             inline=self.inline,
             app_name=app_name,
+            image_format=self.screenshot_format,
         )
 
         if self.inline:
@@ -213,15 +213,10 @@ class AppStateCapture:
                 "size_preset": self.screenshot_size,
             }
         else:
-            # File mode: save to disk
-            screenshot_path = capture_dir / "screenshot.png"
-            # Move temp file to target location
-            import shutil
-
-            shutil.move(screenshot_result["file_path"], screenshot_path)
+            # File mode: already saved in capture_dir
             summary["screenshot"] = {
                 "mode": "file",
-                "file": "screenshot.png",
+                "file": self.screenshot_file,
                 "size_bytes": screenshot_result["size_bytes"],
             }
 
@@ -281,7 +276,7 @@ class AppStateCapture:
                 f.write(f"- State: {device.get('state', 'Unknown')}\n\n")
 
             f.write("## Screenshot\n")
-            f.write("![Current Screen](screenshot.png)\n\n")
+            f.write(f"![Current Screen]({self.screenshot_file})\n\n")
 
             if "accessibility" in summary:
                 acc = summary["accessibility"]
@@ -304,7 +299,7 @@ class AppStateCapture:
                 f.write("\n")
 
             f.write("## Files\n")
-            f.write("- `screenshot.png` - Current screen\n")
+            f.write(f"- `{self.screenshot_file}` - Current screen\n")
             f.write("- `accessibility-tree.json` - Full UI hierarchy\n")
             if self.app_bundle_id:
                 f.write("- `app-logs.txt` - Recent app logs\n")
@@ -339,6 +334,12 @@ def main():
         default="half",
         help="Screenshot size for token optimization (default: half)",
     )
+    parser.add_argument(
+        "--format",
+        choices=["png", "jpeg", "webp"],
+        default="png",
+        help="Screenshot encoding (default: png)",
+    )
     parser.add_argument("--app-name", help="App name for semantic screenshot naming")
 
     args = parser.parse_args()
@@ -356,6 +357,7 @@ def main():
         udid=udid,
         inline=args.inline,
         screenshot_size=args.size,
+        screenshot_format=args.format,
     )
 
     # Capture state
@@ -6,12 +6,23 @@ while respecting Jackson's Law - no over-abstraction, only truly shared logic.
 
 Organization:
 - device_utils: Device detection, command building, coordinate transformation
-- idb_utils: IDB-specific operations (accessibility tree, element manipulation)
+- idb_utils: IDB-specific operations (accessibility tree with per-device cache)
 - cache_utils: Progressive disclosure caching for large outputs
 - screenshot_utils: Screenshot capture with file and inline modes
+- element_index: Indexed element queries, selectors and point lookups
+- command_executor: Per-device command queues for idb/simctl commands
+- tree_diff: Structural diff/patch of accessibility tree snapshots
+- screenshot_index: Perceptual-hash index (duplicates, screen recognition)
+- frame_sampler: Background frame sampling that keeps only changed frames
+- fleet: Bounded-concurrency batch operations across simulators
+- device_inventory: Cached, indexed `simctl list devices` shared by all scripts
+- boot_history: Local history of boot phase timings per device type and runtime
 """
 
+from .boot_history import BootRecord, load_boot_history, record_boot, summarize_boot_history
 from .cache_utils import ProgressiveCache, get_cache
+from .command_executor import CommandExecutor, get_executor, run_command
+from .device_inventory import DeviceInventory, get_inventory, invalidate_inventory
 from .device_utils import (
     build_idb_command,
     build_simctl_command,
@@ -20,23 +31,65 @@ from .device_utils import (
     resolve_udid,
     transform_screenshot_coords,
 )
+from .element_index import ElementIndex, parse_selector
+from .fleet import DeviceResult, FleetReport, run_fleet
+from .frame_sampler import Frame, FrameSampler
 from .idb_utils import (
+    ElementView,
     count_elements,
     flatten_tree,
     get_accessibility_tree,
     get_screen_size,
+    get_tree_cache_stats,
+    invalidate_tree_cache,
+    iter_tree,
+)
+from .screenshot_index import (
+    ScreenshotIndex,
+    hamming_distance,
+    image_hash,
+    index_for_directory,
 )
 from .screenshot_utils import (
+    IMAGE_FORMATS,
     capture_screenshot,
+    downscale_image,
+    encode_image,
     format_screenshot_result,
     generate_screenshot_name,
     get_size_preset,
+    read_simulator_screenshot,
     resize_screenshot,
+    semantic_screenshot_key,
 )
+from .tree_diff import apply_delta, diff_trees, summarize_changes
 
 __all__ = [
+    # screenshot_utils
+    "IMAGE_FORMATS",
+    # boot_history
+    "BootRecord",
+    # command_executor
+    "CommandExecutor",
+    # device_inventory
+    "DeviceInventory",
+    # fleet
+    "DeviceResult",
+    # element_index
+    "ElementIndex",
+    # idb_utils
+    "ElementView",
+    # fleet
+    "FleetReport",
+    # frame_sampler
+    "Frame",
+    "FrameSampler",
     # cache_utils
     "ProgressiveCache",
+    # screenshot_index
+    "ScreenshotIndex",
+    # tree_diff
+    "apply_delta",
     # device_utils
     "build_idb_command",
     "build_simctl_command",
@@ -44,6 +97,9 @@ __all__ = [
     "capture_screenshot",
     # idb_utils
     "count_elements",
+    "diff_trees",
+    "downscale_image",
+    "encode_image",
     "flatten_tree",
     "format_screenshot_result",
     "generate_screenshot_name",
@@ -51,9 +107,38 @@ __all__ = [
     "get_booted_device_udid",
     "get_cache",
     "get_device_screen_size",
+    # command_executor
+    "get_executor",
+    # device_inventory
+    "get_inventory",
+    # idb_utils
     "get_screen_size",
     "get_size_preset",
+    "get_tree_cache_stats",
+    "hamming_distance",
+    "image_hash",
+    "index_for_directory",
+    # device_inventory
+    "invalidate_inventory",
+    # idb_utils
+    "invalidate_tree_cache",
+    "iter_tree",
+    # boot_history
+    "load_boot_history",
+    # element_index
+    "parse_selector",
+    "read_simulator_screenshot",
+    # boot_history
+    "record_boot",
+    # screenshot_utils
     "resize_screenshot",
     "resolve_udid",
+    "run_command",
+    "run_fleet",
+    "semantic_screenshot_key",
+    # boot_history
+    "summarize_boot_history",
+    # tree_diff
+    "summarize_changes",
     "transform_screenshot_coords",
 ]
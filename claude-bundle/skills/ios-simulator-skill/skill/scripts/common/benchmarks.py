@@ -0,0 +1,1026 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the shared utilities.
+
+Nothing here needs a simulator: command benchmarks run against fake
+idb/xcrun/simctl scripts that count their own launches, and tree benchmarks
+use synthetic accessibility trees.
+
+Usage:
+    # Queued vs direct command execution (fake tools)
+    python -m common.benchmarks executor --steps 200
+
+    # Tree traversal time and peak memory on a 50k-node tree
+    python -m common.benchmarks traversal --nodes 50000
+
+    # Accessibility audit: per-element rule lambdas vs compiled rule table,
+    # then a 100-screen flow audited in full vs incrementally
+    python -m common.benchmarks audit --nodes 50000 --screens 100
+
+    # Visual diff on 1290x2796 screenshots (requires Pillow)
+    python -m common.benchmarks visual
+
+    # Log monitor throughput and peak RSS replaying a log (synthetic or --file)
+    python -m common.benchmarks logs --lines 200000
+
+    # Multi-device log streaming: throughput and peak RSS for 1..16 fake devices
+    python -m common.benchmarks log-fleet --devices 1,4,16 --lines 20000
+
+    # Batch erase + verify of 20 fake devices, one at a time vs concurrently
+    python -m common.benchmarks fleet --devices 20 --delay 0.2
+
+    # Device lookups: one `simctl list` per lookup vs the shared inventory
+    python -m common.benchmarks inventory --devices 200 --lookups 50
+
+    # Boot readiness detection: fixed 0.5s polling vs backoff vs bootstatus
+    python -m common.benchmarks boot --ready-after 3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from . import command_executor, device_inventory
+from .command_executor import EXECUTOR_MODES, CommandExecutor
+from .device_inventory import DeviceInventory
+from .device_utils import build_idb_command, build_simctl_command
+from .idb_utils import flatten_tree, iter_tree
+
+FAKE_TOOL = """#!/bin/sh
+echo "$(basename "$0") $*" >> "{counter}"
+sleep {delay}
+if [ "$(basename "$0")" = "xcrun" ]; then
+    if [ "$1" = "--find" ]; then echo "{bin_dir}/$2"; exit 0; fi
+    shift; exec "{bin_dir}/simctl" "$@"
+fi
+echo "ok $*"
+"""
+
+
+def install_fake_tools(tmp: str, delay: float = 0) -> str:
+    """
+    Put counting fake idb/xcrun/simctl first on PATH.
+
+    Args:
+        tmp: Scratch directory (bin/ and launches.log are created inside)
+        delay: Simulated tool startup time in seconds
+
+    Returns:
+        Path of the launch log (one line per tool exec)
+    """
+    bin_dir = Path(tmp) / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    counter = Path(tmp) / "launches.log"
+    for tool in ("idb", "xcrun", "simctl"):
+        path = bin_dir / tool
+        path.write_text(FAKE_TOOL.format(counter=counter, delay=delay, bin_dir=bin_dir))
+        path.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    # Keep the real simctl path and device inventory caches untouched
+    command_executor.TOOL_CACHE_PATH = Path(tmp) / "tool-paths.json"
+    device_inventory._shared["inventory"] = DeviceInventory(Path(tmp) / "device-inventory.json")
+    return str(counter)
+
+
+def install_fake_xcrun(tmp: str, template: str, **fields) -> None:
+    """
+    Put a fake xcrun first on PATH.
+
+    Args:
+        tmp: Scratch directory (bin/ is created inside)
+        template: Script source; {bin_dir} and `fields` are filled in
+    """
+    bin_dir = Path(tmp) / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    path = bin_dir / "xcrun"
+    path.write_text(template.format(bin_dir=bin_dir, **fields))
+    path.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+
+def benchmark_executor(steps: int, delay: float) -> None:
+    """Run a mixed idb/simctl flow against fake tools in both executor modes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = install_fake_tools(tmp, delay)
+        udid = "FAKE-UDID-0001"
+        flow = []
+        for i in range(steps):
+            if i % 10 == 9:
+                flow.append(build_simctl_command("openurl", udid, f"app://step/{i}"))
+            else:
+                flow.append(build_idb_command("ui tap", udid, str(i), str(i * 2)))
+
+        for mode in EXECUTOR_MODES:
+            open(counter, "w").close()
+            executor = CommandExecutor(mode=mode)
+            started = time.perf_counter()
+            futures = [executor.submit(cmd, udid=udid) for cmd in flow]
+            failed = sum(1 for f in futures if f.result().returncode != 0)
+            elapsed = time.perf_counter() - started
+            stats = executor.stats()
+            executor.close()
+
+            with open(counter) as f:
+                launches = [line.split()[0] for line in f if line.strip()]
+            commands = stats["direct_commands"] + sum(stats["queues"].values())
+            print(
+                f"{mode:>7}: {elapsed * 1000:8.1f} ms  commands={commands:<4} "
+                f"idb={launches.count('idb'):<4} xcrun={launches.count('xcrun'):<4} "
+                f"simctl={launches.count('simctl'):<4} failed={failed}"
+            )
+
+
+def synthetic_tree(total: int, fanout: int = 8) -> dict:
+    """
+    Balanced synthetic accessibility tree with realistic node fields.
+
+    Args:
+        total: Number of nodes
+        fanout: Children per node
+
+    Returns:
+        Root node
+    """
+
+    def make(i: int) -> dict:
+        return {
+            "type": ("Button", "StaticText", "Cell", "Image", "Other")[i % 5],
+            "AXLabel": f"Element {i}",
+            "AXValue": None,
+            "AXUniqueId": f"element_{i}" if i % 3 else None,
+            "frame": {"x": i % 390, "y": i % 844, "width": 44, "height": 44},
+            "traits": ["Button"] if i % 5 == 0 else [],
+            "enabled": True,
+            "children": [],
+        }
+
+    root = make(0)
+    queue = [root]
+    head = 0
+    created = 1
+    while created < total:
+        parent = queue[head]
+        head += 1
+        for _ in range(min(fanout, total - created)):
+            child = make(created)
+            parent["children"].append(child)
+            queue.append(child)
+            created += 1
+    return root
+
+
+def _flatten_copying(node: dict, depth: int = 0, elements: list | None = None) -> list[dict]:
+    """The previous recursive node.copy() flatten_tree, for comparison."""
+    if elements is None:
+        elements = []
+    node_copy = node.copy()
+    node_copy["depth"] = depth
+    elements.append(node_copy)
+    for child in node.get("children", []):
+        _flatten_copying(child, depth + 1, elements)
+    return elements
+
+
+def benchmark_traversal(nodes: int, repeat: int = 5) -> None:
+    """Time and peak memory of tree flattening strategies."""
+    tree = synthetic_tree(nodes)
+    strategies = (
+        ("recursive copy", _flatten_copying),
+        ("flatten_tree (copies)", flatten_tree),
+        ("iter_tree (views)", lambda t: list(iter_tree(t))),
+        ("iter_tree (streaming)", lambda t: sum(1 for _ in iter_tree(t))),
+    )
+    for name, fn in strategies:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn(tree)
+            best = min(best, time.perf_counter() - started)
+            del result
+
+        tracemalloc.start()
+        result = fn(tree)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        count = result if isinstance(result, int) else len(result)
+        del result
+        print(f"{name:>22}: {count} nodes {best * 1000:7.1f} ms  peak {peak / 1e6:6.1f} MB")
+
+    chain = deep = {"type": "Other", "children": []}
+    for _ in range(20000):
+        child = {"type": "Other", "children": []}
+        chain["children"].append(child)
+        chain = child
+    try:
+        _flatten_copying(deep)
+        print("recursive copy, 20k-deep chain: ok")
+    except RecursionError:
+        print("recursive copy, 20k-deep chain: RecursionError")
+    print(f"iter_tree, 20k-deep chain: {sum(1 for _ in iter_tree(deep))} nodes")
+
+
+def synthetic_flow(
+    screens: int, cells: int = 40, variants: int = 200, shared: bool = False
+) -> list[dict]:
+    """
+    Screens of a synthetic app flow sharing navigation bar, tab bar and cells.
+
+    Args:
+        screens: Number of screens
+        cells: Cells per screen, drawn from a pool of variants
+        variants: Distinct cell variants in the pool
+        shared: Reuse the node objects of bars and cells across screens, as
+            trees from the tree cache or apply_delta() do (default: every
+            screen is built fresh, as when fetched from idb)
+
+    Returns:
+        Root node per screen
+    """
+
+    def leaf(element_type: str, label: str | None, ident: str | None = None) -> dict:
+        return {
+            "type": element_type,
+            "AXLabel": label,
+            "AXUniqueId": ident,
+            "frame": {"x": 0, "y": 0, "width": 44, "height": 44},
+            "traits": [element_type],
+            "children": [],
+        }
+
+    def cell(v: int) -> dict:
+        node = leaf("Cell", f"Row {v}", f"row_{v}")
+        node["children"] = [
+            leaf("Image", None if v % 7 == 0 else f"Icon {v}"),
+            leaf("StaticText", f"Title {v}"),
+            leaf("StaticText", f"Subtitle {v}"),
+            leaf("Button", "More", f"more_{v}"),
+        ]
+        return node
+
+    def container(element_type: str, children: list[dict]) -> dict:
+        node = leaf(element_type, None)
+        node["children"] = children
+        return node
+
+    def bars() -> tuple[dict, dict]:
+        nav = container("NavigationBar", [leaf("Button", "Back"), leaf("StaticText", "Inbox")])
+        tabs = container(
+            "TabBar", [leaf("Button", name, f"tab_{name}") for name in ("Home", "Search", "Me")]
+        )
+        return nav, tabs
+
+    pool = [cell(v) for v in range(variants)] if shared else None
+    shared_bars = bars() if shared else None
+    flow = []
+    for s in range(screens):
+        nav, tabs = shared_bars or bars()
+        indices = [(s * 3 + i) % variants for i in range(cells)]
+        rows = [pool[v] for v in indices] if pool else [cell(v) for v in indices]
+        content = container("ScrollView", [container("Table", rows)])
+        flow.append(container("Application", [container("Window", [nav, content, tabs])]))
+    return flow
+
+
+def _audit_per_element(tree: dict) -> tuple[int, int, int]:
+    """The previous audit loop: every rule lambda on every element, one dict per issue."""
+    critical_rules = {
+        "missing_label": lambda e: e.get("type") in ["Button", "Link"] and not e.get("AXLabel"),
+        "empty_button": lambda e: e.get("type") == "Button"
+        and not (e.get("AXLabel") or e.get("AXValue")),
+        "image_no_alt": lambda e: e.get("type") == "Image" and not e.get("AXLabel"),
+    }
+    warning_rules = {
+        "missing_hint": lambda e: e.get("type") in ["Slider", "TextField"] and not e.get("help"),
+        "missing_traits": lambda e: e.get("type") and not e.get("traits"),
+    }
+    info_rules = {
+        "no_identifier": lambda e: not e.get("AXUniqueId"),
+        "deep_nesting": lambda e: e.get("depth", 0) > 5,
+    }
+    all_issues = []
+    elements = _flatten_copying(tree)
+    for element in elements:
+        issues = []
+        for severity, rules in (
+            ("critical", critical_rules),
+            ("warning", warning_rules),
+            ("info", info_rules),
+        ):
+            if issues:
+                break
+            for name, rule in rules.items():
+                if rule(element):
+                    issues.append(
+                        {
+                            "severity": severity,
+                            "rule": name,
+                            "element_type": element.get("type", "Unknown"),
+                            "issue": name.replace("_", " "),
+                            "fix": name,
+                            "element": {
+                                "type": element.get("type"),
+                                "label": element.get("AXLabel"),
+                            },
+                        }
+                    )
+        all_issues.extend(issues)
+    critical = len([i for i in all_issues if i["severity"] == "critical"])
+    return len(elements), len(all_issues), critical
+
+
+def benchmark_audit(nodes: int, screens: int, repeat: int = 3) -> None:
+    """Time the old per-element audit loop against the compiled rule table."""
+    # accessibility_audit is a script next to common/ (run from skill/scripts)
+    from accessibility_audit import AccessibilityAuditor
+
+    tree = synthetic_tree(nodes)
+    auditor = AccessibilityAuditor(packs=["wcag"])
+
+    def compiled(t: dict) -> tuple[int, int, int]:
+        summary = auditor.audit(tree=t)["summary"]
+        return summary["total"], summary["issues"], summary["critical"]
+
+    for name, fn in (("per-element lambdas", _audit_per_element), ("compiled rules", compiled)):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            total, issues, critical = fn(tree)
+            best = min(best, time.perf_counter() - started)
+        print(
+            f"{name:>20}: {total} elements {best * 1000:7.1f} ms  "
+            f"issues={issues} critical={critical}"
+        )
+
+    report = json.dumps(auditor.audit(verbose=True, tree=tree))
+    print(f"verbose report: {len(report)} bytes (aggregated per rule)")
+
+    # Flow: every screen audited in full vs incrementally, with trees fetched
+    # fresh (as the CLI does: no memo) and with trees sharing unchanged
+    # subtrees (memoized)
+    for label, shared in (("fresh trees", False), ("shared subtrees", True)):
+        flow = synthetic_flow(screens, shared=shared)
+        elements = sum(sum(1 for _ in iter_tree(screen)) for screen in flow)
+        print(f"flow, {label}: {screens} screens, {elements} elements")
+        full = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for screen in flow:
+                auditor.audit(tree=screen)
+            full = min(full, time.perf_counter() - started)
+        print(f"{'full audits':>20}: {full * 1000:7.1f} ms  rule evaluations={elements}")
+
+        for name, diff in (("incremental", False), ("incremental + diff", True)):
+            best = float("inf")
+            for _ in range(repeat):
+                incremental = AccessibilityAuditor(packs=["wcag"], memoize=shared)
+                if shared:
+                    incremental.memo.clear()
+                evaluated = reused = new = 0
+                previous: list = []
+                started = time.perf_counter()
+                for screen in flow:
+                    result = incremental.audit(
+                        tree=screen, incremental=True, since=previous if diff else None
+                    )
+                    previous = incremental.last_issues
+                    evaluated += incremental.last_stats["evaluated"]
+                    reused += incremental.last_stats["reused"]
+                    new += result["summary"].get("new", 0)
+                best = min(best, time.perf_counter() - started)
+            print(
+                f"{name:>20}: {best * 1000:7.1f} ms  rule evaluations={evaluated} "
+                f"reused subtrees={reused}" + (f" new issues reported={new}" if diff else "")
+            )
+
+
+def synthetic_screenshots(directory: str, width: int = 1290, height: int = 2796) -> tuple[str, str]:
+    """
+    Write a baseline/current screenshot pair with a few changed regions.
+
+    Returns:
+        (baseline path, current path)
+    """
+    from PIL import Image, ImageDraw
+
+    baseline = Image.new("RGB", (width, height), (242, 242, 247))
+    draw = ImageDraw.Draw(baseline)
+    for row in range(0, height, 132):
+        draw.rectangle((48, row + 12, width - 48, row + 120), fill=(255, 255, 255))
+        draw.text((96, row + 50), f"Row {row // 132}", fill=(0, 0, 0))
+    current = baseline.copy()
+    draw = ImageDraw.Draw(current)
+    draw.rectangle((0, 0, width, 140), fill=(250, 250, 250))  # status/nav bar
+    draw.text((96, 1370), "Changed label", fill=(255, 59, 48))
+    draw.rectangle((900, 2500, 1200, 2700), fill=(0, 122, 255))
+
+    paths = (str(Path(directory) / "baseline.png"), str(Path(directory) / "current.png"))
+    baseline.save(paths[0])
+    current.save(paths[1])
+    return paths
+
+
+def benchmark_visual(repeat: int = 3) -> None:
+    """Per-pixel Python loops vs Pillow band operations on retina screenshots."""
+    from PIL import Image, ImageChops
+    from visual_diff import VisualDiffer
+
+    def best_of(fn) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_path, current_path = synthetic_screenshots(tmp)
+        baseline = Image.open(baseline_path).convert("RGB")
+        current = Image.open(current_path).convert("RGB")
+        diff = ImageChops.difference(baseline, current)
+        width, height = baseline.size
+        print(f"screenshots: {width}x{height}")
+
+        # Previous implementations
+        gray = diff.convert("L")
+        legacy_count = best_of(lambda: sum(1 for p in gray.tobytes() if p > 10))
+        strip = height // 16
+
+        def legacy_overlay_strip():
+            out = Image.new("RGB", (width, strip))
+            for x in range(width):
+                for y in range(strip):
+                    if sum(diff.getpixel((x, y))) > 30:
+                        out.putpixel((x, y), (255, 0, 0))
+                    else:
+                        out.putpixel((x, y), current.getpixel((x, y)))
+
+        legacy_overlay = best_of(legacy_overlay_strip) * height / strip
+        print(f"{'legacy count':>22}: {legacy_count:9.1f} ms")
+        print(f"{'legacy overlay':>22}: {legacy_overlay:9.1f} ms (extrapolated from 1/16)")
+
+        differ = VisualDiffer()
+        differ.compare(baseline_path, current_path)  # Decode once, as the CLI does
+        mask = differ.diff_mask(diff)
+        overlay_path = str(Path(tmp) / "diff.png")
+        for name, fn in (
+            ("mask + count", lambda: differ._count_different_pixels(diff)),
+            ("tile stats + regions", lambda: differ.changed_regions(mask)),
+            (
+                "overlay (+ PNG save)",
+                lambda: differ.generate_diff_image(baseline_path, current_path, overlay_path),
+            ),
+        ):
+            print(f"{name:>22}: {best_of(fn):9.1f} ms")
+        result = {}
+        cold = best_of(lambda: result.update(VisualDiffer().compare(baseline_path, current_path)))
+        print(f"{'compare (with decode)':>22}: {cold:9.1f} ms")
+        print(
+            f"changed pixels={result['different_pixels']} tiles={result['changed_tiles']} "
+            f"regions={len(result['changed_regions'])}"
+        )
+
+        # Batch: 16 pairs (half failing) in-process vs one worker per core
+        from visual_diff import run_batch
+
+        batch_dirs = {side: Path(tmp) / side for side in ("baseline", "current")}
+        for directory in batch_dirs.values():
+            directory.mkdir()
+        for i in range(16):
+            name = f"App_Screen{i}_Default_20250101-000000.png"
+            (batch_dirs["baseline"] / name).hardlink_to(baseline_path)
+            (batch_dirs["current"] / name).hardlink_to(current_path if i % 2 else baseline_path)
+        cores = os.cpu_count() or 1
+        for workers in sorted({1, cores}):
+            started = time.perf_counter()
+            run_batch(
+                str(batch_dirs["baseline"]),
+                str(batch_dirs["current"]),
+                str(Path(tmp) / f"report-{workers}"),
+                workers=workers,
+            )
+            elapsed = time.perf_counter() - started
+            print(f"{f'batch, {workers} worker(s)':>22}: {elapsed * 1000:9.1f} ms for 16 pairs")
+
+
+LOG_SEVERITY_WORDS = ("", "", "", "", "", "error", "failed", "warning", "info", "deprecated")
+LOG_WORDS = (
+    "network",
+    "request",
+    "completed",
+    "fetch",
+    "cache",
+    "view",
+    "layout",
+    "render",
+    "token",
+    "session",
+    "user",
+    "load",
+    "image",
+    "update",
+    "state",
+    "sync",
+)
+
+
+def synthetic_log(path: str, lines: int, seed: int = 7) -> None:
+    """
+    Write `log stream`-style text lines; ids and counts make most lines unique.
+
+    Args:
+        path: Output file
+        lines: Number of lines
+        seed: Random seed (same seed, same log)
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(lines):
+            words = " ".join(rng.choice(LOG_WORDS) for _ in range(rng.randint(4, 12)))
+            severity = rng.choice(LOG_SEVERITY_WORDS)
+            f.write(
+                f"2025-01-01 12:{i // 60000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}000+0000 "
+                f"0x{i:x}  Default  0x0  {1000 + i % 50}  0  MyApp: (CFNetwork) "
+                f"[com.apple.network:connection] {words} {severity} "
+                f"id={rng.randint(0, 999999)} bytes={rng.randint(0, 65535)}\n"
+            )
+
+
+APP_LOG_MESSAGES = (
+    ("error", "Task <{uuid}>.<{n}> finished with error [-1001] Error Domain=NSURLErrorDomain"),
+    ("error", "Failed to decode response for /api/v2/items/{n}: keyNotFound(id)"),
+    ("error", "nw_connection_copy_connected_local_endpoint [C{n}] Connection has no endpoint"),
+    ("error", "CoreData: error: Failed to save context, {n} conflicts on object {addr}"),
+    ("error", "Unable to load image {uuid}.jpg (status {n})"),
+    ("warning", "Memory warning received, purging {n} cached images"),
+    ("warning", "Layout constraint conflict on view {addr}, breaking {n} constraints"),
+    ("warning", "Request to {ip} took {ms}ms, exceeding budget of 500ms"),
+    ("warning", "deprecated API call from {addr} ({n} times)"),
+    ("info", "Loaded {n} items for section {n} in {ms}ms"),
+    ("info", "notice: session {uuid} resumed after {ms}ms"),
+    ("debug", "Cell reuse: dequeued {n} cells, created {n}"),
+    ("debug", "Scroll offset {ms} velocity {ms}"),
+    ("debug", "Prefetching {n} rows starting at {n}"),
+    ("debug", "Image cache hit for {uuid}"),
+)
+
+
+# Severity of a synthetic message -> ndjson messageType
+SYNTHETIC_MESSAGE_TYPES = {"error": "Error", "warning": "Default", "info": "Info", "debug": "Debug"}
+
+
+def synthetic_app_log(path: str, lines: int, seed: int = 7, style: str = "text") -> None:
+    """
+    Write `log stream`-style lines from a fixed set of message formats.
+
+    Variable parts (UUIDs, addresses, counts, IPs, timings) differ on
+    nearly every line, so deduplication by text sees mostly unique lines
+    while template mining should find one template per format.
+
+    Args:
+        style: 'text' (default-style lines) or 'ndjson' (`--style ndjson` records)
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(lines):
+            severity, message = rng.choice(APP_LOG_MESSAGES)
+            message = (
+                message.replace("{uuid}", f"{rng.getrandbits(32):08X}-0000-4000-8000-{i:012X}")
+                .replace("{addr}", f"0x{rng.getrandbits(40):x}")
+                .replace("{ip}", f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}")
+                .replace("{ms}", str(rng.randint(1, 5000)))
+                .replace("{n}", str(rng.randint(0, 9999)))
+            )
+            timestamp = (
+                f"2025-01-01 12:{i // 60000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}000+0000"
+            )
+            if style == "ndjson":
+                record = {
+                    "timestamp": timestamp,
+                    "messageType": SYNTHETIC_MESSAGE_TYPES[severity],
+                    "eventType": "logEvent",
+                    "processImagePath": "/private/var/containers/Bundle/MyApp.app/MyApp",
+                    "senderImagePath": "/private/var/containers/Bundle/MyApp.app/MyApp",
+                    "processID": 1000,
+                    "threadID": i,
+                    "activityIdentifier": 0,
+                    "subsystem": "com.example.myapp",
+                    "category": "main",
+                    "eventMessage": message,
+                }
+                f.write(json.dumps(record) + "\n")
+            else:
+                f.write(
+                    f"{timestamp} 0x{i:x}  Default  0x0  1000  0  "
+                    f"MyApp: [com.example.myapp:main] {message}\n"
+                )
+
+
+def _legacy_log_replay(path: str) -> dict:
+    """The previous LogMonitor: 13 re.search calls per line, unbounded buffers."""
+    patterns = {
+        "error": [r"\berror\b", r"\bfault\b", r"\bfailed\b", r"\bexception\b", r"\bcrash\b", "❌"],
+        "warning": [r"\bwarning\b", r"\bwarn\b", r"\bdeprecated\b", "⚠️"],
+        "info": [r"\binfo\b", r"\bnotice\b", "ℹ️"],
+    }
+    log_lines, errors, warnings, seen = [], [], [], set()
+    counts = {"error": 0, "warning": 0, "info": 0, "debug": 0}
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip()
+            log_lines.append(line)
+            lower = line.lower()
+            severity = "debug"
+            for name in ("error", "warning", "info"):
+                if any(re.search(p, lower) for p in patterns[name]):
+                    severity = name
+                    break
+            if severity in ("error", "warning"):
+                signature = re.sub(r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}", "", line)
+                signature = re.sub(r"\[\d+\]", "", signature)
+                signature = re.sub(r"\s+", " ", signature).strip()
+                if signature in seen:
+                    continue
+                seen.add(signature)
+                (errors if severity == "error" else warnings).append(line)
+            counts[severity] += 1
+    return counts
+
+
+def _log_monitor_replay(path: str) -> dict:
+    from log_monitor import LogMonitor
+
+    monitor = LogMonitor()
+    monitor.ingest(path)
+    _log_monitor_replay.monitor = monitor
+    return {
+        "error": monitor.error_count,
+        "warning": monitor.warning_count,
+        "info": monitor.info_count,
+        "debug": monitor.debug_count,
+    }
+
+
+def _timed_log_replay(name: str, path: str) -> tuple[float, dict, int, str]:
+    """
+    Run one replay (in a fresh process).
+
+    Returns:
+        (seconds, severity counts, peak RSS in KB, template summary line)
+    """
+    replay = _legacy_log_replay if name == "legacy" else _log_monitor_replay
+    started = time.perf_counter()
+    counts = replay(path)
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    note = ""
+    if name != "legacy":
+        monitor = _log_monitor_replay.monitor
+        unique = monitor.error_count + monitor.warning_count
+        top = monitor.templates.top(3)
+        note = (
+            f"{len(monitor.templates)} templates ({unique} unique error/warning lines); "
+            f"summary {len(monitor.get_summary())} chars; top: "
+            + " | ".join(f"{t.count}x {t.text[:40]}" for t in top)
+        )
+    return elapsed, counts, rss, note
+
+
+def benchmark_logs(
+    lines: int, path: str | None = None, kind: str = "app", style: str = "text"
+) -> None:
+    """
+    Lines/sec, peak RSS and template compression of the previous and current LogMonitor.
+
+    The previous monitor only knew text lines; on ndjson it classifies the
+    raw JSON, so only LogMonitor's counts reflect the real severities.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = str(Path(tmp) / f"replay.{style}")
+            if kind == "app":
+                synthetic_app_log(path, lines, style=style)
+            else:
+                synthetic_log(path, lines)
+        with open(path, "rb") as f:
+            total = sum(1 for _ in f)
+        print(f"log: {total} lines, {Path(path).stat().st_size / 1e6:.1f} MB")
+
+        # A fresh interpreter per variant, so peak RSS is not shared
+        spawn = multiprocessing.get_context("spawn")
+        results = {}
+        for name in ("legacy", "LogMonitor"):
+            with spawn.Pool(1) as pool:
+                elapsed, counts, rss, note = pool.apply(_timed_log_replay, (name, path))
+            results[name] = counts
+            print(
+                f"{name:>22}: {total / elapsed:11,.0f} lines/s  "
+                f"peak RSS {rss / 1024:6.1f} MB  {counts}"
+            )
+            if note:
+                print(f"{'':>22}  {note}")
+        if results["legacy"] != results["LogMonitor"]:
+            print("note: severity counts differ (LogMonitor's dedup memory is LRU-bounded)")
+
+
+def benchmark_fleet(devices: int, delay: float, concurrency_levels: list[int]) -> None:
+    """Wall time of a verified batch erase at several concurrency levels (fake simctl)."""
+    from simctl_erase import SimulatorEraser
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = install_fake_tools(tmp, delay)
+        udids = [f"{i:08X}-0000-4000-8000-000000000000" for i in range(devices)]
+        print(f"{devices} devices, erase + verify, {delay}s per fake tool launch")
+        baseline = None
+        for concurrency in concurrency_levels:
+            open(counter, "w").close()
+            report = SimulatorEraser.erase_many(
+                "erase", udids, verify=True, concurrency=concurrency
+            )
+            baseline = baseline or report.seconds
+            with open(counter) as f:
+                launches = sum(1 for line in f if line.strip())
+            print(
+                f"  concurrency {concurrency:>2}: {report.seconds:6.2f}s  "
+                f"({baseline / report.seconds:4.1f}x)  {report.succeeded}/{report.total} ok  "
+                f"{launches} tool launches"
+            )
+
+
+FAKE_LOG_STREAM = """#!/bin/sh
+if [ "$1" = "--find" ]; then echo "{bin_dir}/simctl"; exit 0; fi
+exec cat "{log}"
+"""
+
+
+def _timed_log_fleet(devices: int, log: str) -> tuple[float, int, int, dict]:
+    """
+    Stream one log file from N fake devices (in a fresh process).
+
+    Returns:
+        (seconds, peak RSS in KB, timeline entries, fleet statistics)
+    """
+    from log_monitor import MultiDeviceLogMonitor
+
+    udids = [f"{i:08X}-0000-4000-8000-000000000000" for i in range(devices)]
+    monitor = MultiDeviceLogMonitor(udids, app_bundle_id="com.example.myapp")
+    started = time.perf_counter()
+    monitor.stream_logs()
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, rss, len(monitor.timeline), monitor.get_statistics()
+
+
+def benchmark_log_fleet(device_counts: list[int], lines: int) -> None:
+    """Lines/sec and peak RSS of MultiDeviceLogMonitor as the device count grows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "device.ndjson"
+        synthetic_app_log(str(log), lines, style="ndjson")
+        install_fake_xcrun(tmp, FAKE_LOG_STREAM, log=log)
+        print(f"per device: {lines} ndjson lines, {log.stat().st_size / 1e6:.1f} MB")
+
+        spawn = multiprocessing.get_context("spawn")
+        for devices in device_counts:
+            with spawn.Pool(1) as pool:
+                elapsed, rss, entries, stats = pool.apply(_timed_log_fleet, (devices, log))
+            print(
+                f"{devices:>3} devices: {stats['total_lines'] / elapsed:9,.0f} lines/s  "
+                f"peak RSS {rss / 1024:6.1f} MB  timeline {entries} entries  "
+                f"errors={stats['errors']}"
+            )
+
+
+FAKE_DEVICE_LIST = """#!/bin/sh
+echo "xcrun $*" >> "{counter}"
+sleep {delay}
+if [ "$1" = "--find" ]; then echo "{bin_dir}/xcrun"; exit 0; fi
+exec cat "{listing}"
+"""
+
+
+def synthetic_device_list(devices: int) -> dict:
+    """`simctl list devices -j` output with devices spread over four iOS runtimes."""
+    models = ["iPhone 16 Pro", "iPhone 16", "iPhone SE (3rd generation)", "iPad Air 11-inch (M2)"]
+    listing: dict[str, list[dict]] = {}
+    for i in range(devices):
+        runtime = f"com.apple.CoreSimulator.SimRuntime.iOS-{15 + i % 4}-0"
+        model = models[i % len(models)]
+        listing.setdefault(runtime, []).append(
+            {
+                "name": f"{model} #{i}" if i >= len(models) else model,
+                "udid": f"{i:08X}-0000-4000-8000-000000000000",
+                "state": "Booted" if i == 0 else "Shutdown",
+                "isAvailable": True,
+                "deviceTypeIdentifier": "com.apple.CoreSimulator.SimDeviceType."
+                + model.replace(" ", "-"),
+            }
+        )
+    return {"devices": listing}
+
+
+def benchmark_inventory(devices: int, lookups: int, delay: float) -> None:
+    """Device lookups by UDID/name/state: a `simctl list` per lookup vs DeviceInventory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        listing = Path(tmp) / "devices.json"
+        listing.write_text(json.dumps(synthetic_device_list(devices)))
+        counter = Path(tmp) / "launches.log"
+        install_fake_xcrun(tmp, FAKE_DEVICE_LIST, counter=counter, delay=delay, listing=listing)
+        udids = [f"{i * 7 % devices:08X}-0000-4000-8000-000000000000" for i in range(lookups)]
+
+        def launches() -> int:
+            with open(counter) as f:
+                return sum(1 for line in f if line.strip())
+
+        def legacy(udid: str) -> dict | None:
+            cmd = ["xcrun", "simctl", "list", "devices", "-j"]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            for runtime_devices in json.loads(result.stdout)["devices"].values():
+                for device in runtime_devices:
+                    if device["udid"] == udid:
+                        return device
+            return None
+
+        cache_path = Path(tmp) / "device-inventory.json"
+        print(f"{devices} devices, {lookups} lookups, {delay}s per fake simctl launch")
+        for name in ("per-lookup list", "inventory", "inventory (2nd process)"):
+            open(counter, "w").close()
+            inventory = DeviceInventory(cache_path)
+            started = time.perf_counter()
+            for udid in udids:
+                if name == "per-lookup list":
+                    legacy(udid)
+                else:
+                    inventory.get(udid)
+                    inventory.booted()
+            elapsed = time.perf_counter() - started
+            print(f"  {name:>24}: {elapsed * 1000:8.1f} ms  {launches()} simctl launches")
+
+
+FAKE_BOOTING_SIMCTL = """#!/usr/bin/env python3
+import sys, time
+args = sys.argv[1:]
+with open("{counter}", "a") as f:
+    f.write(" ".join(args) + "\\n")
+if args[0] == "--find":
+    print("{bin_dir}/xcrun")
+    sys.exit(0)
+time.sleep({delay})
+with open("{ready_at}") as f:
+    ready_at = float(f.read())
+if args[1] == "bootstatus":
+    time.sleep(max(0.0, ready_at - time.time()))
+    print("Finished")
+elif args[1] == "spawn":
+    sys.exit(0 if time.time() >= ready_at else 1)
+"""
+
+
+def _legacy_wait_for_ready(udid: str, timeout_seconds: float) -> bool:
+    """Readiness check before bootstatus: `launchctl list` every 0.5s."""
+    start_time = time.time()
+    while time.time() - start_time < timeout_seconds:
+        result = subprocess.run(
+            ["xcrun", "simctl", "spawn", udid, "launchctl", "list"],
+            check=False,
+            capture_output=True,
+            timeout=5,
+        )
+        if result.returncode == 0:
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def benchmark_boot(ready_after: float, delay: float) -> None:
+    """Time from a device becoming ready to its readiness being detected (fake simctl)."""
+    from simctl_boot import SimulatorBooter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = Path(tmp) / "launches.log"
+        ready_at = Path(tmp) / "ready_at"
+        install_fake_xcrun(
+            tmp, FAKE_BOOTING_SIMCTL, counter=counter, delay=delay, ready_at=ready_at
+        )
+
+        udid = "00000000-0000-4000-8000-000000000000"
+        booter = SimulatorBooter(udid)
+        methods = {
+            "poll every 0.5s": lambda: _legacy_wait_for_ready(udid, 60),
+            "poll with backoff": lambda: booter._poll_ready(60)[0],
+            "bootstatus": lambda: booter._wait_bootstatus(60)[0],
+        }
+        print(f"device ready {ready_after}s after boot, {delay}s per fake simctl launch")
+        for name, wait in methods.items():
+            counter.write_text("")
+            ready_at.write_text(str(time.time() + ready_after))
+            cpu_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+            ready = wait()
+            detected = time.time()
+            cpu_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+            late = detected - float(ready_at.read_text())
+            launches = sum(1 for line in counter.read_text().splitlines() if line.strip())
+            cpu = (cpu_after.ru_utime + cpu_after.ru_stime) - (
+                cpu_before.ru_utime + cpu_before.ru_stime
+            )
+            print(
+                f"  {name:>18}: detected {late * 1000:6.0f} ms after ready  "
+                f"{launches:>3} simctl launches  {cpu * 1000:5.0f} ms child CPU  ready={ready}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for shared utilities")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    executor = sub.add_parser("executor", help="Queued vs direct idb/simctl execution")
+    executor.add_argument("--steps", type=int, default=200, help="Commands in the flow")
+    executor.add_argument(
+        "--delay", type=float, default=0, help="Simulated tool startup delay (seconds)"
+    )
+
+    traversal = sub.add_parser("traversal", help="Tree flattening time and memory")
+    traversal.add_argument("--nodes", type=int, default=50000, help="Synthetic tree size")
+
+    audit = sub.add_parser("audit", help="Accessibility audit rule evaluation")
+    audit.add_argument("--nodes", type=int, default=50000, help="Synthetic tree size")
+    audit.add_argument("--screens", type=int, default=100, help="Screens in the synthetic flow")
+
+    sub.add_parser("visual", help="Visual diff on 1290x2796 screenshots (requires Pillow)")
+
+    logs = sub.add_parser("logs", help="Log monitor throughput and peak RSS")
+    logs.add_argument("--lines", type=int, default=200000, help="Synthetic log size")
+    logs.add_argument("--file", help="Replay a recorded `log stream` text/ndjson file instead")
+    logs.add_argument(
+        "--kind",
+        choices=["app", "random"],
+        default="app",
+        help="Synthetic log: app message formats, or random words (worst case for templates)",
+    )
+    logs.add_argument(
+        "--style",
+        choices=["text", "ndjson"],
+        default="text",
+        help="Synthetic app log format (ndjson: severity from messageType)",
+    )
+
+    fleet = sub.add_parser("log-fleet", help="Multi-device log streaming vs device count")
+    fleet.add_argument(
+        "--devices", default="1,4,16", help="Comma-separated device counts (default: 1,4,16)"
+    )
+    fleet.add_argument("--lines", type=int, default=20000, help="Lines streamed per device")
+
+    fleet_ops = sub.add_parser("fleet", help="Batch simctl operations vs concurrency")
+    fleet_ops.add_argument("--devices", type=int, default=20, help="Fake devices")
+    fleet_ops.add_argument(
+        "--delay", type=float, default=0.2, help="Simulated seconds per tool launch"
+    )
+    fleet_ops.add_argument(
+        "--concurrency", default="1,4,8", help="Comma-separated levels (default: 1,4,8)"
+    )
+
+    inventory = sub.add_parser("inventory", help="Device lookups: per-lookup simctl vs inventory")
+    inventory.add_argument("--devices", type=int, default=200, help="Devices in the fake listing")
+    inventory.add_argument("--lookups", type=int, default=50, help="Lookups by UDID and state")
+    inventory.add_argument(
+        "--delay", type=float, default=0.1, help="Simulated seconds per simctl launch"
+    )
+
+    boot = sub.add_parser("boot", help="Boot readiness detection: polling vs bootstatus")
+    boot.add_argument(
+        "--ready-after", type=float, default=3.0, help="Seconds until the fake device is ready"
+    )
+    boot.add_argument(
+        "--delay", type=float, default=0.05, help="Simulated seconds per simctl launch"
+    )
+
+    args = parser.parse_args()
+    if args.benchmark == "executor":
+        benchmark_executor(args.steps, args.delay)
+    elif args.benchmark == "traversal":
+        benchmark_traversal(args.nodes)
+    elif args.benchmark == "audit":
+        benchmark_audit(args.nodes, args.screens)
+    elif args.benchmark == "visual":
+        benchmark_visual()
+    elif args.benchmark == "logs":
+        benchmark_logs(args.lines, args.file, args.kind, args.style)
+    elif args.benchmark == "fleet":
+        benchmark_fleet(args.devices, args.delay, [int(n) for n in args.concurrency.split(",")])
+    elif args.benchmark == "log-fleet":
+        benchmark_log_fleet([int(n) for n in args.devices.split(",")], args.lines)
+    elif args.benchmark == "inventory":
+        benchmark_inventory(args.devices, args.lookups, args.delay)
+    elif args.benchmark == "boot":
+        benchmark_boot(args.ready_after, args.delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Local history of simulator boot timings.
+
+Every boot through simctl_boot.py records how long each phase took: the
+`simctl boot` command, data migration (first boot after creating or
+erasing a device, or after a runtime update) and the wait until the device
+is ready. Records are appended as JSON lines to
+~/.ios-simulator-skill/boot-history.jsonl, trimmed to the most recent
+MAX_BOOT_HISTORY, so boot latency can be tracked per device type and
+runtime over time.
+
+Used by:
+- simctl_boot.py - Records every boot, prints the summary (--history)
+
+Usage:
+    python -m common.boot_history               # Latency per device type and runtime
+    python -m common.boot_history --json
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BOOT_HISTORY_PATH = Path("~/.ios-simulator-skill/boot-history.jsonl").expanduser()
+MAX_BOOT_HISTORY = 500  # Records kept; the file is trimmed at twice this
+
+_write_lock = threading.Lock()
+
+
+@dataclass
+class BootRecord:
+    """Phase timings of one boot (None = phase not observed)."""
+
+    udid: str
+    device_type: str  # Device type identifier or name
+    runtime: str  # Readable runtime (e.g., "iOS 18.0")
+    method: str  # Readiness detection: "bootstatus", "poll" or "none" (not waited for)
+    success: bool
+    boot_command: float  # Seconds in `simctl boot`
+    data_migration: float | None = None  # Seconds migrating data before the device came up
+    ready: float | None = None  # Seconds from boot command exit to ready
+    timestamp: float = 0.0  # time.time() when the boot started
+
+    @property
+    def total(self) -> float | None:
+        """Seconds from boot start to ready (None if readiness wasn't reached)."""
+        return None if self.ready is None else self.boot_command + self.ready
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        for key in ("boot_command", "data_migration", "ready"):
+            if data[key] is not None:
+                data[key] = round(data[key], 3)
+        return data
+
+
+def record_boot(record: BootRecord, path: Path = BOOT_HISTORY_PATH) -> None:
+    """Append a boot record (never raises: history is best effort)."""
+    if not record.timestamp:
+        record.timestamp = time.time()
+    line = json.dumps(record.to_dict(), separators=(",", ":")) + "\n"
+    with _write_lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line)
+            if path.stat().st_size > MAX_BOOT_HISTORY * 2 * len(line):
+                _trim(path)
+        except OSError:
+            pass
+
+
+def _trim(path: Path) -> None:
+    lines = path.read_text().splitlines(keepends=True)
+    if len(lines) <= MAX_BOOT_HISTORY * 2:
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text("".join(lines[-MAX_BOOT_HISTORY:]))
+    tmp.replace(path)
+
+
+def load_boot_history(path: Path = BOOT_HISTORY_PATH) -> list[BootRecord]:
+    """Boot records, oldest first (unreadable lines are skipped)."""
+    records = []
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        try:
+            records.append(BootRecord(**json.loads(line)))
+        except (ValueError, TypeError):
+            continue
+    return records
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize_boot_history(records: list[BootRecord]) -> list[dict]:
+    """
+    Boot latency per (device type, runtime), most recently booted first.
+
+    Returns:
+        Dicts with device_type, runtime, boots, failures, median/p90 total
+        seconds to ready, median boot command seconds, median data migration
+        seconds (boots that migrated), and the last boot's timestamp
+    """
+    groups: dict[tuple[str, str], list[BootRecord]] = {}
+    for record in records:
+        groups.setdefault((record.device_type, record.runtime), []).append(record)
+
+    summary = []
+    for (device_type, runtime), group in groups.items():
+        totals = [r.total for r in group if r.success and r.total is not None]
+        migrations = [r.data_migration for r in group if r.data_migration is not None]
+        summary.append(
+            {
+                "device_type": device_type,
+                "runtime": runtime,
+                "boots": len(group),
+                "failures": sum(1 for r in group if not r.success),
+                "median_total": _percentile(totals, 0.5),
+                "p90_total": _percentile(totals, 0.9),
+                "median_boot_command": _percentile([r.boot_command for r in group], 0.5),
+                "median_data_migration": _percentile(migrations, 0.5),
+                "last_boot": max(r.timestamp for r in group),
+            }
+        )
+    summary.sort(key=lambda row: row["last_boot"], reverse=True)
+    return summary
+
+
+def format_boot_summary(summary: list[dict]) -> str:
+    """One line per device type and runtime."""
+    if not summary:
+        return "No boots recorded yet"
+
+    def seconds(value: float | None) -> str:
+        return "-" if value is None else f"{value:.1f}s"
+
+    lines = ["Boot latency (ready = boot command + data migration + startup):"]
+    for row in summary:
+        device_type = row["device_type"].rsplit(".", 1)[-1]
+        lines.append(
+            f"  {device_type} ({row['runtime']}): {row['boots']} boots, "
+            f"{row['failures']} failed, ready median {seconds(row['median_total'])} "
+            f"p90 {seconds(row['p90_total'])}, boot command {seconds(row['median_boot_command'])}, "
+            f"migration {seconds(row['median_data_migration'])}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boot latency per device type and runtime")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    summary = summarize_boot_history(load_boot_history())
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_boot_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
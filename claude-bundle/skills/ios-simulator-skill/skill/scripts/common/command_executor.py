@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Per-device command serialization for idb and simctl.
+
+Concurrent callers could interleave UI actions on one device, and nothing
+told caches that a command had changed the screen. This module runs
+commands through one queue per device and keeps a generation counter per
+device:
+
+- Per-device queues: a worker thread per UDID ("booted" when none) runs
+  that device's commands strictly one after another, so concurrent callers
+  never interleave UI actions on one device.
+- Pipelining: submit() queues a command and returns a Future at once; the
+  caller keeps working while the device catches up.
+- Every command that can change what is on screen (tap, text, swipe,
+  launch, ...) bumps the device's generation counter, which idb_utils uses
+  to invalidate cached accessibility trees. simctl boot/shutdown/create/
+  delete/erase also invalidate the shared device inventory when they finish.
+- simctl is resolved once (`xcrun --find simctl`, cached on disk) and run
+  directly, skipping the xcrun shim on every call.
+
+This is not a connection pool: idb has no persistent client mode, so every
+command is still its own process, exactly as in direct mode. A command that times out is killed alone; commands
+queued behind it still run.
+
+Set IOS_SKILL_EXECUTOR=direct to run each command in the calling thread
+instead (generations are kept in both modes).
+
+Used by:
+- navigator.py - tap, text entry
+- gesture.py - swipes, long press
+- keyboard.py - typing, keys, hardware buttons
+- idb_utils.py - accessibility tree fetches
+
+Offline check (fake idb/xcrun that count their own launches):
+    python -m common.benchmarks executor --steps 200
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .device_inventory import changes_inventory, get_inventory, invalidate_inventory
+
+TOOL_CACHE_PATH = Path("~/.ios-simulator-skill/tool-paths.json").expanduser()
+EXECUTOR_MODES = ("serial", "direct")
+
+# Operations that only read device state; anything else may change the screen
+READ_ONLY_IDB_OPS = {
+    "connect",
+    "describe",
+    "list-apps",
+    "list-targets",
+    "log",
+    "screenshot",
+    "ui describe-all",
+    "ui describe-point",
+}
+READ_ONLY_SIMCTL_OPS = {
+    "appinfo",
+    "bootstatus",
+    "diagnose",
+    "get_app_container",
+    "getenv",
+    "help",
+    "io",
+    "list",
+    "listapps",
+    "spawn",
+}
+
+
+def get_executor_mode() -> str:
+    """
+    Execution mode from IOS_SKILL_EXECUTOR.
+
+    Returns:
+        'serial' (commands queued per device) or 'direct' (run in the calling
+        thread). Invalid values default to 'serial'.
+    """
+    mode = os.environ.get("IOS_SKILL_EXECUTOR", "serial").lower()
+    return mode if mode in EXECUTOR_MODES else "serial"
+
+
+def is_mutating(cmd: list[str]) -> bool:
+    """
+    Whether a command may change device UI state.
+
+    Args:
+        cmd: Command list from build_idb_command()/build_simctl_command()
+
+    Returns:
+        False for known read-only idb/simctl operations, True otherwise
+        (unknown commands are assumed to mutate)
+
+    Example:
+        is_mutating(["idb", "ui", "tap", "10", "20"])             # True
+        is_mutating(["idb", "ui", "describe-all", "--json"])      # False
+        is_mutating(["xcrun", "simctl", "list", "devices", "-j"]) # False
+    """
+    if cmd[:1] == ["idb"] and len(cmd) > 1:
+        op = f"ui {cmd[2]}" if cmd[1] == "ui" and len(cmd) > 2 else cmd[1]
+        return op not in READ_ONLY_IDB_OPS
+    if cmd[:2] == ["xcrun", "simctl"] and len(cmd) > 2:
+        return cmd[2] not in READ_ONLY_SIMCTL_OPS
+    return True
+
+
+def resolve_simctl_path() -> str | None:
+    """
+    Locate the simctl binary once so commands can skip the xcrun shim.
+
+    The result is cached in ~/.ios-simulator-skill/tool-paths.json, keyed by
+    DEVELOPER_DIR, and re-resolved if the cached binary has disappeared
+    (e.g. after switching Xcode versions).
+
+    Returns:
+        Absolute path to simctl, or None if xcrun cannot find it.
+    """
+    key = os.environ.get("DEVELOPER_DIR", "default")
+    try:
+        cached = json.loads(TOOL_CACHE_PATH.read_text()).get(key)
+        if cached and os.access(cached, os.X_OK):
+            return cached
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        result = subprocess.run(
+            ["xcrun", "--find", "simctl"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    path = result.stdout.strip()
+    if not path:
+        return None
+
+    try:
+        TOOL_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            paths = json.loads(TOOL_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            paths = {}
+        paths[key] = path
+        TOOL_CACHE_PATH.write_text(json.dumps(paths))
+    except OSError:
+        pass
+    return path
+
+
+def _run_process(
+    cmd: list[str], text: bool = True, timeout: float | None = None
+) -> subprocess.CompletedProcess:
+    """Run one command with its output captured (the child is killed on timeout)."""
+    return subprocess.run(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=text,
+        timeout=timeout,
+        check=False,
+    )
+
+
+class DeviceQueue:
+    """
+    Worker thread that runs one device's commands in submission order.
+
+    Attributes:
+        key: UDID this queue serves ("booted" when none given)
+        commands: Number of commands submitted
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"device-{key}")
+
+    def submit(self, cmd: list[str], text: bool = True, timeout: float | None = None) -> Future:
+        """
+        Queue a command behind the device's earlier commands.
+
+        Args:
+            cmd: Command list, as returned by build_idb_command()
+            text: Decode stdout/stderr as UTF-8 (default True)
+            timeout: Seconds the command may run once started
+
+        Returns:
+            Future resolving to subprocess.CompletedProcess, or raising
+            subprocess.TimeoutExpired / OSError like subprocess.run()
+        """
+        with self._lock:
+            self.commands += 1
+        return self._pool.submit(_run_process, cmd, text, timeout)
+
+    def close(self) -> None:
+        """Stop the worker once queued commands have finished."""
+        self._pool.shutdown(wait=True)
+
+
+class CommandExecutor:
+    """
+    Runs idb/simctl commands through per-device queues.
+
+    Drop-in for subprocess.run() at build_idb_command()/build_simctl_command()
+    call sites: run() returns a CompletedProcess and raises CalledProcessError
+    when check=True, so existing error handling keeps working.
+
+    Attributes:
+        mode: 'serial' or 'direct' (see IOS_SKILL_EXECUTOR)
+        direct_commands: Commands run in direct mode
+
+    Example:
+        executor = get_executor()
+        cmd = build_idb_command("ui tap", udid, "200", "400")
+        executor.run(cmd, udid=udid, check=True)
+
+        # Pipelined: all three are queued before the first finishes
+        futures = [executor.submit(c, udid=udid) for c in cmds]
+        results = [f.result() for f in futures]
+    """
+
+    def __init__(self, mode: str | None = None):
+        self.mode = mode or get_executor_mode()
+        self.direct_commands = 0
+        self._queues: dict[str, DeviceQueue] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._simctl_path: str | None = None
+        self._simctl_resolved = False
+
+    def generation(self, udid: str | None = None) -> int:
+        """
+        Count of mutating commands sent to a device so far.
+
+        Caches of device state (accessibility trees) compare generations to
+        detect that the screen may have changed since they were filled.
+
+        Args:
+            udid: Device UDID (None = booted device)
+
+        Returns:
+            Monotonic counter, 0 before any mutating command
+        """
+        return self._generations.get(udid or "booted", 0)
+
+    def _bump_generation(self, key: str) -> None:
+        keys = [key]
+        if key == "booted":
+            # The command lands on a booted device, which caches know by its UDID
+            with contextlib.suppress(RuntimeError):
+                keys += [device["udid"] for device in get_inventory().booted()]
+        else:
+            # "booted" may alias this device
+            keys.append("booted")
+        with self._lock:
+            for k in keys:
+                self._generations[k] = self._generations.get(k, 0) + 1
+
+    def _queue(self, key: str) -> DeviceQueue:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = DeviceQueue(key)
+            return queue
+
+    def _prepare(self, cmd: list[str]) -> list[str]:
+        """Rewrite xcrun simctl to the resolved binary."""
+        if cmd[:2] == ["xcrun", "simctl"]:
+            if not self._simctl_resolved:
+                self._simctl_path = resolve_simctl_path()
+                self._simctl_resolved = True
+            if self._simctl_path:
+                return [self._simctl_path, *cmd[2:]]
+        return cmd
+
+    def submit(
+        self,
+        cmd: list[str],
+        udid: str | None = None,
+        text: bool = True,
+        timeout: float | None = None,
+    ) -> Future:
+        """
+        Queue a command on the device's queue without waiting for it.
+
+        Args:
+            cmd: Command list from build_idb_command()/build_simctl_command()
+            udid: Device the command targets (None = booted device)
+            text: Decode output as UTF-8 (default True)
+            timeout: Seconds the command may run once started
+
+        Returns:
+            Future resolving to subprocess.CompletedProcess
+        """
+        key = udid or "booted"
+        if is_mutating(cmd):
+            self._bump_generation(key)
+        if self.mode == "direct":
+            future: Future = Future()
+            try:
+                future.set_result(self._run_direct(cmd, text, timeout))
+            except (OSError, subprocess.TimeoutExpired) as e:
+                future.set_exception(e)
+        else:
+            future = self._queue(key).submit(self._prepare(cmd), text, timeout)
+        if changes_inventory(cmd):
+            # The device list is stale once boot/shutdown/create/delete/erase finishes
+            future.add_done_callback(lambda _: invalidate_inventory())
+        return future
+
+    def run(
+        self,
+        cmd: list[str],
+        udid: str | None = None,
+        check: bool = False,
+        timeout: float | None = None,
+        text: bool = True,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command on the device's queue and wait for it.
+
+        Args:
+            cmd: Command list from build_idb_command()/build_simctl_command()
+            udid: Device the command targets (None = booted device)
+            check: Raise CalledProcessError on non-zero exit
+            timeout: Seconds the command may run once started; on expiry
+                only this command is killed
+            text: Decode output as UTF-8 (default True)
+
+        Returns:
+            subprocess.CompletedProcess with stdout and stderr captured
+
+        Raises:
+            subprocess.CalledProcessError: If check=True and the command fails
+            subprocess.TimeoutExpired: If the command outlives timeout
+        """
+        result = self.submit(cmd, udid=udid, text=text, timeout=timeout).result()
+        if check:
+            result.check_returncode()
+        return result
+
+    def _run_direct(
+        self, cmd: list[str], text: bool, timeout: float | None = None
+    ) -> subprocess.CompletedProcess:
+        self.direct_commands += 1
+        return _run_process(cmd, text, timeout)
+
+    def stats(self) -> dict:
+        """Command counts, in direct mode and per device queue."""
+        return {
+            "mode": self.mode,
+            "direct_commands": self.direct_commands,
+            "queues": {key: queue.commands for key, queue in self._queues.items()},
+        }
+
+    def close(self) -> None:
+        """Shut down all queues."""
+        with self._lock:
+            queues = list(self._queues.values())
+            self._queues.clear()
+        for queue in queues:
+            queue.close()
+
+
+_shared: dict[str, CommandExecutor] = {}  # Process-wide executor, created on first use
+_shared_lock = threading.Lock()
+
+
+def get_executor() -> CommandExecutor:
+    """
+    Shared process-wide executor (created on first use, closed at exit).
+
+    Returns:
+        CommandExecutor instance
+    """
+    with _shared_lock:
+        executor = _shared.get("executor")
+        if executor is None:
+            executor = _shared["executor"] = CommandExecutor()
+            atexit.register(executor.close)
+        return executor
+
+
+def run_command(
+    cmd: list[str],
+    udid: str | None = None,
+    check: bool = False,
+    timeout: float | None = None,
+    text: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    Run an idb/simctl command through the shared executor.
+
+    Drop-in replacement for subprocess.run(cmd, capture_output=True, ...).
+
+    Args:
+        cmd: Command list from build_idb_command()/build_simctl_command()
+        udid: Device the command targets (None = booted device)
+        check: Raise CalledProcessError on non-zero exit
+        timeout: Seconds the command may run before it is killed
+        text: Decode output as UTF-8 (default True)
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        subprocess.CalledProcessError: If check=True and the command fails
+        subprocess.TimeoutExpired: If the command outlives timeout
+
+    Example:
+        cmd = build_idb_command("ui text", udid, "hello")
+        run_command(cmd, udid=udid, check=True)
+    """
+    return get_executor().run(cmd, udid=udid, check=check, timeout=timeout, text=text)
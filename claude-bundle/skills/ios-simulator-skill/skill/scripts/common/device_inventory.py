@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Shared, cached inventory of simulators.
+
+`xcrun simctl list devices -j` used to run separately in device_utils,
+sim_list, simulator_selector, idb_utils and the Xcode builder, often several
+times in one invocation, and each run costs a few hundred milliseconds.
+DeviceInventory fetches the JSON once, keeps it in memory, and shares it
+between processes through a small cache file with a short TTL. It answers
+lookups by UDID, name, state and runtime from prebuilt indexes.
+
+Lifecycle operations issued through the skill (boot, shutdown, create,
+delete, erase) call invalidate_inventory() when they finish. This stamps
+the cache file, so every process refetches on its next lookup. A fetch that
+was already running when the stamp was written is not saved. Changes made
+outside the skill (Xcode, another terminal) show up once the TTL expires
+(IOS_SKILL_INVENTORY_TTL seconds, default 10; 0 fetches on every lookup).
+
+Used by:
+- device_utils.py - list_simulators(), get_booted_device_udid(),
+  resolve_device_identifier()
+- sim_list.py, simulator_selector.py - Device listings
+- idb_utils.py - Device type for screen size caching
+- app_state_capture.py - Device info
+- xcode/builder.py - Simulator auto-detection
+- simctl_boot/shutdown/create/delete/erase.py, command_executor.py - Invalidation
+
+Example:
+    inventory = get_inventory()
+    inventory.get(udid)["state"]          # 'Booted'
+    inventory.by_name("iPhone 16 Pro")    # exact (case-insensitive) matches
+    inventory.by_state("booted")
+    inventory.by_runtime("iOS 18")        # iOS 18.0, 18.1, ...
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+INVENTORY_CACHE_PATH = Path("~/.ios-simulator-skill/device-inventory.json").expanduser()
+DEFAULT_INVENTORY_TTL = 10.0  # Seconds a fetched listing is trusted (IOS_SKILL_INVENTORY_TTL)
+# simctl operations that add, remove or change the state of devices
+INVENTORY_SIMCTL_OPS = {"boot", "shutdown", "create", "clone", "delete", "erase", "rename"}
+
+RUNTIME_KEY_RE = re.compile(r"SimRuntime\.(\w+?)-([\d-]+)$")
+
+
+def runtime_name(runtime_key: str) -> str:
+    """
+    Readable runtime name of a `simctl list -j` runtime key.
+
+    Example:
+        runtime_name("com.apple.CoreSimulator.SimRuntime.iOS-18-0")  # 'iOS 18.0'
+        runtime_name("iOS 18.0")                                     # 'iOS 18.0'
+    """
+    match = RUNTIME_KEY_RE.search(runtime_key)
+    if match:
+        return f"{match.group(1)} {match.group(2).replace('-', '.')}"
+    return runtime_key.replace(" Simulator", "").strip()
+
+
+def device_type_name(device_name: str) -> str:
+    """
+    Device type from a simulator name.
+
+    Example:
+        device_type_name("iPhone 16 Pro")         # 'iPhone'
+        device_type_name("Apple Watch Series 9")  # 'Watch'
+    """
+    if "iPhone" in device_name:
+        return "iPhone"
+    if "iPad" in device_name:
+        return "iPad"
+    if "Watch" in device_name:
+        return "Watch"
+    if "TV" in device_name:
+        return "TV"
+    return "Unknown"
+
+
+def inventory_ttl() -> float:
+    """Listing lifetime from IOS_SKILL_INVENTORY_TTL (seconds, default 10)."""
+    try:
+        return max(0.0, float(os.environ.get("IOS_SKILL_INVENTORY_TTL", DEFAULT_INVENTORY_TTL)))
+    except ValueError:
+        return DEFAULT_INVENTORY_TTL
+
+
+def changes_inventory(cmd: list[str]) -> bool:
+    """Whether a command adds, removes or boots/shuts down simulators."""
+    return cmd[:2] == ["xcrun", "simctl"] and len(cmd) > 2 and cmd[2] in INVENTORY_SIMCTL_OPS
+
+
+class DeviceInventory:
+    """
+    Cached `simctl list devices -j` with indexed lookups.
+
+    Devices are dicts with the keys list_simulators() always returned
+    (name, udid, state, runtime, type) plus runtime_name, is_available and
+    device_type_identifier.
+    """
+
+    def __init__(
+        self,
+        cache_path: str | Path | None = INVENTORY_CACHE_PATH,
+        ttl: float | None = None,
+    ):
+        """
+        Args:
+            cache_path: Cache file shared between processes (None = memory only)
+            ttl: Seconds a listing is trusted before it is fetched again
+                (None = IOS_SKILL_INVENTORY_TTL)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl = inventory_ttl() if ttl is None else ttl
+        self.fetches = 0
+        self._raw: dict | None = None
+        self._fetched_at = 0.0
+        self._cache_mtime: float | None = None  # Cache file version last read or written
+        self._lock = threading.Lock()
+        self._devices: list[dict] = []
+        self._by_udid: dict[str, dict] = {}
+        self._by_name: dict[str, list[dict]] = {}
+        self._by_state: dict[str, list[dict]] = {}
+        self._by_runtime: dict[str, list[dict]] = {}
+
+    def _stat_cache(self) -> float | None:
+        try:
+            return self.cache_path.stat().st_mtime if self.cache_path else None
+        except OSError:
+            return None
+
+    def _read_cache(self) -> dict:
+        if not self.cache_path:
+            return {}
+        try:
+            self._cache_mtime = self._stat_cache()
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_cache(self, data: dict) -> None:
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, separators=(",", ":")))
+            tmp.replace(self.cache_path)
+            self._cache_mtime = self._stat_cache()
+        except OSError:
+            pass
+
+    def _fetch(self) -> None:
+        """Run simctl, index the result and share it through the cache file."""
+        started = time.time()
+        try:
+            result = subprocess.run(
+                ["xcrun", "simctl", "list", "devices", "-j"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            raw = json.loads(result.stdout)
+        except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            raise RuntimeError(f"Failed to list simulators: {e}") from e
+        self.fetches += 1
+        self._index(raw)
+        self._fetched_at = started
+
+        # An invalidation during the fetch means the result may predate the change
+        invalidated_at = self._read_cache().get("invalidated_at", 0)
+        if invalidated_at >= started:
+            self._fetched_at = 0.0
+        else:
+            self._write_cache({"fetched_at": started, "devices": raw})
+
+    def _index(self, raw: dict) -> None:
+        devices, by_udid, by_name, by_state, by_runtime = [], {}, {}, {}, {}
+        for runtime_key, runtime_devices in raw.get("devices", {}).items():
+            readable = runtime_name(runtime_key)
+            for device in runtime_devices:
+                name = device.get("name", "Unknown")
+                entry = {
+                    "name": name,
+                    "udid": device.get("udid", ""),
+                    "state": device.get("state", "Unknown"),
+                    "runtime": runtime_key,
+                    "type": device_type_name(name),
+                    "runtime_name": readable,
+                    "is_available": device.get("isAvailable", True),
+                    "device_type_identifier": device.get("deviceTypeIdentifier"),
+                }
+                devices.append(entry)
+                by_udid[entry["udid"].upper()] = entry
+                by_name.setdefault(name.lower(), []).append(entry)
+                by_state.setdefault(entry["state"].lower(), []).append(entry)
+                by_runtime.setdefault(readable.lower(), []).append(entry)
+        self._raw = raw
+        self._devices, self._by_udid, self._by_name = devices, by_udid, by_name
+        self._by_state, self._by_runtime = by_state, by_runtime
+
+    def load(self, refresh: bool = False) -> "DeviceInventory":
+        """
+        Make sure a listing no older than the TTL is loaded.
+
+        Args:
+            refresh: Fetch from simctl even if a cached listing is fresh
+                (for polling loops waiting on a state change)
+
+        Returns:
+            self
+
+        Raises:
+            RuntimeError: If simctl fails
+        """
+        with self._lock:
+            now = time.time()
+            if not refresh:
+                # A changed cache file means another process invalidated or refetched
+                fresh = self._raw is not None and now - self._fetched_at < self.ttl
+                if fresh and self._stat_cache() == self._cache_mtime:
+                    return self
+                cached = self._read_cache()
+                fetched_at = cached.get("fetched_at", 0)
+                if "devices" in cached and now - fetched_at < self.ttl:
+                    self._index(cached["devices"])
+                    self._fetched_at = fetched_at
+                    return self
+            self._fetch()
+            return self
+
+    def invalidate(self) -> None:
+        """Drop the listing here and, through the cache file, in other processes."""
+        with self._lock:
+            self._raw = None
+            self._fetched_at = 0.0
+            self._write_cache({"invalidated_at": time.time()})
+
+    def raw(self, refresh: bool = False) -> dict:
+        """The `simctl list devices -j` JSON ({"devices": {runtime: [...]}})."""
+        return self.load(refresh)._raw
+
+    def devices(self, refresh: bool = False) -> list[dict]:
+        """All devices, in simctl's order."""
+        return list(self.load(refresh)._devices)
+
+    def get(self, udid: str) -> dict | None:
+        """Device with this UDID (case-insensitive), or None."""
+        return self.load()._by_udid.get(udid.upper())
+
+    def by_name(self, name: str, partial: bool = False) -> list[dict]:
+        """
+        Devices named exactly `name` (case-insensitive).
+
+        Args:
+            partial: Match names containing `name` instead
+        """
+        key = name.lower()
+        self.load()
+        if not partial:
+            return list(self._by_name.get(key, ()))
+        return [d for d in self._devices if key in d["name"].lower()]
+
+    def by_state(self, state: str, refresh: bool = False) -> list[dict]:
+        """Devices in a state ("Booted", "Shutdown", ...; case-insensitive)."""
+        return list(self.load(refresh)._by_state.get(state.lower(), ()))
+
+    def by_runtime(self, runtime: str) -> list[dict]:
+        """
+        Devices of a runtime: a runtime key, a readable name ("iOS 18.0"),
+        or a version prefix ("iOS 18" matches 18.0, 18.1, ...).
+        """
+        self.load()
+        query = runtime_name(runtime).lower()
+        return [
+            d
+            for name, devices in self._by_runtime.items()
+            if name == query or name.startswith(query + ".")
+            for d in devices
+        ]
+
+    def booted(self, refresh: bool = False) -> list[dict]:
+        """Booted devices."""
+        return self.by_state("booted", refresh)
+
+
+_shared: dict[str, DeviceInventory] = {}  # Process-wide inventory, created on first use
+_shared_lock = threading.Lock()
+
+
+def get_inventory() -> DeviceInventory:
+    """Shared process-wide inventory (created on first use)."""
+    with _shared_lock:
+        inventory = _shared.get("inventory")
+        if inventory is None:
+            inventory = _shared["inventory"] = DeviceInventory()
+        return inventory
+
+
+def invalidate_inventory() -> None:
+    """Forget the cached listing in every process (after boot/shutdown/create/delete/erase)."""
+    get_inventory().invalidate()
@@ -14,9 +14,9 @@ Used by:
 - test_recorder.py, app_state_capture.py - Auto-UDID detection
 """
 
-import json
 import re
-import subprocess
+
+from .device_inventory import get_inventory
 
 
 def build_simctl_command(
@@ -125,7 +125,8 @@ def get_booted_device_udid() -> str | None:
     """
     Auto-detect currently booted simulator UDID.
 
-    Queries xcrun simctl for booted devices and returns first match.
+    Looks up booted devices in the shared device inventory and returns the
+    first one.
 
     Returns:
         UDID of booted simulator, or None if no simulator is booted.
@@ -138,24 +139,10 @@ def get_booted_device_udid() -> str | None:
             print("No simulator is currently booted")
     """
     try:
-        result = subprocess.run(
-            ["xcrun", "simctl", "list", "devices", "booted"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        # Parse output to find UDID
-        # Format: "  iPhone 16 Pro (ABC123-DEF456) (Booted)"
-        for line in result.stdout.split("\n"):
-            # Look for UUID pattern in parentheses
-            match = re.search(r"\(([A-F0-9\-]{36})\)", line)
-            if match:
-                return match.group(1)
-
-        return None
-    except subprocess.CalledProcessError:
+        booted = get_inventory().booted()
+    except RuntimeError:
         return None
+    return booted[0]["udid"] if booted else None
 
 
 def resolve_udid(udid_arg: str | None) -> str:
@@ -204,6 +191,7 @@ def get_device_screen_size(udid: str) -> tuple[int, int]:
 
     Queries IDB accessibility tree to determine actual device resolution.
     Falls back to iPhone 14 defaults (390x844) if detection fails.
+    Shares idb_utils.get_screen_size()'s per-device-type cache.
 
     Args:
         udid: Device UDID
@@ -215,26 +203,10 @@ def get_device_screen_size(udid: str) -> tuple[int, int]:
         width, height = get_device_screen_size("ABC123")
         print(f"Device screen: {width}x{height}")
     """
-    try:
-        cmd = build_idb_command("ui describe-all", udid, "--json")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    # Imported here: idb_utils builds its commands with this module
+    from .idb_utils import get_screen_size
 
-        # Parse JSON response
-        data = json.loads(result.stdout)
-        tree = data[0] if isinstance(data, list) and len(data) > 0 else data
-
-        # Get frame size from root element
-        if tree and "frame" in tree:
-            frame = tree["frame"]
-            width = int(frame.get("width", 390))
-            height = int(frame.get("height", 844))
-            return (width, height)
-
-        # Fallback
-        return (390, 844)
-    except Exception:
-        # Graceful fallback to iPhone 14 Pro defaults
-        return (390, 844)
+    return get_screen_size(udid)
 
 
 def resolve_device_identifier(identifier: str) -> str:
@@ -277,16 +249,14 @@ def resolve_device_identifier(identifier: str) -> str:
     if re.match(r"^[A-F0-9\-]{36}$", identifier, re.IGNORECASE):
         return identifier.upper()
 
-    # Try to match by device name
-    simulators = list_simulators(state=None)
-    exact_matches = [s for s in simulators if s["name"].lower() == identifier.lower()]
-    if exact_matches:
-        return exact_matches[0]["udid"]
-
-    # Try partial match
-    partial_matches = [s for s in simulators if identifier.lower() in s["name"].lower()]
-    if partial_matches:
-        return partial_matches[0]["udid"]
+    # Try a known UDID in any format, then device name, then partial match
+    inventory = get_inventory()
+    device = inventory.get(identifier)
+    if device:
+        return device["udid"]
+    matches = inventory.by_name(identifier) or inventory.by_name(identifier, partial=True)
+    if matches:
+        return matches[0]["udid"]
 
     # No match found
     raise RuntimeError(
@@ -295,23 +265,30 @@ def resolve_device_identifier(identifier: str) -> str:
     )
 
 
-def list_simulators(state: str | None = None) -> list[dict]:
+def list_simulators(state: str | None = None, refresh: bool = False) -> list[dict]:
     """
     List iOS simulators with optional state filtering.
 
-    Queries xcrun simctl and returns structured list of simulators.
+    Reads the shared device inventory (one cached `simctl list devices -j`)
+    and returns structured list of simulators.
     Optionally filters by state (available, booted, all).
 
     Args:
         state: Optional filter - "available", "booted", or None for all
+        refresh: Query simctl even if the cached listing is still fresh
+            (for loops polling for a state change)
 
     Returns:
         List of simulator dicts with keys:
         - "name": Device name (e.g., "iPhone 16 Pro")
         - "udid": Device UDID (36 char UUID)
         - "state": Device state ("Booted", "Shutdown", "Unavailable")
-        - "runtime": iOS version (e.g., "iOS 18.0", "unavailable")
-        - "type": Device type ("iPhone", "iPad", "Apple Watch", etc.)
+        - "runtime": Runtime key (e.g., "com.apple.CoreSimulator.SimRuntime.iOS-18-0")
+        - "runtime_name": Readable runtime (e.g., "iOS 18.0")
+        - "type": Device type ("iPhone", "iPad", "Watch", etc.)
+
+    Raises:
+        RuntimeError: If simctl fails
 
     Example:
         # List all simulators
@@ -328,66 +305,12 @@ def list_simulators(state: str | None = None) -> list[dict]:
         for sim in booted:
             print(f"Booted: {sim['name']}")
     """
-    try:
-        # Query simctl for device list
-        cmd = ["xcrun", "simctl", "list", "devices", "-j"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-        data = json.loads(result.stdout)
-        simulators = []
-
-        # Parse JSON response
-        # Format: {"devices": {"iOS 18.0": [{...}, {...}], "iOS 17.0": [...], ...}}
-        for ios_version, devices in data.get("devices", {}).items():
-            for device in devices:
-                sim = {
-                    "name": device.get("name", "Unknown"),
-                    "udid": device.get("udid", ""),
-                    "state": device.get("state", "Unknown"),
-                    "runtime": ios_version,
-                    "type": _extract_device_type(device.get("name", "")),
-                }
-                simulators.append(sim)
-
-        # Apply state filtering
-        if state == "booted":
-            return [s for s in simulators if s["state"] == "Booted"]
-        if state == "available":
-            return [s for s in simulators if s["state"] == "Shutdown"]  # Available to boot
-        if state is None:
-            return simulators
-        return [s for s in simulators if s["state"].lower() == state.lower()]
-
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
-        raise RuntimeError(f"Failed to list simulators: {e}") from e
-
-
-def _extract_device_type(device_name: str) -> str:
-    """
-    Extract device type from device name.
-
-    Parses device name to determine type (iPhone, iPad, Watch, etc.).
-
-    Args:
-        device_name: Full device name (e.g., "iPhone 16 Pro")
-
-    Returns:
-        Device type string
-
-    Example:
-        _extract_device_type("iPhone 16 Pro")  # Returns "iPhone"
-        _extract_device_type("iPad Air")        # Returns "iPad"
-        _extract_device_type("Apple Watch Series 9") # Returns "Watch"
-    """
-    if "iPhone" in device_name:
-        return "iPhone"
-    if "iPad" in device_name:
-        return "iPad"
-    if "Watch" in device_name or "Apple Watch" in device_name:
-        return "Watch"
-    if "TV" in device_name or "Apple TV" in device_name:
-        return "TV"
-    return "Unknown"
+    inventory = get_inventory()
+    if state is None:
+        return inventory.devices(refresh)
+    if state == "available":
+        return inventory.by_state("Shutdown", refresh)  # Available to boot
+    return inventory.by_state(state, refresh)
 
 
 def transform_screenshot_coords(
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Indexed element queries over one accessibility tree snapshot.
+
+Built once per tree (a few ms for thousands of elements), then every lookup
+is answered from indexes instead of scanning the whole tree:
+
+- Hash indexes on element type and AXUniqueId
+- Exact-text index and a token inverted index over AXLabel/AXValue for
+  fuzzy (case-insensitive substring) search
+- Spatial grid for "element at point" and "nearest to point" queries
+- A small selector syntax compiled against those indexes
+
+Used by:
+- navigator.py - find_element, selectors, point queries
+
+Selector syntax:
+    Button                        elements of a type (* = any type)
+    Button[id=loginButton]        AXUniqueId, exact
+    Button[text~=log in]          label or value contains text (case-insensitive)
+    Button[label="Log In"]        exact label ([value=...], [text=...] too)
+    Cell:nth(2)                   third match of this step (0-based)
+    NavigationBar Button          Button somewhere inside a NavigationBar
+
+Example:
+    index = ElementIndex(get_accessibility_tree(udid))
+    login = index.find(text="login", element_type="Button")
+    cells = index.select("Table Cell[text~=settings]")
+    hit = index.element_at(200, 400)
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+from .idb_utils import iter_tree
+
+GRID_CELL = 64  # Points per spatial grid cell
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+STEP_RE = re.compile(
+    r"""(?P<type>\*|[A-Za-z_][\w]*)?
+        (?P<attrs>(?:\[[^\]]*\])*)
+        (?::nth\((?P<nth>\d+)\))?$""",
+    re.VERBOSE,
+)
+ATTR_RE = re.compile(r"\[\s*(\w+)\s*(~=|=)\s*(?:\"([^\"]*)\"|'([^']*)'|([^\]]*?))\s*\]")
+SELECTOR_ATTRS = ("id", "label", "value", "text")
+ATTR_KEYS = {"id": "AXUniqueId", "label": "AXLabel", "value": "AXValue"}
+
+
+def _tokens(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class SelectorStep:
+    """One compound step of a compiled selector."""
+
+    element_type: str | None
+    attrs: list[tuple[str, str, str]]  # (attribute, operator, value)
+    nth: int | None = None
+
+
+def parse_selector(selector: str) -> list[SelectorStep]:
+    """
+    Compile a selector string into steps (outermost ancestor first).
+
+    Args:
+        selector: Selector such as 'NavigationBar Button[text~=back]'
+
+    Returns:
+        List of SelectorStep
+
+    Raises:
+        ValueError: If the selector is malformed or uses an unknown attribute
+    """
+    # Split on whitespace outside brackets and quotes
+    parts, current, depth, quote = [], "", 0, None
+    for ch in selector.strip():
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "\"'" and depth:
+            quote = ch
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+        elif ch.isspace() and depth == 0:
+            if current:
+                parts.append(current)
+            current = ""
+            continue
+        current += ch
+    if current:
+        parts.append(current)
+    if not parts:
+        raise ValueError("Empty selector")
+
+    steps = []
+    for part in parts:
+        match = STEP_RE.match(part)
+        if not match or not part:
+            raise ValueError(f"Invalid selector step: {part!r}")
+        attrs = []
+        for attr in ATTR_RE.finditer(match.group("attrs") or ""):
+            name, op = attr.group(1), attr.group(2)
+            if name not in SELECTOR_ATTRS:
+                raise ValueError(
+                    f"Unknown selector attribute {name!r} (use: {', '.join(SELECTOR_ATTRS)})"
+                )
+            value = next(g for g in attr.groups()[2:] if g is not None)
+            attrs.append((name, op, value))
+        if len(attrs) != (match.group("attrs") or "").count("["):
+            raise ValueError(f"Invalid attribute in selector step: {part!r}")
+        element_type = match.group("type")
+        steps.append(
+            SelectorStep(
+                element_type=None if element_type in (None, "*") else element_type,
+                attrs=attrs,
+                nth=int(match.group("nth")) if match.group("nth") is not None else None,
+            )
+        )
+    return steps
+
+
+class ElementIndex:
+    """
+    Query indexes for one accessibility tree snapshot.
+
+    Elements are identified by their position in document (pre-)order;
+    nodes[i] is the original tree node, not a copy.
+
+    Attributes:
+        tree: Root node the index was built from
+        nodes: Tree nodes in document order
+        parents: Parent position of each node (-1 for the root)
+        depths: Nesting depth of each node
+    """
+
+    def __init__(self, tree: dict):
+        self.tree = tree
+        self.nodes: list[dict] = []
+        self.parents: list[int] = []
+        self.depths: list[int] = []
+        self._texts: list[str] = []
+        self._frames: list[tuple[float, float, float, float]] = []
+        self._by_type: dict[str, list[int]] = {}
+        self._by_id: dict[str, list[int]] = {}
+        self._by_text: dict[str, list[int]] = {}
+        self._by_token: dict[str, list[int]] = {}
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        # Enabled elements bucketed by the cell of their center, per type
+        # ("" = any type), for nearest_to()
+        self._centers: dict[str, dict[tuple[int, int], list[int]]] = {}
+        self._substring_postings: dict[str, set[int]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        for view in iter_tree(self.tree):
+            node, pos = view.node, view.index
+            self.nodes.append(node)
+            self.parents.append(view.parent)
+            self.depths.append(view.depth)
+
+            node_type = node.get("type")
+            if node_type:
+                self._by_type.setdefault(node_type, []).append(pos)
+            if node.get("AXUniqueId"):
+                self._by_id.setdefault(node["AXUniqueId"], []).append(pos)
+
+            label, value = node.get("AXLabel"), node.get("AXValue")
+            for text in {label, value} - {None, ""}:
+                self._by_text.setdefault(text, []).append(pos)
+            combined = f"{label or ''} {value or ''}".lower()
+            self._texts.append(combined)
+            for token in set(_tokens(combined)):
+                self._by_token.setdefault(token, []).append(pos)
+
+            frame = node.get("frame") or {}
+            x, y = float(frame.get("x", 0)), float(frame.get("y", 0))
+            w, h = float(frame.get("width", 0)), float(frame.get("height", 0))
+            self._frames.append((x, y, w, h))
+            if w > 0 and h > 0:
+                for gx in range(int(x // GRID_CELL), int((x + w) // GRID_CELL) + 1):
+                    for gy in range(int(y // GRID_CELL), int((y + h) // GRID_CELL) + 1):
+                        self._grid.setdefault((gx, gy), []).append(pos)
+                if node_type and node.get("enabled", True):
+                    cell = (int((x + w / 2) // GRID_CELL), int((y + h / 2) // GRID_CELL))
+                    for key in ("", node_type):
+                        self._centers.setdefault(key, {}).setdefault(cell, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _text_candidates(self, text: str) -> set[int] | None:
+        """Positions whose tokens can contain every query token (None = no constraint)."""
+        candidates = None
+        for query_token in set(_tokens(text)):
+            matched = self._substring_postings.get(query_token)
+            if matched is None:
+                # Substring semantics: "log" must also find "login". The
+                # vocabulary is far smaller than the element list.
+                matched = set()
+                for token, postings in self._by_token.items():
+                    if query_token in token:
+                        matched.update(postings)
+                self._substring_postings[query_token] = matched
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return set()
+        return candidates
+
+    def _exact_texts(self, pos: int) -> tuple[str | None, str | None]:
+        return (self.nodes[pos].get("AXLabel"), self.nodes[pos].get("AXValue"))
+
+    def _is_enabled(self, pos: int) -> bool:
+        return bool(self.nodes[pos].get("enabled", True))
+
+    def find(
+        self,
+        text: str | None = None,
+        element_type: str | None = None,
+        identifier: str | None = None,
+        fuzzy: bool = True,
+        enabled_only: bool = True,
+    ) -> list[int]:
+        """
+        Positions matching all given criteria, in document order.
+
+        Args:
+            text: Text in label/value (substring, case-insensitive if fuzzy;
+                otherwise exact label or value)
+            element_type: Exact element type
+            identifier: Exact AXUniqueId
+            fuzzy: Substring vs exact text match
+            enabled_only: Skip disabled elements (default True)
+
+        Returns:
+            Sorted list of positions into self.nodes (typed elements only)
+        """
+        sets: list[set[int]] = []
+        if element_type:
+            sets.append(set(self._by_type.get(element_type, ())))
+        if identifier:
+            sets.append(set(self._by_id.get(identifier, ())))
+        if text and not fuzzy:
+            sets.append(set(self._by_text.get(text, ())))
+
+        candidates: set[int] | None = None
+        for s in sorted(sets, key=len):
+            candidates = s if candidates is None else candidates & s
+        if text and fuzzy:
+            narrowed = self._text_candidates(text)
+            if narrowed is not None:
+                candidates = narrowed if candidates is None else candidates & narrowed
+            needle = text.lower()
+            pool = candidates if candidates is not None else range(len(self.nodes))
+            candidates = {pos for pos in pool if needle in self._texts[pos]}
+        if candidates is None:
+            candidates = {pos for positions in self._by_type.values() for pos in positions}
+
+        return sorted(
+            pos
+            for pos in candidates
+            if self.nodes[pos].get("type") and (not enabled_only or self._is_enabled(pos))
+        )
+
+    def _step_matches(self, step: SelectorStep, enabled_only: bool) -> list[int]:
+        """Positions matching one step: narrowed by the indexes, then verified."""
+        identifier = next((v for n, op, v in step.attrs if n == "id" and op == "="), None)
+        text, fuzzy = next(
+            ((v, op == "~=") for n, op, v in step.attrs if n == "text"), (None, True)
+        )
+        matches = self.find(text, step.element_type, identifier, fuzzy, enabled_only)
+        if step.attrs:
+            matches = [p for p in matches if self._accepts(p, step, enabled_only)]
+        if step.nth is not None:
+            return matches[step.nth : step.nth + 1]
+        return matches
+
+    def _accepts(self, pos: int, step: SelectorStep, enabled_only: bool) -> bool:
+        """Whether one element satisfies a step (ignoring :nth)."""
+        node = self.nodes[pos]
+        if not node.get("type") or (enabled_only and not self._is_enabled(pos)):
+            return False
+        if step.element_type and node.get("type") != step.element_type:
+            return False
+        for name, op, value in step.attrs:
+            if name == "text" and op == "~=":
+                ok = value.lower() in self._texts[pos]
+            elif name == "text":
+                ok = value in self._exact_texts(pos)
+            else:
+                actual = node.get(ATTR_KEYS[name])
+                ok = actual == value if op == "=" else value.lower() in (actual or "").lower()
+            if not ok:
+                return False
+        return True
+
+    def select(self, selector: str, enabled_only: bool = True) -> list[int]:
+        """
+        Positions matching a selector, in document order.
+
+        Ancestor steps are matched right to left: each candidate for the last
+        step walks up its parent chain looking for the earlier steps in turn.
+
+        Args:
+            selector: Selector string (see module docstring)
+            enabled_only: Skip disabled elements in every step (default True)
+
+        Returns:
+            Sorted list of positions into self.nodes
+
+        Raises:
+            ValueError: If the selector is malformed
+        """
+        steps = parse_selector(selector)
+        # Ancestor steps are tested per node; only :nth steps need their
+        # full match list, since position depends on every other match
+        nth_sets = {
+            i: set(self._step_matches(step, enabled_only))
+            for i, step in enumerate(steps[:-1])
+            if step.nth is not None
+        }
+        results = []
+        for pos in self._step_matches(steps[-1], enabled_only):
+            remaining = len(steps) - 2
+            ancestor = self.parents[pos]
+            while remaining >= 0 and ancestor >= 0:
+                if remaining in nth_sets:
+                    matched = ancestor in nth_sets[remaining]
+                else:
+                    matched = self._accepts(ancestor, steps[remaining], enabled_only)
+                if matched:
+                    remaining -= 1
+                ancestor = self.parents[ancestor]
+            if remaining < 0:
+                results.append(pos)
+        return results
+
+    def _contains(self, pos: int, x: float, y: float) -> bool:
+        fx, fy, fw, fh = self._frames[pos]
+        return fx <= x <= fx + fw and fy <= y <= fy + fh
+
+    def element_at(self, x: float, y: float, element_type: str | None = None) -> int | None:
+        """
+        Innermost element whose frame contains a point.
+
+        Args:
+            x, y: Point in device coordinates
+            element_type: Only consider elements of this type
+
+        Returns:
+            Position of the deepest containing element (smallest area on
+            ties), or None
+        """
+        cell = self._grid.get((int(x // GRID_CELL), int(y // GRID_CELL)), ())
+        best = None
+        for pos in cell:
+            if element_type and self.nodes[pos].get("type") != element_type:
+                continue
+            if not self._contains(pos, x, y):
+                continue
+            area = self._frames[pos][2] * self._frames[pos][3]
+            rank = (self.depths[pos], -area)
+            if best is None or rank > best[0]:
+                best = (rank, pos)
+        return best[1] if best else None
+
+    def nearest_to(
+        self,
+        x: float,
+        y: float,
+        element_type: str | None = None,
+        enabled_only: bool = True,
+    ) -> int | None:
+        """
+        Element whose center is closest to a point.
+
+        Searches center-grid rings outward from the point's cell and stops
+        once no unvisited ring can hold anything closer than the best match.
+
+        Args:
+            x, y: Point in device coordinates
+            element_type: Only consider elements of this type
+            enabled_only: Only enabled elements are indexed; passing False
+                falls back to a scan that includes disabled ones
+
+        Returns:
+            Position of the nearest element, or None if none qualifies
+        """
+        if not enabled_only:
+            candidates = self.find(element_type=element_type, enabled_only=False)
+            return min(candidates, key=lambda p: self._center_distance(p, x, y), default=None)
+
+        grid = self._centers.get(element_type or "")
+        if not grid:
+            return None
+        cx, cy = int(x // GRID_CELL), int(y // GRID_CELL)
+        max_ring = max(max(abs(gx - cx), abs(gy - cy)) for gx, gy in grid)
+        best: tuple[float, int] | None = None
+        for ring in range(max_ring + 1):
+            # Centers in this ring or beyond are at least (ring - 1) cells away
+            if best is not None and best[0] < (ring - 1) * GRID_CELL:
+                break
+            for gx in range(cx - ring, cx + ring + 1):
+                step = 1 if abs(gx - cx) == ring else 2 * ring
+                for gy in range(cy - ring, cy + ring + 1, max(step, 1)):
+                    for pos in grid.get((gx, gy), ()):
+                        distance = self._center_distance(pos, x, y)
+                        if best is None or distance < best[0]:
+                            best = (distance, pos)
+        return best[1] if best else None
+
+    def _center_distance(self, pos: int, x: float, y: float) -> float:
+        fx, fy, fw, fh = self._frames[pos]
+        return math.hypot(fx + fw / 2 - x, fy + fh / 2 - y)
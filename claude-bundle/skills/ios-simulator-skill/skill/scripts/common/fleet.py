@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency operations across a fleet of simulators.
+
+Batch boot, erase, shutdown and delete used to handle devices strictly one
+after another, each waiting out its own readiness or verification polling,
+so resetting 20 simulators took the sum of 20 resets. run_fleet() runs the
+per-device operation for up to `concurrency` devices at once. simctl does
+the work in its own process, so a thread per in-flight device only waits.
+Readiness and verification polling overlap across devices as well.
+
+Every device gets a result with its own timing. A device that exceeds the
+per-device timeout is reported as failed and no longer waited for. Its
+simctl call keeps running in the background (holding its worker slot),
+bounded by that call's own timeout, because interrupting an erase or
+delete halfway is worse than letting it finish.
+
+Used by:
+- simctl_boot.py - --all, --type
+- simctl_erase.py - --all, --type, --booted
+- simctl_shutdown.py - --all, --type
+- simctl_delete.py - --all, --type, --old
+
+Example:
+    report = run_fleet(
+        "erase_all",
+        lambda udid: SimulatorEraser(udid).erase(verify=True),
+        [sim["udid"] for sim in list_simulators()],
+        concurrency=8,
+    )
+    print(report.summary("Erase"))
+
+Offline check (fake simctl with a fixed delay per call):
+    python -m common.benchmarks fleet --devices 20
+"""
+
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+DEFAULT_CONCURRENCY = 4  # Devices operated on at once (each booted simulator is heavy)
+POLL_INTERVAL = 0.25  # Seconds between per-device timeout checks
+
+
+@dataclass
+class DeviceResult:
+    """Outcome of one device's operation."""
+
+    udid: str
+    success: bool
+    message: str
+    seconds: float
+
+    def to_dict(self) -> dict:
+        return {
+            "udid": self.udid,
+            "success": self.success,
+            "message": self.message,
+            "seconds": round(self.seconds, 2),
+        }
+
+
+@dataclass
+class FleetReport:
+    """Aggregated results of one fleet operation."""
+
+    action: str
+    concurrency: int
+    seconds: float = 0.0
+    results: list[DeviceResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    def summary(self, label: str) -> str:
+        """
+        Human-readable summary: one count line, then one line per failure.
+
+        Args:
+            label: Summary prefix (e.g., "Erase", "Boot iPhone")
+        """
+        device_seconds = sum(r.seconds for r in self.results)
+        lines = [
+            f"{label} summary: {self.succeeded}/{self.total} succeeded, {self.failed} failed "
+            f"[{self.seconds:.1f}s wall, {device_seconds:.1f}s device time, "
+            f"concurrency {self.concurrency}]"
+        ]
+        lines.extend(f"  {r.udid}: {r.message}" for r in self.results if not r.success)
+        return "\n".join(lines)
+
+    def to_dict(self, **extra) -> dict:
+        """JSON output (succeeded/failed/total as before, plus timing and per-device results)."""
+        return {
+            "action": self.action,
+            **extra,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "total": self.total,
+            "seconds": round(self.seconds, 2),
+            "concurrency": self.concurrency,
+            "devices": [r.to_dict() for r in self.results],
+        }
+
+
+def progress_printer(total: int) -> Callable[[DeviceResult], None]:
+    """on_result callback printing "[done/total] udid: ok/FAILED (seconds)" to stderr."""
+    done = [0]
+
+    def report(result: DeviceResult) -> None:
+        done[0] += 1
+        mark = "ok" if result.success else "FAILED"
+        print(
+            f"[{done[0]}/{total}] {result.udid}: {mark} ({result.seconds:.1f}s)",
+            file=sys.stderr,
+        )
+
+    return report
+
+
+def run_fleet(
+    action: str,
+    operation: Callable[[str], tuple[bool, str]],
+    udids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    device_timeout: float | None = None,
+    on_result: Callable[[DeviceResult], None] | None = None,
+) -> FleetReport:
+    """
+    Run a per-device operation across devices with bounded concurrency.
+
+    Args:
+        action: Name reported in the results (e.g., "erase_all")
+        operation: Called with a UDID; returns (success, message) like the
+            single-device methods (SimulatorBooter.boot(), ...)
+        udids: Devices to operate on
+        concurrency: Maximum devices in flight (1 = one at a time)
+        device_timeout: Seconds a device may take, from the moment its
+            operation starts (None = no limit beyond the operation's own)
+        on_result: Called with each result as it completes (progress output)
+
+    Returns:
+        FleetReport with results in input order
+    """
+    udids = list(dict.fromkeys(udids))
+    concurrency = max(1, min(concurrency, len(udids) or 1))
+    report = FleetReport(action=action, concurrency=concurrency)
+    results: dict[str, DeviceResult] = {}
+    started_at: dict[str, float] = {}
+
+    def record(result: DeviceResult) -> None:
+        results[result.udid] = result
+        if on_result:
+            on_result(result)
+
+    def run_one(udid: str) -> DeviceResult:
+        started_at[udid] = time.monotonic()
+        try:
+            success, message = operation(udid)
+        except Exception as e:
+            success, message = False, f"Error: {e}"
+        return DeviceResult(udid, success, message, time.monotonic() - started_at[udid])
+
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet")
+    try:
+        pending: dict[Future, str] = {pool.submit(run_one, udid): udid for udid in udids}
+        while pending:
+            timeout = POLL_INTERVAL if device_timeout is not None else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future.result())
+                del pending[future]
+            if device_timeout is None:
+                continue
+            now = time.monotonic()
+            for future, udid in list(pending.items()):
+                if udid in started_at and now - started_at[udid] >= device_timeout:
+                    del pending[future]
+                    record(
+                        DeviceResult(
+                            udid,
+                            False,
+                            f"Timed out after {device_timeout:g}s (still running in background)",
+                            now - started_at[udid],
+                        )
+                    )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    report.seconds = time.monotonic() - started
+    report.results = [results[udid] for udid in udids if udid in results]
+    return report
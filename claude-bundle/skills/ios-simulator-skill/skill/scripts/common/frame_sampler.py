@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Background frame sampling with change detection.
+
+Explicit captures only see the screen at the moment they are taken, so
+spinners, toasts and error banners that come and go between two steps are
+missed. FrameSampler captures the simulator screen at a fixed rate in a
+worker thread and keeps only frames that differ from the previous kept
+frame (perceptual hash distance above a threshold). Kept frames live in a
+bounded ring buffer with timestamps and can be queried afterwards by time
+range, by the frame on screen at a given moment, or by change size.
+
+Frames are downscaled (default: quarter size) and encoded (default: JPEG)
+before buffering, so a full buffer of 120 frames stays around a few MB.
+
+Requires Pillow.
+
+Used by:
+- test_recorder.py - Transient screens between steps (--sample-fps)
+
+Usage:
+    python -m common.frame_sampler --udid <UDID> --duration 10 --fps 4 --output frames/
+"""
+
+import argparse
+import io
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from .screenshot_index import DUPLICATE_DISTANCE, hamming_distance, image_hash
+from .screenshot_utils import (
+    HAS_PIL,
+    IMAGE_FORMATS,
+    downscale_image,
+    encode_image,
+    get_size_preset,
+    read_simulator_screenshot,
+)
+
+if HAS_PIL:
+    from PIL import Image
+
+DEFAULT_FPS = 2.0
+DEFAULT_CAPACITY = 120  # Frames kept; oldest dropped first
+
+
+@dataclass
+class Frame:
+    """A sampled frame that differs from the frame kept before it."""
+
+    timestamp: float  # time.time() of the capture
+    data: bytes  # Encoded image (sampler's size preset and format)
+    key: int  # image_hash() of the downscaled frame
+    distance: int  # Hash bits changed since the previous kept frame (128 for the first)
+    width: int
+    height: int
+
+
+class FrameSampler:
+    """
+    Samples a simulator's screen in a background thread.
+
+    Example:
+        with FrameSampler(udid, fps=4) as sampler:
+            tap_login()
+            time.sleep(2)
+        for frame in sampler.frames():
+            print(frame.timestamp, frame.distance)
+        sampler.save("frames/")
+    """
+
+    def __init__(
+        self,
+        udid: str | None = None,
+        *,
+        fps: float = DEFAULT_FPS,
+        capacity: int = DEFAULT_CAPACITY,
+        size: str = "quarter",
+        image_format: str = "jpeg",
+        quality: int = 70,
+        threshold: int = DUPLICATE_DISTANCE,
+    ):
+        """
+        Configure a sampler (call start() to begin sampling).
+
+        Args:
+            udid: Device UDID (None = booted device)
+            fps: Target samples per second; slower captures simply run
+                back-to-back
+            capacity: Maximum frames kept in the ring buffer
+            size: Size preset of kept frames ('full', 'half', 'quarter', 'thumb')
+            image_format: Encoding of kept frames ('png', 'jpeg', 'webp')
+            quality: JPEG/WebP quality
+            threshold: A frame is kept when more than this many hash bits
+                (of 128) differ from the previous kept frame
+
+        Raises:
+            ValueError: If fps is not positive or image_format is unknown
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format '{image_format}'")
+        self.udid = udid
+        self.interval = 1.0 / fps
+        self.size = size
+        self.image_format = image_format
+        self.quality = quality
+        self.threshold = threshold
+        self.started_at: float | None = None
+        self.sampled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: str | None = None
+        self._frames: deque[Frame] = deque(maxlen=capacity)
+        self._last_key: int | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "FrameSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "FrameSampler":
+        """
+        Start sampling in a daemon thread (no-op if already running).
+
+        Raises:
+            RuntimeError: If Pillow is not installed
+        """
+        if not HAS_PIL:
+            raise RuntimeError("Frame sampling requires Pillow. Install with: pip3 install pillow")
+        if self.running:
+            return self
+        self._stop.clear()
+        if self.started_at is None:
+            self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="frame-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the in-flight capture to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            self.sample()
+            next_time = max(next_time + self.interval, time.monotonic())
+            self._stop.wait(next_time - time.monotonic())
+
+    def sample(self) -> Frame | None:
+        """
+        Capture one frame now (the worker thread calls this at the sampling rate).
+
+        Returns:
+            The frame if it was kept, None if unchanged or the capture failed
+        """
+        timestamp = time.time()
+        try:
+            raw = read_simulator_screenshot(self.udid)
+            img = Image.open(io.BytesIO(raw))
+            scale_x, scale_y = get_size_preset(self.size) if self.size != "full" else (1.0, 1.0)
+            small = downscale_image(img, (int(img.width * scale_x), int(img.height * scale_y)))
+            key = image_hash(small)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self.last_error = str(e)
+            return None
+
+        with self._lock:
+            self.sampled += 1
+            distance = 128 if self._last_key is None else hamming_distance(key, self._last_key)
+            if distance <= self.threshold:
+                return None
+            self._last_key = key
+
+        # Only changed frames pay for encoding
+        frame = Frame(
+            timestamp=timestamp,
+            data=encode_image(small, self.image_format, self.quality),
+            key=key,
+            distance=distance,
+            width=small.width,
+            height=small.height,
+        )
+        with self._lock:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+        return frame
+
+    def frames(self, since: float | None = None, until: float | None = None) -> list[Frame]:
+        """Kept frames captured in [since, until] (time.time() values), oldest first."""
+        with self._lock:
+            frames = list(self._frames)
+        return [
+            f
+            for f in frames
+            if (since is None or f.timestamp >= since) and (until is None or f.timestamp <= until)
+        ]
+
+    def frame_at(self, timestamp: float) -> Frame | None:
+        """The frame on screen at a moment: the last kept frame captured at or before it."""
+        with self._lock:
+            frames = list(self._frames)
+        position = bisect_right([f.timestamp for f in frames], timestamp)
+        return frames[position - 1] if position else None
+
+    def changes(self, min_distance: int = 16, since: float | None = None) -> list[Frame]:
+        """
+        Frames where the screen changed substantially (new screen, toast, alert).
+
+        Args:
+            min_distance: Minimum hash bits changed (default 16; small
+                animations and spinners change fewer)
+            since: Only frames captured at or after this time.time()
+        """
+        return [f for f in self.frames(since=since) if f.distance >= min_distance]
+
+    def save(
+        self,
+        directory: str | Path,
+        frames: list[Frame] | None = None,
+        prefix: str = "frame",
+    ) -> list[str]:
+        """
+        Write frames to disk, named by their offset from the start of sampling.
+
+        Args:
+            directory: Output directory (created if needed)
+            frames: Frames to write (default: all kept frames)
+            prefix: File name prefix
+
+        Returns:
+            Paths of the written files
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        extension = IMAGE_FORMATS[self.image_format][2]
+        origin = self.started_at or 0.0
+        paths = []
+        for frame in self.frames() if frames is None else frames:
+            path = directory / f"{prefix}-{frame.timestamp - origin:08.2f}s.{extension}"
+            path.write_bytes(frame.data)
+            paths.append(str(path))
+        return paths
+
+    def stats(self) -> dict:
+        """Sampling counters: frames sampled, kept, dropped, capture errors."""
+        with self._lock:
+            kept = len(self._frames)
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return {
+            "sampled": self.sampled,
+            "kept": kept,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "fps": round(self.sampled / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample simulator frames, keeping only changes")
+    parser.add_argument("--udid", help="Device UDID (auto-detects booted simulator)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to sample")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="Samples per second")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Frames kept")
+    parser.add_argument("--size", choices=["full", "half", "quarter", "thumb"], default="quarter")
+    parser.add_argument("--format", choices=["png", "jpeg", "webp"], default="jpeg")
+    parser.add_argument("--output", default="frames", help="Directory for kept frames")
+    args = parser.parse_args()
+
+    from .device_utils import resolve_udid
+
+    sampler = FrameSampler(
+        resolve_udid(args.udid),
+        fps=args.fps,
+        capacity=args.capacity,
+        size=args.size,
+        image_format=args.format,
+    )
+    with sampler:
+        time.sleep(args.duration)
+    sampler.save(args.output)
+    stats = sampler.stats()
+    print(
+        f"Frames: {stats['kept']} changed of {stats['sampled']} sampled "
+        f"({stats['fps']} fps, {stats['errors']} errors) -> {args.output}/"
+    )
+    if sampler.last_error:
+        print(f"Last capture error: {sampler.last_error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,116 @@ Used by:
 - test_recorder.py - Test documentation
 - app_state_capture.py - State snapshots
 - gesture.py - Touch gesture operations
+
+Tree cache:
+    Trees are cached per device for IOS_SKILL_TREE_TTL seconds (default 2).
+    Any mutating command sent through the shared executor (tap, text, swipe,
+    launch, ...) invalidates that device's cached tree, so repeated queries
+    on an unchanged screen cost nothing while queries after an interaction
+    always see the new screen. Screen size never changes for a device type
+    and is cached on disk in ~/.ios-simulator-skill/screen-sizes.json.
 """
 
 import json
+import os
 import subprocess
 import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from .command_executor import get_executor, run_command
+from .device_inventory import get_inventory
+from .device_utils import build_idb_command, get_booted_device_udid
+
+SCREEN_SIZE_CACHE_PATH = Path("~/.ios-simulator-skill/screen-sizes.json").expanduser()
 
+# (device UDID, or "booted" if none is known; nested) -> (fetched_at, executor generation, tree)
+_tree_cache: dict[tuple[str, bool], tuple[float, int, dict]] = {}
+_screen_sizes: dict[str, tuple[int, int]] = {}
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0, "screen_size_hits": 0}
 
-def get_accessibility_tree(udid: str | None = None, nested: bool = True) -> dict:
+
+def get_tree_cache_ttl() -> float:
     """
-    Fetch accessibility tree from IDB.
+    Tree cache lifetime from IOS_SKILL_TREE_TTL (seconds, default 2).
+
+    The TTL only guards against changes the skill didn't cause (animations,
+    network loads); interactions invalidate immediately. 0 disables caching.
+    """
+    try:
+        return max(0.0, float(os.environ.get("IOS_SKILL_TREE_TTL", "2")))
+    except ValueError:
+        return 2.0
+
+
+def _device_key(udid: str | None) -> str:
+    """Cache key for a device: the booted simulator's UDID when udid is None."""
+    return udid or get_booted_device_udid() or "booted"
+
+
+def invalidate_tree_cache(udid: str | None = None) -> None:
+    """
+    Drop cached trees for a device (or all devices when udid is None).
+
+    Call this after changing the screen through something other than the
+    shared executor (e.g. a raw subprocess call).
+
+    Args:
+        udid: Device UDID, or None for every device
+    """
+    keys = [k for k in _tree_cache if udid is None or k[0] in (udid, "booted")]
+    for key in keys:
+        del _tree_cache[key]
+    _cache_stats["invalidations"] += len(keys)
+
+
+def get_tree_cache_stats() -> dict:
+    """
+    Tree cache hit/miss counters for this process.
+
+    Returns:
+        Dict with hits, misses, invalidations, screen_size_hits, hit_rate
+        and the number of cached trees
+    """
+    lookups = _cache_stats["hits"] + _cache_stats["misses"]
+    return {
+        **_cache_stats,
+        "hit_rate": round(_cache_stats["hits"] / lookups, 3) if lookups else 0.0,
+        "cached_trees": len(_tree_cache),
+    }
+
+
+def _cached_tree(key: str, nested: bool, max_age: float) -> dict | None:
+    entry = _tree_cache.get((key, nested))
+    if entry is None:
+        return None
+    fetched_at, generation, tree = entry
+    if generation != get_executor().generation(key) or time.monotonic() - fetched_at > max_age:
+        del _tree_cache[(key, nested)]
+        _cache_stats["invalidations"] += 1
+        return None
+    return tree
+
+
+def get_accessibility_tree(
+    udid: str | None = None, nested: bool = True, max_age: float | None = None
+) -> dict:
+    """
+    Fetch accessibility tree from IDB (cached per device).
 
     The accessibility tree represents the complete UI hierarchy of the current
     screen, with all element properties needed for semantic navigation.
 
+    A cached tree is returned while it is younger than max_age and no
+    mutating command has been sent to the device since it was fetched.
+    Treat the returned tree as read-only; it is shared between callers.
+
     Args:
         udid: Device UDID (uses booted simulator if None)
         nested: Include nested structure (default True). If False, returns flat array.
+        max_age: Maximum cache age in seconds (None = IOS_SKILL_TREE_TTL,
+            0 = always fetch)
 
     Returns:
         Root element of accessibility tree as dict.
@@ -45,21 +138,11 @@ def get_accessibility_tree(udid: str | None = None, nested: bool = True) -> dict
     Example:
         tree = get_accessibility_tree("UDID123")
         # Root is Window element with all children nested
-    """
-    cmd = ["idb", "ui", "describe-all", "--json"]
-    if nested:
-        cmd.append("--nested")
-    if udid:
-        cmd.extend(["--udid", udid])
 
+        tree = get_accessibility_tree("UDID123", max_age=0)  # Force refresh
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        tree_data = json.loads(result.stdout)
-
-        # IDB returns array format, extract first element (root)
-        if isinstance(tree_data, list) and len(tree_data) > 0:
-            return tree_data[0]
-        return tree_data
+        return _fetch_tree(udid, nested, max_age)
     except subprocess.CalledProcessError as e:
         print(f"Error: Failed to get accessibility tree: {e.stderr}", file=sys.stderr)
         sys.exit(1)
@@ -68,12 +151,130 @@ def get_accessibility_tree(udid: str | None = None, nested: bool = True) -> dict
         sys.exit(1)
 
 
+def _fetch_tree(udid: str | None, nested: bool, max_age: float | None) -> dict:
+    """get_accessibility_tree without the exit: idb and JSON errors propagate."""
+    key = _device_key(udid)
+    max_age = get_tree_cache_ttl() if max_age is None else max_age
+    if max_age > 0:
+        cached = _cached_tree(key, nested, max_age)
+        if cached is not None:
+            _cache_stats["hits"] += 1
+            return cached
+    _cache_stats["misses"] += 1
+
+    # Generation before the fetch: a mutation racing with it invalidates the entry
+    generation = get_executor().generation(key)
+    args = ["--json", "--nested"] if nested else ["--json"]
+    cmd = build_idb_command("ui describe-all", udid, *args)
+    result = run_command(cmd, udid=udid, check=True)
+    tree_data = json.loads(result.stdout)
+
+    # IDB returns array format, extract first element (root)
+    if isinstance(tree_data, list) and len(tree_data) > 0:
+        tree_data = tree_data[0]
+    _tree_cache[(key, nested)] = (time.monotonic(), generation, tree_data)
+    return tree_data
+
+
+class ElementView:
+    """
+    Lightweight view of one tree node during traversal.
+
+    Holds a reference to the original node (never a copy) plus its position.
+    Reads like the flatten_tree() dicts: view.get("type"), view["AXLabel"]
+    and view.get("depth") all work, so rule lambdas written against dicts
+    work on views too.
+
+    Attributes:
+        node: Original tree node (children included; treat as read-only)
+        depth: Nesting level (root = starting depth)
+        parent: Traversal index of the parent view (-1 for the root)
+        index: Traversal (pre-order) index of this view
+    """
+
+    __slots__ = ("depth", "index", "node", "parent")
+
+    def __init__(self, node: dict, depth: int, parent: int, index: int):
+        self.node = node
+        self.depth = depth
+        self.parent = parent
+        self.index = index
+
+    def get(self, key: str, default=None):
+        if key == "depth":
+            return self.depth
+        return self.node.get(key, default)
+
+    def __getitem__(self, key: str):
+        if key == "depth":
+            return self.depth
+        return self.node[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key == "depth" or key in self.node
+
+    def to_dict(self) -> dict:
+        """Detached, JSON-serializable copy without children."""
+        data = {k: v for k, v in self.node.items() if k != "children"}
+        data["depth"] = self.depth
+        return data
+
+    def __repr__(self) -> str:
+        return f"ElementView({self.node.get('type')!r}, depth={self.depth}, index={self.index})"
+
+
+def iter_tree(node: dict, depth: int = 0) -> Iterator[ElementView]:
+    """
+    Walk an accessibility tree in document (pre-)order without recursion.
+
+    Uses an explicit stack of child iterators, so arbitrarily deep SwiftUI
+    hierarchies can't hit RecursionError, and yields one ElementView per
+    node instead of copying it. Memory is O(depth) while iterating.
+
+    Used by:
+    - flatten_tree() - dict copies
+    - screen_mapper.py - single-pass screen analysis
+    - accessibility_audit.py - audit scanning
+    - element_index.py - index construction
+
+    Args:
+        node: Root node of tree (typically from get_accessibility_tree)
+        depth: Depth assigned to the root (default 0)
+
+    Yields:
+        ElementView for every node, parents before children
+
+    Example:
+        for view in iter_tree(get_accessibility_tree()):
+            if view.get("type") == "Button":
+                print(view.depth, view.get("AXLabel"))
+    """
+    view = ElementView
+    yield view(node, depth, -1, 0)
+    index = 0
+    stack = [(iter(node.get("children") or ()), depth + 1, 0)]
+    while stack:
+        children, child_depth, parent = stack[-1]
+        # Stay on this sibling list until a child has children of its own
+        for child in children:
+            index += 1
+            yield view(child, child_depth, parent, index)
+            grandchildren = child.get("children")
+            if grandchildren:
+                stack.append((iter(grandchildren), child_depth + 1, index))
+                break
+        else:
+            stack.pop()
+
+
 def flatten_tree(node: dict, depth: int = 0, elements: list[dict] | None = None) -> list[dict]:
     """
     Flatten nested accessibility tree into list of elements.
 
     Converts the hierarchical accessibility tree into a flat list where each
-    element includes its depth for context.
+    element includes its depth for context. Elements are shallow copies of
+    the nodes, safe to modify or serialize; prefer iter_tree() when the
+    copies aren't needed. Iterative, so deep trees can't hit RecursionError.
 
     Used by:
     - navigator.py - Element finding
@@ -82,11 +283,12 @@ def flatten_tree(node: dict, depth: int = 0, elements: list[dict] | None = None)
 
     Args:
         node: Root node of tree (typically from get_accessibility_tree)
-        depth: Current depth (used internally, start at 0)
-        elements: Accumulator list (used internally, start as None)
+        depth: Depth assigned to the root (default 0)
+        elements: Optional list to extend instead of creating a new one
 
     Returns:
-        Flat list of elements, each with "depth" key indicating nesting level.
+        Flat list of elements in document order, each with "depth" key
+        indicating nesting level.
         Structure of each element: {
             "type": "Button",
             "AXLabel": "Login",
@@ -103,28 +305,32 @@ def flatten_tree(node: dict, depth: int = 0, elements: list[dict] | None = None)
     """
     if elements is None:
         elements = []
-
-    # Add current node with depth tracking
-    node_copy = node.copy()
-    node_copy["depth"] = depth
-    elements.append(node_copy)
-
-    # Process children recursively
-    for child in node.get("children", []):
-        flatten_tree(child, depth + 1, elements)
-
+    # Same walk as iter_tree(), copying nodes instead of wrapping them
+    append = elements.append
+    append({**node, "depth": depth})
+    stack = [(iter(node.get("children") or ()), depth + 1)]
+    while stack:
+        children, child_depth = stack[-1]
+        for child in children:
+            append({**child, "depth": child_depth})
+            grandchildren = child.get("children")
+            if grandchildren:
+                stack.append((iter(grandchildren), child_depth + 1))
+                break
+        else:
+            stack.pop()
     return elements
 
 
 def count_elements(node: dict) -> int:
     """
-    Count total elements in tree (recursive).
+    Count total elements in tree (iterative).
 
     Traverses entire tree counting all elements for reporting purposes.
 
     Used by:
     - test_recorder.py - Element counting per step
-    - screen_mapper.py - Summary statistics
+    - app_state_capture.py - State snapshots
 
     Args:
         node: Root node of tree
@@ -137,12 +343,45 @@ def count_elements(node: dict) -> int:
         total = count_elements(tree)
         print(f"Screen has {total} elements")
     """
-    count = 1
-    for child in node.get("children", []):
-        count += count_elements(child)
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        children = current.get("children")
+        if children:
+            stack.extend(children)
     return count
 
 
+def _device_type(udid: str) -> str | None:
+    """Device type identifier (e.g. ...iPhone-16-Pro) for a simulator UDID."""
+    try:
+        device = get_inventory().get(udid)
+    except RuntimeError:
+        return None
+    return device["device_type_identifier"] if device else None
+
+
+def _load_screen_sizes() -> dict:
+    try:
+        return json.loads(SCREEN_SIZE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_screen_size(udid: str, device_type: str | None, size: tuple[int, int]) -> None:
+    data = _load_screen_sizes()
+    if device_type:
+        data.setdefault("device_types", {})[udid] = device_type
+        data.setdefault("sizes", {})[device_type] = list(size)
+    try:
+        SCREEN_SIZE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SCREEN_SIZE_CACHE_PATH.write_text(json.dumps(data))
+    except OSError:
+        pass
+
+
 def get_screen_size(udid: str | None = None) -> tuple[int, int]:
     """
     Get screen dimensions from accessibility tree.
@@ -150,6 +389,11 @@ def get_screen_size(udid: str | None = None) -> tuple[int, int]:
     Extracts the screen size from the root element's frame. Useful for
     gesture calculations and coordinate normalization.
 
+    Screen size is invariant per device type, so it is cached in memory per
+    device and on disk per device type: once one device of a type has been
+    measured, any other device of that type (looked up in the device
+    inventory) needs no idb call. A cached tree is reused when present.
+
     Used by:
     - gesture.py - Gesture positioning
     - Potentially: screenshot positioning, screen-aware scaling
@@ -169,12 +413,36 @@ def get_screen_size(udid: str | None = None) -> tuple[int, int]:
     DEFAULT_WIDTH = 390  # iPhone 14
     DEFAULT_HEIGHT = 844
 
+    key = _device_key(udid)
+    if key in _screen_sizes:
+        _cache_stats["screen_size_hits"] += 1
+        return _screen_sizes[key]
+
+    device_type = None
+    if key != "booted":
+        # Any device of a known type will do, not just this UDID
+        data = _load_screen_sizes()
+        device_type = _device_type(key) or data.get("device_types", {}).get(key)
+        size = data.get("sizes", {}).get(device_type) if device_type else None
+        if size:
+            _cache_stats["screen_size_hits"] += 1
+            _screen_sizes[key] = (int(size[0]), int(size[1]))
+            return _screen_sizes[key]
+
     try:
-        tree = get_accessibility_tree(udid, nested=False)
-        frame = tree.get("frame", {})
+        tree = _cached_tree(key, True, get_tree_cache_ttl()) or _cached_tree(
+            key, False, get_tree_cache_ttl()
+        )
+        if tree is None:
+            tree = _fetch_tree(udid, nested=False, max_age=None)
+        frame = tree.get("frame", {}) if isinstance(tree, dict) else {}
         width = int(frame.get("width", DEFAULT_WIDTH))
         height = int(frame.get("height", DEFAULT_HEIGHT))
-        return (width, height)
-    except Exception:
-        # Silently fall back to defaults if tree access fails
+    except (subprocess.SubprocessError, OSError, ValueError, TypeError):
+        # Silently fall back to defaults if tree access fails (not cached)
         return (DEFAULT_WIDTH, DEFAULT_HEIGHT)
+
+    _screen_sizes[key] = (width, height)
+    if key != "booted":
+        _save_screen_size(key, device_type, (width, height))
+    return (width, height)
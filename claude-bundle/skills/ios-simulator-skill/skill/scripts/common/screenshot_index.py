@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash index of screenshots.
+
+Every screenshot gets a 128-bit perceptual hash: a 64-bit difference hash
+(dHash, gradients of a 9x8 thumbnail) followed by a 64-bit DCT hash (pHash,
+low frequencies of a 32x32 thumbnail). Re-encoding, scaling and rendering
+noise barely move either; a different screen moves both a lot.
+
+The index keeps an exact-hash table (identical frames in O(1)) and a
+BK-tree over Hamming distance (near neighbours without scanning every
+entry), persisted as a small JSON file. It answers:
+
+- Is this frame a duplicate of one already stored? (find_duplicate)
+- Which known screen is this? (identify)
+- Which baseline in a directory matches this screenshot? (sync_directory
+  + nearest)
+
+Requires Pillow for hashing images; lookups by precomputed hash don't.
+
+Used by:
+- screenshot_utils.py - capture_screenshot() reports the hash of each capture
+- test_recorder.py - Duplicate frames are not stored twice
+- visual_diff.py - Baseline picked automatically from a directory
+
+Usage:
+    python -m common.screenshot_index build baselines/
+    python -m common.screenshot_index identify current.png --index baselines/.screenshot-index.json
+"""
+
+import argparse
+import io
+import json
+import math
+from pathlib import Path
+
+try:
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+DUPLICATE_DISTANCE = 4  # Bits (of 128) within which frames count as duplicates
+MATCH_DISTANCE = 24  # Bits within which a screenshot counts as the same screen
+INDEX_FILENAME = ".screenshot-index.json"
+SCREENSHOT_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+# DCT-II basis for the 8 lowest frequencies of 32 samples (pHash)
+_DCT = [[math.cos(math.pi * (2 * x + 1) * u / 64) for x in range(32)] for u in range(8)]
+
+
+def dhash(image: "Image.Image") -> int:
+    """64-bit difference hash: is each thumbnail pixel brighter than its right neighbour."""
+    pixels = image.convert("L").resize((9, 8), Image.Resampling.BOX).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def phash(image: "Image.Image") -> int:
+    """64-bit DCT hash: 8x8 lowest frequencies of a 32x32 thumbnail vs their median."""
+    pixels = image.convert("L").resize((32, 32), Image.Resampling.BOX).tobytes()
+    rows = [pixels[y * 32 : y * 32 + 32] for y in range(32)]
+    # Separable 2-D DCT, only the 8 frequencies kept in each direction
+    partial = [
+        [sum(b * r for b, r in zip(basis, row, strict=True)) for basis in _DCT] for row in rows
+    ]
+    coefficients = [
+        sum(_DCT[u][y] * partial[y][v] for y in range(32)) for u in range(8) for v in range(8)
+    ]
+    median = sorted(coefficients[1:])[31]  # DC term excluded: it's just brightness
+    bits = 0
+    for value in coefficients:
+        bits = (bits << 1) | (value > median)
+    return bits
+
+
+def image_hash(image: "Image.Image | str | Path | bytes") -> int:
+    """
+    128-bit perceptual hash (dHash << 64 | pHash) of an image, image file or
+    encoded image bytes.
+
+    Raises:
+        RuntimeError: If Pillow is not installed
+    """
+    if not HAS_PIL:
+        raise RuntimeError("Perceptual hashing requires Pillow. Install with: pip3 install pillow")
+    if isinstance(image, str | Path | bytes):
+        source = io.BytesIO(image) if isinstance(image, bytes) else image
+        with Image.open(source) as opened:
+            opened.draft("L", (256, 256))  # JPEG: decode at reduced size
+            return image_hash(opened)
+    return (dhash(image) << 64) | phash(image)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance (ints) for radius queries."""
+
+    def __init__(self):
+        # Node: [hash, values, {distance: child node}]
+        self.root: list | None = None
+
+    def add(self, key: int, value) -> None:
+        if self.root is None:
+            self.root = [key, [value], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(key, node[0])
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, [value], {}]
+                return
+            node = child
+
+    def search(self, key: int, radius: int) -> list[tuple[int, object]]:
+        """All (distance, value) within radius, nearest first."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node[0])
+            if distance <= radius:
+                found.extend((distance, value) for value in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can match
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+class ScreenshotIndex:
+    """
+    Persistent perceptual-hash index of screenshots.
+
+    Entries are {"hash": hex, "path": str, "screen": str | None, "mtime": ns,
+    "size": bytes}; the screen label defaults to the file's semantic name
+    (timestamp stripped), so captures of one screen across runs share a
+    label. mtime and size tell sync_directory() when a file was replaced.
+
+    Example:
+        index = ScreenshotIndex("shots/.screenshot-index.json")
+        if index.find_duplicate(h) is None:
+            index.add("shots/App_Login_20250101-120000.png", key=h)
+        index.identify("current.png")  # 'App_Login'
+        index.save()
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        Load an index (an empty one if path is None or doesn't exist yet).
+
+        Args:
+            path: JSON file backing the index (None = in-memory only)
+        """
+        self.path = Path(path) if path else None
+        self.entries: list[dict] = []
+        self._exact: dict[int, list[dict]] = {}
+        self._tree = BKTree()
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = {}
+            for entry in data.get("entries", []):
+                self._insert(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _insert(self, entry: dict) -> None:
+        key = int(entry["hash"], 16)
+        self.entries.append(entry)
+        self._exact.setdefault(key, []).append(entry)
+        self._tree.add(key, entry)
+
+    def add(
+        self,
+        path: str | Path,
+        screen: str | None = None,
+        key: int | None = None,
+    ) -> dict:
+        """
+        Index a screenshot.
+
+        Args:
+            path: Screenshot file
+            screen: Screen label (default: semantic name of the file)
+            key: Precomputed image_hash() of the file (hashes the file if None)
+
+        Returns:
+            The new entry
+        """
+        from .screenshot_utils import semantic_screenshot_key
+
+        if key is None:
+            key = image_hash(path)
+        entry = {
+            "hash": f"{key:032x}",
+            "path": str(path),
+            "screen": screen or semantic_screenshot_key(path),
+        }
+        stamp = _file_stamp(path)
+        if stamp is not None:
+            entry["mtime"], entry["size"] = stamp
+        self._insert(entry)
+        return entry
+
+    def lookup(self, key: int, max_distance: int = MATCH_DISTANCE) -> list[tuple[int, dict]]:
+        """All (distance, entry) within max_distance bits, nearest first."""
+        if max_distance == 0:
+            return [(0, entry) for entry in self._exact.get(key, [])]
+        return self._tree.search(key, max_distance)
+
+    def nearest(self, key: int, max_distance: int = MATCH_DISTANCE) -> tuple[int, dict] | None:
+        """Closest (distance, entry) within max_distance, or None."""
+        exact = self._exact.get(key)
+        if exact:
+            return 0, exact[-1]
+        matches = self.lookup(key, max_distance)
+        return matches[0] if matches else None
+
+    def find_duplicate(self, key: int, max_distance: int = DUPLICATE_DISTANCE) -> dict | None:
+        """Entry of a stored near-identical frame, or None."""
+        match = self.nearest(key, max_distance)
+        return match[1] if match else None
+
+    def identify(
+        self, image: "Image.Image | str | Path | int", max_distance: int = MATCH_DISTANCE
+    ) -> str | None:
+        """Screen label of the closest known screenshot (image, file or hash), or None."""
+        key = image if isinstance(image, int) else image_hash(image)
+        match = self.nearest(key, max_distance)
+        return match[1]["screen"] if match else None
+
+    def sync_directory(self, directory: str | Path) -> int:
+        """
+        Make the index cover exactly the screenshots under a directory.
+
+        New files and files overwritten in place (mtime or size changed) are
+        hashed, entries of deleted files dropped; unchanged files are not
+        re-hashed.
+
+        Returns:
+            Number of files hashed
+        """
+        directory = Path(directory)
+        files = {
+            str(p): _file_stamp(p)
+            for p in directory.rglob("*")
+            if p.suffix.lower() in SCREENSHOT_SUFFIXES and p.is_file()
+        }
+        kept = [
+            entry
+            for entry in self.entries
+            if files.get(entry["path"]) == (entry.get("mtime"), entry.get("size"))
+        ]
+        if len(kept) != len(self.entries):
+            self.entries, self._exact, self._tree = [], {}, BKTree()
+            for entry in kept:
+                self._insert(entry)
+        known = {entry["path"] for entry in self.entries}
+        added = 0
+        for path in sorted(files.keys() - known):
+            self.add(path)
+            added += 1
+        return added
+
+    def save(self) -> None:
+        """Write the index to its JSON file (no-op for in-memory indexes)."""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"entries": self.entries}, separators=(",", ":")))
+        tmp.replace(self.path)
+
+
+def _file_stamp(path: str | Path) -> tuple[int, int] | None:
+    """(mtime in ns, size) of a file, or None if it can't be read."""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def index_for_directory(directory: str | Path) -> ScreenshotIndex:
+    """Load <directory>/.screenshot-index.json, bring it up to date and save it."""
+    index = ScreenshotIndex(Path(directory) / INDEX_FILENAME)
+    if index.sync_directory(directory) or not index.path.exists():
+        index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perceptual-hash screenshot index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Index every screenshot under a directory")
+    build.add_argument("directory")
+
+    identify = sub.add_parser("identify", help="Name the known screen a screenshot shows")
+    identify.add_argument("image")
+    identify.add_argument("--index", required=True, help="Index file or indexed directory")
+    identify.add_argument(
+        "--max-distance", type=int, default=MATCH_DISTANCE, help="Bits of 128 (default: 24)"
+    )
+
+    args = parser.parse_args()
+    if args.command == "build":
+        index = index_for_directory(args.directory)
+        screens = len({entry["screen"] for entry in index.entries})
+        print(f"Indexed: {len(index)} screenshots, {screens} screens -> {index.path}")
+    else:
+        source = Path(args.index)
+        index = index_for_directory(source) if source.is_dir() else ScreenshotIndex(source)
+        match = index.nearest(image_hash(args.image), args.max_distance)
+        if match is None:
+            print("No known screen matches")
+        else:
+            distance, entry = match
+            print(f"Screen: {entry['screen']} (distance {distance}, {entry['path']})")
+
+
+if __name__ == "__main__":
+    main()
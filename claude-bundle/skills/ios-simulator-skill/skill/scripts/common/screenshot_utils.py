@@ -7,8 +7,14 @@ Provides unified screenshot handling with:
 - Inline base64 mode: Vision-based automation for agent analysis
 - Size presets: Token optimization (full/half/quarter/thumb)
 - Semantic naming: {appName}_{screenName}_{state}_{timestamp}.png
+- Perceptual hash of every capture (with PIL), for screenshot_index
+- Output encodings: PNG, JPEG, WebP
 
-Supports resize operations via PIL (optional dependency).
+Captures are streamed from simctl into memory, downscaled and encoded
+there, and written once (file mode) or base64-encoded directly (inline
+mode), so concurrent captures on several simulators never share a file.
+
+Supports resize and re-encoding via PIL (optional dependency).
 
 Used by:
 - test_recorder.py - Step-based screenshot recording
@@ -16,13 +22,21 @@ Used by:
 """
 
 import base64
+import io
 import os
+import re
+import struct
 import subprocess
 import sys
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .command_executor import run_command
+from .device_utils import build_simctl_command
+from .screenshot_index import image_hash
+
 # Try to import PIL for resizing, but make it optional
 try:
     from PIL import Image
@@ -31,6 +45,16 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# Trailing _YYYYMMDD-HHMMSS added by generate_screenshot_name
+TIMESTAMP_SUFFIX_RE = re.compile(r"_\d{8}-\d{6}$")
+
+# Output encoding -> (PIL format, MIME type, file extension)
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png", "png"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+}
+
 
 def generate_screenshot_name(
     app_name: str | None = None,
@@ -75,6 +99,25 @@ def generate_screenshot_name(
     return f"{name}.{extension}"
 
 
+def semantic_screenshot_key(path: str | Path) -> str:
+    """Stable key of a screenshot file: its name without timestamp and extension.
+
+    Screenshots of the same screen taken in different runs share a key, so
+    baseline and current captures can be paired by name.
+
+    Args:
+        path: Screenshot path or file name
+
+    Returns:
+        Key such as 'MyApp_Login_Empty' (or the plain stem for other names)
+
+    Example:
+        semantic_screenshot_key('shots/MyApp_Login_Empty_20251028-143052.png')
+        # Returns: 'MyApp_Login_Empty'
+    """
+    return TIMESTAMP_SUFFIX_RE.sub("", Path(path).stem)
+
+
 def get_size_preset(size: str = "half") -> tuple[float, float]:
     """Get scale factors for size preset.
 
@@ -154,17 +197,13 @@ def resize_screenshot(
             f"Size preset '{size}' requires PIL (Pillow). " "Install with: pip3 install pillow"
         )
 
-    # Open original image
-    img = Image.open(str(input_file))
-    orig_w, orig_h = img.size
-
-    # Calculate new size
+    # Open original image (JPEG decodes straight at the reduced size)
     scale_x, scale_y = get_size_preset(size)
-    new_w = int(orig_w * scale_x)
-    new_h = int(orig_h * scale_y)
-
-    # Resize with high-quality resampling
-    resized = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+    img = Image.open(str(input_file))
+    new_w = int(img.width * scale_x)
+    new_h = int(img.height * scale_y)
+    img.draft(img.mode, (new_w, new_h))
+    resized = downscale_image(img, (new_w, new_h))
 
     # Determine output path
     if output_path is None:
@@ -179,6 +218,99 @@ def resize_screenshot(
     return (output_path, new_w, new_h)
 
 
+def downscale_image(img: "Image.Image", size: tuple[int, int]) -> "Image.Image":
+    """Shrink an image to size, by box-averaging when the factor is a whole number.
+
+    Size presets divide screenshots by whole factors (half = 2, quarter = 4,
+    thumb = 10 on common devices); Image.reduce() does that in one cheap pass.
+    Other sizes fall back to LANCZOS, which still reduces first when the
+    factor is large (reducing_gap).
+
+    Args:
+        img: Decoded image
+        size: Target (width, height)
+
+    Returns:
+        Downscaled image (img itself if it already has that size)
+
+    Example:
+        thumb = downscale_image(img, (img.width // 4, img.height // 4))
+    """
+    width, height = size
+    if (width, height) == img.size:
+        return img
+    factor = img.width // width
+    if (
+        factor >= 2
+        and img.height // height == factor
+        and img.width - width * factor < factor
+        and img.height - height * factor < factor
+    ):
+        # Leftover edge pixels (fewer than one block) are dropped
+        return img.reduce(factor, box=(0, 0, width * factor, height * factor))
+    return img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def encode_image(img: "Image.Image", image_format: str = "png", quality: int = 85) -> bytes:
+    """Encode an image in memory.
+
+    Args:
+        img: Decoded image
+        image_format: 'png', 'jpeg' or 'webp'
+        quality: JPEG/WebP quality (1-100, default: 85)
+
+    Returns:
+        Encoded image bytes
+    """
+    pil_format = IMAGE_FORMATS[image_format][0]
+    if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")  # JPEG has no alpha channel
+    buffer = io.BytesIO()
+    if pil_format == "PNG":
+        img.save(buffer, pil_format)
+    else:
+        img.save(buffer, pil_format, quality=quality)
+    return buffer.getvalue()
+
+
+def _png_dimensions(data: bytes) -> tuple[int, int]:
+    """Width and height from a PNG header (no PIL needed)."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    return 390, 844  # Fallback to common device size
+
+
+def read_simulator_screenshot(udid: str | None) -> bytes:
+    """Raw PNG screenshot of a simulator, streamed from simctl into memory.
+
+    Nothing is written to a shared path, so captures on several simulators
+    can run concurrently. If simctl prints nothing to stdout (very old
+    Xcode), a private temp file is used instead.
+
+    Args:
+        udid: Device UDID (None = booted device)
+
+    Returns:
+        PNG bytes
+
+    Raises:
+        subprocess.CalledProcessError: If simctl fails
+    """
+    cmd = build_simctl_command("io", udid, "screenshot", "--type=png", "-")
+    result = run_command(cmd, udid=udid, check=True, text=False)
+    if result.stdout:
+        return result.stdout
+
+    fd, temp_path = tempfile.mkstemp(prefix="ios_simulator_screenshot_", suffix=".png")
+    os.close(fd)
+    try:
+        cmd = build_simctl_command("io", udid, "screenshot", "--type=png", temp_path)
+        run_command(cmd, udid=udid, check=True, text=False)
+        return Path(temp_path).read_bytes()
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+
 def capture_screenshot(
     udid: str,
     output_path: str | None = None,
@@ -187,11 +319,15 @@ def capture_screenshot(
     app_name: str | None = None,
     screen_name: str | None = None,
     state: str | None = None,
+    *,
+    image_format: str = "png",
+    quality: int = 85,
 ) -> dict[str, Any]:
     """Capture screenshot with flexible output modes.
 
     Supports both file-based (persistent artifacts) and inline base64 modes
-    (for vision-based automation).
+    (for vision-based automation). The capture is decoded, downscaled and
+    encoded in memory; a full-size PNG is passed through untouched.
 
     Args:
         udid: Device UDID
@@ -201,6 +337,8 @@ def capture_screenshot(
         app_name: App name for semantic naming
         screen_name: Screen name for semantic naming
         state: State description for semantic naming
+        image_format: 'png', 'jpeg' or 'webp' (default: 'png')
+        quality: JPEG/WebP quality (1-100, default: 85)
 
     Returns:
         Dict with mode-specific fields:
@@ -212,103 +350,101 @@ def capture_screenshot(
             'size_bytes': int,
             'width': int,
             'height': int,
-            'size_preset': str
+            'size_preset': str,
+            'format': str,
+            'hash': str  # image_hash() as hex, only with PIL
         }
 
         Inline mode:
         {
             'mode': 'inline',
             'base64_data': str,
-            'mime_type': 'image/png',
+            'mime_type': 'image/png',  # or image/jpeg, image/webp
             'width': int,
             'height': int,
-            'size_preset': str
+            'size_preset': str,
+            'format': str,
+            'hash': str  # only with PIL
         }
 
+    Raises:
+        ValueError: If image_format is unknown, or not PNG without PIL
+        RuntimeError: If the capture fails
+
     Example:
         # File mode
         result = capture_screenshot('ABC123', app_name='MyApp')
         print(f"Saved to: {result['file_path']}")
 
-        # Inline mode
-        result = capture_screenshot('ABC123', inline=True, size='half')
+        # Inline mode, compact JPEG for vision models
+        result = capture_screenshot('ABC123', inline=True, size='half', image_format='jpeg')
         print(f"Screenshot: {result['width']}x{result['height']}")
         print(f"Base64: {result['base64_data'][:50]}...")
     """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(
+            f"Unknown image format '{image_format}' (choose from {', '.join(IMAGE_FORMATS)})"
+        )
+    if image_format != "png" and not HAS_PIL:
+        raise ValueError(
+            f"Format '{image_format}' requires PIL (Pillow). Install with: pip3 install pillow"
+        )
+    _, mime_type, extension = IMAGE_FORMATS[image_format]
+
     try:
-        # Capture raw screenshot to temp file
-        temp_path = "/tmp/ios_simulator_screenshot.png"
-        cmd = ["xcrun", "simctl", "io", udid, "screenshot", temp_path]
+        raw = read_simulator_screenshot(udid)
 
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        image_key = None
+        if HAS_PIL:
+            img = Image.open(io.BytesIO(raw))
+            scale_x, scale_y = get_size_preset(size) if size != "full" else (1.0, 1.0)
+            target = (int(img.width * scale_x), int(img.height * scale_y))
+            resized = downscale_image(img, target)
+            width, height = resized.size
+            if resized is img and image_format == "png":
+                data = raw  # Already a full-size PNG: no re-encode
+            else:
+                data = encode_image(resized, image_format, quality)
+            # Lossy formats: hash the encoded bytes, as image_hash() of the file would
+            image_key = image_hash(resized if image_format == "png" else data)
+        else:
+            # Without PIL the capture is kept as-is (full-size PNG)
+            data = raw
+            width, height = _png_dimensions(raw)
 
         if inline:
-            # Inline mode: resize and convert to base64
-            # Resize if needed
-            if size != "full" and HAS_PIL:
-                resized_path, width, height = resize_screenshot(temp_path, size=size)
-            else:
-                resized_path = temp_path
-                # Get dimensions via PIL if available
-                if HAS_PIL:
-                    img = Image.open(resized_path)
-                    width, height = img.size
-                else:
-                    width, height = 390, 844  # Fallback to common device size
-
-            # Read and encode as base64
-            with open(resized_path, "rb") as f:
-                base64_data = base64.b64encode(f.read()).decode("utf-8")
-
-            # Clean up temp files
-            Path(temp_path).unlink(missing_ok=True)
-            if resized_path != temp_path:
-                Path(resized_path).unlink(missing_ok=True)
-
-            return {
+            result = {
                 "mode": "inline",
-                "base64_data": base64_data,
-                "mime_type": "image/png",
+                "base64_data": base64.b64encode(data).decode("ascii"),
+                "mime_type": mime_type,
                 "width": width,
                 "height": height,
                 "size_preset": size,
+                "format": image_format,
             }
-
-        # File mode: save to output path with semantic naming
-        if output_path is None:
-            output_path = generate_screenshot_name(app_name, screen_name, state)
-
-        # Resize if needed
-        if size != "full" and HAS_PIL:
-            final_path, width, height = resize_screenshot(temp_path, output_path, size)
         else:
-            # Just move temp to output
-            import shutil
-
-            shutil.move(temp_path, output_path)
-            final_path = output_path
-
-            # Get dimensions via PIL if available
-            if HAS_PIL:
-                img = Image.open(final_path)
-                width, height = img.size
-            else:
-                width, height = 390, 844  # Fallback
-
-        # Get file size
-        size_bytes = Path(final_path).stat().st_size
-
-        return {
-            "mode": "file",
-            "file_path": final_path,
-            "size_bytes": size_bytes,
-            "width": width,
-            "height": height,
-            "size_preset": size,
-        }
+            # File mode: write once to output path with semantic naming
+            if output_path is None:
+                output_path = generate_screenshot_name(
+                    app_name, screen_name, state, extension=extension
+                )
+            Path(output_path).write_bytes(data)
+            result = {
+                "mode": "file",
+                "file_path": str(output_path),
+                "size_bytes": len(data),
+                "width": width,
+                "height": height,
+                "size_preset": size,
+                "format": image_format,
+            }
+        if image_key is not None:
+            result["hash"] = f"{image_key:032x}"
+        return result
 
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to capture screenshot: {e.stderr}") from e
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else e.stderr
+        raise RuntimeError(f"Failed to capture screenshot: {stderr}") from e
     except Exception as e:
         raise RuntimeError(f"Screenshot capture error: {e!s}") from e
 
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Structural diff between two accessibility tree snapshots.
+
+Children of matched parents are paired in three passes: by AXUniqueId, then
+by (type, label), then by type in sibling order (so a label change is an
+update, not a delete + insert). The result is a flat list of operations:
+
+    {"op": "update", "path": [...], "set": {...}, "unset": [...], "node": {...summary}}
+    {"op": "insert", "path": [...], "index": j, "node": {...}}
+    {"op": "delete", "path": [...], "index": i, "node": {...summary}}
+    {"op": "move",   "path": [...], "from": i, "to": j}
+
+"path" is the parent's (or, for updates, the node's) child-index path in
+the NEW tree; "from"/"index" of delete and move are child indexes in the
+old parent. A "children" key that appears or disappears is an update too
+(set to [] before inserts, or unset). apply_delta() rebuilds the new tree from the old one, so a
+recording can store one full snapshot followed by deltas.
+
+Used by:
+- test_recorder.py - Delta storage of per-step accessibility snapshots
+
+Example:
+    ops = diff_trees(before, after)
+    assert apply_delta(before, ops) == after
+    summarize_changes(ops)  # {"updated": 1, ..., "region": {...}}
+"""
+
+import copy
+from bisect import bisect_left
+from collections import deque
+
+from .idb_utils import iter_tree
+
+# Fields kept in delete/update ops (enough for change summaries, not the subtree)
+SUMMARY_FIELDS = ("type", "AXLabel", "AXUniqueId", "frame")
+
+
+def _match_children(old: list[dict], new: list[dict]) -> list[int | None]:
+    """
+    Pair children of two matched parents.
+
+    Returns:
+        For each new child index, the matched old child index (or None)
+    """
+    matches: list[int | None] = [None] * len(new)
+    unmatched = set(range(len(old)))
+    passes = (
+        lambda n: n.get("AXUniqueId"),
+        lambda n: (n.get("type"), n.get("AXLabel")),
+        lambda n: n.get("type"),
+    )
+    for key in passes:
+        candidates: dict = {}
+        for i in sorted(unmatched):
+            k = key(old[i])
+            if k is not None:
+                candidates.setdefault(k, deque()).append(i)
+        if not candidates:
+            continue
+        for j, node in enumerate(new):
+            if matches[j] is not None:
+                continue
+            queue = candidates.get(key(node))
+            if queue:
+                i = queue.popleft()
+                matches[j] = i
+                unmatched.discard(i)
+    return matches
+
+
+def _stable(indexes: list[int]) -> set[int]:
+    """Old indexes forming a longest increasing subsequence (children that didn't move)."""
+    tails: list[int] = []
+    tail_pos: list[int] = []
+    previous = [-1] * len(indexes)
+    for pos, value in enumerate(indexes):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_pos.append(pos)
+        else:
+            tails[k] = value
+            tail_pos[k] = pos
+        previous[pos] = tail_pos[k - 1] if k else -1
+    stable = set()
+    pos = tail_pos[-1] if tail_pos else -1
+    while pos >= 0:
+        stable.add(indexes[pos])
+        pos = previous[pos]
+    return stable
+
+
+def _fields(node: dict) -> dict:
+    return {k: v for k, v in node.items() if k != "children"}
+
+
+def _summary(node: dict) -> dict:
+    return {k: node[k] for k in SUMMARY_FIELDS if k in node}
+
+
+def diff_trees(old: dict, new: dict) -> list[dict]:
+    """
+    Operations turning the old tree into the new one.
+
+    Args:
+        old: Previous snapshot (nested tree)
+        new: Current snapshot
+
+    Returns:
+        List of insert/delete/update/move operations (empty if identical)
+    """
+    ops: list[dict] = []
+    stack = [(old, new, [])]
+    while stack:
+        old_node, new_node, path = stack.pop()
+        if old_node == new_node:
+            continue
+
+        old_fields, new_fields = _fields(old_node), _fields(new_node)
+        had_children, has_children = "children" in old_node, "children" in new_node
+        if old_fields != new_fields or had_children != has_children:
+            changed = {
+                k: v for k, v in new_fields.items() if k not in old_fields or old_fields[k] != v
+            }
+            unset = [k for k in old_fields if k not in new_fields]
+            if had_children and not has_children:
+                unset.append("children")
+            elif has_children and not had_children:
+                changed["children"] = []
+            op = {"op": "update", "path": path, "set": changed, "node": _summary(new_node)}
+            if unset:
+                op["unset"] = unset
+            ops.append(op)
+
+        old_children = old_node.get("children") or []
+        new_children = new_node.get("children") or []
+        matches = _match_children(old_children, new_children)
+        matched = {i for i in matches if i is not None}
+        for i, child in enumerate(old_children):
+            if i not in matched:
+                ops.append({"op": "delete", "path": path, "index": i, "node": _summary(child)})
+        stable = _stable([i for i in matches if i is not None])
+        for j, i in enumerate(matches):
+            if i is None:
+                ops.append({"op": "insert", "path": path, "index": j, "node": new_children[j]})
+                continue
+            if i not in stable:
+                ops.append({"op": "move", "path": path, "from": i, "to": j})
+            stack.append((old_children[i], new_children[j], path + [j]))
+    return ops
+
+
+def apply_delta(tree: dict, ops: list[dict]) -> dict:
+    """
+    Rebuild the new tree from the old one and diff_trees() operations.
+
+    The input tree is not modified; unchanged subtrees are shared with it
+    (copy.deepcopy the result before mutating it).
+
+    Args:
+        tree: Old snapshot
+        ops: Operations from diff_trees(tree, new)
+
+    Returns:
+        The new snapshot
+    """
+    by_path: dict[tuple, list[dict]] = {}
+    for op in ops:
+        by_path.setdefault(tuple(op["path"]), []).append(op)
+    # Only subtrees on a changed path need rebuilding
+    touched = {path[:k] for path in by_path for k in range(len(path) + 1)}
+
+    def rebuild(old_node: dict, path: tuple) -> dict:
+        if path not in touched:
+            return old_node
+        node = dict(old_node)
+        node_ops = by_path.get(path, ())
+        structural = False
+        for op in node_ops:
+            if op["op"] == "update":
+                node.update(op["set"])
+                for key in op.get("unset", ()):
+                    node.pop(key, None)
+            else:
+                structural = True
+
+        old_children = old_node.get("children") or []
+        if not structural:
+            sources: list = list(old_children)
+        else:
+            deleted = {op["index"] for op in node_ops if op["op"] == "delete"}
+            placed: dict[int, object] = {}
+            for op in node_ops:
+                if op["op"] == "insert":
+                    placed[op["index"]] = ("new", op["node"])
+                elif op["op"] == "move":
+                    placed[op["to"]] = old_children[op["from"]]
+                    deleted.add(op["from"])
+            remaining = iter(c for i, c in enumerate(old_children) if i not in deleted)
+            size = len(old_children) - len(deleted) + len(placed)
+            sources = [placed[j] if j in placed else next(remaining) for j in range(size)]
+
+        children = []
+        for j, source in enumerate(sources):
+            if isinstance(source, tuple):
+                children.append(copy.deepcopy(source[1]))
+            else:
+                children.append(rebuild(source, path + (j,)))
+        if children or "children" in node:
+            node["children"] = children
+        return node
+
+    return rebuild(tree, ())
+
+
+def summarize_changes(ops: list[dict]) -> dict:
+    """
+    Compact summary of a delta for reports.
+
+    Returns:
+        Counts per operation, up to 5 short descriptions, and the bounding
+        box of changed elements' frames ("region", None if no frames)
+    """
+    counts = {"inserted": 0, "deleted": 0, "updated": 0, "moved": 0}
+    names = {"insert": "inserted", "delete": "deleted", "update": "updated", "move": "moved"}
+    details = []
+    left = top = float("inf")
+    right = bottom = float("-inf")
+    for op in ops:
+        counts[names[op["op"]]] += 1
+        if op["op"] == "move":
+            continue
+        node = op["node"]
+        frames = [node.get("frame")]
+        if op["op"] == "insert":
+            frames = [n.get("frame") for n in iter_tree(node)]
+        for frame in frames:
+            if frame and frame.get("width") and frame.get("height"):
+                left = min(left, frame["x"])
+                top = min(top, frame["y"])
+                right = max(right, frame["x"] + frame["width"])
+                bottom = max(bottom, frame["y"] + frame["height"])
+        if len(details) < 5:
+            what = node.get("type") or ""
+            label = node.get("AXLabel")
+            if label:
+                what = f"{what} '{label[:30]}'".strip()
+            if op["op"] == "update":
+                what = f"{what or 'element'} ({', '.join(sorted(op['set']))})"
+            details.append(f"{names[op['op']]} {what}".strip())
+
+    region = None
+    if left != float("inf"):
+        region = {"x": left, "y": top, "width": right - left, "height": bottom - top}
+    return {**counts, "details": details, "region": region}
@@ -63,9 +63,11 @@ import sys
 import time
 
 from common import (
+    build_idb_command,
     get_device_screen_size,
     get_screen_size,
     resolve_udid,
+    run_command,
     transform_screenshot_coords,
 )
 
@@ -133,18 +135,16 @@ class GestureController:
         Returns:
             Success status
         """
-        cmd = ["idb", "ui", "swipe"]
-        cmd.extend([str(start[0]), str(start[1]), str(end[0]), str(end[1])])
+        args = [start[0], start[1], end[0], end[1]]
 
         # IDB doesn't support duration directly, but we can add delay
         if duration != 0.3:
-            cmd.extend(["--duration", str(int(duration * 1000))])
+            args.extend(["--duration", int(duration * 1000)])
 
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui swipe", self.udid, *args)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -179,13 +179,10 @@ class GestureController:
         """
         # IDB doesn't have native long press, simulate with tap
         # In real implementation, might need to use different approach
-        cmd = ["idb", "ui", "tap", str(x), str(y)]
-
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui tap", self.udid, x, y)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             # Simulate hold with delay
             time.sleep(duration)
             return True
@@ -70,7 +70,7 @@ import subprocess
 import sys
 import time
 
-from common import resolve_udid
+from common import build_idb_command, resolve_udid, run_command
 
 
 class KeyboardController:
@@ -130,12 +130,10 @@ class KeyboardController:
 
     def _type_single(self, text: str) -> bool:
         """Type text using IDB."""
-        cmd = ["idb", "ui", "text", text]
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui text", self.udid, text)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -160,13 +158,11 @@ class KeyboardController:
             except ValueError:
                 return False
 
-        cmd = ["idb", "ui", "key", str(key_code)]
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui key", self.udid, key_code)
 
         try:
             for _ in range(count):
-                subprocess.run(cmd, capture_output=True, check=True)
+                run_command(cmd, udid=self.udid, check=True)
                 if count > 1:
                     time.sleep(0.1)  # Small delay for multiple presses
             return True
@@ -183,8 +179,6 @@ class KeyboardController:
         Returns:
             Success status
         """
-        cmd_base = ["idb", "ui", "key-sequence"]
-
         # Map keys to codes
         mapped_keys = []
         for key in keys:
@@ -197,13 +191,10 @@ class KeyboardController:
                     return False
             mapped_keys.append(str(mapped))
 
-        cmd = cmd_base + mapped_keys
-
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui key-sequence", self.udid, *mapped_keys)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -222,12 +213,10 @@ class KeyboardController:
         if not button_code:
             return False
 
-        cmd = ["idb", "ui", "button", button_code]
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui button", self.udid, button_code)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -6,12 +6,25 @@ Real-time log streaming from iOS simulators with intelligent filtering, error de
 and token-efficient summarization. Enhanced version of app_state_capture.py's log capture.
 
 Features:
-- Real-time log streaming from booted simulators
+- Real-time log streaming from booted simulators (`log stream --style ndjson`:
+  exact severity from messageType, app filtering on process/subsystem fields)
+- Offline ingestion of saved ndjson or text logs from files or stdin
 - Smart filtering by app bundle ID, subsystem, category, severity
 - Error/warning classification and deduplication
+- Template mining: messages differing only in IDs, addresses or counts are
+  grouped into one template, and summaries rank templates by frequency
 - Duration-based or continuous follow mode
 - Token-efficient summaries with full logs saved to file
 - Integration with test_recorder and app_state_capture
+- Bounded memory: ring buffer of recent lines, LRU-bounded deduplication;
+  with --output every line is written straight to the log file
+- Several simulators at once (--devices): one asyncio loop reads every
+  stream, entries are merged into one timestamp-ordered timeline tagged by
+  device, with per-device and fleet-wide statistics
+
+Each line is classified once by a single precompiled keyword regex (the
+previous version ran up to 13 searches per line, twice in follow mode).
+Throughput on a replayed log: python -m common.benchmarks logs
 
 Usage Examples:
     # Monitor app logs in real-time (follow mode)
@@ -28,17 +41,314 @@ Usage Examples:
 
     # Verbose output with full log lines
     python scripts/log_monitor.py --app com.myapp.MyApp --verbose
+
+    # Analyze a saved log (ndjson or text) without a simulator
+    python scripts/log_monitor.py --input logs/MyApp-20250101-120000.ndjson
+    xcrun simctl spawn booted log show --style ndjson --last 5m | \\
+        python scripts/log_monitor.py --input -
+
+    # Every booted simulator at once, merged into one timeline
+    python scripts/log_monitor.py --devices booted --app com.myapp.MyApp --follow
 """
 
 import argparse
+import asyncio
+import heapq
 import json
 import re
 import signal
 import subprocess
 import sys
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 
+from common.device_utils import list_simulators, resolve_device_identifier
+
+# Severity keywords; when a line has several, the most severe wins
+SEVERITY_KEYWORDS = {
+    "error": ("error", "fault", "failed", "exception", "crash", "❌"),
+    "warning": ("warning", "warn", "deprecated", "⚠️"),
+    "info": ("info", "notice", "ℹ️"),
+}
+SEVERITY_RANK = {"debug": 0, "info": 1, "warning": 2, "error": 3}
+KEYWORD_SEVERITY = {
+    keyword: severity for severity, keywords in SEVERITY_KEYWORDS.items() for keyword in keywords
+}
+# Words need word boundaries, emoji don't: one alternation, one pass per line
+KEYWORD_RE = re.compile(
+    r"\b("
+    + "|".join(k for k in KEYWORD_SEVERITY if k.isalpha())
+    + r")\b|("
+    + "|".join(k for k in KEYWORD_SEVERITY if not k.isalpha())
+    + ")"
+)
+
+# Parts of a line that differ between repeats of the same message
+TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}")
+PID_RE = re.compile(r"\[\d+\]")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# ndjson messageType -> severity; "Default" carries no level, so keywords decide
+MESSAGE_TYPE_SEVERITY = {"Fault": "error", "Error": "error", "Info": "info", "Debug": "debug"}
+LOG_STYLES = ("ndjson", "text")
+
+DEFAULT_MAX_LINES = 10000  # Recent raw lines kept in memory
+DEFAULT_DEDUP_SIZE = 10000  # Message signatures remembered for deduplication
+MAX_STORED_MESSAGES = 500  # Unique errors/warnings kept (counts are not capped)
+
+# Header of a default-style `log stream` line, up to the message text:
+# 2025-01-01 12:00:00.123456+0000 0x1a2b  Error  0x0  1234  0  MyApp: (CFNetwork) [sub:cat]
+LOG_HEADER_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+[+-]\d{4})\s+0x[0-9a-f]+\s+\w+"
+    r"\s+0x[0-9a-f]+\s+\d+\s+\d+\s+(?:\S+:\s+)?(?:\([^)]*\)\s+)?(?:\[[^\]]*\]\s+)?"
+)
+# Variable parts masked before template matching (longest patterns first)
+VARIABLE_RE = re.compile(
+    r"[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}"  # UUID
+    r"|\b0x[0-9A-Fa-f]+\b"  # Address
+    r"|\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"  # IPv4[:port]
+    r"|(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[A-Za-z%]{1,3})?(?![\w.])"  # Number (with unit)
+)
+WILDCARD = "<*>"
+DIGIT_RE = re.compile(r"\d")
+
+DEFAULT_TEMPLATE_DEPTH = 4  # Drain tree depth: length node + 2 prefix tokens + leaf
+DEFAULT_TEMPLATE_SIMILARITY = 0.5  # Share of equal (non-wildcard) tokens to join a template
+DEFAULT_MAX_TEMPLATES = 1000  # Least recently matched templates evicted first
+MAX_TEMPLATE_CHILDREN = 100  # Per tree node; further prefix tokens share a wildcard child
+MAX_TEMPLATE_SAMPLES = 3  # Variable samples kept per template
+MAX_ROUTE_CACHE = 10000  # (length, prefix tokens) -> leaf shortcuts
+
+# Multi-device streaming
+DEFAULT_REORDER_WINDOW = 0.5  # Seconds an entry may wait for earlier entries from other devices
+DEFAULT_QUEUE_SIZE = 1000  # Lines in flight between readers and analysis (backpressure)
+MIN_DEVICE_BUDGET = 1000  # Floor of each device's share of lines/signatures
+MIN_DEVICE_TEMPLATES = 100  # Floor of each device's share of templates
+STREAM_LINE_LIMIT = 1 << 16  # Longer lines are skipped; a reader buffers at most 2x this
+
+
+@dataclass
+class LogTemplate:
+    """One cluster of log messages: a token template plus statistics."""
+
+    template_id: int
+    tokens: list[str]
+    count: int = 0
+    first_seen: str | None = None
+    last_seen: str | None = None
+    severities: dict[str, int] = field(default_factory=dict)
+    samples: list[list[str]] = field(default_factory=list)  # Variable values per example
+    leaf: list["LogTemplate"] | None = None  # Tree leaf holding this template
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.tokens)
+
+    @property
+    def severity(self) -> str:
+        """Most severe level seen for this template."""
+        return max(self.severities, key=SEVERITY_RANK.__getitem__, default="debug")
+
+    def to_dict(self) -> dict:
+        return {
+            "template": self.text,
+            "count": self.count,
+            "severity": self.severity,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "samples": self.samples,
+        }
+
+
+class LogTemplateMiner:
+    """
+    Online log template mining (Drain: fixed-depth parse tree).
+
+    Each message is masked (UUIDs, addresses, IPs, numbers become <*>),
+    split into tokens and routed down a tree by token count and its first
+    tokens to a small leaf list of templates. It joins the most similar
+    template if enough tokens match, turning the differing positions into
+    <*>; otherwise it starts a new template. Cost per line is independent
+    of how many templates exist, and memory is bounded by max_templates.
+
+    Example:
+        miner = LogTemplateMiner()
+        miner.add("Request 42 failed after 3 retries", "error")
+        miner.add("Request 97 failed after 5 retries", "error")
+        miner.top()[0].text  # 'Request <*> failed after <*> retries'
+    """
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_TEMPLATE_DEPTH,
+        similarity: float = DEFAULT_TEMPLATE_SIMILARITY,
+        max_templates: int = DEFAULT_MAX_TEMPLATES,
+    ):
+        """
+        Args:
+            depth: Tree depth (prefix tokens used for routing = depth - 2)
+            similarity: Minimum share of equal tokens to join a template
+            max_templates: Templates kept (least recently matched evicted)
+        """
+        self.prefix_tokens = max(1, depth - 2)
+        self.similarity = similarity
+        self.max_templates = max_templates
+        self.templates: OrderedDict[int, LogTemplate] = OrderedDict()
+        self.evicted = 0
+        self.lines = 0
+        self._root: dict = {}
+        self._routes: dict[tuple, list[LogTemplate]] = {}
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def _leaf(self, tokens: list[str]) -> list[LogTemplate]:
+        route = (len(tokens), *tokens[: self.prefix_tokens])
+        leaf = self._routes.get(route)
+        if leaf is not None:
+            return leaf
+        if len(self._routes) >= MAX_ROUTE_CACHE:
+            self._routes.clear()
+
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[: self.prefix_tokens]:
+            if WILDCARD in token or DIGIT_RE.search(token):
+                token = WILDCARD  # Variable-looking tokens must not split the tree
+            child = node.get(token)
+            if child is None:
+                if len(node) >= MAX_TEMPLATE_CHILDREN:
+                    token = WILDCARD
+                child = node.setdefault(token, {})
+            node = child
+        leaf = self._routes[route] = node.setdefault(None, [])
+        return leaf
+
+    def _best_match(self, leaf: list[LogTemplate], tokens: list[str]) -> LogTemplate | None:
+        best, best_score = None, (-1.0, -1)
+        for template in leaf:
+            equal = wildcards = 0
+            for a, b in zip(template.tokens, tokens, strict=True):
+                if a == WILDCARD:
+                    wildcards += 1
+                elif a == b:
+                    equal += 1
+            # Wildcards don't count as similar (so they can't absorb everything);
+            # ties go to the more general template
+            score = (equal / len(tokens), wildcards)
+            if score > best_score:
+                best, best_score = template, score
+        return best if best_score[0] >= self.similarity else None
+
+    def add(self, message: str, severity: str = "debug", seen: str | None = None) -> LogTemplate:
+        """
+        Assign a message to a template (creating or generalising one).
+
+        Args:
+            message: Log message (without the `log stream` header)
+            severity: Severity of the line
+            seen: Timestamp of the line (default: now)
+
+        Returns:
+            The template the message now belongs to
+        """
+        tokens = VARIABLE_RE.sub(WILDCARD, message).split() or [""]
+        seen = seen or datetime.now().isoformat(timespec="seconds")
+        generalized: list[str] = []
+        self.lines += 1
+
+        leaf = self._leaf(tokens)
+        template = self._best_match(leaf, tokens)
+        if template is None:
+            template = LogTemplate(self._next_id, tokens, first_seen=seen, leaf=leaf)
+            self._next_id += 1
+            leaf.append(template)
+            self.templates[template.template_id] = template
+            if len(self.templates) > self.max_templates:
+                _, old = self.templates.popitem(last=False)
+                old.leaf.remove(old)
+                self.evicted += 1
+        else:
+            self.templates.move_to_end(template.template_id)
+            if template.tokens != tokens:
+                for i, (a, b) in enumerate(zip(template.tokens, tokens, strict=True)):
+                    if a not in (b, WILDCARD):
+                        template.tokens[i] = WILDCARD
+                        generalized.append(b)
+
+        template.count += 1
+        template.last_seen = seen
+        template.severities[severity] = template.severities.get(severity, 0) + 1
+        if len(template.samples) < MAX_TEMPLATE_SAMPLES:
+            values = VARIABLE_RE.findall(message) + generalized
+            if values:
+                template.samples.append(values)
+        return template
+
+    def top(self, count: int | None = None, severity: str | None = None) -> list[LogTemplate]:
+        """
+        Templates by descending frequency.
+
+        Args:
+            count: Maximum templates returned (None = all)
+            severity: Only templates seen at this level, ranked by how often
+        """
+        if severity is None:
+            templates = sorted(self.templates.values(), key=lambda t: t.count, reverse=True)
+        else:
+            templates = [t for t in self.templates.values() if severity in t.severities]
+            templates.sort(key=lambda t: t.severities[severity], reverse=True)
+        return templates[:count] if count is not None else templates
+
+
+def parse_log_timestamp(timestamp: str | None) -> float | None:
+    """Epoch seconds of a `log` timestamp ('2025-01-01 12:00:00.123456+0000'), or None."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_log_record(line: str) -> dict | None:
+    """
+    Parse one `log stream/show --style ndjson` line.
+
+    Returns:
+        The record's fields, or None if the line is not an ndjson log event
+        (e.g. the "Filtering the log data..." banner or a text-style line)
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or "eventMessage" not in record:
+        return None
+    return record
+
+
+def format_log_record(record: dict) -> str:
+    """Render an ndjson record like a default-style `log stream` text line."""
+    process = record.get("processImagePath", "").rsplit("/", 1)[-1]
+    sender = record.get("senderImagePath", "").rsplit("/", 1)[-1]
+    source = f"{process}: "
+    if sender and sender != process:
+        source += f"({sender}) "
+    if record.get("subsystem"):
+        source += f"[{record['subsystem']}:{record.get('category', '')}] "
+    return (
+        f"{record.get('timestamp', '')} {record.get('threadID', 0):#x}  "
+        f"{record.get('messageType', 'Default')}  {record.get('activityIdentifier', 0):#x}  "
+        f"{record.get('processID', 0)}  0  {source}{record['eventMessage']}"
+    )
+
 
 class LogMonitor:
     """Monitor and analyze iOS simulator logs with intelligent filtering."""
@@ -48,6 +358,10 @@ class LogMonitor:
         app_bundle_id: str | None = None,
         device_udid: str | None = None,
         severity_filter: list[str] | None = None,
+        *,
+        max_lines: int = DEFAULT_MAX_LINES,
+        dedup_size: int = DEFAULT_DEDUP_SIZE,
+        style: str = "ndjson",
     ):
         """
         Initialize log monitor.
@@ -56,13 +370,23 @@ class LogMonitor:
             app_bundle_id: Filter logs by app bundle ID
             device_udid: Device UDID (uses booted if not specified)
             severity_filter: List of severities to include (error, warning, info, debug)
+            max_lines: Recent raw lines kept in memory (older lines only go
+                to the log file, if one was started)
+            dedup_size: Message signatures remembered for deduplication
+                (least recently seen forgotten first)
+            style: `log stream` output style for live streaming: 'ndjson'
+                (structured fields) or 'text' (classic human-readable lines)
         """
         self.app_bundle_id = app_bundle_id
+        self.app_name = app_bundle_id.split(".")[-1] if app_bundle_id else None
+        self.style = style
         self.device_udid = device_udid or "booted"
         self.severity_filter = severity_filter or ["error", "warning", "info", "debug"]
 
-        # Log storage
-        self.log_lines: list[str] = []
+        # Log storage (bounded; see start_log_file() for a complete copy)
+        self.log_lines: deque[str] = deque(maxlen=max_lines)
+        self.log_file: Path | None = None
+        self._log_handle = None
         self.errors: list[str] = []
         self.warnings: list[str] = []
         self.info_messages: list[str] = []
@@ -73,9 +397,14 @@ class LogMonitor:
         self.info_count = 0
         self.debug_count = 0
         self.total_lines = 0
+        self.last_seen: str | None = None  # Timestamp of the last processed line
+
+        # Deduplication (LRU of message signatures)
+        self.seen_messages: OrderedDict[str, None] = OrderedDict()
+        self.dedup_size = dedup_size
 
-        # Deduplication
-        self.seen_messages: set[str] = set()
+        # Message templates of every line that passes the severity filter
+        self.templates = LogTemplateMiner()
 
         # Process control
         self.log_process: subprocess.Popen | None = None
@@ -119,37 +448,14 @@ class LogMonitor:
         Returns:
             Severity level (error, warning, info, debug) or None
         """
-        line_lower = line.lower()
-
-        # Error patterns
-        error_patterns = [
-            r"\berror\b",
-            r"\bfault\b",
-            r"\bfailed\b",
-            r"\bexception\b",
-            r"\bcrash\b",
-            r"❌",
-        ]
-
-        # Warning patterns
-        warning_patterns = [r"\bwarning\b", r"\bwarn\b", r"\bdeprecated\b", r"⚠️"]
-
-        # Info patterns
-        info_patterns = [r"\binfo\b", r"\bnotice\b", r"ℹ️"]
-
-        for pattern in error_patterns:
-            if re.search(pattern, line_lower):
-                return "error"
-
-        for pattern in warning_patterns:
-            if re.search(pattern, line_lower):
-                return "warning"
-
-        for pattern in info_patterns:
-            if re.search(pattern, line_lower):
-                return "info"
-
-        return "debug"
+        severity = "debug"
+        for word, emoji in KEYWORD_RE.findall(line.lower()):
+            found = KEYWORD_SEVERITY[word or emoji]
+            if found == "error":
+                return found  # Nothing outranks an error
+            if SEVERITY_RANK[found] > SEVERITY_RANK[severity]:
+                severity = found
+        return severity
 
     def deduplicate_message(self, line: str) -> bool:
         """
@@ -162,53 +468,156 @@ class LogMonitor:
             True if this is a new message, False if duplicate
         """
         # Create signature by removing timestamps and process IDs
-        signature = re.sub(r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}", "", line)
-        signature = re.sub(r"\[\d+\]", "", signature)
-        signature = re.sub(r"\s+", " ", signature).strip()
+        signature = TIMESTAMP_RE.sub("", line)
+        signature = PID_RE.sub("", signature)
+        signature = WHITESPACE_RE.sub(" ", signature).strip()
 
         if signature in self.seen_messages:
+            self.seen_messages.move_to_end(signature)
             return False
 
-        self.seen_messages.add(signature)
+        self.seen_messages[signature] = None
+        if len(self.seen_messages) > self.dedup_size:
+            self.seen_messages.popitem(last=False)
         return True
 
-    def process_log_line(self, line: str):
+    def matches_app(self, record: dict) -> bool:
+        """Whether an ndjson record belongs to the monitored app (by process or subsystem)."""
+        if not self.app_bundle_id:
+            return True
+        return self.app_name in record.get("processImagePath", "") or record.get(
+            "subsystem", ""
+        ).startswith(self.app_bundle_id)
+
+    def process_log_line(self, line: str) -> str | None:
         """
-        Process a single log line.
+        Process a single log line (ndjson record or text line).
+
+        ndjson records get their severity from messageType (keywords only
+        for "Default" messages) and are filtered by app on their fields;
+        text lines are classified by keywords.
 
         Args:
             line: Log line to process
+
+        Returns:
+            Severity of the line if it passes the app and severity filters, else None
         """
         if not line.strip():
-            return
+            return None
+
+        record = parse_log_record(line)
+        if record is not None:
+            if not self.matches_app(record):
+                return None
+            message = record["eventMessage"]
+            text = format_log_record(record)
+            severity = MESSAGE_TYPE_SEVERITY.get(record.get("messageType"))
+            severity = severity or self.classify_log_line(message)
+            seen = record.get("timestamp")
+            process = record.get("processImagePath", "").rsplit("/", 1)[-1]
+            signature_text = f"{process} {record.get('subsystem', '')} {message}"
+        else:
+            if line.startswith("{") or line.startswith("Filtering the log data"):
+                return None  # Non-event JSON or the `log` banner
+            if self.app_bundle_id and self.app_name not in line and self.app_bundle_id not in line:
+                return None
+            text = signature_text = line
+            severity = self.classify_log_line(line)
+            header = LOG_HEADER_RE.match(line)
+            message = line[header.end() :] if header else line
+            seen = header.group(1) if header else None
 
         self.total_lines += 1
-        self.log_lines.append(line)
-
-        # Classify severity
-        severity = self.classify_log_line(line)
+        self.last_seen = seen
+        self.log_lines.append(text)
+        if self._log_handle:
+            self._log_handle.write(line + "\n")  # Raw, so saved ndjson can be re-ingested
 
         # Skip if not in filter
         if severity not in self.severity_filter:
-            return
+            return None
+
+        self.templates.add(message, severity, seen)
 
         # Deduplicate (for errors and warnings)
-        if severity in ["error", "warning"] and not self.deduplicate_message(line):
-            return
+        if severity in ["error", "warning"] and not self.deduplicate_message(signature_text):
+            return severity
 
         # Store by severity
         if severity == "error":
             self.error_count += 1
-            self.errors.append(line)
+            if len(self.errors) < MAX_STORED_MESSAGES:
+                self.errors.append(text)
         elif severity == "warning":
             self.warning_count += 1
-            self.warnings.append(line)
+            if len(self.warnings) < MAX_STORED_MESSAGES:
+                self.warnings.append(text)
         elif severity == "info":
             self.info_count += 1
             if len(self.info_messages) < 20:  # Keep only recent info
-                self.info_messages.append(line)
+                self.info_messages.append(text)
         else:  # debug
             self.debug_count += 1
+        return severity
+
+    def recent_lines(self, count: int = 50) -> list[str]:
+        """Last count raw lines (oldest first)."""
+        return list(islice(self.log_lines, max(0, len(self.log_lines) - count), None))
+
+    def start_log_file(self, output_dir: str, suffix: str = ".log") -> Path:
+        """
+        Write every processed line to a log file as it arrives.
+
+        The in-memory buffer only holds the most recent lines, so call this
+        before streaming when the complete log is wanted (save_logs() then
+        reuses this file). Lines are written as received, so an ndjson
+        stream is saved as ndjson and can be replayed with ingest().
+
+        Args:
+            output_dir: Directory to save logs
+            suffix: File suffix ('.ndjson' for ndjson streams)
+
+        Returns:
+            Path to the log file
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.log_file = output_path / f"{self.app_name or 'simulator'}-{timestamp}{suffix}"
+        self._log_handle = open(self.log_file, "w")  # noqa: SIM115 - closed by save_logs()
+        return self.log_file
+
+    def build_stream_command(self, last_minutes: float | None = None) -> list[str]:
+        """
+        `log stream` command for this monitor's device, style and app filter.
+
+        Args:
+            last_minutes: Start from N minutes ago
+
+        Returns:
+            Command argument list
+        """
+        cmd = ["xcrun", "simctl", "spawn", self.device_udid, "log", "stream"]
+        if self.style == "ndjson":
+            cmd.extend(["--style", "ndjson"])
+
+        # Add filters (ndjson records are also checked field by field)
+        if self.app_bundle_id:
+            cmd.extend(
+                [
+                    "--predicate",
+                    f'processImagePath CONTAINS "{self.app_name}" '
+                    f'OR subsystem BEGINSWITH "{self.app_bundle_id}"',
+                ]
+            )
+
+        # Add time filter for historical logs
+        if last_minutes:
+            start_time = datetime.now() - timedelta(minutes=last_minutes)
+            time_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
+            cmd.extend(["--start", time_str])
+        return cmd
 
     def stream_logs(
         self,
@@ -227,20 +636,7 @@ class LogMonitor:
         Returns:
             True if successful
         """
-        # Build log stream command
-        cmd = ["xcrun", "simctl", "spawn", self.device_udid, "log", "stream"]
-
-        # Add filters
-        if self.app_bundle_id:
-            # Filter by process name (extracted from bundle ID)
-            app_name = self.app_bundle_id.split(".")[-1]
-            cmd.extend(["--predicate", f'processImagePath CONTAINS "{app_name}"'])
-
-        # Add time filter for historical logs
-        if last_minutes:
-            start_time = datetime.now() - timedelta(minutes=last_minutes)
-            time_str = start_time.strftime("%Y-%m-%d %H:%M:%S")
-            cmd.extend(["--start", time_str])
+        cmd = self.build_stream_command(last_minutes)
 
         # Setup signal handler for graceful interruption
         def signal_handler(sig, frame):
@@ -268,14 +664,13 @@ class LogMonitor:
                 if not line:
                     break
 
-                # Process the line
-                self.process_log_line(line.rstrip())
+                # Process the line (classified once)
+                line = line.rstrip()
+                severity = self.process_log_line(line)
 
                 # Print in follow mode
-                if follow:
-                    severity = self.classify_log_line(line)
-                    if severity in self.severity_filter:
-                        print(line.rstrip())
+                if follow and severity:
+                    print(self.log_lines[-1])
 
                 # Check duration
                 if duration and (datetime.now() - start_time).total_seconds() >= duration:
@@ -297,6 +692,29 @@ class LogMonitor:
             if self.log_process:
                 self.log_process.terminate()
 
+    def ingest(self, source: str) -> bool:
+        """
+        Process a saved log (ndjson or text, detected per line) at full read speed.
+
+        Args:
+            source: File path, or '-' for stdin
+
+        Returns:
+            True if the source was read completely
+        """
+        try:
+            stream = sys.stdin if source == "-" else open(source, errors="replace")  # noqa: SIM115
+        except OSError as e:
+            print(f"Error reading logs: {e}", file=sys.stderr)
+            return False
+        try:
+            for line in stream:
+                self.process_log_line(line.rstrip())
+            return True
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
     def get_summary(self, verbose: bool = False) -> str:
         """
         Get log summary.
@@ -321,40 +739,50 @@ class LogMonitor:
             f"Errors: {self.error_count}, Warnings: {self.warning_count}, Info: {self.info_count}"
         )
 
-        # Top issues
-        if self.errors:
-            lines.append(f"\nTop Errors ({len(self.errors)}):")
-            for error in self.errors[:5]:  # Show first 5
-                lines.append(f"  ❌ {error[:120]}")  # Truncate long lines
+        lines.append(f"Templates: {len(self.templates)}")
 
-        if self.warnings:
-            lines.append(f"\nTop Warnings ({len(self.warnings)}):")
-            for warning in self.warnings[:5]:  # Show first 5
-                lines.append(f"  ⚠️  {warning[:120]}")
+        # Top issues, as templates ranked by frequency
+        for severity, title, icon in (("error", "Errors", "❌"), ("warning", "Warnings", "⚠️ ")):
+            ranked = self.templates.top(severity=severity)
+            if not ranked:
+                continue
+            lines.append(f"\nTop {title} ({len(ranked)} templates):")
+            for template in ranked[:5]:  # Show top 5
+                count = template.severities[severity]
+                lines.append(f"  {icon} {count}x {template.text[:120]}")
 
         # Verbose output
         if verbose and self.log_lines:
             lines.append("\n=== Recent Log Lines ===")
-            for line in self.log_lines[-50:]:  # Last 50 lines
-                lines.append(line)
+            lines.extend(self.recent_lines(50))
 
         return "\n".join(lines)
 
+    def get_statistics(self) -> dict:
+        """Line and severity counts."""
+        return {
+            "total_lines": self.total_lines,
+            "errors": self.error_count,
+            "warnings": self.warning_count,
+            "info": self.info_count,
+            "debug": self.debug_count,
+        }
+
     def get_json_output(self) -> dict:
         """Get log results as JSON."""
         return {
             "app_bundle_id": self.app_bundle_id,
             "device_udid": self.device_udid,
-            "statistics": {
-                "total_lines": self.total_lines,
-                "errors": self.error_count,
-                "warnings": self.warning_count,
-                "info": self.info_count,
-                "debug": self.debug_count,
+            "statistics": self.get_statistics(),
+            "templates": [t.to_dict() for t in self.templates.top(50)],
+            "template_stats": {
+                "templates": len(self.templates),
+                "lines": self.templates.lines,
+                "evicted": self.templates.evicted,
             },
             "errors": self.errors[:20],  # Limit to 20
             "warnings": self.warnings[:20],
-            "sample_logs": self.log_lines[-50:],  # Last 50 lines
+            "sample_logs": self.recent_lines(50),
         }
 
     def save_logs(self, output_dir: str) -> str:
@@ -367,25 +795,428 @@ class LogMonitor:
         Returns:
             Path to saved log file
         """
-        # Create output directory
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        if self._log_handle:
+            # Lines were written as they arrived
+            self._log_handle.close()
+            self._log_handle = None
+            log_file = self.log_file
+        else:
+            # Write the buffered (most recent) lines
+            log_file = self.start_log_file(output_dir)
+            self._log_handle.write("\n".join(self.log_lines))
+            self._log_handle.close()
+            self._log_handle = None
+
+        # Also save JSON summary
+        json_file = log_file.with_name(f"{log_file.stem}-summary.json")
+        with open(json_file, "w") as f:
+            json.dump(self.get_json_output(), f, indent=2)
+
+        return str(log_file)
+
+
+@dataclass
+class TimelineEntry:
+    """One filtered entry of the merged multi-device timeline."""
+
+    timestamp: float  # Log timestamp in epoch seconds (arrival time if the line has none)
+    device: str  # Device tag (UDID prefix)
+    severity: str
+    line: str
+
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(timespec="microseconds"),
+            "device": self.device,
+            "severity": self.severity,
+            "line": self.line,
+        }
+
 
-        # Generate filename with timestamp
+class MultiDeviceLogMonitor:
+    """
+    Stream logs from several simulators at once into one merged timeline.
+
+    A single asyncio loop reads every device's `log stream`, so there is
+    no thread per device. Readers share a bounded queue: when analysis
+    falls behind, they stop reading, the pipes fill and `log` itself is
+    throttled instead of lines piling up in memory. Each device keeps its
+    own LogMonitor (statistics, deduplication, templates) with an equal
+    share of the line, signature and template budgets, so memory stays
+    flat as devices are added.
+
+    Entries passing the filters are merged by log timestamp. An entry is
+    released once every open stream has logged past it, or after the
+    reorder window, whichever comes first.
+
+    Example:
+        monitor = MultiDeviceLogMonitor([udid_a, udid_b], app_bundle_id="com.myapp.MyApp")
+        monitor.stream_logs(duration=30)
+        for entry in monitor.timeline:
+            print(entry.device, entry.line)
+    """
+
+    def __init__(
+        self,
+        device_udids: list[str],
+        app_bundle_id: str | None = None,
+        severity_filter: list[str] | None = None,
+        *,
+        max_lines: int = DEFAULT_MAX_LINES,
+        dedup_size: int = DEFAULT_DEDUP_SIZE,
+        style: str = "ndjson",
+        reorder_window: float = DEFAULT_REORDER_WINDOW,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        """
+        Initialize a multi-device monitor.
+
+        Args:
+            device_udids: Devices to stream from
+            app_bundle_id: Filter logs by app bundle ID
+            severity_filter: List of severities to include (error, warning, info, debug)
+            max_lines: Timeline entries kept, and the line budget shared by
+                the per-device monitors
+            dedup_size: Message signatures remembered, shared by the devices
+            style: `log stream` output style ('ndjson' or 'text')
+            reorder_window: Seconds an entry waits for earlier entries from
+                slower devices before it is released out of order
+            queue_size: Lines buffered between the stream readers and analysis
+
+        Raises:
+            ValueError: If no devices are given
+        """
+        if not device_udids:
+            raise ValueError("At least one device is required")
+        devices = list(dict.fromkeys(device_udids))
+        share = len(devices)
+        self.app_bundle_id = app_bundle_id
+        self.monitors: dict[str, LogMonitor] = {}
+        for udid in devices:
+            monitor = LogMonitor(
+                app_bundle_id=app_bundle_id,
+                device_udid=udid,
+                severity_filter=severity_filter,
+                max_lines=max(MIN_DEVICE_BUDGET, max_lines // share),
+                dedup_size=max(MIN_DEVICE_BUDGET, dedup_size // share),
+                style=style,
+            )
+            monitor.templates = LogTemplateMiner(
+                max_templates=max(MIN_DEVICE_TEMPLATES, DEFAULT_MAX_TEMPLATES // share)
+            )
+            self.monitors[udid] = monitor
+        self.tags = {udid: udid[:8] for udid in devices}
+        self.reorder_window = reorder_window
+        self.queue_size = queue_size
+
+        self.timeline: deque[TimelineEntry] = deque(maxlen=max_lines)
+        self.out_of_order = 0  # Entries released before an earlier one arrived
+        self.timeline_file: Path | None = None
+        self._timeline_handle = None
+        self._pending: list[tuple[float, int, float, TimelineEntry]] = []
+        self._sequence = 0
+        self._latest: dict[str, float] = {}  # Last log timestamp per open stream
+        self._done: set[str] = set()  # Devices whose stream has ended
+        self._last_released = float("-inf")
+        self._processes: dict[str, asyncio.subprocess.Process] = {}
+        self.interrupted = False
+
+    def _release(self, follow: bool, drain: bool = False) -> None:
+        """Move pending entries that can no longer be preceded onto the timeline."""
+        open_streams = [self._latest.get(udid) for udid in self.monitors if udid not in self._done]
+        if None in open_streams:
+            watermark = float("-inf")  # A stream that hasn't logged yet could still be earliest
+        else:
+            watermark = min(open_streams, default=float("inf"))
+        deadline = time.monotonic() - self.reorder_window
+        pending = self._pending
+        while pending and (drain or pending[0][0] <= watermark or pending[0][2] <= deadline):
+            _, _, _, entry = heapq.heappop(pending)
+            if entry.timestamp < self._last_released:
+                self.out_of_order += 1
+            self._last_released = max(self._last_released, entry.timestamp)
+            self.timeline.append(entry)
+            text = f"[{entry.device}] {entry.line}"
+            if self._timeline_handle:
+                self._timeline_handle.write(text + "\n")
+            if follow:
+                print(text)
+
+    async def _read(self, udid: str, cmd: list[str], queue: asyncio.Queue) -> None:
+        """Feed one device's stream into the shared queue (waits while the queue is full)."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=STREAM_LINE_LIMIT,
+            )
+        except OSError as e:
+            print(f"Error streaming logs from {udid}: {e}", file=sys.stderr)
+            await queue.put((udid, None))
+            return
+        self._processes[udid] = process
+        try:
+            while True:
+                try:
+                    line = await process.stdout.readline()
+                except ValueError:  # Longer than STREAM_LINE_LIMIT
+                    continue
+                if not line:
+                    break
+                await queue.put((udid, line))
+        finally:
+            await queue.put((udid, None))
+
+    async def _run(self, follow: bool, duration: float | None, last_minutes: float | None) -> None:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        readers = [
+            asyncio.create_task(self._read(udid, monitor.build_stream_command(last_minutes), queue))
+            for udid, monitor in self.monitors.items()
+        ]
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self._interrupt)
+        deadline = time.monotonic() + duration if duration else None
+        try:
+            while len(self._done) < len(self.monitors) and not self.interrupted:
+                timeout = self.reorder_window
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.monotonic())
+                    if timeout <= 0:
+                        break
+                try:
+                    udid, raw = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    self._release(follow)
+                    continue
+                if raw is None:
+                    self._done.add(udid)
+                    self._latest.pop(udid, None)
+                    self._release(follow)
+                    continue
+
+                monitor = self.monitors[udid]
+                severity = monitor.process_log_line(raw.decode(errors="replace").rstrip())
+                timestamp = parse_log_timestamp(monitor.last_seen)
+                if timestamp is not None:
+                    self._latest[udid] = timestamp
+                if severity:
+                    self._sequence += 1
+                    entry = TimelineEntry(
+                        timestamp if timestamp is not None else time.time(),
+                        self.tags[udid],
+                        severity,
+                        monitor.log_lines[-1],
+                    )
+                    heapq.heappush(
+                        self._pending, (entry.timestamp, self._sequence, time.monotonic(), entry)
+                    )
+                self._release(follow)
+        finally:
+            loop.remove_signal_handler(signal.SIGINT)
+            for process in self._processes.values():
+                if process.returncode is None:
+                    process.terminate()
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            for process in self._processes.values():
+                await process.wait()
+            self._release(follow, drain=True)
+
+    def _interrupt(self) -> None:
+        self.interrupted = True
+        for process in self._processes.values():
+            if process.returncode is None:
+                process.terminate()
+
+    def stream_logs(
+        self,
+        follow: bool = False,
+        duration: float | None = None,
+        last_minutes: float | None = None,
+    ) -> bool:
+        """
+        Stream logs from every device until the streams end, the duration
+        passes or Ctrl+C.
+
+        Args:
+            follow: Print merged entries as they are released, tagged by device
+            duration: Capture duration in seconds
+            last_minutes: Show logs from last N minutes
+
+        Returns:
+            True if successful
+        """
+        try:
+            asyncio.run(self._run(follow, duration, last_minutes))
+            return True
+        except Exception as e:
+            print(f"Error streaming logs: {e}", file=sys.stderr)
+            return False
+
+    def start_log_files(self, output_dir: str, suffix: str = ".log") -> Path:
+        """
+        Write each device's lines to <output_dir>/<udid>/ and the merged
+        timeline to <output_dir>/timeline-<timestamp>.log as they arrive.
+
+        Returns:
+            Path to the timeline file
+        """
+        for udid, monitor in self.monitors.items():
+            monitor.start_log_file(str(Path(output_dir) / udid), suffix)
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        app_name = self.app_bundle_id.split(".")[-1] if self.app_bundle_id else "simulator"
-        log_file = output_path / f"{app_name}-{timestamp}.log"
+        self.timeline_file = Path(output_dir) / f"timeline-{timestamp}.log"
+        self._timeline_handle = open(self.timeline_file, "w")  # noqa: SIM115
+        return self.timeline_file
 
-        # Write all log lines
-        with open(log_file, "w") as f:
-            f.write("\n".join(self.log_lines))
+    def save_logs(self, output_dir: str) -> str:
+        """
+        Save per-device logs, the merged timeline and a JSON summary.
 
-        # Also save JSON summary
-        json_file = output_path / f"{app_name}-{timestamp}-summary.json"
+        Args:
+            output_dir: Directory to save logs
+
+        Returns:
+            Path to the timeline file
+        """
+        if not self._timeline_handle:
+            self.start_log_files(output_dir)
+            self._timeline_handle.write("".join(f"[{e.device}] {e.line}\n" for e in self.timeline))
+        self._timeline_handle.close()
+        self._timeline_handle = None
+        for monitor in self.monitors.values():
+            monitor.save_logs(str(Path(output_dir) / monitor.device_udid))
+
+        json_file = self.timeline_file.with_name(f"{self.timeline_file.stem}-summary.json")
         with open(json_file, "w") as f:
             json.dump(self.get_json_output(), f, indent=2)
+        return str(self.timeline_file)
 
-        return str(log_file)
+    def get_statistics(self) -> dict:
+        """Fleet-wide line and severity counts."""
+        totals: dict[str, int] = {}
+        for monitor in self.monitors.values():
+            for key, value in monitor.get_statistics().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def top_templates(self, severity: str, count: int = 5) -> list[tuple[str, int, list[str]]]:
+        """
+        Templates merged across devices by text, ranked by frequency.
+
+        Returns:
+            (template text, count at this severity, device tags) tuples
+        """
+        merged: dict[str, list] = {}
+        for udid, monitor in self.monitors.items():
+            for template in monitor.templates.top(severity=severity):
+                item = merged.setdefault(template.text, [template.text, 0, []])
+                item[1] += template.severities[severity]
+                item[2].append(self.tags[udid])
+        ranked = sorted(merged.values(), key=lambda item: item[1], reverse=True)
+        return [tuple(item) for item in ranked[:count]]
+
+    def get_summary(self, verbose: bool = False) -> str:
+        """
+        Get fleet log summary.
+
+        Args:
+            verbose: Include the most recent timeline entries
+
+        Returns:
+            Formatted summary string
+        """
+        stats = self.get_statistics()
+        target = self.app_bundle_id or "All processes"
+        lines = [
+            f"Logs for: {target} ({len(self.monitors)} devices)",
+            f"Total lines: {stats['total_lines']}",
+            f"Errors: {stats['errors']}, Warnings: {stats['warnings']}, Info: {stats['info']}",
+            "",
+            "Devices:",
+        ]
+        for udid, monitor in self.monitors.items():
+            lines.append(
+                f"  {self.tags[udid]}: {monitor.total_lines} lines, "
+                f"{monitor.error_count} errors, {monitor.warning_count} warnings, "
+                f"{len(monitor.templates)} templates"
+            )
+
+        for severity, title, icon in (("error", "Errors", "❌"), ("warning", "Warnings", "⚠️ ")):
+            ranked = self.top_templates(severity)
+            if not ranked:
+                continue
+            lines.append(f"\nTop {title}:")
+            for text, count, tags in ranked:
+                lines.append(f"  {icon} {count}x {text[:100]} [{', '.join(tags)}]")
+
+        if verbose and self.timeline:
+            lines.append("\n=== Recent Timeline ===")
+            start = max(0, len(self.timeline) - 50)
+            lines.extend(f"[{e.device}] {e.line}" for e in islice(self.timeline, start, None))
+
+        return "\n".join(lines)
+
+    def get_json_output(self) -> dict:
+        """Get fleet log results as JSON."""
+        start = max(0, len(self.timeline) - 50)
+        return {
+            "app_bundle_id": self.app_bundle_id,
+            "statistics": self.get_statistics(),
+            "devices": {
+                udid: {"tag": self.tags[udid], **monitor.get_statistics()}
+                for udid, monitor in self.monitors.items()
+            },
+            "templates": {
+                severity: [
+                    {"template": text, "count": count, "devices": tags}
+                    for text, count, tags in self.top_templates(severity, 20)
+                ]
+                for severity in ("error", "warning")
+            },
+            "timeline_stats": {"entries": len(self.timeline), "out_of_order": self.out_of_order},
+            "timeline": [e.to_dict() for e in islice(self.timeline, start, None)],
+        }
+
+
+def run_multi_device(args: argparse.Namespace, severity_filter: list[str] | None) -> int:
+    """Stream several devices (--devices) and print the fleet summary."""
+    try:
+        if args.devices.strip().lower() == "booted":
+            udids = [sim["udid"] for sim in list_simulators(state="booted")]
+        else:
+            udids = [resolve_device_identifier(d.strip()) for d in args.devices.split(",")]
+        monitor = MultiDeviceLogMonitor(
+            udids,
+            app_bundle_id=args.app_bundle_id,
+            severity_filter=severity_filter,
+            style=args.style,
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    parse = next(iter(monitor.monitors.values())).parse_time_duration
+    duration = parse(args.duration) if args.duration else None
+    last_minutes = parse(args.last_minutes) / 60 if args.last_minutes else None
+
+    if args.output:
+        monitor.start_log_files(args.output, ".ndjson" if args.style == "ndjson" else ".log")
+
+    print(f"Monitoring logs on {len(monitor.monitors)} devices...", file=sys.stderr)
+    if not monitor.stream_logs(follow=args.follow, duration=duration, last_minutes=last_minutes):
+        return 1
+
+    if args.output:
+        print(f"\nLogs saved to: {monitor.save_logs(args.output)}", file=sys.stderr)
+
+    if not args.follow:
+        if args.json:
+            print(json.dumps(monitor.get_json_output(), indent=2))
+        else:
+            print("\n" + monitor.get_summary(verbose=args.verbose))
+    return 0
 
 
 def main():
@@ -406,6 +1237,12 @@ Examples:
 
   # Save logs to file
   python scripts/log_monitor.py --app com.myapp.MyApp --duration 1m --output logs/
+
+  # Re-analyze a saved ndjson log offline
+  python scripts/log_monitor.py --input logs/MyApp-20250101-120000.ndjson --json
+
+  # All booted simulators, merged into one timeline tagged by device
+  python scripts/log_monitor.py --devices booted --app com.myapp.MyApp --duration 1m
         """,
     )
 
@@ -414,6 +1251,10 @@ Examples:
         "--app", dest="app_bundle_id", help="App bundle ID to filter logs (e.g., com.myapp.MyApp)"
     )
     parser.add_argument("--device-udid", help="Device UDID (uses booted if not specified)")
+    parser.add_argument(
+        "--devices",
+        help="Stream several devices at once: comma-separated UDIDs/names, or 'booted' for all",
+    )
     parser.add_argument(
         "--severity", help="Comma-separated severity levels (error,warning,info,debug)"
     )
@@ -427,6 +1268,15 @@ Examples:
     time_group.add_argument(
         "--last", dest="last_minutes", help="Show logs from last N minutes (e.g., 5m)"
     )
+    time_group.add_argument(
+        "--input", help="Analyze a saved ndjson/text log instead of streaming ('-' = stdin)"
+    )
+    parser.add_argument(
+        "--style",
+        choices=LOG_STYLES,
+        default="ndjson",
+        help="log stream output style (default: ndjson; text for the classic format)",
+    )
 
     # Output options
     parser.add_argument("--output", help="Save logs to directory")
@@ -440,11 +1290,17 @@ Examples:
     if args.severity:
         severity_filter = [s.strip().lower() for s in args.severity.split(",")]
 
+    if args.devices:
+        if args.input:
+            parser.error("--devices streams live logs; it cannot be combined with --input")
+        sys.exit(run_multi_device(args, severity_filter))
+
     # Initialize monitor
     monitor = LogMonitor(
         app_bundle_id=args.app_bundle_id,
         device_udid=args.device_udid,
         severity_filter=severity_filter,
+        style=args.style,
     )
 
     # Parse duration
@@ -457,12 +1313,25 @@ Examples:
     if args.last_minutes:
         last_minutes = monitor.parse_time_duration(args.last_minutes) / 60
 
-    # Stream logs
-    print("Monitoring logs...", file=sys.stderr)
-    if args.app_bundle_id:
-        print(f"App: {args.app_bundle_id}", file=sys.stderr)
-
-    success = monitor.stream_logs(follow=args.follow, duration=duration, last_minutes=last_minutes)
+    # Full log goes to disk as it streams; memory holds only recent lines
+    if args.output:
+        if args.input:
+            suffix = Path(args.input).suffix if args.input != "-" else ".log"
+        else:
+            suffix = ".ndjson" if args.style == "ndjson" else ".log"
+        monitor.start_log_file(args.output, suffix or ".log")
+
+    if args.input:
+        success = monitor.ingest(args.input)
+    else:
+        # Stream logs
+        print("Monitoring logs...", file=sys.stderr)
+        if args.app_bundle_id:
+            print(f"App: {args.app_bundle_id}", file=sys.stderr)
+
+        success = monitor.stream_logs(
+            follow=args.follow, duration=duration, last_minutes=last_minutes
+        )
 
     if not success:
         sys.exit(1)
@@ -13,6 +13,7 @@ Key Features:
 - Find elements by text (fuzzy or exact matching)
 - Find elements by type (Button, TextField, etc.)
 - Find elements by accessibility identifier
+- Selector queries (e.g. 'NavigationBar Button[text~=back]')
 - Tap elements at their center point
 - Enter text into text fields
 - List all tappable elements on screen
@@ -28,6 +29,9 @@ Usage Examples:
     # Tap element by accessibility ID
     python scripts/navigator.py --find-id "submitButton" --tap --udid <device-id>
 
+    # Tap the second Cell inside a Table via selector
+    python scripts/navigator.py --selector "Table Cell:nth(1)" --tap --udid <device-id>
+
     # List all interactive elements
     python scripts/navigator.py --list --udid <device-id>
 
@@ -48,7 +52,7 @@ Navigation Priority (best to worst):
 Technical Details:
 - Uses IDB's accessibility tree via `idb ui describe-all --json --nested`
 - Caches tree for multiple operations (call with force_refresh to update)
-- Finds elements by parsing tree recursively
+- Finds elements through an ElementIndex built once per tree snapshot
 - Calculates tap coordinates from element frame center
 - Uses `idb ui tap` for tapping, `idb ui text` for text entry
 - Extracts data from AXLabel, AXValue, and AXUniqueId fields
@@ -61,10 +65,14 @@ import sys
 from dataclasses import dataclass
 
 from common import (
-    flatten_tree,
+    ElementIndex,
+    build_idb_command,
     get_accessibility_tree,
     get_device_screen_size,
+    iter_tree,
+    parse_selector,
     resolve_udid,
+    run_command,
     transform_screenshot_coords,
 )
 
@@ -101,38 +109,39 @@ class Navigator:
     def __init__(self, udid: str | None = None):
         """Initialize navigator with optional device UDID."""
         self.udid = udid
-        self._tree_cache = None
+        self._index: ElementIndex | None = None
 
     def get_accessibility_tree(self, force_refresh: bool = False) -> dict:
-        """Get accessibility tree (cached for efficiency)."""
-        if self._tree_cache and not force_refresh:
-            return self._tree_cache
+        """Get accessibility tree (shared cache, invalidated by taps and text entry)."""
+        return get_accessibility_tree(self.udid, nested=True, max_age=0 if force_refresh else None)
 
-        # Delegate to shared utility
-        self._tree_cache = get_accessibility_tree(self.udid, nested=True)
-        return self._tree_cache
+    def get_index(self) -> ElementIndex:
+        """Element index for the current tree (rebuilt only when the tree changes)."""
+        tree = self.get_accessibility_tree()
+        if self._index is None or self._index.tree is not tree:
+            self._index = ElementIndex(tree)
+        return self._index
+
+    @staticmethod
+    def _to_element(node: dict) -> Element:
+        return Element(
+            type=node.get("type") or "Unknown",
+            label=node.get("AXLabel"),
+            value=node.get("AXValue"),
+            identifier=node.get("AXUniqueId"),
+            frame=node.get("frame", {}),
+            traits=node.get("traits", []),
+            enabled=node.get("enabled", True),
+        )
 
     def _flatten_tree(self, node: dict, elements: list[Element] | None = None) -> list[Element]:
         """Flatten accessibility tree into list of elements."""
         if elements is None:
             elements = []
 
-        # Create element from node
-        if node.get("type"):
-            element = Element(
-                type=node.get("type", "Unknown"),
-                label=node.get("AXLabel"),
-                value=node.get("AXValue"),
-                identifier=node.get("AXUniqueId"),
-                frame=node.get("frame", {}),
-                traits=node.get("traits", []),
-                enabled=node.get("enabled", True),
-            )
-            elements.append(element)
-
-        # Process children
-        for child in node.get("children", []):
-            self._flatten_tree(child, elements)
+        for view in iter_tree(node):
+            if view.node.get("type"):
+                elements.append(self._to_element(view.node))
 
         return elements
 
@@ -143,6 +152,8 @@ class Navigator:
         identifier: str | None = None,
         index: int = 0,
         fuzzy: bool = True,
+        *,
+        selector: str | None = None,
     ) -> Element | None:
         """
         Find element by various criteria.
@@ -153,44 +164,38 @@ class Navigator:
             identifier: Accessibility identifier
             index: Which matching element to return (0-based)
             fuzzy: Use fuzzy matching for text
+            selector: Selector query (replaces the other criteria), e.g.
+                'NavigationBar Button[text~=back]'
 
         Returns:
             Element if found, None otherwise
-        """
-        tree = self.get_accessibility_tree()
-        elements = self._flatten_tree(tree)
 
-        matches = []
-
-        for elem in elements:
-            # Skip disabled elements
-            if not elem.enabled:
-                continue
-
-            # Check type
-            if element_type and elem.type != element_type:
-                continue
-
-            # Check identifier (exact match)
-            if identifier and elem.identifier != identifier:
-                continue
-
-            # Check text (in label or value)
-            if text:
-                elem_text = (elem.label or "") + " " + (elem.value or "")
-                if fuzzy:
-                    if text.lower() not in elem_text.lower():
-                        continue
-                elif text not in (elem.label, elem.value):
-                    continue
-
-            matches.append(elem)
+        Raises:
+            ValueError: If selector is malformed
+        """
+        element_index = self.get_index()
+        if selector:
+            matches = element_index.select(selector)
+        else:
+            matches = element_index.find(text, element_type, identifier, fuzzy)
 
         if matches and index < len(matches):
-            return matches[index]
+            return self._to_element(element_index.nodes[matches[index]])
 
         return None
 
+    def element_at(self, x: int, y: int) -> Element | None:
+        """Innermost element at a point."""
+        element_index = self.get_index()
+        pos = element_index.element_at(x, y)
+        return self._to_element(element_index.nodes[pos]) if pos is not None else None
+
+    def nearest_element(self, x: int, y: int, element_type: str | None = None) -> Element | None:
+        """Enabled element whose center is nearest to a point."""
+        element_index = self.get_index()
+        pos = element_index.nearest_to(x, y, element_type)
+        return self._to_element(element_index.nodes[pos]) if pos is not None else None
+
     def tap(self, element: Element) -> bool:
         """Tap on an element."""
         x, y = element.center
@@ -198,12 +203,10 @@ class Navigator:
 
     def tap_at(self, x: int, y: int) -> bool:
         """Tap at specific coordinates."""
-        cmd = ["idb", "ui", "tap", str(x), str(y)]
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui tap", self.udid, x, y)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -229,12 +232,10 @@ class Navigator:
             time.sleep(0.5)
 
         # Enter text
-        cmd = ["idb", "ui", "text", text]
-        if self.udid:
-            cmd.extend(["--udid", self.udid])
+        cmd = build_idb_command("ui text", self.udid, text)
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_command(cmd, udid=self.udid, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
@@ -245,6 +246,9 @@ class Navigator:
         element_type: str | None = None,
         identifier: str | None = None,
         index: int = 0,
+        fuzzy: bool = True,
+        *,
+        selector: str | None = None,
     ) -> tuple[bool, str]:
         """
         Find element and tap it.
@@ -252,10 +256,10 @@ class Navigator:
         Returns:
             (success, message) tuple
         """
-        element = self.find_element(text, element_type, identifier, index)
+        element = self.find_element(text, element_type, identifier, index, fuzzy, selector=selector)
 
         if not element:
-            criteria = []
+            criteria = [f"selector='{selector}'"] if selector else []
             if text:
                 criteria.append(f"text='{text}'")
             if element_type:
@@ -275,6 +279,8 @@ class Navigator:
         element_type: str | None = "TextField",
         identifier: str | None = None,
         index: int = 0,
+        *,
+        selector: str | None = None,
     ) -> tuple[bool, str]:
         """
         Find element and enter text into it.
@@ -282,7 +288,7 @@ class Navigator:
         Returns:
             (success, message) tuple
         """
-        element = self.find_element(find_text, element_type, identifier, index)
+        element = self.find_element(find_text, element_type, identifier, index, selector=selector)
 
         if not element:
             return (False, "TextField not found")
@@ -301,6 +307,9 @@ def main():
     parser.add_argument("--find-exact", help="Find element by exact text")
     parser.add_argument("--find-type", help="Element type (Button, TextField, etc.)")
     parser.add_argument("--find-id", help="Accessibility identifier")
+    parser.add_argument(
+        "--selector", help="Selector query, e.g. 'NavigationBar Button[text~=back]:nth(0)'"
+    )
     parser.add_argument("--index", type=int, default=0, help="Which match to use (0-based)")
 
     # Action options
@@ -343,6 +352,13 @@ def main():
 
     navigator = Navigator(udid=udid)
 
+    if args.selector:
+        try:
+            parse_selector(args.selector)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     # List mode
     if args.list:
         tree = navigator.get_accessibility_tree()
@@ -406,7 +422,12 @@ def main():
         fuzzy = args.find_text is not None
 
         success, message = navigator.find_and_tap(
-            text=text, element_type=args.find_type, identifier=args.find_id, index=args.index
+            text=text,
+            element_type=args.find_type,
+            identifier=args.find_id,
+            index=args.index,
+            fuzzy=fuzzy,
+            selector=args.selector,
         )
 
         print(message)
@@ -423,6 +444,7 @@ def main():
             element_type=args.find_type or "TextField",
             identifier=args.find_id,
             index=args.index,
+            selector=args.selector,
         )
 
         print(message)
@@ -440,6 +462,7 @@ def main():
             identifier=args.find_id,
             index=args.index,
             fuzzy=fuzzy,
+            selector=args.selector,
         )
 
         if element:
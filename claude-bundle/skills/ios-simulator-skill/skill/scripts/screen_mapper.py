@@ -49,7 +49,7 @@ import subprocess
 import sys
 from collections import defaultdict
 
-from common import get_accessibility_tree, resolve_udid
+from common import get_accessibility_tree, iter_tree, resolve_udid
 
 
 class ScreenMapper:
@@ -121,15 +121,16 @@ class ScreenMapper:
             "focusable": 0,
         }
 
-        self._analyze_recursive(node, analysis, depth)
+        for view in iter_tree(node, depth):
+            self._analyze_node(view.node, analysis)
 
         # Post-process for clean output
         analysis["elements_by_type"] = dict(analysis["elements_by_type"])
 
         return analysis
 
-    def _analyze_recursive(self, node: dict, analysis: dict, depth: int):
-        """Recursively analyze tree nodes."""
+    def _analyze_node(self, node: dict, analysis: dict):
+        """Analyze one tree node (children are visited by iter_tree)."""
         elem_type = node.get("type")
         label = node.get("AXLabel", "")
         value = node.get("AXValue", "")
@@ -170,10 +171,6 @@ class ScreenMapper:
             if "ViewController" in identifier or "Screen" in identifier:
                 analysis["screen_name"] = identifier
 
-        # Process children
-        for child in node.get("children", []):
-            self._analyze_recursive(child, analysis, depth + 1)
-
     def format_summary(self, analysis: dict, verbose: bool = False) -> str:
         """Format analysis as token-efficient summary."""
         lines = []
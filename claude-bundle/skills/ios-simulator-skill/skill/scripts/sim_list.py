@@ -39,11 +39,10 @@ Technical Details:
 
 import argparse
 import json
-import subprocess
 import sys
 from typing import Any
 
-from common import get_cache
+from common import get_cache, get_inventory
 
 
 class SimulatorLister:
@@ -68,15 +67,8 @@ class SimulatorLister:
             }
         """
         try:
-            result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "--json"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            return json.loads(result.stdout)
-        except (subprocess.CalledProcessError, json.JSONDecodeError):
+            return get_inventory().raw()
+        except RuntimeError:
             return {"devices": {}, "runtimes": []}
 
     def parse_devices(self, sim_data: dict) -> list[dict]:
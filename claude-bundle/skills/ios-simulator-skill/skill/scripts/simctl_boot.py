@@ -7,23 +7,39 @@ a ready state. It measures boot time and provides progress feedback.
 
 Key features:
 - Boot by UDID or device name
-- Wait for device readiness with configurable timeout
-- Measure boot performance
-- Batch boot operations (boot all, boot by type)
+- Wait for device readiness with configurable timeout (`simctl bootstatus`,
+  falling back to polling with exponential backoff)
+- Measure boot performance: boot command, data migration and ready phases
+  are recorded in a local history (--history for latency per device type
+  and runtime)
+- Batch boot operations (boot all, boot by type), several devices at once
+  with readiness waits overlapping (--concurrency)
 - Progress reporting for CI/CD pipelines
 """
 
 import argparse
 import subprocess
 import sys
+import threading
 import time
 from typing import Optional
 
+from common.boot_history import (
+    BootRecord,
+    format_boot_summary,
+    load_boot_history,
+    record_boot,
+    summarize_boot_history,
+)
+from common.device_inventory import get_inventory, invalidate_inventory
 from common.device_utils import (
-    get_booted_device_udid,
     list_simulators,
     resolve_device_identifier,
 )
+from common.fleet import DEFAULT_CONCURRENCY, FleetReport, progress_printer, run_fleet
+
+POLL_INITIAL_INTERVAL = 0.1  # Seconds before the first readiness re-check (fallback path)
+POLL_MAX_INTERVAL = 2.0  # Backoff cap between readiness checks
 
 
 class SimulatorBooter:
@@ -32,6 +48,7 @@ class SimulatorBooter:
     def __init__(self, udid: str | None = None):
         """Initialize booter with optional device UDID."""
         self.udid = udid
+        self.last_record: BootRecord | None = None  # Phase timings of the last boot
 
     def boot(self, wait_ready: bool = False, timeout_seconds: int = 120) -> tuple[bool, str]:
         """
@@ -50,18 +67,21 @@ class SimulatorBooter:
         start_time = time.time()
 
         # Check if already booted
+        device = None
         try:
-            booted = get_booted_device_udid()
-            if booted == self.udid:
+            device = get_inventory().get(self.udid)
+            if device and device["state"] == "Booted":
                 elapsed = time.time() - start_time
                 return True, (f"Device already booted: {self.udid} " f"[checked in {elapsed:.1f}s]")
         except RuntimeError:
-            pass  # No booted device, proceed with boot
+            pass  # Listing failed, proceed with boot
 
         # Execute boot command
+        boot_start = time.time()
         try:
             cmd = ["xcrun", "simctl", "boot", self.udid]
             result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=30)
+            invalidate_inventory()
 
             if result.returncode != 0:
                 error = result.stderr.strip()
@@ -71,33 +91,146 @@ class SimulatorBooter:
         except Exception as e:
             return False, f"Boot error: {e}"
 
+        device_type = (device["device_type_identifier"] or device["name"]) if device else None
+        record = BootRecord(
+            udid=self.udid,
+            device_type=device_type or "unknown",
+            runtime=device["runtime_name"] if device else "unknown",
+            method="none",
+            success=True,
+            boot_command=time.time() - boot_start,
+            timestamp=boot_start,
+        )
+        self.last_record = record
+
         # Optionally wait for readiness
         if wait_ready:
-            ready, wait_message = self._wait_for_ready(timeout_seconds)
+            ready, wait_message = self._wait_for_ready(timeout_seconds, record)
+            record.success = ready
+            record_boot(record)
             elapsed = time.time() - start_time
             if ready:
-                return True, (f"Device booted and ready: {self.udid} " f"[{elapsed:.1f}s total]")
+                migration = (
+                    f", data migration {record.data_migration:.1f}s"
+                    if record.data_migration
+                    else ""
+                )
+                return True, (
+                    f"Device booted and ready: {self.udid} "
+                    f"[{elapsed:.1f}s total: boot {record.boot_command:.1f}s{migration}]"
+                )
             return False, wait_message
 
+        record_boot(record)
         elapsed = time.time() - start_time
         return True, (
             f"Device booted: {self.udid} [boot in {elapsed:.1f}s] "
             "(use --wait-ready to wait for availability)"
         )
 
-    def _wait_for_ready(self, timeout_seconds: int = 120) -> tuple[bool, str]:
+    def _wait_for_ready(
+        self, timeout_seconds: float = 120, record: BootRecord | None = None
+    ) -> tuple[bool, str]:
         """
         Wait for device to reach ready state.
 
+        Blocks on `simctl bootstatus`, which returns as soon as the device
+        has finished booting. Falls back to polling when bootstatus is
+        unavailable or fails.
+
         Args:
             timeout_seconds: Maximum seconds to wait
+            record: Boot record to fill with the detection method, data
+                migration and ready timings
 
         Returns:
             (success, message) tuple
         """
         start_time = time.time()
-        poll_interval = 0.5
+        outcome = self._wait_bootstatus(timeout_seconds, record)
+        if outcome is None:
+            remaining = timeout_seconds - (time.time() - start_time)
+            outcome = self._poll_ready(remaining, record)
+        if record and outcome[0]:
+            record.ready = time.time() - start_time
+        return outcome
+
+    def _wait_bootstatus(
+        self, timeout_seconds: float, record: BootRecord | None = None
+    ) -> tuple[bool, str] | None:
+        """
+        Wait for readiness with `simctl bootstatus -b` (blocks until booted).
+
+        Data migration is timed from bootstatus's progress lines.
+
+        Returns:
+            (success, message), or None if bootstatus is unavailable or failed
+        """
+        start_time = time.time()
+        try:
+            process = subprocess.Popen(
+                ["xcrun", "simctl", "bootstatus", self.udid, "-b"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        except OSError:
+            return None
+        if record:
+            record.method = "bootstatus"
+
+        timed_out = threading.Event()
+
+        def expire() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(max(0.0, timeout_seconds), expire)
+        timer.start()
+        migration_start = migration_end = None
+        try:
+            # e.g. "Waiting on Data Migration", "Data Migration Complete", "Finished"
+            for line in process.stdout:
+                migrating = "data migration" in line.lower()
+                if migrating and migration_start is None:
+                    migration_start = time.time()
+                if migration_start and migration_end is None:
+                    if not migrating or "complete" in line.lower():
+                        migration_end = time.time()
+            process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+
+        elapsed = time.time() - start_time
+        if timed_out.is_set():
+            return False, (
+                f"Boot timeout: Device did not reach ready state "
+                f"within {elapsed:.1f}s (bootstatus)"
+            )
+        if process.returncode != 0:
+            return None
+        if record and migration_start:
+            record.data_migration = (migration_end or time.time()) - migration_start
+        return True, f"Device ready: {self.udid} [{elapsed:.1f}s, bootstatus]"
+
+    def _poll_ready(
+        self, timeout_seconds: float, record: BootRecord | None = None
+    ) -> tuple[bool, str]:
+        """
+        Poll `launchctl list` inside the device until it responds.
+
+        Checks start POLL_INITIAL_INTERVAL apart and back off exponentially
+        up to POLL_MAX_INTERVAL.
+
+        Returns:
+            (success, message) tuple
+        """
+        start_time = time.time()
+        interval = POLL_INITIAL_INTERVAL
         checks = 0
+        if record:
+            record.method = "poll"
 
         while time.time() - start_time < timeout_seconds:
             try:
@@ -119,7 +252,9 @@ class SimulatorBooter:
             except (subprocess.TimeoutExpired, RuntimeError):
                 pass  # Not ready yet
 
-            time.sleep(poll_interval)
+            remaining = timeout_seconds - (time.time() - start_time)
+            time.sleep(max(0.0, min(interval, remaining)))
+            interval = min(interval * 2, POLL_MAX_INTERVAL)
 
         elapsed = time.time() - start_time
         return False, (
@@ -128,52 +263,72 @@ class SimulatorBooter:
         )
 
     @staticmethod
-    def boot_all() -> tuple[int, int]:
+    def boot_many(
+        action: str,
+        udids: list[str],
+        *,
+        wait_ready: bool = False,
+        timeout_seconds: int = 120,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        device_timeout: float | None = None,
+        progress: bool = False,
+    ) -> FleetReport:
         """
-        Boot all available simulators.
+        Boot several simulators, up to `concurrency` at a time.
+
+        Args:
+            action: Name reported in the results
+            udids: Devices to boot
+            wait_ready: Wait for each device to be ready (waits overlap)
+            timeout_seconds: Maximum seconds to wait for each device's readiness
+            concurrency: Devices booted at once
+            device_timeout: Overall seconds allowed per device (None = no limit)
+            progress: Print one line per finished device to stderr
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
-        simulators = list_simulators(state="available")
-        succeeded = 0
-        failed = 0
+        return run_fleet(
+            action,
+            lambda udid: SimulatorBooter(udid=udid).boot(wait_ready, timeout_seconds),
+            udids,
+            concurrency=concurrency,
+            device_timeout=device_timeout,
+            on_result=progress_printer(len(udids)) if progress else None,
+        )
+
+    @staticmethod
+    def boot_all(**fleet_options) -> FleetReport:
+        """
+        Boot all available simulators.
 
-        for sim in simulators:
-            booter = SimulatorBooter(udid=sim["udid"])
-            success, _message = booter.boot(wait_ready=False)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
+        Args:
+            **fleet_options: wait_ready, timeout_seconds, concurrency,
+                device_timeout, progress (see boot_many())
 
-        return succeeded, failed
+        Returns:
+            FleetReport with per-device results and timing
+        """
+        simulators = list_simulators(state="available")
+        return SimulatorBooter.boot_many(
+            "boot_all", [sim["udid"] for sim in simulators], **fleet_options
+        )
 
     @staticmethod
-    def boot_by_type(device_type: str) -> tuple[int, int]:
+    def boot_by_type(device_type: str, **fleet_options) -> FleetReport:
         """
         Boot all simulators of a specific type.
 
         Args:
             device_type: Device type filter (e.g., "iPhone", "iPad")
+            **fleet_options: See boot_many()
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state="available")
-        succeeded = 0
-        failed = 0
-
-        for sim in simulators:
-            if device_type.lower() in sim["name"].lower():
-                booter = SimulatorBooter(udid=sim["udid"])
-                success, _message = booter.boot(wait_ready=False)
-                if success:
-                    succeeded += 1
-                else:
-                    failed += 1
-
-        return succeeded, failed
+        udids = [sim["udid"] for sim in simulators if device_type.lower() in sim["name"].lower()]
+        return SimulatorBooter.boot_many("boot_by_type", udids, **fleet_options)
 
 
 def main():
@@ -207,6 +362,22 @@ def main():
         "--type",
         help="Boot all simulators of a specific type (e.g., iPhone, iPad)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Devices booted at once with --all/--type (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--device-timeout",
+        type=float,
+        help="Overall seconds allowed per device with --all/--type (default: no limit)",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Show boot latency per device type and runtime from past boots",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -215,47 +386,43 @@ def main():
 
     args = parser.parse_args()
 
+    if args.history:
+        summary = summarize_boot_history(load_boot_history())
+        if args.json:
+            import json
+
+            print(json.dumps(summary, indent=2))
+        else:
+            print(format_boot_summary(summary))
+        sys.exit(0)
+
     # Handle batch operations
+    fleet_options = {
+        "wait_ready": args.wait_ready,
+        "timeout_seconds": args.timeout,
+        "concurrency": args.concurrency,
+        "device_timeout": args.device_timeout,
+        "progress": not args.json,
+    }
     if args.all:
-        succeeded, failed = SimulatorBooter.boot_all()
+        report = SimulatorBooter.boot_all(**fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "boot_all",
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict()))
         else:
-            total = succeeded + failed
-            print(f"Boot summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary("Boot"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.type:
-        succeeded, failed = SimulatorBooter.boot_by_type(args.type)
+        report = SimulatorBooter.boot_by_type(args.type, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "boot_by_type",
-                        "type": args.type,
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict(type=args.type)))
         else:
-            total = succeeded + failed
-            print(f"Boot {args.type} summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary(f"Boot {args.type}"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     # Resolve device identifier
     device_id = args.udid or args.name
@@ -284,6 +451,7 @@ def main():
                     "udid": udid,
                     "success": success,
                     "message": message,
+                    "timing": booter.last_record.to_dict() if booter.last_record else None,
                 }
             )
         )
@@ -18,6 +18,7 @@ import subprocess
 import sys
 from typing import Optional
 
+from common.device_inventory import invalidate_inventory
 from common.device_utils import list_simulators
 
 
@@ -109,6 +110,7 @@ class SimulatorCreator:
             ]
 
             result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=60)
+            invalidate_inventory()
 
             if result.returncode != 0:
                 error = result.stderr.strip() or result.stdout.strip()
@@ -8,7 +8,7 @@ Includes safety confirmation to prevent accidental deletion.
 Key features:
 - Delete by UDID or device name
 - Confirmation required for safety
-- Batch delete operations
+- Batch delete operations, several devices at once (--concurrency)
 - Report freed disk space estimate
 """
 
@@ -17,10 +17,18 @@ import subprocess
 import sys
 from typing import Optional
 
+from common.device_inventory import invalidate_inventory
 from common.device_utils import (
     list_simulators,
     resolve_device_identifier,
 )
+from common.fleet import (
+    DEFAULT_CONCURRENCY,
+    DeviceResult,
+    FleetReport,
+    progress_printer,
+    run_fleet,
+)
 
 
 class SimulatorDeleter:
@@ -58,6 +66,7 @@ class SimulatorDeleter:
         try:
             cmd = ["xcrun", "simctl", "delete", self.udid]
             result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=60)
+            invalidate_inventory()
 
             if result.returncode != 0:
                 error = result.stderr.strip() or result.stdout.strip()
@@ -71,59 +80,88 @@ class SimulatorDeleter:
             return False, f"Deletion error: {e}"
 
     @staticmethod
-    def delete_all(confirm: bool = False) -> tuple[int, int]:
+    def delete_many(
+        action: str,
+        udids: list[str],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        device_timeout: float | None = None,
+        progress: bool = False,
+    ) -> FleetReport:
+        """
+        Delete several simulators (already confirmed), up to `concurrency` at a time.
+
+        Args:
+            action: Name reported in the results
+            udids: Devices to delete
+            concurrency: Devices deleted at once
+            device_timeout: Overall seconds allowed per device (None = no limit)
+            progress: Print one line per finished device to stderr
+
+        Returns:
+            FleetReport with per-device results and timing
+        """
+        return run_fleet(
+            action,
+            lambda udid: SimulatorDeleter(udid=udid).delete(confirm=True),
+            udids,
+            concurrency=concurrency,
+            device_timeout=device_timeout,
+            on_result=progress_printer(len(udids)) if progress else None,
+        )
+
+    @staticmethod
+    def _cancelled(action: str, udids: list[str]) -> FleetReport:
+        """Report for a declined batch: every device counts as failed."""
+        report = FleetReport(action=action, concurrency=0)
+        report.results = [DeviceResult(udid, False, "Deletion cancelled", 0.0) for udid in udids]
+        return report
+
+    @staticmethod
+    def delete_all(confirm: bool = False, **fleet_options) -> FleetReport:
         """
         Delete all simulators permanently.
 
         Args:
             confirm: Skip confirmation prompt
+            **fleet_options: concurrency, device_timeout, progress (see delete_many())
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
-        simulators = list_simulators(state=None)
+        udids = [sim["udid"] for sim in list_simulators(state=None)]
 
         if not confirm:
-            count = len(simulators)
+            count = len(udids)
             try:
                 response = input(
                     f"Permanently delete ALL {count} simulators? " f"(type 'yes' to confirm): "
                 )
                 if response.lower() != "yes":
-                    return 0, count
+                    return SimulatorDeleter._cancelled("delete_all", udids)
             except KeyboardInterrupt:
-                return 0, count
-
-        succeeded = 0
-        failed = 0
-
-        for sim in simulators:
-            deleter = SimulatorDeleter(udid=sim["udid"])
-            success, _message = deleter.delete(confirm=True)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
+                return SimulatorDeleter._cancelled("delete_all", udids)
 
-        return succeeded, failed
+        return SimulatorDeleter.delete_many("delete_all", udids, **fleet_options)
 
     @staticmethod
-    def delete_by_type(device_type: str, confirm: bool = False) -> tuple[int, int]:
+    def delete_by_type(device_type: str, confirm: bool = False, **fleet_options) -> FleetReport:
         """
         Delete all simulators of a specific type.
 
         Args:
             device_type: Device type filter (e.g., "iPhone", "iPad")
             confirm: Skip confirmation prompt
+            **fleet_options: See delete_many()
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state=None)
-        matching = [s for s in simulators if device_type.lower() in s["name"].lower()]
+        matching = [s["udid"] for s in simulators if device_type.lower() in s["name"].lower()]
 
         if not matching:
-            return 0, 0
+            return SimulatorDeleter.delete_many("delete_by_type", [])
 
         if not confirm:
             count = len(matching)
@@ -133,25 +171,14 @@ class SimulatorDeleter:
                     f"(type 'yes' to confirm): "
                 )
                 if response.lower() != "yes":
-                    return 0, count
+                    return SimulatorDeleter._cancelled("delete_by_type", matching)
             except KeyboardInterrupt:
-                return 0, count
+                return SimulatorDeleter._cancelled("delete_by_type", matching)
 
-        succeeded = 0
-        failed = 0
-
-        for sim in matching:
-            deleter = SimulatorDeleter(udid=sim["udid"])
-            success, _message = deleter.delete(confirm=True)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
-
-        return succeeded, failed
+        return SimulatorDeleter.delete_many("delete_by_type", matching, **fleet_options)
 
     @staticmethod
-    def delete_old(keep_count: int = 3, confirm: bool = False) -> tuple[int, int]:
+    def delete_old(keep_count: int = 3, confirm: bool = False, **fleet_options) -> FleetReport:
         """
         Delete older simulators, keeping most recent versions.
 
@@ -161,9 +188,10 @@ class SimulatorDeleter:
         Args:
             keep_count: Number of recent simulators to keep per type (default: 3)
             confirm: Skip confirmation prompt
+            **fleet_options: See delete_many()
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state=None)
 
@@ -181,10 +209,10 @@ class SimulatorDeleter:
             # Sort by runtime (iOS version) - keep newest
             sorted_sims = sorted(sims, key=lambda s: s["runtime"], reverse=True)
             # Mark older ones for deletion
-            to_delete.extend(sorted_sims[keep_count:])
+            to_delete.extend(sim["udid"] for sim in sorted_sims[keep_count:])
 
         if not to_delete:
-            return 0, 0
+            return SimulatorDeleter.delete_many("delete_old", [])
 
         if not confirm:
             count = len(to_delete)
@@ -194,22 +222,11 @@ class SimulatorDeleter:
                     f"(type 'yes' to confirm): "
                 )
                 if response.lower() != "yes":
-                    return 0, count
+                    return SimulatorDeleter._cancelled("delete_old", to_delete)
             except KeyboardInterrupt:
-                return 0, count
-
-        succeeded = 0
-        failed = 0
-
-        for sim in to_delete:
-            deleter = SimulatorDeleter(udid=sim["udid"])
-            success, _message = deleter.delete(confirm=True)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
+                return SimulatorDeleter._cancelled("delete_old", to_delete)
 
-        return succeeded, failed
+        return SimulatorDeleter.delete_many("delete_old", to_delete, **fleet_options)
 
 
 def main():
@@ -243,6 +260,17 @@ def main():
         metavar="KEEP_COUNT",
         help="Delete older simulators, keeping this many per type (e.g., --old 3)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Devices deleted at once in batch operations (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--device-timeout",
+        type=float,
+        help="Overall seconds allowed per device in batch operations (default: no limit)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -252,70 +280,40 @@ def main():
     args = parser.parse_args()
 
     # Handle batch operations
+    fleet_options = {
+        "concurrency": args.concurrency,
+        "device_timeout": args.device_timeout,
+        "progress": not args.json,
+    }
     if args.all:
-        succeeded, failed = SimulatorDeleter.delete_all(confirm=args.yes)
+        report = SimulatorDeleter.delete_all(confirm=args.yes, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "delete_all",
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict()))
         else:
-            total = succeeded + failed
-            print(f"Delete summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary("Delete"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.type:
-        succeeded, failed = SimulatorDeleter.delete_by_type(args.type, confirm=args.yes)
+        report = SimulatorDeleter.delete_by_type(args.type, confirm=args.yes, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "delete_by_type",
-                        "type": args.type,
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict(type=args.type)))
         else:
-            total = succeeded + failed
-            print(f"Delete {args.type} summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary(f"Delete {args.type}"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.old is not None:
-        succeeded, failed = SimulatorDeleter.delete_old(keep_count=args.old, confirm=args.yes)
+        report = SimulatorDeleter.delete_old(keep_count=args.old, confirm=args.yes, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "delete_old",
-                        "keep_count": args.old,
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict(keep_count=args.old)))
         else:
-            total = succeeded + failed
-            print(
-                f"Delete old summary: {succeeded}/{total} succeeded, "
-                f"{failed} failed (kept {args.old} per type)"
-            )
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary(f"Delete old (kept {args.old} per type)"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     # Delete single device
     device_id = args.udid or args.name
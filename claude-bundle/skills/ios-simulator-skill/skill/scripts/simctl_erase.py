@@ -10,7 +10,8 @@ Key features:
 - Erase by UDID or device name
 - Preserve device UUID (faster than delete)
 - Verify erase completion
-- Batch erase operations (all, by type)
+- Batch erase operations (all, by type), several devices at once with
+  verification overlapping (--concurrency)
 """
 
 import argparse
@@ -19,10 +20,12 @@ import sys
 import time
 from typing import Optional
 
+from common.device_inventory import invalidate_inventory
 from common.device_utils import (
     list_simulators,
     resolve_device_identifier,
 )
+from common.fleet import DEFAULT_CONCURRENCY, FleetReport, progress_printer, run_fleet
 
 
 class SimulatorEraser:
@@ -55,6 +58,7 @@ class SimulatorEraser:
         try:
             cmd = ["xcrun", "simctl", "erase", self.udid]
             result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=60)
+            invalidate_inventory()
 
             if result.returncode != 0:
                 error = result.stderr.strip()
@@ -126,74 +130,88 @@ class SimulatorEraser:
         )
 
     @staticmethod
-    def erase_all() -> tuple[int, int]:
+    def erase_many(
+        action: str,
+        udids: list[str],
+        *,
+        verify: bool = False,
+        timeout_seconds: int = 30,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        device_timeout: float | None = None,
+        progress: bool = False,
+    ) -> FleetReport:
         """
-        Erase all simulators (factory reset).
+        Erase several simulators, up to `concurrency` at a time.
+
+        Args:
+            action: Name reported in the results
+            udids: Devices to erase
+            verify: Wait for each erase to complete (verifications overlap)
+            timeout_seconds: Maximum seconds to wait for each verification
+            concurrency: Devices erased at once
+            device_timeout: Overall seconds allowed per device (None = no limit)
+            progress: Print one line per finished device to stderr
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
-        simulators = list_simulators(state=None)
-        succeeded = 0
-        failed = 0
+        return run_fleet(
+            action,
+            lambda udid: SimulatorEraser(udid=udid).erase(verify, timeout_seconds),
+            udids,
+            concurrency=concurrency,
+            device_timeout=device_timeout,
+            on_result=progress_printer(len(udids)) if progress else None,
+        )
+
+    @staticmethod
+    def erase_all(**fleet_options) -> FleetReport:
+        """
+        Erase all simulators (factory reset).
 
-        for sim in simulators:
-            eraser = SimulatorEraser(udid=sim["udid"])
-            success, _message = eraser.erase(verify=False)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
+        Args:
+            **fleet_options: verify, timeout_seconds, concurrency,
+                device_timeout, progress (see erase_many())
 
-        return succeeded, failed
+        Returns:
+            FleetReport with per-device results and timing
+        """
+        simulators = list_simulators(state=None)
+        return SimulatorEraser.erase_many(
+            "erase_all", [sim["udid"] for sim in simulators], **fleet_options
+        )
 
     @staticmethod
-    def erase_by_type(device_type: str) -> tuple[int, int]:
+    def erase_by_type(device_type: str, **fleet_options) -> FleetReport:
         """
         Erase all simulators of a specific type.
 
         Args:
             device_type: Device type filter (e.g., "iPhone", "iPad")
+            **fleet_options: See erase_many()
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state=None)
-        succeeded = 0
-        failed = 0
-
-        for sim in simulators:
-            if device_type.lower() in sim["name"].lower():
-                eraser = SimulatorEraser(udid=sim["udid"])
-                success, _message = eraser.erase(verify=False)
-                if success:
-                    succeeded += 1
-                else:
-                    failed += 1
-
-        return succeeded, failed
+        udids = [sim["udid"] for sim in simulators if device_type.lower() in sim["name"].lower()]
+        return SimulatorEraser.erase_many("erase_by_type", udids, **fleet_options)
 
     @staticmethod
-    def erase_booted() -> tuple[int, int]:
+    def erase_booted(**fleet_options) -> FleetReport:
         """
         Erase all currently booted simulators.
 
+        Args:
+            **fleet_options: See erase_many()
+
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state="booted")
-        succeeded = 0
-        failed = 0
-
-        for sim in simulators:
-            eraser = SimulatorEraser(udid=sim["udid"])
-            success, _message = eraser.erase(verify=False)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
-
-        return succeeded, failed
+        return SimulatorEraser.erase_many(
+            "erase_booted", [sim["udid"] for sim in simulators], **fleet_options
+        )
 
 
 def main():
@@ -232,6 +250,17 @@ def main():
         action="store_true",
         help="Erase all currently booted simulators",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Devices erased at once in batch operations (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--device-timeout",
+        type=float,
+        help="Overall seconds allowed per device in batch operations (default: no limit)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -241,66 +270,42 @@ def main():
     args = parser.parse_args()
 
     # Handle batch operations
+    fleet_options = {
+        "verify": args.verify,
+        "timeout_seconds": args.timeout,
+        "concurrency": args.concurrency,
+        "device_timeout": args.device_timeout,
+        "progress": not args.json,
+    }
     if args.all:
-        succeeded, failed = SimulatorEraser.erase_all()
+        report = SimulatorEraser.erase_all(**fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "erase_all",
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict()))
         else:
-            total = succeeded + failed
-            print(f"Erase summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary("Erase"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.type:
-        succeeded, failed = SimulatorEraser.erase_by_type(args.type)
+        report = SimulatorEraser.erase_by_type(args.type, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "erase_by_type",
-                        "type": args.type,
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict(type=args.type)))
         else:
-            total = succeeded + failed
-            print(f"Erase {args.type} summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary(f"Erase {args.type}"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.booted:
-        succeeded, failed = SimulatorEraser.erase_booted()
+        report = SimulatorEraser.erase_booted(**fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "erase_booted",
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict()))
         else:
-            total = succeeded + failed
-            print(f"Erase booted summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary("Erase booted"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     # Erase single device
     device_id = args.udid or args.name
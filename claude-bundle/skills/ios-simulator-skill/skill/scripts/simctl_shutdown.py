@@ -8,7 +8,8 @@ verifies completion. Supports batch operations for efficient cleanup.
 Key features:
 - Shutdown by UDID or device name
 - Verify shutdown completion with timeout
-- Batch shutdown operations (all, by type)
+- Batch shutdown operations (all, by type), several devices at once with
+  verification overlapping (--concurrency)
 - Progress reporting for CI/CD pipelines
 """
 
@@ -18,10 +19,12 @@ import sys
 import time
 from typing import Optional
 
+from common.device_inventory import get_inventory, invalidate_inventory
 from common.device_utils import (
     list_simulators,
     resolve_device_identifier,
 )
+from common.fleet import DEFAULT_CONCURRENCY, FleetReport, progress_printer, run_fleet
 
 
 class SimulatorShutdown:
@@ -48,8 +51,8 @@ class SimulatorShutdown:
         start_time = time.time()
 
         # Check if already shutdown
-        simulators = list_simulators(state="booted")
-        if not any(s["udid"] == self.udid for s in simulators):
+        device = get_inventory().get(self.udid)
+        if not device or device["state"] != "Booted":
             elapsed = time.time() - start_time
             return True, (f"Device already shutdown: {self.udid} " f"[checked in {elapsed:.1f}s]")
 
@@ -57,6 +60,7 @@ class SimulatorShutdown:
         try:
             cmd = ["xcrun", "simctl", "shutdown", self.udid]
             result = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=30)
+            invalidate_inventory()
 
             if result.returncode != 0:
                 error = result.stderr.strip()
@@ -97,8 +101,8 @@ class SimulatorShutdown:
         while time.time() - start_time < timeout_seconds:
             try:
                 checks += 1
-                # Check booted devices
-                simulators = list_simulators(state="booted")
+                # Check booted devices (fresh listing, not the cached one)
+                simulators = list_simulators(state="booted", refresh=True)
                 if not any(s["udid"] == self.udid for s in simulators):
                     elapsed = time.time() - start_time
                     return True, (
@@ -117,52 +121,72 @@ class SimulatorShutdown:
         )
 
     @staticmethod
-    def shutdown_all() -> tuple[int, int]:
+    def shutdown_many(
+        action: str,
+        udids: list[str],
+        *,
+        verify: bool = False,
+        timeout_seconds: int = 30,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        device_timeout: float | None = None,
+        progress: bool = False,
+    ) -> FleetReport:
         """
-        Shutdown all booted simulators.
+        Shutdown several simulators, up to `concurrency` at a time.
+
+        Args:
+            action: Name reported in the results
+            udids: Devices to shut down
+            verify: Wait for each shutdown to complete (verifications overlap)
+            timeout_seconds: Maximum seconds to wait for each verification
+            concurrency: Devices shut down at once
+            device_timeout: Overall seconds allowed per device (None = no limit)
+            progress: Print one line per finished device to stderr
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
-        simulators = list_simulators(state="booted")
-        succeeded = 0
-        failed = 0
+        return run_fleet(
+            action,
+            lambda udid: SimulatorShutdown(udid=udid).shutdown(verify, timeout_seconds),
+            udids,
+            concurrency=concurrency,
+            device_timeout=device_timeout,
+            on_result=progress_printer(len(udids)) if progress else None,
+        )
 
-        for sim in simulators:
-            shutdown = SimulatorShutdown(udid=sim["udid"])
-            success, _message = shutdown.shutdown(verify=False)
-            if success:
-                succeeded += 1
-            else:
-                failed += 1
+    @staticmethod
+    def shutdown_all(**fleet_options) -> FleetReport:
+        """
+        Shutdown all booted simulators.
 
-        return succeeded, failed
+        Args:
+            **fleet_options: verify, timeout_seconds, concurrency,
+                device_timeout, progress (see shutdown_many())
+
+        Returns:
+            FleetReport with per-device results and timing
+        """
+        simulators = list_simulators(state="booted")
+        return SimulatorShutdown.shutdown_many(
+            "shutdown_all", [sim["udid"] for sim in simulators], **fleet_options
+        )
 
     @staticmethod
-    def shutdown_by_type(device_type: str) -> tuple[int, int]:
+    def shutdown_by_type(device_type: str, **fleet_options) -> FleetReport:
         """
         Shutdown all booted simulators of a specific type.
 
         Args:
             device_type: Device type filter (e.g., "iPhone", "iPad")
+            **fleet_options: See shutdown_many()
 
         Returns:
-            (succeeded, failed) tuple with counts
+            FleetReport with per-device results and timing
         """
         simulators = list_simulators(state="booted")
-        succeeded = 0
-        failed = 0
-
-        for sim in simulators:
-            if device_type.lower() in sim["name"].lower():
-                shutdown = SimulatorShutdown(udid=sim["udid"])
-                success, _message = shutdown.shutdown(verify=False)
-                if success:
-                    succeeded += 1
-                else:
-                    failed += 1
-
-        return succeeded, failed
+        udids = [sim["udid"] for sim in simulators if device_type.lower() in sim["name"].lower()]
+        return SimulatorShutdown.shutdown_many("shutdown_by_type", udids, **fleet_options)
 
 
 def main():
@@ -198,6 +222,17 @@ def main():
         "--type",
         help="Shutdown all booted simulators of a specific type (e.g., iPhone)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Devices shut down at once with --all/--type (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--device-timeout",
+        type=float,
+        help="Overall seconds allowed per device with --all/--type (default: no limit)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -207,48 +242,32 @@ def main():
     args = parser.parse_args()
 
     # Handle batch operations
+    fleet_options = {
+        "verify": args.verify,
+        "timeout_seconds": args.timeout,
+        "concurrency": args.concurrency,
+        "device_timeout": args.device_timeout,
+        "progress": not args.json,
+    }
     if args.all:
-        succeeded, failed = SimulatorShutdown.shutdown_all()
+        report = SimulatorShutdown.shutdown_all(**fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "shutdown_all",
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict()))
         else:
-            total = succeeded + failed
-            print(f"Shutdown summary: {succeeded}/{total} succeeded, " f"{failed} failed")
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary("Shutdown"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     if args.type:
-        succeeded, failed = SimulatorShutdown.shutdown_by_type(args.type)
+        report = SimulatorShutdown.shutdown_by_type(args.type, **fleet_options)
         if args.json:
             import json
 
-            print(
-                json.dumps(
-                    {
-                        "action": "shutdown_by_type",
-                        "type": args.type,
-                        "succeeded": succeeded,
-                        "failed": failed,
-                        "total": succeeded + failed,
-                    }
-                )
-            )
+            print(json.dumps(report.to_dict(type=args.type)))
         else:
-            total = succeeded + failed
-            print(
-                f"Shutdown {args.type} summary: {succeeded}/{total} succeeded, " f"{failed} failed"
-            )
-        sys.exit(0 if failed == 0 else 1)
+            print(report.summary(f"Shutdown {args.type}"))
+        sys.exit(0 if report.failed == 0 else 1)
 
     # Resolve device identifier
     device_id = args.udid or args.name
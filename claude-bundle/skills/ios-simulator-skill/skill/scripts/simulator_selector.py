@@ -24,13 +24,14 @@ Usage Examples:
 
 import argparse
 import json
-import re
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from common import get_inventory, invalidate_inventory
+
 # Try to import config from build_and_test if available
 try:
     from xcode.config import Config
@@ -100,46 +101,25 @@ class SimulatorSelector:
             List of SimulatorInfo objects
         """
         try:
-            result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "--json"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            data = json.loads(result.stdout)
-            simulators = []
-
-            # Parse devices by iOS version
-            for runtime, devices in data.get("devices", {}).items():
-                # Extract iOS version from runtime (e.g., "com.apple.CoreSimulator.SimRuntime.iOS-18-0")
-                ios_version_match = re.search(r"iOS-(\d+-\d+)", runtime)
-                if not ios_version_match:
-                    continue
-
-                ios_version = ios_version_match.group(1).replace("-", ".")
-
-                for device in devices:
-                    name = device.get("name", "")
-                    udid = device.get("udid", "")
-                    is_available = device.get("isAvailable", False)
-
-                    if not is_available or "iPhone" not in name:
-                        continue
+            devices = get_inventory().devices()
+        except RuntimeError as e:
+            print(f"Error listing simulators: {e}", file=sys.stderr)
+            return []
 
-                    status = device.get("state", "").capitalize()
-                    sim_info = SimulatorInfo(name, udid, ios_version, status)
-                    simulators.append(sim_info)
+        simulators = []
+        for device in devices:
+            # Readable runtime, e.g. "iOS 18.0" for "com.apple.CoreSimulator.SimRuntime.iOS-18-0"
+            if not device["runtime_name"].startswith("iOS "):
+                continue
+            if not device["is_available"] or "iPhone" not in device["name"]:
+                continue
 
-            self.simulators = simulators
-            return simulators
+            ios_version = device["runtime_name"].removeprefix("iOS ")
+            status = device["state"].capitalize()
+            simulators.append(SimulatorInfo(device["name"], device["udid"], ios_version, status))
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error listing simulators: {e.stderr}", file=sys.stderr)
-            return []
-        except json.JSONDecodeError as e:
-            print(f"Error parsing simulator list: {e}", file=sys.stderr)
-            return []
+        self.simulators = simulators
+        return simulators
 
     def get_suggestions(self, count: int = 4) -> list[SimulatorInfo]:
         """
@@ -253,6 +233,7 @@ class SimulatorSelector:
                 capture_output=True,
                 check=True,
             )
+            invalidate_inventory()
             return True
         except subprocess.CalledProcessError as e:
             print(f"Error booting simulator: {e.stderr}", file=sys.stderr)
@@ -5,6 +5,15 @@ Test Recorder for iOS Simulator Testing
 Records test execution with automatic screenshots and documentation.
 Optimized for minimal token output during execution.
 
+Accessibility snapshots are stored as a full tree for the first step (and
+every KEYFRAME_INTERVAL steps) and as structural deltas in between, e.g.
+accessibility/001-launch.json, accessibility/002-tap-login.delta.json. Any
+step's tree can be rebuilt with load_accessibility_snapshot().
+
+Screenshots go to screenshots/ and are perceptually hashed: a frame that is
+a near-duplicate of an earlier step's is not stored again (the step points
+at the earlier file), and steps showing an already-seen screen are linked.
+
 Usage:
     As a script: python scripts/test_recorder.py --test-name "Test Name" --output dir/
     As a module: from scripts.test_recorder import TestRecorder
@@ -18,13 +27,54 @@ from datetime import datetime
 from pathlib import Path
 
 from common import (
+    IMAGE_FORMATS,
+    FrameSampler,
+    ScreenshotIndex,
+    apply_delta,
     capture_screenshot,
     count_elements,
+    diff_trees,
     generate_screenshot_name,
     get_accessibility_tree,
     resolve_udid,
+    summarize_changes,
 )
 
+KEYFRAME_INTERVAL = 25  # Store a full snapshot every N steps (bounds rebuild cost)
+
+
+def load_accessibility_snapshot(accessibility_dir: str | Path, step: int) -> dict:
+    """
+    Rebuild the accessibility tree recorded for a step.
+
+    Args:
+        accessibility_dir: Recording's accessibility/ directory
+        step: Step number (1-based)
+
+    Returns:
+        The step's tree
+
+    Raises:
+        FileNotFoundError: If no snapshot was stored for the step (or its base)
+    """
+    accessibility_dir = Path(accessibility_dir)
+    chain = []
+    while True:
+        matches = sorted(accessibility_dir.glob(f"{step:03d}-*.json"))
+        if not matches:
+            raise FileNotFoundError(f"No accessibility snapshot for step {step}")
+        with open(matches[0]) as f:
+            data = json.load(f)
+        if not matches[0].name.endswith(".delta.json"):
+            tree = data
+            break
+        chain.append(data["ops"])
+        step = data["base"]
+
+    for ops in reversed(chain):
+        tree = apply_delta(tree, ops)
+    return tree
+
 
 class TestRecorder:
     """Records test execution with screenshots and accessibility snapshots."""
@@ -37,6 +87,9 @@ class TestRecorder:
         inline: bool = False,
         screenshot_size: str = "half",
         app_name: str | None = None,
+        *,
+        screenshot_format: str = "png",
+        sample_fps: float | None = None,
     ):
         """
         Initialize test recorder.
@@ -48,15 +101,22 @@ class TestRecorder:
             inline: If True, return screenshots as base64 (for vision-based automation)
             screenshot_size: 'full', 'half', 'quarter', 'thumb' (default: 'half')
             app_name: App name for semantic screenshot naming
+            screenshot_format: 'png', 'jpeg' or 'webp' (default: 'png')
+            sample_fps: If set, sample frames in the background at this rate
+                and keep screens seen between steps (file mode only)
         """
         self.test_name = test_name
         self.udid = udid
         self.inline = inline
         self.screenshot_size = screenshot_size
+        self.screenshot_format = screenshot_format
         self.app_name = app_name
         self.start_time = time.time()
         self.steps: list[dict] = []
         self.current_step = 0
+        self._last_tree: dict | None = None
+        self._last_tree_step: int | None = None  # Step whose snapshot holds _last_tree
+        self._last_keyframe = 0
 
         # Create timestamped output directory
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -68,12 +128,21 @@ class TestRecorder:
         if not inline:
             self.screenshots_dir = self.output_dir / "screenshots"
             self.screenshots_dir.mkdir(exist_ok=True)
+            self.screenshot_index = ScreenshotIndex(self.output_dir / "screenshot-index.json")
         else:
             self.screenshots_dir = None
+            self.screenshot_index = None
 
         self.accessibility_dir = self.output_dir / "accessibility"
         self.accessibility_dir.mkdir(exist_ok=True)
 
+        # Background sampling catches spinners, toasts and alerts between steps
+        self.sampler = None
+        self._last_frame_at = 0.0  # Timestamp of the newest frame already saved
+        if sample_fps and not inline:
+            self.frames_dir = self.output_dir / "frames"
+            self.sampler = FrameSampler(udid, fps=sample_fps).start()
+
         # Token-efficient output
         mode_str = "(inline mode)" if inline else ""
         print(f"Recording: {test_name} {mode_str}")
@@ -99,39 +168,51 @@ class TestRecorder:
         """
         self.current_step += 1
         step_time = time.time() - self.start_time
+        frames = self._collect_frames(f"{self.current_step:03d}")
 
         # Capture screenshot using new utility
+        output_path = None
+        if self.screenshots_dir is not None:
+            output_path = str(
+                self.screenshots_dir
+                / generate_screenshot_name(
+                    self.app_name,
+                    screen_name or description,
+                    state,
+                    extension=IMAGE_FORMATS[self.screenshot_format][2],
+                )
+            )
         screenshot_result = capture_screenshot(
             self.udid,
+            output_path=output_path,
             size=self.screenshot_size,
             inline=self.inline,
             app_name=self.app_name,
             screen_name=screen_name or description,
             state=state,
+            image_format=self.screenshot_format,
         )
 
-        # Capture accessibility tree
-        accessibility_path = (
-            self.accessibility_dir
-            / f"{self.current_step:03d}-{description.lower().replace(' ', '-')[:20]}.json"
+        # Capture accessibility tree (full or delta against the previous step)
+        accessibility = self._capture_accessibility(
+            f"{self.current_step:03d}-{description.lower().replace(' ', '-')[:20]}"
         )
-        element_count = self._capture_accessibility(accessibility_path)
 
         # Store step data
         step_data = {
             "number": self.current_step,
             "description": description,
             "timestamp": step_time,
-            "element_count": element_count,
-            "accessibility": accessibility_path.name,
+            **accessibility,
             "screenshot_mode": screenshot_result["mode"],
             "screenshot_size": self.screenshot_size,
         }
+        if frames:
+            step_data["frames"] = frames
 
         # Handle screenshot data based on mode
         if screenshot_result["mode"] == "file":
-            step_data["screenshot"] = screenshot_result["file_path"]
-            step_data["screenshot_name"] = Path(screenshot_result["file_path"]).name
+            step_data.update(self._store_screenshot(screenshot_result, screen_name or description))
         else:
             # Inline mode
             step_data["screenshot_base64"] = screenshot_result["base64_data"]
@@ -158,6 +239,57 @@ class TestRecorder:
             f"{status} Step {self.current_step}: {description} ({step_time:.1f}s){screenshot_info}"
         )
 
+    def _collect_frames(self, prefix: str) -> list[str]:
+        """
+        Save frames the sampler kept since the previous step.
+
+        Args:
+            prefix: File name prefix (the step number)
+
+        Returns:
+            File names under frames/ (empty without a sampler)
+        """
+        if self.sampler is None:
+            return []
+        frames = [f for f in self.sampler.frames() if f.timestamp > self._last_frame_at]
+        if frames:
+            self._last_frame_at = frames[-1].timestamp
+        return [Path(p).name for p in self.sampler.save(self.frames_dir, frames, prefix)]
+
+    def _store_screenshot(self, screenshot_result: dict, screen: str) -> dict:
+        """
+        Keep a captured file unless it duplicates an earlier step's frame.
+
+        Args:
+            screenshot_result: capture_screenshot() result (file mode)
+            screen: Screen label for the index
+
+        Returns:
+            Step fields: screenshot, screenshot_name and, when matched,
+            duplicate_of (step number) or same_screen_as (screen label)
+        """
+        path = screenshot_result["file_path"]
+        fields = {"screenshot": path, "screenshot_name": Path(path).name}
+        if "hash" not in screenshot_result:
+            return fields  # No PIL: nothing to compare
+
+        key = int(screenshot_result["hash"], 16)
+        duplicate = self.screenshot_index.find_duplicate(key)
+        if duplicate is not None:
+            Path(path).unlink(missing_ok=True)
+            return {
+                "screenshot": duplicate["path"],
+                "screenshot_name": Path(duplicate["path"]).name,
+                "duplicate_of": duplicate["step"],
+            }
+        match = self.screenshot_index.nearest(key)
+        if match is not None:
+            fields["same_screen_as"] = match[1]["screen"]
+
+        entry = self.screenshot_index.add(path, screen=screen, key=key)
+        entry["step"] = self.current_step
+        return fields
+
     def _capture_screenshot(self, output_path: Path) -> bool:
         """Capture screenshot using simctl."""
         cmd = ["xcrun", "simctl", "io"]
@@ -175,20 +307,53 @@ class TestRecorder:
         except subprocess.CalledProcessError:
             return False
 
-    def _capture_accessibility(self, output_path: Path) -> int:
-        """Capture accessibility tree and return element count."""
+    def _capture_accessibility(self, stem: str) -> dict:
+        """
+        Capture accessibility tree, stored in full or as a delta.
+
+        Args:
+            stem: File name without extension (step number prefix first)
+
+        Returns:
+            Step fields: element_count, accessibility (file name, None on
+            failure), accessibility_mode ('full'/'delta') and, for deltas,
+            changes (summarize_changes output)
+        """
         try:
             # Use shared utility to fetch tree
             tree = get_accessibility_tree(self.udid, nested=True)
+        except Exception:
+            return {"element_count": 0, "accessibility": None}
 
-            # Save tree
-            with open(output_path, "w") as f:
-                json.dump(tree, f, indent=2)
-
-            # Count elements using shared utility
-            return count_elements(tree)
+        result = {"element_count": count_elements(tree)}
+        keyframe = (
+            self._last_tree is None or self.current_step - self._last_keyframe >= KEYFRAME_INTERVAL
+        )
+        try:
+            if keyframe:
+                path = self.accessibility_dir / f"{stem}.json"
+                data = tree
+                self._last_keyframe = self.current_step
+                result["accessibility_mode"] = "full"
+            else:
+                ops = diff_trees(self._last_tree, tree)
+                path = self.accessibility_dir / f"{stem}.delta.json"
+                data = {"base": self._last_tree_step, "ops": ops}
+                result["accessibility_mode"] = "delta"
+                result["changes"] = summarize_changes(ops)
+            with open(path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
         except Exception:
-            return 0
+            return {**result, "accessibility": None}
+
+        self._last_tree = tree
+        self._last_tree_step = self.current_step
+        result["accessibility"] = path.name
+        return result
+
+    def load_accessibility(self, step: int) -> dict:
+        """Rebuild the accessibility tree recorded for a step (see load_accessibility_snapshot)."""
+        return load_accessibility_snapshot(self.accessibility_dir, step)
 
     def generate_report(self) -> dict[str, str]:
         """
@@ -199,6 +364,9 @@ class TestRecorder:
         """
         duration = time.time() - self.start_time
         report_path = self.output_dir / "report.md"
+        trailing_frames = self._collect_frames("end")
+        if self.sampler is not None:
+            self.sampler.stop()
 
         # Generate markdown
         with open(report_path, "w") as f:
@@ -213,7 +381,17 @@ class TestRecorder:
                 f.write(
                     f"### Step {step['number']}: {step['description']} ({step['timestamp']:.1f}s)\n\n"
                 )
-                f.write(f"![Screenshot](screenshots/{step['screenshot']})\n\n")
+                if step.get("screenshot_name"):
+                    f.write(f"![Screenshot](screenshots/{step['screenshot_name']})\n\n")
+                if step.get("frames"):
+                    f.write(f"**Frames since previous step:** {len(step['frames'])}\n")
+                    for name in step["frames"]:
+                        f.write(f"- [{name}](frames/{name})\n")
+                    f.write("\n")
+                if step.get("duplicate_of"):
+                    f.write(f"**Screen unchanged since step {step['duplicate_of']}**\n\n")
+                elif step.get("same_screen_as"):
+                    f.write(f"**Same screen as:** {step['same_screen_as']}\n\n")
 
                 if step.get("assertion"):
                     status = "✓" if step.get("assertion_passed") else "✗"
@@ -226,14 +404,55 @@ class TestRecorder:
                     f.write("\n")
 
                 f.write(f"**Accessibility Elements:** {step['element_count']}\n\n")
+                changes = step.get("changes")
+                if changes:
+                    counts = ", ".join(
+                        f"{count} {kind}"
+                        for kind in ("inserted", "deleted", "updated", "moved")
+                        if (count := changes[kind])
+                    )
+                    f.write(f"**Changes:** {counts or 'none'}")
+                    region = changes["region"]
+                    if region:
+                        f.write(
+                            f" (region {region['x']:.0f},{region['y']:.0f} "
+                            f"{region['width']:.0f}x{region['height']:.0f})"
+                        )
+                    f.write("\n")
+                    for detail in changes["details"]:
+                        f.write(f"- {detail}\n")
+                    f.write("\n")
                 f.write("---\n\n")
 
+            if trailing_frames:
+                f.write(f"**Frames after last step:** {len(trailing_frames)}\n")
+                for name in trailing_frames:
+                    f.write(f"- [{name}](frames/{name})\n")
+                f.write("\n")
+
             # Summary
             f.write("## Summary\n\n")
             f.write(f"- Total steps: {len(self.steps)}\n")
             f.write(f"- Duration: {duration:.1f}s\n")
-            f.write(f"- Screenshots: {len(self.steps)}\n")
-            f.write(f"- Accessibility snapshots: {len(self.steps)}\n")
+            stored = len({s["screenshot"] for s in self.steps if s.get("screenshot")})
+            f.write(f"- Screenshots: {len(self.steps)} ({stored} stored, duplicates skipped)\n")
+            stored = [s for s in self.steps if s.get("accessibility")]
+            full = sum(1 for s in stored if s["accessibility_mode"] == "full")
+            size = sum((self.accessibility_dir / s["accessibility"]).stat().st_size for s in stored)
+            f.write(
+                f"- Accessibility snapshots: {len(stored)} "
+                f"({full} full, {len(stored) - full} deltas, {size / 1024:.1f} KB)\n"
+            )
+            if self.sampler is not None:
+                stats = self.sampler.stats()
+                f.write(
+                    f"- Sampled frames: {stats['sampled']} at {stats['fps']} fps, "
+                    f"{stats['kept']} changed ({stats['dropped']} dropped, "
+                    f"{stats['errors']} errors)\n"
+                )
+
+        if self.screenshot_index is not None:
+            self.screenshot_index.save()
 
         # Save metadata JSON
         metadata_path = self.output_dir / "metadata.json"
@@ -283,6 +502,17 @@ def main():
         default="half",
         help="Screenshot size for token optimization (default: half)",
     )
+    parser.add_argument(
+        "--format",
+        choices=["png", "jpeg", "webp"],
+        default="png",
+        help="Screenshot encoding (default: png)",
+    )
+    parser.add_argument(
+        "--sample-fps",
+        type=float,
+        help="Sample frames in the background at this rate to catch transient screens",
+    )
     parser.add_argument("--app-name", help="App name for semantic screenshot naming")
 
     args = parser.parse_args()
@@ -304,6 +534,8 @@ def main():
         inline=args.inline,
         screenshot_size=args.size,
         app_name=args.app_name,
+        screenshot_format=args.format,
+        sample_fps=args.sample_fps,
     )
 
     print("Test recorder initialized. Use the following methods:")
@@ -5,33 +5,265 @@ Visual Diff Tool for iOS Simulator Screenshots
 Compares two screenshots pixel-by-pixel to detect visual changes.
 Optimized for minimal token output.
 
+All pixel work is done with Pillow band operations (difference, point
+lookup tables, histograms, composite), never per-pixel Python loops: a
+retina screenshot diffs in tens of milliseconds. Changed pixels are also
+summarized per tile and merged into bounding boxes of changed regions.
+
+Verdicts can use the changed-pixel ratio (default) or SSIM (8x8 windows,
+tolerant of anti-aliasing). A perceptual hash pre-check short-circuits
+identical screenshots, and ignore regions (status bar, named accessibility
+elements, pixel boxes) are masked out of both images before scoring.
+
+Batch mode pairs screenshots across two directory trees by semantic name
+(generate_screenshot_name without its timestamp), compares them in a process
+pool and writes diff artifacts only for failures, plus one JSON/markdown
+report.
+
 Usage: python scripts/visual_diff.py baseline.png current.png [options]
+
+    # Structural similarity instead of changed-pixel ratio
+    python scripts/visual_diff.py base.png cur.png --metric ssim
+
+    # Ignore the clock and a text field with a blinking cursor
+    python scripts/visual_diff.py base.png cur.png --ignore-status-bar --ignore-element searchField
+
+    # Baseline picked from a directory by perceptual hash (same screen)
+    python scripts/visual_diff.py baselines/ current.png
+
+    # Whole regression pass: baselines/ vs current/ on all CPU cores
+    python scripts/visual_diff.py baselines/ current/ --batch --output regression/
 """
 
 import argparse
 import json
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from common import (
+    get_accessibility_tree,
+    hamming_distance,
+    image_hash,
+    index_for_directory,
+    iter_tree,
+    resolve_udid,
+    semantic_screenshot_key,
+)
+
 try:
-    from PIL import Image, ImageChops, ImageDraw
+    from PIL import Image, ImageChops, ImageDraw, ImageMath
 except ImportError:
     print("Error: Pillow not installed. Run: pip3 install pillow")
     sys.exit(1)
 
 
+NOISE_THRESHOLD = 10  # Grayscale difference counted as a changed pixel
+HIGHLIGHT_THRESHOLD = 30  # Summed RGB difference highlighted in diff images
+TILE_SIZE = 64  # Pixels per tile for per-tile statistics
+MAX_REGIONS = 10  # Changed-region boxes reported by compare()
+METRICS = ("pixels", "ssim")
+DEFAULT_MIN_SSIM = 0.98  # SSIM pass threshold
+SSIM_WINDOW = 8  # Pixels per SSIM window edge
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+STATUS_BAR_POINTS = 54  # Status bar height on notched/Dynamic Island iPhones
+IGNORE_FILL = (128, 128, 128)
+SCREENSHOT_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# String-expression ImageMath: unsafe_eval on Pillow >= 10.3, eval before that
+_image_math = getattr(ImageMath, "unsafe_eval", None) or ImageMath.eval
+
+# Lookup tables for Image.point(): pixel -> 255 if changed else 0
+NOISE_LUT = [255 if level > NOISE_THRESHOLD else 0 for level in range(256)]
+HIGHLIGHT_LUT = [255 if level > HIGHLIGHT_THRESHOLD else 0 for level in range(256)]
+
+
+Region = tuple[int, int, int, int]  # x, y, width, height in pixels
+
+
+def points_scale(image_width: int, screen_width: float | None = None) -> float:
+    """
+    Pixels per point for a screenshot.
+
+    Args:
+        image_width: Screenshot width in pixels
+        screen_width: Screen width in points if known (accessibility root frame)
+
+    Returns:
+        Scale factor (guessed from the width when the screen size is unknown)
+    """
+    if screen_width:
+        return image_width / screen_width
+    if image_width >= 1000:
+        return 3.0
+    return 2.0 if image_width >= 600 else 1.0
+
+
+def status_bar_region(image_width: int, screen_width: float | None = None) -> Region:
+    """Pixel box covering the status bar (clock, battery, signal)."""
+    scale = points_scale(image_width, screen_width)
+    return (0, 0, image_width, round(STATUS_BAR_POINTS * scale))
+
+
+def element_regions(names: list[str], udid: str | None, image_width: int) -> list[Region]:
+    """
+    Resolve accessibility elements to pixel boxes on the current screen.
+
+    Args:
+        names: AXUniqueId or AXLabel values (exact match)
+        udid: Device UDID (None = booted simulator)
+        image_width: Screenshot width in pixels (frames are in points)
+
+    Returns:
+        One region per matching element
+
+    Raises:
+        ValueError: If a name matches no element
+    """
+    tree = get_accessibility_tree(udid, nested=True)
+    scale = points_scale(image_width, (tree.get("frame") or {}).get("width"))
+    wanted = set(names)
+    found: set[str] = set()
+    regions = []
+    for element in iter_tree(tree):
+        matched = wanted & {element.get("AXUniqueId"), element.get("AXLabel")}
+        frame = element.get("frame")
+        if not matched or not frame:
+            continue
+        found |= matched
+        regions.append(
+            (
+                round(frame["x"] * scale),
+                round(frame["y"] * scale),
+                round(frame["width"] * scale),
+                round(frame["height"] * scale),
+            )
+        )
+    missing = wanted - found
+    if missing:
+        raise ValueError(f"Element(s) not found on screen: {', '.join(sorted(missing))}")
+    return regions
+
+
 class VisualDiffer:
     """Performs visual comparison between screenshots."""
 
-    def __init__(self, threshold: float = 0.01):
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        *,
+        tile_size: int = TILE_SIZE,
+        metric: str = "pixels",
+        min_ssim: float = DEFAULT_MIN_SSIM,
+        ignore_regions: list[Region] | None = None,
+        ignore_status_bar: bool = False,
+    ):
         """
         Initialize differ with threshold.
 
         Args:
             threshold: Maximum acceptable difference ratio (0.01 = 1%)
+            tile_size: Tile edge in pixels for tile statistics and regions
+            metric: Verdict metric, 'pixels' (changed ratio) or 'ssim'
+            min_ssim: Minimum SSIM to pass when metric is 'ssim'
+            ignore_regions: Pixel boxes (x, y, width, height) masked out of
+                both images before any scoring
+            ignore_status_bar: Also mask the status bar (sized per image)
+
+        Raises:
+            ValueError: If metric is unknown
         """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (available: {', '.join(METRICS)})")
         self.threshold = threshold
+        self.tile_size = tile_size
+        self.metric = metric
+        self.min_ssim = min_ssim
+        self.ignore_regions = list(ignore_regions or [])
+        self.ignore_status_bar = ignore_status_bar
+        # Decoded images by path, so compare() + artifacts decode each file once
+        self._images: dict[str, tuple[float, Image.Image]] = {}
+
+    def _load(self, path: str) -> Image.Image:
+        """Open an image as RGB, reusing the decoded copy if the file is unchanged."""
+        mtime = Path(path).stat().st_mtime
+        cached = self._images.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        image = Image.open(path)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        else:
+            image.load()
+        if len(self._images) >= 4:
+            self._images.clear()
+        self._images[path] = (mtime, image)
+        return image
+
+    def _ignore_mask(self, size: tuple[int, int]) -> Image.Image | None:
+        """Mode 'L' mask of ignored pixels (255), or None without ignore regions."""
+        regions = list(self.ignore_regions)
+        if self.ignore_status_bar:
+            regions.append(status_bar_region(size[0]))
+        if not regions:
+            return None
+        mask = Image.new("L", size, 0)
+        draw = ImageDraw.Draw(mask)
+        for x, y, width, height in regions:
+            if width > 0 and height > 0:
+                draw.rectangle((x, y, x + width - 1, y + height - 1), fill=255)
+        return mask
+
+    def _prepare(self, baseline_path: str, current_path: str) -> tuple[Image.Image, Image.Image]:
+        """Load both images and paint ignore regions with the same flat color in each."""
+        baseline = self._load(baseline_path)
+        current = self._load(current_path)
+        if baseline.size == current.size:
+            mask = self._ignore_mask(baseline.size)
+            if mask is not None:
+                baseline = baseline.copy()
+                current = current.copy()
+                baseline.paste(IGNORE_FILL, mask=mask)
+                current.paste(IGNORE_FILL, mask=mask)
+        return baseline, current
+
+    @staticmethod
+    def ssim(baseline: Image.Image, current: Image.Image) -> tuple[float, float]:
+        """
+        Structural similarity of two same-size images.
+
+        Means, variances and covariance are computed per 8x8 window with
+        Image.reduce() on float images, then combined with ImageMath: a few
+        whole-image operations, no Python loops. Flat identical areas
+        (including masked regions) score 1.
+
+        Returns:
+            (mean SSIM, lowest window SSIM)
+        """
+        x = baseline.convert("L").convert("F")
+        y = current.convert("L").convert("F")
+        w = SSIM_WINDOW
+        mx, my = x.reduce(w), y.reduce(w)
+        xx = _image_math("a * a", a=x).reduce(w)
+        yy = _image_math("b * b", b=y).reduce(w)
+        xy = _image_math("a * b", a=x, b=y).reduce(w)
+        ssim_map = _image_math(
+            "((2 * mx * my + c1) * (2 * (xy - mx * my) + c2))"
+            " / ((mx * mx + my * my + c1) * ((xx - mx * mx) + (yy - my * my) + c2))",
+            mx=mx,
+            my=my,
+            xx=xx,
+            yy=yy,
+            xy=xy,
+            c1=SSIM_C1,
+            c2=SSIM_C2,
+        )
+        # ImageStat bins float images into 256 buckets; a 1x1 box resize is the exact mean
+        mean = ssim_map.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+        return mean, ssim_map.getextrema()[0]
 
     def compare(self, baseline_path: str, current_path: str) -> dict:
         """
@@ -44,10 +276,9 @@ class VisualDiffer:
         Returns:
             Dictionary with comparison results
         """
-        # Load images
+        # Load images (ignore regions already masked out)
         try:
-            baseline = Image.open(baseline_path)
-            current = Image.open(current_path)
+            baseline, current = self._prepare(baseline_path, current_path)
         except FileNotFoundError as e:
             print(f"Error: Image not found - {e}")
             sys.exit(1)
@@ -63,70 +294,192 @@ class VisualDiffer:
                 "current_size": current.size,
             }
 
-        # Convert to RGB if needed
-        if baseline.mode != "RGB":
-            baseline = baseline.convert("RGB")
-        if current.mode != "RGB":
-            current = current.convert("RGB")
+        total_pixels = baseline.size[0] * baseline.size[1]
+        ignore_mask = self._ignore_mask(baseline.size)
+        ignored = self._count_mask(ignore_mask) if ignore_mask is not None else 0
+        result = {
+            "dimensions": baseline.size,
+            "total_pixels": total_pixels,
+            "ignored_pixels": ignored,
+            "metric": self.metric,
+            "threshold_percentage": self.threshold * 100,
+        }
+        if self.metric == "ssim":
+            result["min_ssim"] = self.min_ssim
+
+        # Pre-check: equal perceptual hashes, then equal bytes = identical
+        hash_distance = hamming_distance(image_hash(baseline), image_hash(current))
+        result["hash_distance"] = hash_distance
+        if hash_distance == 0 and baseline.tobytes() == current.tobytes():
+            result.update(
+                different_pixels=0,
+                difference_percentage=0.0,
+                passed=True,
+                verdict="PASS",
+                identical=True,
+                changed_tiles=0,
+                changed_regions=[],
+            )
+            if self.metric == "ssim":
+                result.update(ssim=1.0, ssim_min_window=1.0)
+            return result
 
         # Calculate difference
         diff = ImageChops.difference(baseline, current)
+        mask = self.diff_mask(diff)
 
-        # Calculate metrics
-        total_pixels = baseline.size[0] * baseline.size[1]
-        diff_pixels = self._count_different_pixels(diff)
-        diff_percentage = (diff_pixels / total_pixels) * 100
+        # Calculate metrics (ignored pixels are neither changed nor counted)
+        compared = max(1, total_pixels - ignored)
+        diff_pixels = self._count_mask(mask)
+        diff_percentage = (diff_pixels / compared) * 100
+        tiles = self.tile_stats(mask)
 
         # Determine pass/fail
-        passed = diff_percentage <= (self.threshold * 100)
+        if self.metric == "ssim":
+            mean, lowest = self.ssim(baseline, current)
+            result["ssim"] = round(mean, 4)
+            result["ssim_min_window"] = round(lowest, 4)
+            passed = mean >= self.min_ssim
+        else:
+            passed = diff_percentage <= (self.threshold * 100)
+
+        result.update(
+            different_pixels=diff_pixels,
+            difference_percentage=round(diff_percentage, 2),
+            passed=passed,
+            verdict="PASS" if passed else "FAIL",
+            identical=False,
+            changed_tiles=len(tiles),
+            changed_regions=self.changed_regions(mask, tiles)[:MAX_REGIONS],
+        )
+        return result
 
-        return {
-            "dimensions": baseline.size,
-            "total_pixels": total_pixels,
-            "different_pixels": diff_pixels,
-            "difference_percentage": round(diff_percentage, 2),
-            "threshold_percentage": self.threshold * 100,
-            "passed": passed,
-            "verdict": "PASS" if passed else "FAIL",
-        }
+    @staticmethod
+    def diff_mask(diff_image: Image.Image) -> Image.Image:
+        """Mode 'L' mask of changed pixels (255 where grayscale difference > noise)."""
+        return diff_image.convert("L").point(NOISE_LUT)
+
+    @staticmethod
+    def _count_mask(mask: Image.Image) -> int:
+        return mask.histogram()[255]
 
     def _count_different_pixels(self, diff_image: Image.Image) -> int:
         """Count number of pixels that are different."""
-        # Convert to grayscale for easier processing
-        diff_gray = diff_image.convert("L")
+        return self._count_mask(self.diff_mask(diff_image))
+
+    def tile_stats(self, mask: Image.Image) -> list[dict]:
+        """
+        Changed-pixel counts per tile, for tiles with any change.
 
-        # Count non-zero pixels (different)
-        pixels = diff_gray.getdata()
-        return sum(1 for pixel in pixels if pixel > 10)  # Threshold for noise
+        Args:
+            mask: Output of diff_mask()
+
+        Returns:
+            List of {"x", "y", "width", "height", "changed", "ratio"} in
+            row-major order (pixel coordinates)
+        """
+        size = self.tile_size
+        width, height = mask.size
+        tiles = []
+        # Skip rows with no change at all via one bbox per tile row
+        for top in range(0, height, size):
+            row = mask.crop((0, top, width, min(top + size, height)))
+            bbox = row.getbbox()
+            if not bbox:
+                continue
+            for left in range(bbox[0] // size * size, bbox[2], size):
+                box = (left, top, min(left + size, width), min(top + size, height))
+                changed = mask.crop(box).histogram()[255]
+                if changed:
+                    area = (box[2] - box[0]) * (box[3] - box[1])
+                    tiles.append(
+                        {
+                            "x": left,
+                            "y": top,
+                            "width": box[2] - box[0],
+                            "height": box[3] - box[1],
+                            "changed": changed,
+                            "ratio": round(changed / area, 4),
+                        }
+                    )
+        return tiles
+
+    def changed_regions(self, mask: Image.Image, tiles: list[dict] | None = None) -> list[dict]:
+        """
+        Bounding boxes of changed regions, largest first.
+
+        Changed tiles that touch (including diagonally) form one region; each
+        region's box is then tightened to its changed pixels.
+
+        Args:
+            mask: Output of diff_mask()
+            tiles: tile_stats(mask) if already computed
+
+        Returns:
+            List of {"x", "y", "width", "height", "changed"}
+        """
+        if tiles is None:
+            tiles = self.tile_stats(mask)
+        size = self.tile_size
+        by_cell = {(t["x"] // size, t["y"] // size): t for t in tiles}
+        seen: set[tuple[int, int]] = set()
+        regions = []
+        for start in by_cell:
+            if start in seen:
+                continue
+            seen.add(start)
+            stack = [start]
+            cells = []
+            while stack:
+                cx, cy = stack.pop()
+                cells.append((cx, cy))
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        neighbor = (cx + dx, cy + dy)
+                        if neighbor in by_cell and neighbor not in seen:
+                            seen.add(neighbor)
+                            stack.append(neighbor)
+            left = min(cx for cx, _ in cells) * size
+            top = min(cy for _, cy in cells) * size
+            right = min(mask.size[0], (max(cx for cx, _ in cells) + 1) * size)
+            bottom = min(mask.size[1], (max(cy for _, cy in cells) + 1) * size)
+            bbox = mask.crop((left, top, right, bottom)).getbbox()
+            if not bbox:
+                continue
+            regions.append(
+                {
+                    "x": left + bbox[0],
+                    "y": top + bbox[1],
+                    "width": bbox[2] - bbox[0],
+                    "height": bbox[3] - bbox[1],
+                    "changed": sum(by_cell[cell]["changed"] for cell in cells),
+                }
+            )
+        regions.sort(key=lambda r: r["changed"], reverse=True)
+        return regions
 
     def generate_diff_image(self, baseline_path: str, current_path: str, output_path: str) -> None:
-        """Generate highlighted difference image."""
-        baseline = Image.open(baseline_path).convert("RGB")
-        current = Image.open(current_path).convert("RGB")
+        """Generate highlighted difference image (ignored regions are not highlighted)."""
+        baseline, masked = self._prepare(baseline_path, current_path)
+        current = self._load(current_path)
 
         # Create difference image
-        diff = ImageChops.difference(baseline, current)
+        diff = ImageChops.difference(baseline, masked)
 
-        # Enhance differences with red overlay
-        diff_enhanced = Image.new("RGB", baseline.size)
-        for x in range(baseline.size[0]):
-            for y in range(baseline.size[1]):
-                diff_pixel = diff.getpixel((x, y))
-                if sum(diff_pixel) > 30:  # Threshold for visibility
-                    # Highlight in red
-                    diff_enhanced.putpixel((x, y), (255, 0, 0))
-                else:
-                    # Keep original
-                    diff_enhanced.putpixel((x, y), current.getpixel((x, y)))
+        # Summed RGB difference (saturating at 255 keeps the > 30 test exact)
+        red, green, blue = diff.split()
+        highlight = ImageChops.add(ImageChops.add(red, green), blue).point(HIGHLIGHT_LUT)
 
-        diff_enhanced.save(output_path)
+        # Enhance differences with red overlay, keep original elsewhere
+        overlay = Image.new("RGB", baseline.size, (255, 0, 0))
+        Image.composite(overlay, current, highlight).save(output_path)
 
     def generate_side_by_side(
         self, baseline_path: str, current_path: str, output_path: str
     ) -> None:
         """Generate side-by-side comparison image."""
-        baseline = Image.open(baseline_path)
-        current = Image.open(current_path)
+        baseline = self._load(baseline_path)
+        current = self._load(current_path)
 
         # Create combined image
         width = baseline.size[0] * 2 + 10  # 10px separator
@@ -140,11 +493,169 @@ class VisualDiffer:
         combined.save(output_path)
 
 
+def pair_screenshots(baseline_dir: str, current_dir: str) -> dict[str, list]:
+    """
+    Pair screenshots across two directory trees by semantic name.
+
+    The key is the relative directory plus semantic_screenshot_key() of the
+    file, so MyApp_Login_Empty_<timestamp>.png matches across runs. When a
+    tree holds several captures with one key, the latest (by name) is used.
+
+    Returns:
+        {"pairs": [(key, baseline, current)], "missing": [keys only in
+        baseline], "new": [keys only in current]}, each sorted by key
+    """
+
+    def index(root: str) -> dict[str, str]:
+        files: dict[str, str] = {}
+        for path in sorted(Path(root).rglob("*")):
+            if path.suffix.lower() not in SCREENSHOT_SUFFIXES or not path.is_file():
+                continue
+            relative = path.relative_to(root)
+            key = str(relative.parent / semantic_screenshot_key(relative))
+            files[key] = str(path)  # Sorted walk: later timestamps win
+        return files
+
+    baseline, current = index(baseline_dir), index(current_dir)
+    return {
+        "pairs": [(key, baseline[key], current[key]) for key in sorted(baseline.keys() & current)],
+        "missing": sorted(baseline.keys() - current.keys()),
+        "new": sorted(current.keys() - baseline.keys()),
+    }
+
+
+def _compare_pair(job: tuple[str, str, str, str, dict]) -> dict:
+    """Batch worker: compare one pair, writing artifacts only if it fails."""
+    key, baseline_path, current_path, output_dir, options = job
+    entry = {"key": key, "baseline": baseline_path, "current": current_path}
+    try:
+        differ = VisualDiffer(**options)
+        # Decode up front (cached for compare) so unreadable files raise, not exit
+        differ._load(baseline_path)
+        differ._load(current_path)
+        result = differ.compare(baseline_path, current_path)
+        if "error" in result:
+            entry.update(verdict="ERROR", passed=False, error=result["error"])
+            return entry
+        entry.update(
+            verdict=result["verdict"],
+            passed=result["passed"],
+            difference_percentage=result["difference_percentage"],
+            changed_regions=result["changed_regions"][:3],
+        )
+        if "ssim" in result:
+            entry["ssim"] = result["ssim"]
+        if not result["passed"]:
+            artifact_dir = Path(output_dir) / re.sub(r"[^\w.-]+", "_", key)
+            artifact_dir.mkdir(parents=True, exist_ok=True)
+            diff_path = artifact_dir / "diff.png"
+            side_by_side_path = artifact_dir / "side-by-side.png"
+            differ.generate_diff_image(baseline_path, current_path, str(diff_path))
+            differ.generate_side_by_side(baseline_path, current_path, str(side_by_side_path))
+            entry["artifacts"] = {
+                "diff": str(diff_path.relative_to(output_dir)),
+                "comparison": str(side_by_side_path.relative_to(output_dir)),
+            }
+    except Exception as e:
+        entry.update(verdict="ERROR", passed=False, error=str(e) or type(e).__name__)
+    return entry
+
+
+def run_batch(
+    baseline_dir: str,
+    current_dir: str,
+    output_dir: str,
+    workers: int | None = None,
+    **differ_options,
+) -> dict:
+    """
+    Compare every paired screenshot of two directory trees in parallel.
+
+    Each worker process decodes and scores its pairs independently, so
+    throughput scales with CPU cores. Diff and side-by-side images are
+    written (under output_dir/<key>/) only for failures.
+
+    Args:
+        baseline_dir: Baseline screenshot tree
+        current_dir: Current screenshot tree
+        output_dir: Directory for artifacts and batch-report.json/.md
+        workers: Worker processes (None = CPU count, 1 = in-process)
+        **differ_options: VisualDiffer keyword arguments
+
+    Returns:
+        Report dict: summary counts, failures (failed + errored entries),
+        missing/new keys and all results
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    paired = pair_screenshots(baseline_dir, current_dir)
+    jobs = [(key, b, c, output_dir, differ_options) for key, b, c in paired["pairs"]]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        results = [_compare_pair(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_compare_pair, jobs))
+
+    failures = [r for r in results if not r["passed"]]
+    errors = sum(1 for r in failures if r["verdict"] == "ERROR")
+    report = {
+        "summary": {
+            "compared": len(results),
+            "passed": len(results) - len(failures),
+            "failed": len(failures) - errors,
+            "errors": errors,
+            "missing": len(paired["missing"]),
+            "new": len(paired["new"]),
+            "workers": workers,
+        },
+        "failures": failures,
+        "missing": paired["missing"],
+        "new": paired["new"],
+        "results": results,
+    }
+
+    output = Path(output_dir)
+    with open(output / "batch-report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    with open(output / "batch-report.md", "w") as f:
+        summary = report["summary"]
+        f.write("# Visual Regression Report\n\n")
+        f.write(f"**Baseline:** {baseline_dir}\n")
+        f.write(f"**Current:** {current_dir}\n\n")
+        f.write(
+            f"- Compared: {summary['compared']} (passed {summary['passed']}, "
+            f"failed {summary['failed']}, errors {summary['errors']})\n"
+        )
+        f.write(f"- Missing in current: {summary['missing']}\n")
+        f.write(f"- New in current: {summary['new']}\n\n")
+        if failures:
+            f.write("## Failures\n\n")
+            f.write("| Screen | Verdict | Difference | Diff |\n|---|---|---|---|\n")
+            for entry in failures:
+                difference = entry.get("error") or f"{entry['difference_percentage']}%"
+                if "ssim" in entry:
+                    difference += f" (SSIM {entry['ssim']})"
+                artifact = entry.get("artifacts", {}).get("diff")
+                link = f"[diff]({artifact})" if artifact else ""
+                f.write(f"| {entry['key']} | {entry['verdict']} | {difference} | {link} |\n")
+            f.write("\n")
+        for title, keys in (("Missing in current", paired["missing"]), ("New", paired["new"])):
+            if keys:
+                f.write(f"## {title}\n\n")
+                f.writelines(f"- {key}\n" for key in keys)
+                f.write("\n")
+    return report
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Compare screenshots for visual differences")
-    parser.add_argument("baseline", help="Path to baseline screenshot")
-    parser.add_argument("current", help="Path to current screenshot")
+    parser.add_argument(
+        "baseline",
+        help="Baseline screenshot, or a directory (best match picked; tree with --batch)",
+    )
+    parser.add_argument("current", help="Path to current screenshot (directory with --batch)")
     parser.add_argument(
         "--output",
         default=".",
@@ -159,6 +670,41 @@ def main():
     parser.add_argument(
         "--details", action="store_true", help="Show detailed output (increases tokens)"
     )
+    parser.add_argument(
+        "--metric", choices=METRICS, default="pixels", help="Verdict metric (default: pixels)"
+    )
+    parser.add_argument(
+        "--min-ssim",
+        type=float,
+        default=DEFAULT_MIN_SSIM,
+        help=f"Minimum SSIM to pass with --metric ssim (default: {DEFAULT_MIN_SSIM})",
+    )
+    parser.add_argument(
+        "--ignore-status-bar", action="store_true", help="Mask the status bar before scoring"
+    )
+    parser.add_argument(
+        "--ignore-element",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Mask an on-screen element by identifier or label (repeatable, needs simulator)",
+    )
+    parser.add_argument(
+        "--ignore-region",
+        action="append",
+        default=[],
+        metavar="X,Y,W,H",
+        help="Mask a pixel box (repeatable)",
+    )
+    parser.add_argument(
+        "--udid", help="Device UDID for --ignore-element (auto-detects booted simulator)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat baseline/current as directory trees and compare every paired screenshot",
+    )
+    parser.add_argument("--workers", type=int, help="Batch worker processes (default: CPU count)")
 
     args = parser.parse_args()
 
@@ -166,8 +712,72 @@ def main():
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Resolve ignore regions to pixel boxes
+    ignore_regions: list[Region] = []
+    try:
+        for spec in args.ignore_region:
+            values = spec.split(",")
+            if len(values) != 4:
+                raise ValueError(f"Invalid --ignore-region '{spec}' (expected X,Y,W,H)")
+            x, y, width, height = (int(v) for v in values)
+            ignore_regions.append((x, y, width, height))
+        if args.ignore_element:
+            if args.batch:
+                raise ValueError("--ignore-element needs a live screen; not supported with --batch")
+            with Image.open(args.current) as image:
+                image_width = image.width
+            udid = resolve_udid(args.udid)
+            ignore_regions.extend(element_regions(args.ignore_element, udid, image_width))
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # Directory baseline: pick the screenshot of the same screen
+    if not args.batch and Path(args.baseline).is_dir():
+        try:
+            match = index_for_directory(args.baseline).nearest(image_hash(args.current))
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if match is None:
+            print(f"Error: No screenshot in {args.baseline} matches this screen")
+            sys.exit(1)
+        distance, entry = match
+        args.baseline = entry["path"]
+        print(f"Baseline: {entry['path']} (screen {entry['screen']}, hash distance {distance})")
+
+    differ_options = {
+        "threshold": args.threshold,
+        "metric": args.metric,
+        "min_ssim": args.min_ssim,
+        "ignore_regions": ignore_regions,
+        "ignore_status_bar": args.ignore_status_bar,
+    }
+    if args.batch:
+        for directory in (args.baseline, args.current):
+            if not Path(directory).is_dir():
+                print(f"Error: Not a directory: {directory}")
+                sys.exit(1)
+        report = run_batch(
+            args.baseline, args.current, str(output_dir), workers=args.workers, **differ_options
+        )
+        summary = report["summary"]
+        print(
+            f"Compared: {summary['compared']}, Passed: {summary['passed']}, "
+            f"Failed: {summary['failed']}, Errors: {summary['errors']}"
+        )
+        if summary["missing"] or summary["new"]:
+            print(f"Missing in current: {summary['missing']}, New in current: {summary['new']}")
+        for entry in report["failures"][:5]:
+            detail = entry.get("error") or f"{entry['difference_percentage']}%"
+            print(f"  [{entry['verdict']}] {entry['key']} - {detail}")
+        if len(report["failures"]) > 5:
+            print(f"  ... {len(report['failures']) - 5} more")
+        print(f"Report: {output_dir / 'batch-report.md'}")
+        sys.exit(0 if summary["failed"] == 0 and summary["errors"] == 0 else 1)
+
     # Initialize differ
-    differ = VisualDiffer(threshold=args.threshold)
+    differ = VisualDiffer(**differ_options)
 
     # Perform comparison
     result = differ.compare(args.baseline, args.current)
@@ -183,11 +793,13 @@ def main():
     diff_image_path = output_dir / "diff.png"
     comparison_image_path = output_dir / "side-by-side.png"
 
-    try:
-        differ.generate_diff_image(args.baseline, args.current, str(diff_image_path))
-        differ.generate_side_by_side(args.baseline, args.current, str(comparison_image_path))
-    except Exception as e:
-        print(f"Warning: Could not generate images - {e}")
+    # Identical screenshots have nothing to show
+    if not result["identical"]:
+        try:
+            differ.generate_diff_image(args.baseline, args.current, str(diff_image_path))
+            differ.generate_side_by_side(args.baseline, args.current, str(comparison_image_path))
+        except Exception as e:
+            print(f"Warning: Could not generate images - {e}")
 
     # Output results (token-optimized)
     if args.details:
@@ -208,9 +820,21 @@ def main():
         print(json.dumps(report, indent=2))
     else:
         # Minimal output (default)
-        print(f"Difference: {result['difference_percentage']}% ({result['verdict']})")
+        if result["identical"]:
+            print("Identical (PASS)")
+        elif args.metric == "ssim":
+            print(
+                f"SSIM: {result['ssim']} (min {args.min_ssim}, {result['verdict']}), "
+                f"difference: {result['difference_percentage']}%"
+            )
+        else:
+            print(f"Difference: {result['difference_percentage']}% ({result['verdict']})")
         if result["different_pixels"] > 0:
             print(f"Changed pixels: {result['different_pixels']:,}")
+            regions = result["changed_regions"]
+            boxes = ", ".join(f"{r['width']}x{r['height']}@{r['x']},{r['y']}" for r in regions[:3])
+            more = f" (+{len(regions) - 3} more)" if len(regions) > 3 else ""
+            print(f"Changed regions: {boxes}{more}")
         print(f"Artifacts saved to: {output_dir}/")
 
     # Save JSON report
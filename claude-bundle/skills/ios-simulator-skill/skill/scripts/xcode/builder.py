@@ -9,6 +9,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from common.device_inventory import get_inventory
+
 from .cache import XCResultCache
 from .config import Config
 
@@ -144,18 +146,22 @@ class BuildRunner:
             True if simulator exists and is available
         """
         try:
-            result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "available", "iOS"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            return any(name in device["name"] for device in self._available_ios_simulators())
+        except RuntimeError:
+            return False
 
-            # Check if simulator name appears in available devices
-            return any(name in line and "(" in line for line in result.stdout.split("\n"))
+    def _available_ios_simulators(self) -> list[dict]:
+        """
+        Available iOS simulators from the shared device inventory.
 
-        except subprocess.CalledProcessError:
-            return False
+        Raises:
+            RuntimeError: If simctl fails
+        """
+        return [
+            device
+            for device in get_inventory().devices()
+            if device["is_available"] and device["runtime_name"].startswith("iOS ")
+        ]
 
     def _extract_simulator_name_from_destination(self, destination: str) -> str | None:
         """
@@ -181,26 +187,15 @@ class BuildRunner:
             Destination string for -destination flag
         """
         try:
-            result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "available", "iOS"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            # Parse available simulators, prefer latest iPhone
-            # Looking for lines like: "iPhone 16 Pro (12345678-1234-1234-1234-123456789012) (Shutdown)"
-            for line in result.stdout.split("\n"):
-                if "iPhone" in line and "(" in line:
-                    # Extract device name
-                    name = line.split("(")[0].strip()
-                    if name:
-                        return f"platform=iOS Simulator,name={name}"
+            # Prefer the first available iPhone
+            for device in self._available_ios_simulators():
+                if "iPhone" in device["name"]:
+                    return f"platform=iOS Simulator,name={device['name']}"
 
             # Fallback to generic iOS Simulator if no iPhone found
             return "generic/platform=iOS Simulator"
 
-        except subprocess.CalledProcessError as e:
+        except RuntimeError as e:
             print(f"Warning: Could not auto-detect simulator: {e}", file=sys.stderr)
             return "generic/platform=iOS Simulator"
 
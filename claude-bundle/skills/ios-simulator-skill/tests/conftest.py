@@ -0,0 +1,6 @@
+"""Make the skill's scripts importable the way they import each other (from skill/scripts)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "skill" / "scripts"))
@@ -0,0 +1,56 @@
+"""Incremental audits: memoized subtrees give the same results as a full audit."""
+
+import copy
+
+import pytest
+
+from accessibility_audit import AccessibilityAuditor
+from common.benchmarks import synthetic_flow
+
+
+@pytest.fixture
+def auditor():
+    auditor = AccessibilityAuditor(packs=["wcag"])
+    auditor.memo.clear()
+    return auditor
+
+
+def test_shared_subtrees_are_reused_with_the_same_results(auditor):
+    plain = AccessibilityAuditor(packs=["wcag"], memoize=False)
+    flow = synthetic_flow(10, cells=8, variants=12, shared=True)
+    for screen in flow:
+        expected = plain.audit_incremental(screen)
+        result = auditor.audit_incremental(screen)
+        assert result["issues"] == expected["issues"]
+        assert result["total"] == expected["total"] == auditor.audit_tree(screen)["total"]
+        assert result["rules"] == expected["rules"]
+    assert auditor.last_stats["reused"] > 0
+    assert auditor.last_stats["evaluated"] < auditor.last_stats["nodes"]
+
+
+def test_same_tree_is_not_walked_again(auditor):
+    screen = synthetic_flow(1)[0]
+    first = auditor.audit_incremental(screen)
+    second = auditor.audit_incremental(screen)
+    assert second["issues"] == first["issues"]
+    assert auditor.last_stats == {"nodes": first["total"], "evaluated": 0, "reused": 1}
+
+
+def test_subtree_at_another_depth_is_evaluated_again(auditor):
+    cell = synthetic_flow(1, cells=1, variants=1)[0]
+    auditor.audit_incremental(cell)
+    wrapped = {"type": "Other", "traits": ["Other"], "children": [cell]}
+    for _ in range(5):
+        wrapped = {"type": "Other", "traits": ["Other"], "children": [wrapped]}
+
+    expected = AccessibilityAuditor(packs=["wcag"], memoize=False).audit_incremental(wrapped)
+    assert auditor.audit_incremental(wrapped)["issues"] == expected["issues"]
+    assert any(issue[0] == "deep_nesting" for issue in expected["issues"])
+
+
+def test_fresh_copies_are_evaluated(auditor):
+    screen = synthetic_flow(1)[0]
+    auditor.audit_incremental(screen)
+    result = auditor.audit_incremental(copy.deepcopy(screen))
+    assert auditor.last_stats["reused"] == 0
+    assert result["issues"] == auditor.audit_incremental(screen)["issues"]
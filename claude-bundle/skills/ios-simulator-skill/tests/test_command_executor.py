@@ -0,0 +1,149 @@
+"""Per-device command queues: output capture, ordering, timeouts and generations."""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from common import command_executor
+from common.command_executor import CommandExecutor, is_mutating
+
+MODES = ["serial", "direct"]
+
+
+def sh(script: str) -> list[str]:
+    return ["/bin/sh", "-c", script]
+
+
+@pytest.fixture(params=MODES)
+def executor(request, monkeypatch):
+    invalidations = []
+    monkeypatch.setattr(command_executor, "invalidate_inventory", lambda: invalidations.append(1))
+    executor = CommandExecutor(mode=request.param)
+    executor.invalidations = invalidations
+    yield executor
+    executor.close()
+
+
+def test_output_and_exit_status_are_kept_per_command(executor):
+    futures = [
+        executor.submit(sh(f"printf 'out {i}'; printf 'err {i}' >&2; exit {i}"), udid="A")
+        for i in range(5)
+    ]
+    for i, future in enumerate(futures):
+        result = future.result()
+        assert (result.stdout, result.stderr, result.returncode) == (f"out {i}", f"err {i}", i)
+
+
+def test_large_output_is_not_truncated(executor):
+    script = "import sys; sys.stdout.write('x' * 3_000_000)"
+    result = executor.run([sys.executable, "-c", script], udid="A")
+    assert len(result.stdout) == 3_000_000
+
+
+def test_binary_output(executor):
+    result = executor.run(sh("printf '\\211PNG\\000'"), udid="A", text=False)
+    assert result.stdout == b"\x89PNG\x00"
+
+
+def test_commands_on_one_device_run_in_order(executor, tmp_path):
+    log = tmp_path / "order.log"
+    futures = [
+        executor.submit(sh(f"sleep 0.0{5 - i}; echo {i} >> {log}"), udid="A") for i in range(5)
+    ]
+    for future in futures:
+        future.result()
+    assert log.read_text().split() == ["0", "1", "2", "3", "4"]
+
+
+def test_check_raises_called_process_error(executor):
+    with pytest.raises(subprocess.CalledProcessError):
+        executor.run(sh("exit 3"), udid="A", check=True)
+
+
+def test_timeout_fails_only_the_timed_out_command(executor):
+    started = time.monotonic()
+    slow = executor.submit(sh("sleep 5"), udid="A", timeout=0.3)
+    queued = executor.submit(sh("echo still here"), udid="A")
+    other_device = executor.submit(sh("echo other"), udid="B")
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        slow.result()
+    assert queued.result().stdout == "still here\n"
+    assert other_device.result().stdout == "other\n"
+    assert time.monotonic() - started < 3
+
+    # The device keeps working after a timeout
+    assert executor.run(sh("echo again"), udid="A").stdout == "again\n"
+
+
+def test_run_timeout_raises_timeout_expired(executor):
+    with pytest.raises(subprocess.TimeoutExpired):
+        executor.run(sh("sleep 5"), udid="A", timeout=0.2)
+
+
+def test_simctl_runs_resolved_binary(monkeypatch):
+    monkeypatch.setattr(command_executor, "resolve_simctl_path", lambda: "/bin/echo")
+    executor = CommandExecutor(mode="serial")
+    assert executor.run(["xcrun", "simctl", "help"], udid="A").stdout == "help\n"
+    executor.close()
+
+
+def test_is_mutating():
+    assert is_mutating(["idb", "ui", "tap", "1", "2"])
+    assert is_mutating(["xcrun", "simctl", "openurl", "booted", "app://"])
+    assert not is_mutating(["idb", "ui", "describe-all", "--json"])
+    assert not is_mutating(["xcrun", "simctl", "list", "devices", "-j"])
+
+
+class BootedInventory:
+    def booted(self):
+        return [{"udid": "A"}]
+
+
+def test_generations_count_mutating_commands(executor, monkeypatch):
+    monkeypatch.setattr(command_executor, "_run_process", lambda *args: None)
+    monkeypatch.setattr(command_executor, "resolve_simctl_path", lambda: None)
+    monkeypatch.setattr(command_executor, "get_inventory", BootedInventory)
+    assert executor.generation("A") == 0
+
+    executor.run(["idb", "ui", "describe-all", "--json"], udid="A")
+    assert executor.generation("A") == 0
+
+    executor.run(["idb", "ui", "tap", "1", "2"], udid="A")
+    executor.run(["idb", "ui", "text", "hi"], udid="A")
+    assert executor.generation("A") == 2
+    assert executor.generation("B") == 0
+    # A named device may be the booted one
+    assert executor.generation() == 2
+
+    # An untargeted command lands on the booted device
+    executor.run(["idb", "ui", "tap", "1", "2"])
+    assert executor.generation() == 3
+    assert executor.generation("A") == 3
+    assert executor.generation("B") == 0
+
+
+def test_lifecycle_commands_invalidate_inventory(executor, monkeypatch):
+    monkeypatch.setattr(
+        command_executor,
+        "_run_process",
+        lambda cmd, *args: subprocess.CompletedProcess(cmd, 0, "", ""),
+    )
+    monkeypatch.setattr(command_executor, "resolve_simctl_path", lambda: None)
+    executor.run(["xcrun", "simctl", "listapps", "A"], udid="A")
+    assert executor.invalidations == []
+    executor.run(["xcrun", "simctl", "boot", "A"], udid="A")
+    assert executor.invalidations == [1]
+
+
+def test_idb_commands_run_as_given(executor, monkeypatch):
+    ran = []
+    monkeypatch.setattr(command_executor, "_run_process", lambda cmd, *args: ran.append(cmd))
+    executor.run(["idb", "ui", "tap", "1", "2", "--udid", "A"], udid="A")
+    executor.run(["idb", "ui", "tap", "3", "4", "--udid", "A"], udid="A")
+    assert ran == [
+        ["idb", "ui", "tap", "1", "2", "--udid", "A"],
+        ["idb", "ui", "tap", "3", "4", "--udid", "A"],
+    ]
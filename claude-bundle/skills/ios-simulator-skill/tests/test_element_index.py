@@ -0,0 +1,62 @@
+"""ElementIndex queries: text, type, identifier and selectors."""
+
+import pytest
+
+from common.element_index import ElementIndex
+
+
+def node(element_type: str | None, label: str | None = None, **fields) -> dict:
+    data = {"AXLabel": label, "children": fields.pop("children", []), **fields}
+    if element_type:
+        data["type"] = element_type
+    return data
+
+
+@pytest.fixture
+def index():
+    return ElementIndex(
+        node(
+            "Application",
+            "App",
+            children=[
+                node("NavigationBar", children=[node("Button", "Back", AXUniqueId="back")]),
+                node(None, "Terms and conditions"),
+                node("Button", "Log In", AXUniqueId="login"),
+                node("Button", "Log Out", enabled=False),
+            ],
+        )
+    )
+
+
+def labels(index: ElementIndex, positions: list[int]) -> list[str]:
+    return [index.nodes[pos]["AXLabel"] for pos in positions]
+
+
+def test_fuzzy_text_is_a_case_insensitive_substring(index):
+    assert labels(index, index.find(text="log")) == ["Log In"]
+    assert labels(index, index.find(text="log", enabled_only=False)) == ["Log In", "Log Out"]
+
+
+def test_exact_text(index):
+    assert labels(index, index.find(text="Log In", fuzzy=False)) == ["Log In"]
+    assert index.find(text="log in", fuzzy=False) == []
+
+
+def test_untyped_nodes_are_never_matched(index):
+    assert index.find(text="terms") == []
+    assert index.select("*[text~=terms]") == []
+    assert "Terms and conditions" not in labels(index, index.find())
+    assert "Terms and conditions" not in labels(index, index.select("*"))
+
+
+def test_type_and_identifier(index):
+    assert labels(index, index.find(element_type="Button")) == ["Back", "Log In"]
+    assert labels(index, index.find(identifier="login")) == ["Log In"]
+
+
+def test_selectors(index):
+    assert labels(index, index.select("NavigationBar Button")) == ["Back"]
+    assert labels(index, index.select("Button[id=login]")) == ["Log In"]
+    assert labels(index, index.select("Button:nth(1)")) == ["Log In"]
+    with pytest.raises(ValueError):
+        index.select("Button[size=1]")
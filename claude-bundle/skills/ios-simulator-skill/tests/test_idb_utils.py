@@ -0,0 +1,48 @@
+"""Tree traversal and screen-size caching."""
+
+import json
+
+from common import idb_utils
+from common.benchmarks import synthetic_tree
+from common.idb_utils import flatten_tree, iter_tree
+
+
+def test_flatten_tree_returns_serializable_copies():
+    tree = synthetic_tree(500)
+    flat = flatten_tree(tree)
+    json.dumps(flat)
+    assert [e["depth"] for e in flat] == [v.depth for v in iter_tree(tree)]
+    assert [e.get("type") for e in flat] == [v.get("type") for v in iter_tree(tree)]
+
+    flat[0]["type"] = "Changed"
+    assert tree["type"] != "Changed"
+
+
+def test_deep_trees_do_not_recurse():
+    root = chain = {"type": "Other"}
+    for _ in range(5000):
+        chain["children"] = [{"type": "Other"}]
+        chain = chain["children"][0]
+    assert len(flatten_tree(root, depth=2)) == 5001
+    assert flatten_tree(root, depth=2)[-1]["depth"] == 5002
+
+
+def test_screen_size_is_shared_by_device_type(tmp_path, monkeypatch):
+    class Inventory:
+        def get(self, udid):
+            return {"device_type_identifier": "iPhone-16"}
+
+    def fetch(udid, nested, max_age):
+        fetched.append(udid)
+        return {"frame": {"width": 402, "height": 874}}
+
+    fetched = []
+    monkeypatch.setattr(idb_utils, "SCREEN_SIZE_CACHE_PATH", tmp_path / "sizes.json")
+    monkeypatch.setattr(idb_utils, "_screen_sizes", {})
+    monkeypatch.setattr(idb_utils, "get_inventory", Inventory)
+    monkeypatch.setattr(idb_utils, "_fetch_tree", fetch)
+
+    assert idb_utils.get_screen_size("A") == (402, 874)
+    idb_utils._screen_sizes.clear()
+    assert idb_utils.get_screen_size("B") == (402, 874)
+    assert fetched == ["A"]
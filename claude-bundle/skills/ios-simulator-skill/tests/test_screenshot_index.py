@@ -0,0 +1,37 @@
+"""Directory indexes: new, replaced and deleted screenshots are picked up."""
+
+import os
+
+import pytest
+
+from common.screenshot_index import image_hash, index_for_directory
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def screen(path, split: int) -> None:
+    image = Image.new("L", (90, 80), 0)
+    image.paste(255, (0, 0, split, 80))
+    image.save(path)
+
+
+def test_sync_rehashes_only_changed_files(tmp_path):
+    login, home = tmp_path / "App_Login_1.png", tmp_path / "App_Home_1.png"
+    screen(login, 10)
+    screen(home, 60)
+    index = index_for_directory(tmp_path)
+    assert len(index) == 2
+    assert index.sync_directory(tmp_path) == 0
+
+    # Overwritten in place: same path, different image
+    mtime = login.stat().st_mtime_ns
+    screen(login, 40)
+    os.utime(login, ns=(mtime + 1_000_000, mtime + 1_000_000))
+    index = index_for_directory(tmp_path)
+    entry = next(e for e in index.entries if e["path"] == str(login))
+    assert int(entry["hash"], 16) == image_hash(login)
+    assert len(index) == 2
+
+    home.unlink()
+    index = index_for_directory(tmp_path)
+    assert [e["path"] for e in index.entries] == [str(login)]
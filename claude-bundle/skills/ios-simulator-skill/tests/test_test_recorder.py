@@ -0,0 +1,54 @@
+"""Accessibility snapshots stored by TestRecorder."""
+
+import pytest
+
+import test_recorder
+
+
+def tree(*labels: str) -> dict:
+    return {
+        "type": "Application",
+        "AXLabel": "App",
+        "children": [{"type": "Button", "AXLabel": label} for label in labels],
+    }
+
+
+@pytest.fixture
+def recorder(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        test_recorder,
+        "capture_screenshot",
+        lambda *args, **kwargs: {"mode": "inline", "base64_data": "", "width": 1, "height": 1},
+    )
+    return test_recorder.TestRecorder("snapshots", output_dir=str(tmp_path), inline=True)
+
+
+def test_deltas_rebuild_every_step(recorder, monkeypatch):
+    trees = [tree("A"), tree("A", "B"), tree("B", "C")]
+    fetched = iter(trees)
+    monkeypatch.setattr(test_recorder, "get_accessibility_tree", lambda *a, **k: next(fetched))
+    for step in range(3):
+        recorder.step(f"step {step + 1}")
+
+    assert [s["accessibility_mode"] for s in recorder.steps] == ["full", "delta", "delta"]
+    for step, expected in enumerate(trees, 1):
+        assert recorder.load_accessibility(step) == expected
+
+
+def test_failed_capture_mid_recording(recorder, monkeypatch):
+    def fetch(*args, **kwargs):
+        result = next(fetched)
+        if result is None:
+            raise RuntimeError("idb unavailable")
+        return result
+
+    fetched = iter([tree("A"), None, tree("A", "B")])
+    monkeypatch.setattr(test_recorder, "get_accessibility_tree", fetch)
+    for step in range(3):
+        recorder.step(f"step {step + 1}")
+
+    assert recorder.steps[1]["accessibility"] is None
+    # Step 3 is a delta against step 1, the last step that stored a snapshot
+    assert recorder.load_accessibility(3) == tree("A", "B")
+    with pytest.raises(FileNotFoundError):
+        recorder.load_accessibility(2)
@@ -0,0 +1,35 @@
+"""Tree deltas: apply_delta(old, diff_trees(old, new)) rebuilds new exactly."""
+
+import pytest
+
+from common.tree_diff import apply_delta, diff_trees
+
+
+def node(label: str, *children: dict, **fields) -> dict:
+    data = {"type": "Button", "AXLabel": label, **fields}
+    if children:
+        data["children"] = list(children)
+    return data
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        (node("root", node("a"), node("b")), node("root", node("b"), node("a"), node("c"))),
+        (node("root", node("a", node("x")), node("b")), node("root", node("a"), node("b"))),
+        (node("root", node("a"), node("b")), node("root")),
+        (node("root"), node("root", children=[])),
+        (node("root", children=[]), node("root")),
+        (node("root"), node("root", node("a"))),
+        (node("root", node("a", enabled=True)), node("root", node("renamed"))),
+    ],
+)
+def test_apply_delta_rebuilds_the_new_tree(old, new):
+    rebuilt = apply_delta(old, diff_trees(old, new))
+    assert rebuilt == new
+    assert ("children" in rebuilt) == ("children" in new)
+
+
+def test_identical_trees_have_no_ops():
+    tree = node("root", node("a"))
+    assert diff_trees(tree, node("root", node("a"))) == []